@@ -42,4 +42,8 @@ echo "🧠 Rebuilding identity templates..."
 python scripts/rebuild_identity_templates.py || echo "⚠️ Identity template rebuild skipped"
 
 echo "🚀 Starting TraceIQ Backend..."
+if [ "${API_WORKERS:-1}" -gt 1 ]; then
+    # Face models load once here and are shared copy-on-write by the forked workers.
+    exec python scripts/serve_prefork.py --host 0.0.0.0 --port 8000 --workers "${API_WORKERS}"
+fi
 exec uvicorn src.main:app --host 0.0.0.0 --port 8000
@@ -0,0 +1,90 @@
+"""Add ANN index on identity template embeddings
+
+Revision ID: 0c4e8a9b7d21
+Revises: f7a8b9c0d1e2
+Create Date: 2026-10-16 09:00:00.000000
+
+"""
+import math
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0c4e8a9b7d21"
+down_revision: Union[str, Sequence[str], None] = "f7a8b9c0d1e2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEX_NAME = "ix_identity_templates_template_embedding_ann"
+HNSW_MIN_PGVECTOR_VERSION = (0, 5, 0)
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+
+
+def _pgvector_version(bind) -> tuple[int, ...]:
+    raw_version = bind.execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not raw_version:
+        return (0,)
+    return tuple(int(part) for part in str(raw_version).split(".") if part.isdigit())
+
+
+def _resolve_index_method(bind) -> str:
+    # VECTOR_INDEX_METHOD lets operators force ivfflat (e.g. faster builds, lower memory).
+    requested = (os.getenv("VECTOR_INDEX_METHOD") or "").strip().lower()
+    if requested in {"hnsw", "ivfflat"}:
+        return requested
+    if _pgvector_version(bind) >= HNSW_MIN_PGVECTOR_VERSION:
+        return "hnsw"
+    return "ivfflat"
+
+
+def _resolve_ivfflat_lists(bind) -> int:
+    configured = os.getenv("VECTOR_INDEX_IVFFLAT_LISTS")
+    if configured:
+        return max(int(configured), 1)
+
+    # pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond that.
+    row_count = int(bind.execute(sa.text("SELECT count(*) FROM identity_templates")).scalar() or 0)
+    if row_count > 1_000_000:
+        return max(int(math.sqrt(row_count)), 10)
+    return max(row_count // 1000, 10)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    index_method = _resolve_index_method(bind)
+
+    if index_method == "hnsw":
+        op.create_index(
+            INDEX_NAME,
+            "identity_templates",
+            ["template_embedding"],
+            unique=False,
+            postgresql_using="hnsw",
+            postgresql_with={"m": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION},
+            postgresql_ops={"template_embedding": "vector_l2_ops"},
+        )
+        return
+
+    # IVFFlat centroids are trained on the rows present at build time; REINDEX after
+    # bulk enrollment or re-embedding to keep recall stable.
+    op.create_index(
+        INDEX_NAME,
+        "identity_templates",
+        ["template_embedding"],
+        unique=False,
+        postgresql_using="ivfflat",
+        postgresql_with={"lists": _resolve_ivfflat_lists(bind)},
+        postgresql_ops={"template_embedding": "vector_l2_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(INDEX_NAME, table_name="identity_templates")
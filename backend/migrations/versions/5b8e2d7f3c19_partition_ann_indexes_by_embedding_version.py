@@ -0,0 +1,176 @@
+"""Partition ANN indexes by embedding version
+
+Revision ID: 5b8e2d7f3c19
+Revises: 0c4e8a9b7d21
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+import math
+import os
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b8e2d7f3c19"
+down_revision: Union[str, Sequence[str], None] = "0c4e8a9b7d21"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+GLOBAL_TEMPLATE_INDEX_NAME = "ix_identity_templates_template_embedding_ann"
+# (table, vector column, index name prefix)
+VECTOR_COLUMNS = [
+    ("identity_templates", "template_embedding", "ix_identity_templates_ann"),
+    ("face_embeddings", "embedding", "ix_face_embeddings_ann"),
+]
+# Embedding spaces of the bundled models (ONNX backends store their PyTorch model's space).
+DEFAULT_EMBEDDING_VERSIONS = ["tracenet_v1", "facenet_vggface2", "tracenet_v1_int8"]
+# Versions are interpolated into the index predicate, so anything else is skipped.
+EMBEDDING_VERSION_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_.\-]{0,63}$")
+POSTGRES_MAX_IDENTIFIER_LENGTH = 63
+HNSW_MIN_PGVECTOR_VERSION = (0, 5, 0)
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+
+
+def _pgvector_version(bind) -> tuple[int, ...]:
+    raw_version = bind.execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not raw_version:
+        return (0,)
+    return tuple(int(part) for part in str(raw_version).split(".") if part.isdigit())
+
+
+def _resolve_index_method(bind) -> str:
+    # VECTOR_INDEX_METHOD lets operators force ivfflat (e.g. faster builds, lower memory).
+    requested = (os.getenv("VECTOR_INDEX_METHOD") or "").strip().lower()
+    if requested in {"hnsw", "ivfflat"}:
+        return requested
+    if _pgvector_version(bind) >= HNSW_MIN_PGVECTOR_VERSION:
+        return "hnsw"
+    return "ivfflat"
+
+
+def _resolve_ivfflat_lists(bind, table: str, embedding_version: str | None = None) -> int:
+    configured = os.getenv("VECTOR_INDEX_IVFFLAT_LISTS")
+    if configured:
+        return max(int(configured), 1)
+
+    # pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) beyond that, per partition.
+    if embedding_version is None:
+        row_count = int(bind.execute(sa.text(f"SELECT count(*) FROM {table}")).scalar() or 0)
+    else:
+        row_count = int(
+            bind.execute(
+                sa.text(f"SELECT count(*) FROM {table} WHERE embedding_version = :version"),
+                {"version": embedding_version},
+            ).scalar()
+            or 0
+        )
+    if row_count > 1_000_000:
+        return max(int(math.sqrt(row_count)), 10)
+    return max(row_count // 1000, 10)
+
+
+def _embedding_versions(bind) -> list[str]:
+    # VECTOR_INDEX_EMBEDDING_VERSIONS (comma separated) adds versions that have no rows yet,
+    # e.g. a model about to be rolled out by the embedding migration.
+    configured = [
+        version.strip().lower()
+        for version in (os.getenv("VECTOR_INDEX_EMBEDDING_VERSIONS") or "").split(",")
+        if version.strip()
+    ]
+    stored = [
+        row[0]
+        for table, _column, _prefix in VECTOR_COLUMNS
+        for row in bind.execute(
+            sa.text(f"SELECT DISTINCT embedding_version FROM {table} WHERE embedding_version IS NOT NULL")
+        )
+    ]
+    versions: list[str] = []
+    for version in [*DEFAULT_EMBEDDING_VERSIONS, *configured, *stored]:
+        if version not in versions and EMBEDDING_VERSION_PATTERN.match(version):
+            versions.append(version)
+    return versions
+
+
+def _index_name(prefix: str, embedding_version: str) -> str:
+    slug = re.sub(r"[^a-z0-9_]", "_", embedding_version)
+    return f"{prefix}_{slug}"[:POSTGRES_MAX_IDENTIFIER_LENGTH]
+
+
+def _existing_partial_indexes(bind) -> list[tuple[str, str]]:
+    rows = bind.execute(
+        sa.text(
+            "SELECT tablename, indexname FROM pg_indexes "
+            "WHERE tablename IN ('identity_templates', 'face_embeddings') "
+            "AND (indexname LIKE 'ix_identity_templates_ann_%' OR indexname LIKE 'ix_face_embeddings_ann_%')"
+        )
+    )
+    return [(table, index_name) for table, index_name in rows]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    index_method = _resolve_index_method(bind)
+
+    # One partial index per (table, embedding version): searches filter on the active
+    # version, so each probe walks a graph holding only comparable vectors.
+    # Versions registered after this ran get theirs from scripts/create_vector_indexes.py.
+    op.drop_index(GLOBAL_TEMPLATE_INDEX_NAME, table_name="identity_templates")
+    for embedding_version in _embedding_versions(bind):
+        for table, column, prefix in VECTOR_COLUMNS:
+            if index_method == "hnsw":
+                index_options = {
+                    "postgresql_using": "hnsw",
+                    "postgresql_with": {"m": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION},
+                }
+            else:
+                # IVFFlat centroids are trained on the partition's rows at build time;
+                # REINDEX after bulk enrollment or re-embedding into this version.
+                index_options = {
+                    "postgresql_using": "ivfflat",
+                    "postgresql_with": {"lists": _resolve_ivfflat_lists(bind, table, embedding_version)},
+                }
+            op.create_index(
+                _index_name(prefix, embedding_version),
+                table,
+                [column],
+                unique=False,
+                postgresql_ops={column: "vector_l2_ops"},
+                postgresql_where=sa.text(f"embedding_version = '{embedding_version}'"),
+                **index_options,
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    for table, index_name in _existing_partial_indexes(bind):
+        op.drop_index(index_name, table_name=table)
+
+    if _resolve_index_method(bind) == "hnsw":
+        op.create_index(
+            GLOBAL_TEMPLATE_INDEX_NAME,
+            "identity_templates",
+            ["template_embedding"],
+            unique=False,
+            postgresql_using="hnsw",
+            postgresql_with={"m": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION},
+            postgresql_ops={"template_embedding": "vector_l2_ops"},
+        )
+        return
+
+    op.create_index(
+        GLOBAL_TEMPLATE_INDEX_NAME,
+        "identity_templates",
+        ["template_embedding"],
+        unique=False,
+        postgresql_using="ivfflat",
+        postgresql_with={"lists": _resolve_ivfflat_lists(bind, "identity_templates")},
+        postgresql_ops={"template_embedding": "vector_l2_ops"},
+    )
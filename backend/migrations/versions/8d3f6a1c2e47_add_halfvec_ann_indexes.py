@@ -0,0 +1,172 @@
+"""Add opt-in halfvec ANN indexes
+
+Revision ID: 8d3f6a1c2e47
+Revises: 5b8e2d7f3c19
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+import math
+import os
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8d3f6a1c2e47"
+down_revision: Union[str, Sequence[str], None] = "5b8e2d7f3c19"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (table, vector column, float32 index prefix, halfvec index prefix)
+VECTOR_COLUMNS = [
+    ("identity_templates", "template_embedding", "ix_identity_templates_ann", "ix_identity_templates_ann_half"),
+    ("face_embeddings", "embedding", "ix_face_embeddings_ann", "ix_face_embeddings_ann_half"),
+]
+EMBEDDING_DIMENSIONS = 512
+DEFAULT_EMBEDDING_VERSIONS = ["tracenet_v1", "facenet_vggface2", "tracenet_v1_int8"]
+EMBEDDING_VERSION_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_.\-]{0,63}$")
+POSTGRES_MAX_IDENTIFIER_LENGTH = 63
+HALFVEC_MIN_PGVECTOR_VERSION = (0, 7, 0)
+HNSW_MIN_PGVECTOR_VERSION = (0, 5, 0)
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+
+
+def _halfvec_requested() -> bool:
+    # Opt-in: without VECTOR_INDEX_HALFVEC this revision only records that it ran.
+    # To switch later, `alembic downgrade 5b8e2d7f3c19` then upgrade with the variable set.
+    return (os.getenv("VECTOR_INDEX_HALFVEC") or "").strip().lower() in {"1", "true", "yes"}
+
+
+def _pgvector_version(bind) -> tuple[int, ...]:
+    raw_version = bind.execute(
+        sa.text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+    ).scalar()
+    if not raw_version:
+        return (0,)
+    return tuple(int(part) for part in str(raw_version).split(".") if part.isdigit())
+
+
+def _resolve_index_method(bind) -> str:
+    requested = (os.getenv("VECTOR_INDEX_METHOD") or "").strip().lower()
+    if requested in {"hnsw", "ivfflat"}:
+        return requested
+    if _pgvector_version(bind) >= HNSW_MIN_PGVECTOR_VERSION:
+        return "hnsw"
+    return "ivfflat"
+
+
+def _resolve_ivfflat_lists(bind, table: str, embedding_version: str) -> int:
+    configured = os.getenv("VECTOR_INDEX_IVFFLAT_LISTS")
+    if configured:
+        return max(int(configured), 1)
+
+    row_count = int(
+        bind.execute(
+            sa.text(f"SELECT count(*) FROM {table} WHERE embedding_version = :version"),
+            {"version": embedding_version},
+        ).scalar()
+        or 0
+    )
+    if row_count > 1_000_000:
+        return max(int(math.sqrt(row_count)), 10)
+    return max(row_count // 1000, 10)
+
+
+def _embedding_versions(bind) -> list[str]:
+    configured = [
+        version.strip().lower()
+        for version in (os.getenv("VECTOR_INDEX_EMBEDDING_VERSIONS") or "").split(",")
+        if version.strip()
+    ]
+    stored = [
+        row[0]
+        for table, _column, _prefix, _halfvec_prefix in VECTOR_COLUMNS
+        for row in bind.execute(
+            sa.text(f"SELECT DISTINCT embedding_version FROM {table} WHERE embedding_version IS NOT NULL")
+        )
+    ]
+    versions: list[str] = []
+    for version in [*DEFAULT_EMBEDDING_VERSIONS, *configured, *stored]:
+        if version not in versions and EMBEDDING_VERSION_PATTERN.match(version):
+            versions.append(version)
+    return versions
+
+
+def _index_name(prefix: str, embedding_version: str) -> str:
+    slug = re.sub(r"[^a-z0-9_]", "_", embedding_version)
+    return f"{prefix}_{slug}"[:POSTGRES_MAX_IDENTIFIER_LENGTH]
+
+
+def _index_options(bind, index_method: str, table: str, embedding_version: str) -> dict:
+    if index_method == "hnsw":
+        return {
+            "postgresql_using": "hnsw",
+            "postgresql_with": {"m": HNSW_M, "ef_construction": HNSW_EF_CONSTRUCTION},
+        }
+    return {
+        "postgresql_using": "ivfflat",
+        "postgresql_with": {"lists": _resolve_ivfflat_lists(bind, table, embedding_version)},
+    }
+
+
+def _has_halfvec_indexes(bind) -> bool:
+    return bool(
+        bind.execute(
+            sa.text(
+                "SELECT count(*) FROM pg_indexes "
+                "WHERE indexname LIKE 'ix_identity_templates_ann_half_%' "
+                "OR indexname LIKE 'ix_face_embeddings_ann_half_%'"
+            )
+        ).scalar()
+    )
+
+
+def upgrade() -> None:
+    if not _halfvec_requested():
+        return
+
+    bind = op.get_bind()
+    if _pgvector_version(bind) < HALFVEC_MIN_PGVECTOR_VERSION:
+        raise RuntimeError("VECTOR_INDEX_HALFVEC requires pgvector >= 0.7.0 for the halfvec type.")
+
+    # Expression indexes over (embedding::halfvec) store 2 bytes per dimension while the
+    # float32 column stays in the heap for the exact re-score of the shortlisted rows.
+    # They replace the float32 partial indexes, halving index size and cache footprint.
+    index_method = _resolve_index_method(bind)
+    for embedding_version in _embedding_versions(bind):
+        for table, column, prefix, halfvec_prefix in VECTOR_COLUMNS:
+            op.drop_index(_index_name(prefix, embedding_version), table_name=table, if_exists=True)
+            op.create_index(
+                _index_name(halfvec_prefix, embedding_version),
+                table,
+                [sa.text(f"({column}::halfvec({EMBEDDING_DIMENSIONS})) halfvec_l2_ops")],
+                unique=False,
+                postgresql_where=sa.text(f"embedding_version = '{embedding_version}'"),
+                **_index_options(bind, index_method, table, embedding_version),
+            )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if not _has_halfvec_indexes(bind):
+        return
+
+    index_method = _resolve_index_method(bind)
+    for embedding_version in _embedding_versions(bind):
+        for table, column, prefix, halfvec_prefix in VECTOR_COLUMNS:
+            op.drop_index(_index_name(halfvec_prefix, embedding_version), table_name=table, if_exists=True)
+            op.create_index(
+                _index_name(prefix, embedding_version),
+                table,
+                [column],
+                unique=False,
+                if_not_exists=True,
+                postgresql_ops={column: "vector_l2_ops"},
+                postgresql_where=sa.text(f"embedding_version = '{embedding_version}'"),
+                **_index_options(bind, index_method, table, embedding_version),
+            )
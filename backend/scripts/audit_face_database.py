@@ -1,9 +1,12 @@
 import argparse
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import hashlib
 import json
 from pathlib import Path
 import sys
-from typing import Any
+from typing import Any, Iterable
 from uuid import UUID
 
 
@@ -11,13 +14,46 @@ PROJECT_ROOT = Path(__file__).resolve().parents[1]
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
-from scripts.evaluate_embeddings import EmbeddingRecord, fetch_embedding_records
+import numpy as np  # noqa: E402
+from sqlalchemy import text, true  # noqa: E402
+from sqlalchemy.orm import aliased  # noqa: E402
+from sqlmodel import select  # noqa: E402
+
+from scripts.evaluate_embeddings import (  # noqa: E402
+    EmbeddingRecord,
+    build_async_sessionmaker,
+    fetch_embedding_records,
+)
+from src.domain.models.face import FaceEmbedding  # noqa: E402
+from src.domain.models.review_case import (  # noqa: E402
+    DuplicateRiskLevel,
+    ReviewCase,
+    ReviewCaseStatus,
+    ReviewCaseType,
+)
+from src.infrastructure.repositories.review_case import ReviewCaseRepository  # noqa: E402
+from src.infrastructure.repositories.vector_search import (  # noqa: E402
+    DEFAULT_HALFVEC_RERANK_FACTOR,
+    halfvec_candidate_limit,
+    nearest_neighbors_select,
+)
+from src.infrastructure.vector_indexes import verify_halfvec_indexes  # noqa: E402
 
 
 DEFAULT_PROBABLE_THRESHOLD = 0.004
 DEFAULT_REVIEW_THRESHOLD = 0.005
 DEFAULT_TOP_CRIMINAL_PAIRS = 25
 DEFAULT_TOP_FACE_PAIRS_PER_GROUP = 5
+DEFAULT_MEMORY_BUDGET_MB = 256
+DEFAULT_ANN_NEIGHBORS = 50
+DEFAULT_ANN_BATCH_SIZE = 500
+CANDIDATE_MODES = ("blockwise", "ann")
+# Candidates are screened with float64 matrix products and then re-measured with
+# pair_distance; the slack keeps rounding near review_threshold from dropping a pair.
+CANDIDATE_DISTANCE_SLACK = 1e-4
+# Incremental runs re-scan faces changed shortly before the watermark, covering rows
+# whose transaction committed after the previous run read the gallery.
+WATERMARK_OVERLAP_SECONDS = 300
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -55,6 +91,65 @@ def build_parser() -> argparse.ArgumentParser:
             f"(default: {DEFAULT_TOP_FACE_PAIRS_PER_GROUP})."
         ),
     )
+    parser.add_argument(
+        "--candidate-mode",
+        choices=CANDIDATE_MODES,
+        default="blockwise",
+        help=(
+            "blockwise: exact scan of every face pair in memory-bounded blocks. "
+            "ann: ask the pgvector ANN index for each face's nearest neighbours (approximate, for very large galleries)."
+        ),
+    )
+    parser.add_argument(
+        "--memory-budget-mb",
+        type=float,
+        default=DEFAULT_MEMORY_BUDGET_MB,
+        help=f"Blockwise scan: memory for one block of the distance matrix (default: {DEFAULT_MEMORY_BUDGET_MB}).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Blockwise scan: processes scanning blocks in parallel (default: 1).",
+    )
+    parser.add_argument(
+        "--ann-neighbors",
+        type=int,
+        default=DEFAULT_ANN_NEIGHBORS,
+        help=(
+            "ANN mode: neighbours requested per face, including the face's own identity "
+            f"(default: {DEFAULT_ANN_NEIGHBORS})."
+        ),
+    )
+    parser.add_argument(
+        "--halfvec",
+        action="store_true",
+        help=(
+            "ANN mode: search through the halfvec indexes (migration 8d3f6a1c2e47) with exact float32 "
+            "re-scoring; set it whenever the API runs with VECTOR_INDEX_HALFVEC=true."
+        ),
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help=(
+            "Only compare faces enrolled or re-embedded since the previous report's watermark against the "
+            "gallery, and carry the previous report's findings over. Requires --output-json."
+        ),
+    )
+    parser.add_argument(
+        "--previous-report",
+        type=Path,
+        help="Incremental mode: report to resume from (default: the --output-json file, when it exists).",
+    )
+    parser.add_argument(
+        "--open-review-cases",
+        action="store_true",
+        help=(
+            "Open a duplicate-identity review case for each reported criminal pair without an open case "
+            "(in incremental mode only for pairs with new suspicious faces)."
+        ),
+    )
     parser.add_argument(
         "--output-json",
         type=Path,
@@ -111,6 +206,26 @@ def _ordered_records(left: EmbeddingRecord, right: EmbeddingRecord) -> tuple[Emb
     return right, left
 
 
+def _audit_order(records: list[EmbeddingRecord]) -> list[EmbeddingRecord]:
+    return sorted(records, key=lambda record: (str(record.criminal_id), str(record.face_id)))
+
+
+def _face_pair_key(left: EmbeddingRecord, right: EmbeddingRecord) -> tuple[str, str]:
+    return tuple(sorted((str(left.face_id), str(right.face_id))))
+
+
+def embedding_fingerprint(record: EmbeddingRecord) -> str:
+    """Short digest of a face's identity and embedding; any change to either means it must be re-audited."""
+    digest = hashlib.blake2b(str(record.criminal_id).encode("utf-8"), digest_size=8)
+    digest.update(np.ascontiguousarray(record.embedding, dtype=np.float32).tobytes())
+    return digest.hexdigest()
+
+
+def _changed_at(record: EmbeddingRecord) -> datetime | None:
+    timestamps = [value for value in (record.created_at, record.embedding_migrated_at) if value is not None]
+    return max(timestamps) if timestamps else None
+
+
 def _severity_rank(value: str) -> int:
     if value == "probable_duplicate":
         return 2
@@ -119,6 +234,186 @@ def _severity_rank(value: str) -> int:
     return 0
 
 
+# Block scans run in worker processes; the embedding matrix is handed over once per
+# worker through the pool initializer rather than pickled with every block.
+_block_scan_state: dict[str, Any] = {}
+
+
+def _init_block_scan(
+    embeddings: np.ndarray,
+    criminal_codes: np.ndarray,
+    squared_threshold: float,
+    rows: np.ndarray,
+    upper_triangle: bool,
+) -> None:
+    _block_scan_state["embeddings"] = embeddings
+    _block_scan_state["squared_norms"] = np.einsum("ij,ij->i", embeddings, embeddings)
+    _block_scan_state["criminal_codes"] = criminal_codes
+    _block_scan_state["squared_threshold"] = squared_threshold
+    _block_scan_state["rows"] = rows
+    _block_scan_state["upper_triangle"] = upper_triangle
+
+
+def _scan_block(bounds: tuple[int, int]) -> np.ndarray:
+    """(row, column) pairs for rows[start:stop] whose squared distance is under the threshold."""
+    start, stop = bounds
+    embeddings = _block_scan_state["embeddings"]
+    squared_norms = _block_scan_state["squared_norms"]
+    criminal_codes = _block_scan_state["criminal_codes"]
+    rows = _block_scan_state["rows"][start:stop]
+    upper_triangle = _block_scan_state["upper_triangle"]
+    # A full scan only needs the upper triangle: rows are contiguous, so columns start at the first row.
+    first_column = int(rows[0]) if upper_triangle else 0
+    # One float64 matrix, updated in place: |a|^2 + |b|^2 - 2ab.
+    squared_distances = np.matmul(embeddings[rows], embeddings[first_column:].T)
+    squared_distances *= -2.0
+    squared_distances += squared_norms[rows, None]
+    squared_distances += squared_norms[None, first_column:]
+    candidates = squared_distances <= _block_scan_state["squared_threshold"]
+    del squared_distances
+    columns = np.arange(first_column, len(embeddings))
+    candidates &= rows[:, None] < columns[None, :] if upper_triangle else rows[:, None] != columns[None, :]
+    candidates &= criminal_codes[rows, None] != criminal_codes[None, first_column:]
+    pairs = np.argwhere(candidates)
+    return np.column_stack((rows[pairs[:, 0]], pairs[:, 1] + first_column))
+
+
+def _block_rows(record_count: int, dimension: int, memory_budget_mb: float) -> int:
+    # Peak per block row (see _scan_block): the gathered float64 embedding row, one
+    # float64 distance row with its bool candidate row, and one bool row for whichever
+    # mask is being combined in.
+    bytes_per_row = max(record_count, 1) * (8 + 1 + 1) + dimension * 8
+    return max(int(memory_budget_mb * 1024 * 1024 // bytes_per_row), 1)
+
+
+def find_candidate_pairs_blockwise(
+    records: list[EmbeddingRecord],
+    distance_threshold: float,
+    *,
+    row_indices: Iterable[int] | None = None,
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+    workers: int = 1,
+) -> list[tuple[int, int]]:
+    """
+    Index pairs (i, j), i < j, of cross-criminal records within distance_threshold
+    (plus CANDIDATE_DISTANCE_SLACK), in ascending (i, j) order.
+
+    Distances come from one matrix product per block of rows, sized so a block stays
+    within memory_budget_mb; only pairs under the threshold are materialized. With
+    row_indices only pairs involving one of those records are scanned (each against
+    every record), which is what an incremental audit needs. Records are only compared
+    with records of the same embedding dimension.
+    """
+    selected_indices = None if row_indices is None else set(row_indices)
+    indices_by_dimension: dict[tuple[int, ...], list[int]] = {}
+    for index, record in enumerate(records):
+        indices_by_dimension.setdefault(record.embedding.shape, []).append(index)
+
+    criminal_codes_by_id: dict[UUID, int] = {}
+    squared_threshold = (distance_threshold + CANDIDATE_DISTANCE_SLACK) ** 2
+    pairs: set[tuple[int, int]] = set()
+    for indices in indices_by_dimension.values():
+        if selected_indices is None:
+            rows = np.arange(len(indices))
+        else:
+            rows = np.asarray(
+                [position for position, index in enumerate(indices) if index in selected_indices],
+                dtype=np.int64,
+            )
+        if len(indices) < 2 or len(rows) == 0:
+            continue
+
+        embeddings = np.stack([records[index].embedding for index in indices]).astype(np.float64)
+        embeddings = embeddings.reshape(len(indices), -1)
+        criminal_codes = np.asarray(
+            [criminal_codes_by_id.setdefault(records[index].criminal_id, len(criminal_codes_by_id)) for index in indices],
+            dtype=np.int64,
+        )
+        block_rows = _block_rows(len(indices), embeddings.shape[1], memory_budget_mb)
+        blocks = [(start, min(start + block_rows, len(rows))) for start in range(0, len(rows), block_rows)]
+        scan_state = (embeddings, criminal_codes, squared_threshold, rows, selected_indices is None)
+
+        if workers > 1 and len(blocks) > 1:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_block_scan,
+                initargs=scan_state,
+            ) as executor:
+                block_pairs = list(executor.map(_scan_block, blocks))
+        else:
+            _init_block_scan(*scan_state)
+            try:
+                block_pairs = [_scan_block(bounds) for bounds in blocks]
+            finally:
+                _block_scan_state.clear()
+
+        for local_pairs in block_pairs:
+            for left, right in local_pairs.tolist():
+                left_index, right_index = indices[left], indices[right]
+                pairs.add((left_index, right_index) if left_index < right_index else (right_index, left_index))
+
+    return sorted(pairs)
+
+
+async def fetch_ann_candidate_pairs(
+    records: list[EmbeddingRecord],
+    distance_threshold: float,
+    *,
+    neighbors: int = DEFAULT_ANN_NEIGHBORS,
+    embedding_version: str | None = None,
+    batch_size: int = DEFAULT_ANN_BATCH_SIZE,
+    halfvec: bool = False,
+    halfvec_rerank_factor: int = DEFAULT_HALFVEC_RERANK_FACTOR,
+) -> list[tuple[UUID, UUID]]:
+    """
+    Candidate face-id pairs from the face_embeddings ANN index: each face's `neighbors`
+    nearest faces, kept when within distance_threshold (plus CANDIDATE_DISTANCE_SLACK).
+
+    Approximate: a pair is missed when the index does not return it, e.g. when a face
+    has more than `neighbors` closer faces of its own identity. With `halfvec` the
+    search goes through the halfvec indexes like the API's repositories do; they are
+    partial per embedding version, so `embedding_version` is then required.
+    """
+    if halfvec and not embedding_version:
+        raise ValueError("halfvec ANN search needs an embedding_version: its indexes are partial per version.")
+    face_ids = [record.face_id for record in records]
+    probe = aliased(FaceEmbedding)
+    nearest = (
+        nearest_neighbors_select(
+            FaceEmbedding,
+            "embedding",
+            probe.embedding,
+            neighbors,
+            embedding_version=embedding_version,
+            halfvec=halfvec,
+            rerank_factor=halfvec_rerank_factor,
+        )
+        .correlate(probe)
+        .lateral("nearest_faces")
+    )
+    async_session = build_async_sessionmaker()
+    pairs: list[tuple[UUID, UUID]] = []
+    # HNSW returns at most ef_search rows per probe; with halfvec that is the whole shortlist.
+    ef_search = max(halfvec_candidate_limit(neighbors, halfvec=halfvec, rerank_factor=halfvec_rerank_factor), 40)
+    async with async_session() as session:
+        if halfvec:
+            async with session.begin():
+                await verify_halfvec_indexes(session, embedding_version)
+        for start in range(0, len(face_ids), batch_size):
+            async with session.begin():
+                await session.execute(text(f"SET LOCAL hnsw.ef_search = {ef_search}"))
+                statement = (
+                    select(probe.id, nearest.c.id)
+                    .select_from(probe)
+                    .join(nearest, true())
+                    .where(probe.id.in_(face_ids[start:start + batch_size]))
+                    .where(nearest.c.id != probe.id)
+                    .where(nearest.c.distance <= distance_threshold + CANDIDATE_DISTANCE_SLACK)
+                )
+                pairs.extend((left, right) for left, right in (await session.execute(statement)).all())
+    return pairs
+
+
 def build_duplicate_audit_report(
     records: list[EmbeddingRecord],
     probable_threshold: float,
@@ -126,7 +421,22 @@ def build_duplicate_audit_report(
     top_criminal_pairs: int,
     top_face_pairs_per_group: int,
     embedding_version: str | None = None,
+    *,
+    candidate_face_pairs: Iterable[tuple[UUID, UUID]] | None = None,
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+    workers: int = 1,
+    incremental_state: dict[str, Any] | None = None,
 ) -> dict[str, Any]:
+    """
+    Groups cross-criminal face pairs within review_threshold by criminal pair.
+
+    Candidate pairs come from the blockwise scan, or from `candidate_face_pairs` (ANN
+    and incremental modes). Either way each candidate's distance is re-measured with
+    pair_distance and the pairs are accumulated in the original (criminal_id, face_id)
+    pair order, so the report is the same as comparing every pair one by one.
+    With `incremental_state` the report also carries that state plus every suspicious
+    face pair (not just the top ones), which is what the next incremental run resumes from.
+    """
     if probable_threshold > review_threshold:
         raise ValueError("probable_threshold must be less than or equal to review_threshold")
 
@@ -136,58 +446,76 @@ def build_duplicate_audit_report(
 
     criminal_pairs: dict[tuple[UUID, UUID], dict[str, Any]] = {}
     suspicious_face_pair_count = 0
+    suspicious_face_pairs: list[tuple[str, str]] = []
 
-    sorted_records = sorted(records, key=lambda record: (str(record.criminal_id), str(record.face_id)))
-
-    for left_index, left in enumerate(sorted_records):
-        for right in sorted_records[left_index + 1:]:
-            if left.criminal_id == right.criminal_id:
-                continue
-
-            distance = pair_distance(left, right)
-            risk_level = classify_pair_risk(distance, probable_threshold, review_threshold)
-            if risk_level is None:
-                continue
-
-            suspicious_face_pair_count += 1
-            pair_key = _sorted_pair_key(left, right)
-            group = criminal_pairs.get(pair_key)
-            if group is None:
-                left_criminal, right_criminal = _ordered_records(left, right)
-                group = {
-                    "criminal_a": _criminal_identity(left_criminal),
-                    "criminal_b": _criminal_identity(right_criminal),
-                    "risk_level": risk_level,
-                    "minimum_distance": distance,
-                    "review_face_pair_count": 0,
-                    "probable_duplicate_face_pair_count": 0,
-                    "total_cross_face_pair_count": (
-                        len(grouped_records[pair_key[0]]) * len(grouped_records[pair_key[1]])
-                    ),
-                    "face_pairs": [],
-                }
-                criminal_pairs[pair_key] = group
-
-            group["risk_level"] = (
-                risk_level
-                if _severity_rank(risk_level) > _severity_rank(group["risk_level"])
-                else group["risk_level"]
-            )
-            group["minimum_distance"] = min(float(group["minimum_distance"]), distance)
-            if risk_level == "probable_duplicate":
-                group["probable_duplicate_face_pair_count"] += 1
-            else:
-                group["review_face_pair_count"] += 1
-
-            face_a, face_b = _ordered_records(left, right)
-            group["face_pairs"].append(
-                {
-                    "distance": round(distance, 6),
-                    "risk_level": risk_level,
-                    "face_a": _face_identity(face_a),
-                    "face_b": _face_identity(face_b),
-                }
-            )
+    sorted_records = _audit_order(records)
+
+    if candidate_face_pairs is None:
+        candidate_pairs = find_candidate_pairs_blockwise(
+            sorted_records,
+            review_threshold,
+            memory_budget_mb=memory_budget_mb,
+            workers=workers,
+        )
+    else:
+        index_by_face_id = {record.face_id: index for index, record in enumerate(sorted_records)}
+        candidate_pairs = sorted({
+            tuple(sorted((index_by_face_id[left_id], index_by_face_id[right_id])))
+            for left_id, right_id in candidate_face_pairs
+            if left_id in index_by_face_id and right_id in index_by_face_id and left_id != right_id
+        })
+
+    for left_index, right_index in candidate_pairs:
+        left = sorted_records[left_index]
+        right = sorted_records[right_index]
+        if left.criminal_id == right.criminal_id:
+            continue
+
+        distance = pair_distance(left, right)
+        risk_level = classify_pair_risk(distance, probable_threshold, review_threshold)
+        if risk_level is None:
+            continue
+
+        suspicious_face_pair_count += 1
+        suspicious_face_pairs.append(_face_pair_key(left, right))
+        pair_key = _sorted_pair_key(left, right)
+        group = criminal_pairs.get(pair_key)
+        if group is None:
+            left_criminal, right_criminal = _ordered_records(left, right)
+            group = {
+                "criminal_a": _criminal_identity(left_criminal),
+                "criminal_b": _criminal_identity(right_criminal),
+                "risk_level": risk_level,
+                "minimum_distance": distance,
+                "review_face_pair_count": 0,
+                "probable_duplicate_face_pair_count": 0,
+                "total_cross_face_pair_count": (
+                    len(grouped_records[pair_key[0]]) * len(grouped_records[pair_key[1]])
+                ),
+                "face_pairs": [],
+            }
+            criminal_pairs[pair_key] = group
+
+        group["risk_level"] = (
+            risk_level
+            if _severity_rank(risk_level) > _severity_rank(group["risk_level"])
+            else group["risk_level"]
+        )
+        group["minimum_distance"] = min(float(group["minimum_distance"]), distance)
+        if risk_level == "probable_duplicate":
+            group["probable_duplicate_face_pair_count"] += 1
+        else:
+            group["review_face_pair_count"] += 1
+
+        face_a, face_b = _ordered_records(left, right)
+        group["face_pairs"].append(
+            {
+                "distance": round(distance, 6),
+                "risk_level": risk_level,
+                "face_a": _face_identity(face_a),
+                "face_b": _face_identity(face_b),
+            }
+        )
 
     suspicious_groups = list(criminal_pairs.values())
     for group in suspicious_groups:
@@ -211,7 +539,7 @@ def build_duplicate_audit_report(
         for criminal_id in (group["criminal_a"]["id"], group["criminal_b"]["id"])
     }
 
-    return {
+    report = {
         "configuration": {
             "embedding_version": embedding_version,
             "probable_threshold": probable_threshold,
@@ -236,6 +564,192 @@ def build_duplicate_audit_report(
         },
         "suspicious_criminal_pairs": suspicious_groups,
     }
+    if incremental_state is not None:
+        report["incremental_state"] = {
+            **incremental_state,
+            "suspicious_face_pairs": [list(pair) for pair in sorted(suspicious_face_pairs)],
+        }
+    return report
+
+
+def changed_records_since(
+    records: list[EmbeddingRecord],
+    previous_report: dict[str, Any] | None,
+    *,
+    review_threshold: float,
+    embedding_version: str | None = None,
+) -> list[EmbeddingRecord] | None:
+    """
+    Records to re-audit since the previous report, or None when it cannot be resumed
+    and every face has to be scanned: no incremental_state, or a different
+    embedding_version or review_threshold.
+
+    A record counts as changed when it was enrolled or re-embedded since the watermark
+    (less WATERMARK_OVERLAP_SECONDS), has no timestamps, or its embedding_fingerprint
+    is new or differs from the previous run's. The fingerprints catch changes that do
+    not move the timestamps forward, such as a snapshot restore putting back an older
+    embedding_migrated_at, or a merge moving a face to another criminal.
+    """
+    previous_state = (previous_report or {}).get("incremental_state")
+    previous_configuration = (previous_report or {}).get("configuration", {})
+    if (
+        previous_state is None
+        or "face_fingerprints" not in previous_state
+        or previous_configuration.get("embedding_version") != embedding_version
+        or previous_configuration.get("review_threshold") != review_threshold
+    ):
+        return None
+
+    previous_fingerprints = previous_state["face_fingerprints"]
+    cutoff = None
+    if previous_state.get("watermark"):
+        cutoff = datetime.fromisoformat(previous_state["watermark"]) - timedelta(seconds=WATERMARK_OVERLAP_SECONDS)
+    return [
+        record
+        for record in records
+        if _changed_at(record) is None
+        or (cutoff is not None and _changed_at(record) >= cutoff)
+        or previous_fingerprints.get(str(record.face_id)) != embedding_fingerprint(record)
+    ]
+
+
+def build_incremental_audit_report(
+    records: list[EmbeddingRecord],
+    probable_threshold: float,
+    review_threshold: float,
+    top_criminal_pairs: int,
+    top_face_pairs_per_group: int,
+    embedding_version: str | None = None,
+    *,
+    previous_report: dict[str, Any] | None = None,
+    scan_candidate_face_pairs: Iterable[tuple[UUID, UUID]] | None = None,
+    memory_budget_mb: float = DEFAULT_MEMORY_BUDGET_MB,
+    workers: int = 1,
+) -> dict[str, Any]:
+    """
+    build_duplicate_audit_report that only scans faces changed since the previous report,
+    each against the whole gallery, instead of every pair of faces.
+
+    The previous report's suspicious face pairs are re-measured alongside the new
+    candidates, so pairs of unchanged faces carry over, and pairs whose face was deleted
+    or re-embedded out of range drop out. The result matches a full audit of `records`.
+    `scan_candidate_face_pairs` replaces the blockwise scan of the changed faces (ANN mode).
+    """
+    changed_records = changed_records_since(
+        records,
+        previous_report,
+        review_threshold=review_threshold,
+        embedding_version=embedding_version,
+    )
+    previous_face_pairs: set[tuple[str, str]] = set()
+    if changed_records is not None:
+        previous_face_pairs = {
+            tuple(pair) for pair in previous_report["incremental_state"].get("suspicious_face_pairs", [])
+        }
+
+    if scan_candidate_face_pairs is None:
+        sorted_records = _audit_order(records)
+        changed_face_ids = None if changed_records is None else {record.face_id for record in changed_records}
+        scan_candidate_face_pairs = [
+            (sorted_records[left].face_id, sorted_records[right].face_id)
+            for left, right in find_candidate_pairs_blockwise(
+                sorted_records,
+                review_threshold,
+                row_indices=(
+                    None
+                    if changed_face_ids is None
+                    else [index for index, record in enumerate(sorted_records) if record.face_id in changed_face_ids]
+                ),
+                memory_budget_mb=memory_budget_mb,
+                workers=workers,
+            )
+        ]
+
+    watermark = max((value for value in map(_changed_at, records) if value is not None), default=None)
+    report = build_duplicate_audit_report(
+        records,
+        probable_threshold,
+        review_threshold,
+        top_criminal_pairs,
+        top_face_pairs_per_group,
+        embedding_version,
+        candidate_face_pairs=[
+            *scan_candidate_face_pairs,
+            *((UUID(left), UUID(right)) for left, right in previous_face_pairs),
+        ],
+        incremental_state={
+            "watermark": watermark.isoformat() if watermark is not None else None,
+            "resumed_from_watermark": (
+                previous_report["incremental_state"]["watermark"] if changed_records is not None else None
+            ),
+            "scanned_face_count": len(records) if changed_records is None else len(changed_records),
+            "face_fingerprints": {str(record.face_id): embedding_fingerprint(record) for record in records},
+        },
+    )
+
+    criminal_by_face_id = {str(record.face_id): str(record.criminal_id) for record in records}
+    new_face_pairs = [
+        pair for pair in map(tuple, report["incremental_state"]["suspicious_face_pairs"]) if pair not in previous_face_pairs
+    ]
+    report["incremental_state"]["new_suspicious_face_pair_count"] = len(new_face_pairs)
+    report["incremental_state"]["new_suspicious_criminal_pairs"] = sorted(
+        {tuple(sorted((criminal_by_face_id[left], criminal_by_face_id[right]))) for left, right in new_face_pairs}
+    )
+    return report
+
+
+async def open_review_cases(
+    report: dict[str, Any],
+    review_case_repo: ReviewCaseRepository | None = None,
+) -> int:
+    """
+    Opens a duplicate-identity ReviewCase per reported criminal pair that has no open
+    case. In incremental reports only pairs with new suspicious faces are considered,
+    so findings an operator already resolved are not reopened every night.
+    """
+    if review_case_repo is None:
+        async_session = build_async_sessionmaker()
+        async with async_session() as session:
+            return await open_review_cases(report, ReviewCaseRepository(session))
+
+    new_criminal_pairs = None
+    if "incremental_state" in report:
+        new_criminal_pairs = {tuple(pair) for pair in report["incremental_state"]["new_suspicious_criminal_pairs"]}
+
+    opened = 0
+    for finding in report["suspicious_criminal_pairs"]:
+        criminal_a = UUID(finding["criminal_a"]["id"])
+        criminal_b = UUID(finding["criminal_b"]["id"])
+        if new_criminal_pairs is not None and tuple(sorted((str(criminal_a), str(criminal_b)))) not in new_criminal_pairs:
+            continue
+        if await review_case_repo.get_open_duplicate_case(criminal_a, criminal_b) is not None:
+            continue
+
+        # face_pairs is empty with --top-face-pairs-per-group 0; the case then names no faces.
+        closest_pair = finding["face_pairs"][0] if finding["face_pairs"] else None
+        case_fields: dict[str, Any] = {}
+        if closest_pair is not None:
+            case_fields = {
+                "source_face_id": UUID(closest_pair["face_a"]["face_id"]),
+                "matched_face_id": UUID(closest_pair["face_b"]["face_id"]),
+                "embedding_version": closest_pair["face_a"]["embedding_version"],
+            }
+        elif report["configuration"]["embedding_version"]:
+            case_fields["embedding_version"] = report["configuration"]["embedding_version"]
+        await review_case_repo.create(
+            ReviewCase(
+                case_type=ReviewCaseType.DUPLICATE_IDENTITY,
+                status=ReviewCaseStatus.OPEN,
+                risk_level=DuplicateRiskLevel(finding["risk_level"]),
+                source_criminal_id=criminal_a,
+                matched_criminal_id=criminal_b,
+                distance=finding["minimum_distance"],
+                notes="Opened by the face database duplicate audit.",
+                **case_fields,
+            )
+        )
+        opened += 1
+    return opened
 
 
 def print_report(report: dict[str, Any]) -> None:
@@ -251,6 +765,14 @@ def print_report(report: dict[str, Any]) -> None:
         f"Probable duplicates: {summary['probable_duplicate_criminal_pair_count']} | "
         f"Needs review: {summary['needs_review_criminal_pair_count']}"
     )
+    incremental_state = report.get("incremental_state")
+    if incremental_state is not None:
+        print(
+            f"Incremental: scanned {incremental_state['scanned_face_count']} faces since "
+            f"{incremental_state['resumed_from_watermark'] or 'the beginning'} | "
+            f"new suspicious face pairs: {incremental_state['new_suspicious_face_pair_count']} | "
+            f"watermark: {incremental_state['watermark']}"
+        )
 
     findings = report["suspicious_criminal_pairs"]
     if not findings:
@@ -271,16 +793,60 @@ def print_report(report: dict[str, Any]) -> None:
 
 async def async_main(args: argparse.Namespace) -> int:
     records = await fetch_embedding_records(args.embedding_version)
-    report = build_duplicate_audit_report(
-        records=records,
-        probable_threshold=args.probable_threshold,
-        review_threshold=args.review_threshold,
-        top_criminal_pairs=args.top_criminal_pairs,
-        top_face_pairs_per_group=args.top_face_pairs_per_group,
-        embedding_version=args.embedding_version,
-    )
+    previous_report = None
+    scanned_records = records
+    if args.incremental:
+        previous_report_path = args.previous_report or args.output_json
+        if previous_report_path.exists():
+            previous_report = json.loads(previous_report_path.read_text(encoding="utf-8"))
+        changed_records = changed_records_since(
+            records,
+            previous_report,
+            review_threshold=args.review_threshold,
+            embedding_version=args.embedding_version,
+        )
+        if changed_records is not None:
+            scanned_records = changed_records
+
+    candidate_face_pairs = None
+    if args.candidate_mode == "ann":
+        candidate_face_pairs = await fetch_ann_candidate_pairs(
+            scanned_records,
+            args.review_threshold,
+            neighbors=args.ann_neighbors,
+            embedding_version=args.embedding_version,
+            halfvec=args.halfvec,
+        )
+
+    if args.incremental:
+        report = build_incremental_audit_report(
+            records=records,
+            probable_threshold=args.probable_threshold,
+            review_threshold=args.review_threshold,
+            top_criminal_pairs=args.top_criminal_pairs,
+            top_face_pairs_per_group=args.top_face_pairs_per_group,
+            embedding_version=args.embedding_version,
+            previous_report=previous_report,
+            scan_candidate_face_pairs=candidate_face_pairs,
+            memory_budget_mb=args.memory_budget_mb,
+            workers=args.workers,
+        )
+    else:
+        report = build_duplicate_audit_report(
+            records=records,
+            probable_threshold=args.probable_threshold,
+            review_threshold=args.review_threshold,
+            top_criminal_pairs=args.top_criminal_pairs,
+            top_face_pairs_per_group=args.top_face_pairs_per_group,
+            embedding_version=args.embedding_version,
+            candidate_face_pairs=candidate_face_pairs,
+            memory_budget_mb=args.memory_budget_mb,
+            workers=args.workers,
+        )
 
     print_report(report)
+    if args.open_review_cases:
+        print(f"Opened {await open_review_cases(report)} duplicate review cases.")
 
     if args.output_json:
         args.output_json.parent.mkdir(parents=True, exist_ok=True)
@@ -291,7 +857,12 @@ async def async_main(args: argparse.Namespace) -> int:
 
 
 def main() -> int:
-    args = build_parser().parse_args()
+    parser = build_parser()
+    args = parser.parse_args()
+    if args.incremental and args.output_json is None:
+        parser.error("--incremental needs --output-json to record the watermark for the next run")
+    if args.halfvec and not args.embedding_version:
+        parser.error("--halfvec needs --embedding-version: the halfvec indexes are partial per embedding version")
     return asyncio.run(async_main(args))
 
 
@@ -0,0 +1,178 @@
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+from typing import Any
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from scripts.benchmark_vector_index import summarize_latencies  # noqa: E402
+from src.services.ai.pipeline import FaceProcessingPipeline, rescale_detection  # noqa: E402
+from src.services.ai.quantization import DEFAULT_CALIBRATION_DIR, iter_calibration_images  # noqa: E402
+from src.services.ai.strategies import MTCNNStrategy  # noqa: E402
+
+
+DEFAULT_IMAGE_SIDES = [1024, 2048, 4000]
+DEFAULT_MAX_SIDES = [0, 1920, 1280, 960, 640]
+DEFAULT_IOU_THRESHOLD = 0.5
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure MTCNN detection latency and recall when large images are downscaled to a max side "
+            "before detection. Each image is upscaled to every --image-side to stand in for phone photos "
+            "and CCTV stills; recall is against detections on the image at its native size."
+        ),
+    )
+    parser.add_argument(
+        "--image-dir",
+        type=Path,
+        default=DEFAULT_CALIBRATION_DIR,
+        help=f"Face photos to benchmark (default: {DEFAULT_CALIBRATION_DIR}).",
+    )
+    parser.add_argument(
+        "--image-side",
+        type=int,
+        action="append",
+        dest="image_sides",
+        help=f"Longer side the photos are resized to. Repeat for multiple (default: {DEFAULT_IMAGE_SIDES}).",
+    )
+    parser.add_argument(
+        "--max-side",
+        type=int,
+        action="append",
+        dest="max_sides",
+        help=f"Detection max side to evaluate; 0 means full resolution. Repeat (default: {DEFAULT_MAX_SIDES}).",
+    )
+    parser.add_argument("--max-images", type=int, help="Optional cap on images.")
+    parser.add_argument("--iou-threshold", type=float, default=DEFAULT_IOU_THRESHOLD, help="IoU for a matched face.")
+    parser.add_argument("--output-json", type=Path, help="Optional path to save the benchmark report as JSON.")
+    return parser
+
+
+def box_iou(first: tuple[int, int, int, int], second: tuple[int, int, int, int]) -> float:
+    ax, ay, aw, ah = first
+    bx, by, bw, bh = second
+    overlap_w = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    overlap_h = max(0, min(ay + ah, by + bh) - max(ay, by))
+    overlap = overlap_w * overlap_h
+    union = aw * ah + bw * bh - overlap
+    return overlap / union if union > 0 else 0.0
+
+
+def count_matches(reference_boxes: list, detected_boxes: list, iou_threshold: float) -> int:
+    unmatched = list(detected_boxes)
+    matches = 0
+    for reference_box in reference_boxes:
+        best = max(unmatched, key=lambda box: box_iou(reference_box, box), default=None)
+        if best is not None and box_iou(reference_box, best) >= iou_threshold:
+            unmatched.remove(best)
+            matches += 1
+    return matches
+
+
+def load_images(image_dir: Path, max_images: int | None) -> list[np.ndarray]:
+    images: list[np.ndarray] = []
+    for path in iter_calibration_images(image_dir):
+        image_bgr = cv2.imread(str(path))
+        if image_bgr is None:
+            continue
+        images.append(cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB))
+        if max_images is not None and len(images) >= max_images:
+            break
+    return images
+
+
+def run_detection_scaling_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    detector = MTCNNStrategy(device="cpu")
+    images = load_images(args.image_dir, args.max_images)
+    if not images:
+        raise SystemExit(f"No readable images under {args.image_dir}")
+    native_pipeline = FaceProcessingPipeline(detector, embedder=None)
+    native_detections = [native_pipeline.detect_face_detections(image) for image in images]
+
+    runs: list[dict[str, Any]] = []
+    for image_side in args.image_sides or DEFAULT_IMAGE_SIDES:
+        for max_side in args.max_sides or DEFAULT_MAX_SIDES:
+            face_pipeline = FaceProcessingPipeline(detector, embedder=None, detection_max_side=max_side or None)
+            latencies_ms: list[float] = []
+            reference_faces = 0
+            matched_faces = 0
+            for image, detections in zip(images, native_detections):
+                scale = image_side / max(image.shape[:2])
+                large_image = cv2.resize(
+                    image,
+                    (int(round(image.shape[1] * scale)), int(round(image.shape[0] * scale))),
+                    interpolation=cv2.INTER_CUBIC,
+                )
+                started = time.perf_counter()
+                found = face_pipeline.detect_face_detections(large_image)
+                latencies_ms.append((time.perf_counter() - started) * 1000.0)
+
+                reference_boxes = [rescale_detection(detection, scale)["box"] for detection in detections]
+                reference_faces += len(reference_boxes)
+                matched_faces += count_matches(
+                    reference_boxes,
+                    [detection["box"] for detection in found],
+                    args.iou_threshold,
+                )
+
+            runs.append(
+                {
+                    "image_side": image_side,
+                    "max_side": max_side or None,
+                    "recall": round(matched_faces / reference_faces, 4) if reference_faces else None,
+                    "reference_faces": reference_faces,
+                    "latency": summarize_latencies(latencies_ms),
+                }
+            )
+
+    return {
+        "report_type": "detection_scaling_benchmark",
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "configuration": {
+            "image_dir": str(args.image_dir),
+            "images": len(images),
+            "iou_threshold": args.iou_threshold,
+        },
+        "runs": runs,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\nDetection Scaling Benchmark")
+    print("=" * 27)
+    for run in report["runs"]:
+        latency = run["latency"]
+        max_side = run["max_side"] or "full"
+        print(
+            f"image_side={run['image_side']:>5} max_side={max_side!s:>5} recall={run['recall']} "
+            f"p50={latency['p50_ms']}ms p99={latency['p99_ms']}ms"
+        )
+    print()
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_detection_scaling_benchmark(args)
+    print_report(report)
+
+    if args.output_json:
+        args.output_json.parent.mkdir(parents=True, exist_ok=True)
+        args.output_json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved JSON report to {args.output_json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,230 @@
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+from typing import Any
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np  # noqa: E402
+
+from scripts.benchmark_vector_index import summarize_latencies  # noqa: E402
+from src.services.ai.onnx_export import export_embedding_model, load_tracenet_checkpoint  # noqa: E402
+from src.services.ai.pipeline import FaceProcessingPipeline  # noqa: E402
+from src.services.ai.quantization import (  # noqa: E402
+    DEFAULT_CALIBRATION_DIR,
+    build_tracenet_calibration_batches,
+    collect_calibration_crops,
+    quantize_embedding_graph,
+)
+from src.services.ai.strategies import (  # noqa: E402
+    DEFAULT_TRACENET_PATH,
+    MTCNNStrategy,
+    OnnxEmbeddingStrategy,
+    TRACENET_INT8_EMBEDDING_VERSION,
+    TRACENET_ONNX_EMBEDDING_VERSION,
+    TraceNetStrategy,
+)
+
+
+DEFAULT_BATCH_SIZES = [1, 4, 16, 32]
+DEFAULT_ITERATIONS = 20
+DEFAULT_WARMUP = 3
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare TraceNet embedding throughput (faces/sec) and parity between eager PyTorch, "
+            "ONNX Runtime and (optionally) static INT8 ONNX Runtime on CPU."
+        ),
+    )
+    parser.add_argument(
+        "--model-path",
+        type=Path,
+        default=DEFAULT_TRACENET_PATH,
+        help=f"TraceNet checkpoint (default: {DEFAULT_TRACENET_PATH}).",
+    )
+    parser.add_argument("--onnx-path", type=Path, help="Exported graph to use; exported from --model-path if omitted.")
+    parser.add_argument(
+        "--random-weights",
+        action="store_true",
+        help="Benchmark a randomly initialised TraceNet instead of a deployment checkpoint.",
+    )
+    parser.add_argument(
+        "--int8",
+        action="store_true",
+        help="Also benchmark a static INT8 graph calibrated on --calibration-dir.",
+    )
+    parser.add_argument(
+        "--calibration-dir",
+        type=Path,
+        default=DEFAULT_CALIBRATION_DIR,
+        help=f"Face photos used to calibrate the INT8 graph (default: {DEFAULT_CALIBRATION_DIR}).",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        action="append",
+        dest="batch_sizes",
+        help=f"Faces per embed_faces call. Repeat for multiple (default: {DEFAULT_BATCH_SIZES}).",
+    )
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="Timed calls per batch size.")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, help="Untimed calls per batch size.")
+    parser.add_argument("--threads", type=int, help="Threads for both backends (torch.set_num_threads / ORT intra-op).")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for synthetic crops.")
+    parser.add_argument("--output-json", type=Path, help="Optional path to save the benchmark report as JSON.")
+    return parser
+
+
+def measure_backend(embedder, crops: list[np.ndarray], *, batch_size: int, iterations: int, warmup: int) -> dict[str, Any]:
+    batch = [crops[index % len(crops)] for index in range(batch_size)]
+    for _ in range(warmup):
+        embedder.embed_faces(batch)
+
+    latencies_ms: list[float] = []
+    started = time.perf_counter()
+    for _ in range(iterations):
+        call_started = time.perf_counter()
+        embedder.embed_faces(batch)
+        latencies_ms.append((time.perf_counter() - call_started) * 1000.0)
+    elapsed_seconds = time.perf_counter() - started
+
+    return {
+        "batch_size": batch_size,
+        "faces_per_second": round(batch_size * iterations / elapsed_seconds, 3) if elapsed_seconds else None,
+        "latency": summarize_latencies(latencies_ms),
+    }
+
+
+def max_embedding_delta(reference, candidate, crops: list[np.ndarray]) -> float:
+    expected = np.asarray(reference.embed_faces(crops), dtype=np.float32)
+    actual = np.asarray(candidate.embed_faces(crops), dtype=np.float32)
+    return float(np.max(np.abs(expected - actual)))
+
+
+def run_embedding_backend_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    import torch
+
+    from src.services.ai.tracenet_model import TraceNet
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    rng = np.random.default_rng(args.seed)
+    crops = [rng.integers(0, 255, size=(112, 112, 3), dtype=np.uint8) for _ in range(64)]
+    batch_sizes = args.batch_sizes or DEFAULT_BATCH_SIZES
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        checkpoint_path = args.model_path
+        if args.random_weights:
+            checkpoint_path = Path(work_dir) / "tracenet_random.pth"
+            torch.manual_seed(args.seed)
+            torch.save({"model_state_dict": TraceNet(embedding_size=512).state_dict()}, checkpoint_path)
+
+        onnx_path = args.onnx_path
+        if onnx_path is None:
+            onnx_path = export_embedding_model(
+                load_tracenet_checkpoint(checkpoint_path),
+                Path(work_dir) / "tracenet.onnx",
+                input_size=112,
+            )
+
+        backends = {
+            "pytorch": TraceNetStrategy(model_path=checkpoint_path, device="cpu"),
+            "onnxruntime": OnnxEmbeddingStrategy(
+                onnx_path,
+                family="tracenet",
+                embedding_version=TRACENET_ONNX_EMBEDDING_VERSION,
+                intra_op_num_threads=args.threads,
+            ),
+        }
+        parity_crops = crops[:16]
+        if args.int8:
+            detector_pipeline = FaceProcessingPipeline(MTCNNStrategy(device="cpu"), embedder=None)
+            face_crops = collect_calibration_crops(args.calibration_dir, detector_pipeline)
+            int8_path = quantize_embedding_graph(
+                onnx_path,
+                Path(work_dir) / "tracenet_int8.onnx",
+                build_tracenet_calibration_batches(face_crops),
+            )
+            backends["onnxruntime_int8"] = OnnxEmbeddingStrategy(
+                int8_path,
+                family="tracenet",
+                embedding_version=TRACENET_INT8_EMBEDDING_VERSION,
+                intra_op_num_threads=args.threads,
+            )
+            # Real faces: INT8 error on noise crops says little about recognition accuracy.
+            parity_crops = face_crops[:16] or parity_crops
+
+        parity_max_delta = {
+            backend_name: max_embedding_delta(backends["pytorch"], embedder, parity_crops)
+            for backend_name, embedder in backends.items()
+            if backend_name != "pytorch"
+        }
+
+        runs: list[dict[str, Any]] = []
+        for batch_size in batch_sizes:
+            for backend_name, embedder in backends.items():
+                runs.append(
+                    {
+                        "backend": backend_name,
+                        **measure_backend(
+                            embedder,
+                            crops,
+                            batch_size=batch_size,
+                            iterations=args.iterations,
+                            warmup=args.warmup,
+                        ),
+                    }
+                )
+
+    return {
+        "report_type": "embedding_backend_benchmark",
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "configuration": {
+            "random_weights": args.random_weights,
+            "iterations": args.iterations,
+            "warmup": args.warmup,
+            "threads": args.threads,
+            "int8": args.int8,
+        },
+        "parity_max_abs_delta": parity_max_delta,
+        "runs": runs,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\nEmbedding Backend Benchmark")
+    print("=" * 27)
+    for backend_name, delta in report["parity_max_abs_delta"].items():
+        print(f"Max |pytorch - {backend_name}| embedding delta: {delta:.2e}")
+    for run in report["runs"]:
+        latency = run["latency"]
+        print(
+            f"batch={run['batch_size']:>3} {run['backend']:<17} {run['faces_per_second']:>9} faces/s "
+            f"p50={latency['p50_ms']}ms p99={latency['p99_ms']}ms"
+        )
+    print()
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_embedding_backend_benchmark(args)
+    print_report(report)
+
+    if args.output_json:
+        args.output_json.parent.mkdir(parents=True, exist_ok=True)
+        args.output_json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved JSON report to {args.output_json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
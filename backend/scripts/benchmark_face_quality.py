@@ -0,0 +1,118 @@
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+from typing import Any
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from scripts.benchmark_vector_index import summarize_latencies  # noqa: E402
+from src.services.ai.face_quality import FaceQualityAssessor  # noqa: E402
+
+
+DEFAULT_FACE_COUNTS = [1, 8, 32, 128]
+DEFAULT_FRAME_SIZE = (3840, 2160)
+DEFAULT_ITERATIONS = 10
+# Landmark layout inside a face box (eyes, nose, mouth corners), as fractions of the box.
+LANDMARK_LAYOUT = [(0.3, 0.35), (0.7, 0.35), (0.5, 0.55), (0.35, 0.75), (0.65, 0.75)]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark FaceQualityAssessor on scene frames: one assess() call per face vs a single "
+            "assess_batch() call for all faces of the frame."
+        ),
+    )
+    parser.add_argument(
+        "--faces",
+        type=int,
+        action="append",
+        dest="face_counts",
+        help=f"Faces per frame. Repeat for multiple (default: {DEFAULT_FACE_COUNTS}).",
+    )
+    parser.add_argument("--width", type=int, default=DEFAULT_FRAME_SIZE[0], help="Frame width.")
+    parser.add_argument("--height", type=int, default=DEFAULT_FRAME_SIZE[1], help="Frame height.")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="Timed runs per mode.")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed for the frame and face placement.")
+    parser.add_argument("--output-json", type=Path, help="Optional path to save the benchmark report as JSON.")
+    return parser
+
+
+def build_faces(count: int, width: int, height: int, rng: np.random.Generator) -> tuple[list, list]:
+    boxes, landmarks = [], []
+    for _ in range(count):
+        size = int(rng.integers(30, 160))
+        x, y = int(rng.integers(0, width - size)), int(rng.integers(0, height - size))
+        boxes.append((x, y, size, size))
+        landmarks.append([(x + size * fx, y + size * fy) for fx, fy in LANDMARK_LAYOUT])
+    return boxes, landmarks
+
+
+def run_face_quality_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    rng = np.random.default_rng(args.seed)
+    noise = rng.integers(0, 256, size=(args.height, args.width, 3), dtype=np.uint8)
+    frame = cv2.GaussianBlur(noise, (0, 0), 1.5)
+    assessor = FaceQualityAssessor()
+
+    runs: list[dict[str, Any]] = []
+    for face_count in args.face_counts or DEFAULT_FACE_COUNTS:
+        boxes, landmarks = build_faces(face_count, args.width, args.height, rng)
+        modes = {
+            "per_face": lambda: [
+                assessor.assess(frame, box, landmarks=points) for box, points in zip(boxes, landmarks)
+            ],
+            "batch": lambda: assessor.assess_batch(frame, boxes, landmarks),
+        }
+        for mode, assess in modes.items():
+            assess()
+            latencies_ms: list[float] = []
+            for _ in range(args.iterations):
+                started = time.perf_counter()
+                assess()
+                latencies_ms.append((time.perf_counter() - started) * 1000.0)
+            runs.append({"faces": face_count, "mode": mode, "latency": summarize_latencies(latencies_ms)})
+
+    return {
+        "report_type": "face_quality_benchmark",
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "configuration": {
+            "frame_size": [args.width, args.height],
+            "iterations": args.iterations,
+        },
+        "runs": runs,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\nFace Quality Benchmark")
+    print("=" * 22)
+    for run in report["runs"]:
+        latency = run["latency"]
+        print(f"faces={run['faces']:>4} {run['mode']:<9} p50={latency['p50_ms']}ms p99={latency['p99_ms']}ms")
+    print()
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_face_quality_benchmark(args)
+    print_report(report)
+
+    if args.output_json:
+        args.output_json.parent.mkdir(parents=True, exist_ok=True)
+        args.output_json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved JSON report to {args.output_json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
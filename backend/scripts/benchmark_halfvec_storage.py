@@ -0,0 +1,280 @@
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+from typing import Any
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np  # noqa: E402
+from sqlalchemy import text  # noqa: E402
+
+from scripts.benchmark_vector_index import compute_recall_at_k, summarize_latencies  # noqa: E402
+from scripts.evaluate_embeddings import build_async_sessionmaker  # noqa: E402
+from src.infrastructure.repositories.vector_search import (  # noqa: E402
+    DEFAULT_HALFVEC_RERANK_FACTOR,
+    halfvec_candidate_limit,
+)
+
+
+DEFAULT_ROWS = 1_000_000
+DEFAULT_DIMENSIONS = 512
+DEFAULT_CLUSTERS = 5000
+DEFAULT_QUERY_COUNT = 100
+DEFAULT_K = 10
+DEFAULT_EF_SEARCH = 40
+DEFAULT_INSERT_BATCH_SIZE = 5000
+TABLE_NAME = "halfvec_benchmark_faces"
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark float32 vs halfvec ANN indexes on a synthetic face table: table and index size, "
+            "buffer cache hit ratio, KNN latency and recall@k. Uses a scratch table, not the app's tables."
+        ),
+    )
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help=f"Synthetic faces (default: {DEFAULT_ROWS}).")
+    parser.add_argument("--dimensions", type=int, default=DEFAULT_DIMENSIONS, help="Embedding dimensions.")
+    parser.add_argument("--clusters", type=int, default=DEFAULT_CLUSTERS, help="Identities the faces are drawn around.")
+    parser.add_argument("--queries", type=int, default=DEFAULT_QUERY_COUNT, help="Probe vectors per mode.")
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help=f"Neighbours per query (default: {DEFAULT_K}).")
+    parser.add_argument("--ef-search", type=int, default=DEFAULT_EF_SEARCH, help="hnsw.ef_search for both indexes.")
+    parser.add_argument(
+        "--rerank-factor",
+        type=int,
+        default=DEFAULT_HALFVEC_RERANK_FACTOR,
+        help="halfvec shortlist size as a multiple of k, re-scored in float32.",
+    )
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_INSERT_BATCH_SIZE, help="Rows per INSERT.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic data.")
+    parser.add_argument(
+        "--keep-table",
+        action="store_true",
+        help="Keep the scratch table and its halfvec index afterwards.",
+    )
+    parser.add_argument("--output-json", type=Path, help="Optional path to save the benchmark report as JSON.")
+    return parser
+
+
+def synthetic_faces(count: int, centers: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Unit vectors scattered around identity centers, like several photos per person."""
+    faces = centers[rng.integers(0, len(centers), size=count)]
+    faces = faces + rng.normal(scale=0.35, size=faces.shape).astype(np.float32)
+    return faces / np.linalg.norm(faces, axis=1, keepdims=True)
+
+
+def vector_literal(vector: np.ndarray) -> str:
+    return "[" + ",".join(f"{value:.7g}" for value in vector.tolist()) + "]"
+
+
+async def create_table(session, args: argparse.Namespace, rng: np.random.Generator, centers: np.ndarray) -> None:
+    await session.execute(text(f"DROP TABLE IF EXISTS {TABLE_NAME}"))
+    await session.execute(
+        text(f"CREATE TABLE {TABLE_NAME} (id bigint PRIMARY KEY, embedding vector({args.dimensions}) NOT NULL)")
+    )
+    for start in range(0, args.rows, args.batch_size):
+        faces = synthetic_faces(min(args.batch_size, args.rows - start), centers, rng)
+        await session.execute(
+            text(
+                f"INSERT INTO {TABLE_NAME} (id, embedding) "
+                "SELECT id, vector_text::vector FROM unnest(CAST(:ids AS bigint[]), CAST(:vectors AS text[])) "
+                "AS rows(id, vector_text)"
+            ),
+            {
+                "ids": list(range(start, start + len(faces))),
+                "vectors": [vector_literal(face) for face in faces],
+            },
+        )
+        await session.commit()
+
+
+INDEX_STATEMENTS = {
+    "float32": "USING hnsw (embedding vector_l2_ops) WITH (m = 16, ef_construction = 64)",
+    # Same expression index shape as migration 8d3f6a1c2e47.
+    "halfvec": "USING hnsw ((embedding::halfvec({dimensions})) halfvec_l2_ops) WITH (m = 16, ef_construction = 64)",
+}
+
+
+async def build_index(session, mode: str, dimensions: int) -> tuple[float, int]:
+    """Builds the mode's ANN index, returning (build seconds, index bytes)."""
+    index_name = f"ix_{TABLE_NAME}_{mode}"
+    started = time.perf_counter()
+    await session.execute(
+        text(f"CREATE INDEX {index_name} ON {TABLE_NAME} {INDEX_STATEMENTS[mode].format(dimensions=dimensions)}")
+    )
+    await session.commit()
+    build_seconds = round(time.perf_counter() - started, 2)
+    await session.execute(text(f"ANALYZE {TABLE_NAME}"))
+    index_bytes = int((await session.execute(text("SELECT pg_relation_size(:index)"), {"index": index_name})).scalar())
+    await session.commit()
+    return build_seconds, index_bytes
+
+
+async def drop_index(session, mode: str) -> None:
+    await session.execute(text(f"DROP INDEX IF EXISTS ix_{TABLE_NAME}_{mode}"))
+    await session.commit()
+
+
+async def heap_size(session) -> int:
+    heap_bytes = (await session.execute(text("SELECT pg_relation_size(:table)"), {"table": TABLE_NAME})).scalar()
+    await session.commit()
+    return int(heap_bytes)
+
+
+def knn_sql(mode: str, args: argparse.Namespace) -> str:
+    if mode in {"exact", "float32"}:
+        return f"SELECT id FROM {TABLE_NAME} ORDER BY embedding <-> CAST(:query AS vector) LIMIT {args.k}"
+    # Mirrors nearest_neighbors_select: halfvec shortlist, exact float32 re-score.
+    shortlist_size = halfvec_candidate_limit(args.k, halfvec=True, rerank_factor=args.rerank_factor)
+    return (
+        f"SELECT id FROM {TABLE_NAME} WHERE id IN ("
+        f"SELECT id FROM {TABLE_NAME} "
+        f"ORDER BY embedding::halfvec({args.dimensions}) <-> CAST(:query AS halfvec({args.dimensions})) "
+        f"LIMIT {shortlist_size}) "
+        f"ORDER BY embedding <-> CAST(:query AS vector) LIMIT {args.k}"
+    )
+
+
+async def run_mode(session, mode: str, queries: list[str], args: argparse.Namespace) -> dict[str, Any]:
+    statement = knn_sql(mode, args)
+    candidate_limit = halfvec_candidate_limit(args.k, halfvec=mode == "halfvec", rerank_factor=args.rerank_factor)
+    ef_search = max(args.ef_search, candidate_limit)
+    results: list[list[int]] = []
+    latencies_ms: list[float] = []
+    shared_hit = 0
+    shared_read = 0
+    for query in queries:
+        async with session.begin():
+            await session.execute(text(f"SET LOCAL hnsw.ef_search = {int(ef_search)}"))
+            if mode == "exact":
+                await session.execute(text("SET LOCAL enable_indexscan = off"))
+                await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+            # Buffer counters come from EXPLAIN so they cover exactly this query.
+            plan = (
+                await session.execute(text(f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement}"), {"query": query})
+            ).scalar()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            root = plan[0]
+            latencies_ms.append(float(root["Execution Time"]))
+            shared_hit += int(root["Plan"].get("Shared Hit Blocks", 0))
+            shared_read += int(root["Plan"].get("Shared Read Blocks", 0))
+            ids = (await session.execute(text(statement), {"query": query})).scalars().all()
+            results.append(list(ids))
+    return {
+        "mode": mode,
+        "results": results,
+        "latency": summarize_latencies(latencies_ms),
+        "shared_hit_blocks": shared_hit,
+        "shared_read_blocks": shared_read,
+        "cache_hit_ratio": round(shared_hit / (shared_hit + shared_read), 4) if shared_hit + shared_read else None,
+    }
+
+
+async def run_halfvec_storage_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    async_session = build_async_sessionmaker()
+    rng = np.random.default_rng(args.seed)
+    centers = rng.normal(size=(args.clusters, args.dimensions)).astype(np.float32)
+    queries = [vector_literal(query) for query in synthetic_faces(args.queries, centers, rng)]
+
+    async with async_session() as session:
+        await create_table(session, args, rng, centers)
+        sizes = {"heap_bytes": await heap_size(session)}
+        modes = [await run_mode(session, "exact", queries, args)]
+        # One ANN index at a time, as in production: with both present the planner could
+        # serve the halfvec query's float32 re-score from the float32 index.
+        for mode in ("float32", "halfvec"):
+            build_seconds, sizes[f"{mode}_index_bytes"] = await build_index(session, mode, args.dimensions)
+            entry = await run_mode(session, mode, queries, args)
+            entry["index_build_seconds"] = build_seconds
+            modes.append(entry)
+            if not args.keep_table or mode == "float32":
+                await drop_index(session, mode)
+
+        exact_results = modes[0]["results"]
+        runs = []
+        for entry in modes:
+            recalls = [
+                recall
+                for recall in (
+                    compute_recall_at_k(exact, approximate, args.k)
+                    for exact, approximate in zip(exact_results, entry.pop("results"))
+                )
+                if recall is not None
+            ]
+            entry["recall_at_k"] = round(float(np.mean(recalls)), 6) if recalls else None
+            runs.append(entry)
+
+        if not args.keep_table:
+            await session.execute(text(f"DROP TABLE IF EXISTS {TABLE_NAME}"))
+            await session.commit()
+
+    return {
+        "report_type": "halfvec_storage_benchmark",
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "configuration": {
+            "rows": args.rows,
+            "dimensions": args.dimensions,
+            "clusters": args.clusters,
+            "query_count": len(queries),
+            "k": args.k,
+            "ef_search": args.ef_search,
+            "rerank_factor": args.rerank_factor,
+            "seed": args.seed,
+        },
+        "sizes": {
+            **sizes,
+            "halfvec_index_ratio": (
+                round(sizes["halfvec_index_bytes"] / sizes["float32_index_bytes"], 4)
+                if sizes["float32_index_bytes"]
+                else None
+            ),
+        },
+        "runs": runs,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\nHalfvec Storage Benchmark")
+    print("=" * 25)
+    sizes = report["sizes"]
+    megabytes = 1024 * 1024
+    print(
+        f"Rows: {report['configuration']['rows']} | heap={sizes['heap_bytes'] / megabytes:.1f}MB | "
+        f"float32 index={sizes['float32_index_bytes'] / megabytes:.1f}MB | "
+        f"halfvec index={sizes['halfvec_index_bytes'] / megabytes:.1f}MB ({sizes['halfvec_index_ratio']}x)"
+    )
+    for run in report["runs"]:
+        latency = run["latency"]
+        print(
+            f"{run['mode']:<8} recall@k={run['recall_at_k']} cache_hit={run['cache_hit_ratio']} "
+            f"p50={latency['p50_ms']}ms p99={latency['p99_ms']}ms"
+        )
+    print()
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    report = await run_halfvec_storage_benchmark(args)
+    print_report(report)
+
+    if args.output_json:
+        args.output_json.parent.mkdir(parents=True, exist_ok=True)
+        args.output_json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved JSON report to {args.output_json}")
+
+    return 0
+
+
+def main() -> int:
+    return asyncio.run(async_main(build_parser().parse_args()))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
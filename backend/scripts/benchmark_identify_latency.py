@@ -0,0 +1,212 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+from typing import Any, List
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from scripts.benchmark_vector_index import sample_query_vectors, summarize_latencies  # noqa: E402
+from scripts.evaluate_embeddings import build_async_sessionmaker  # noqa: E402
+from src.infrastructure.repositories.criminal import CriminalRepository  # noqa: E402
+from src.infrastructure.repositories.face import FaceRepository  # noqa: E402
+from src.infrastructure.repositories.identity_template import (  # noqa: E402
+    IdentityTemplateRepository,
+    PrimaryFaceRow,
+    TemplateCandidateRow,
+)
+from src.services.recognition_service import RecognitionService  # noqa: E402
+from src.services.template_gallery import TemplateGallery  # noqa: E402
+
+
+DEFAULT_QUERY_COUNT = 200
+DEFAULT_WARMUP_COUNT = 10
+
+
+class FixedEmbeddingPipeline:
+    """Skips detection/embedding so the benchmark isolates the database side of identify."""
+
+    def __init__(self) -> None:
+        self.embedding: List[float] = []
+
+    def process_image(self, _image: np.ndarray) -> list[dict[str, Any]]:
+        return [{"box": (0, 0, 112, 112), "embedding": self.embedding}]
+
+
+class NullAuditRepository:
+    async def create(self, audit_entry: Any) -> Any:
+        return audit_entry
+
+
+class SequentialLookupTemplateRepository(IdentityTemplateRepository):
+    """Reproduces the pre-join lookup pattern: KNN, then a criminal and a face fetch per candidate."""
+
+    def __init__(self, session, criminal_repo: CriminalRepository, face_repo: FaceRepository) -> None:
+        super().__init__(session)
+        self.criminal_repo = criminal_repo
+        self.face_repo = face_repo
+
+    async def find_nearest_candidates(self, query_vector: List[float], limit: int = 5, **_kwargs):
+        rows = []
+        for template, distance in await self.find_nearest_neighbors(query_vector, limit=limit):
+            criminal = await self.criminal_repo.get(template.criminal_id)
+            face = await self.face_repo.get(template.primary_face_id) if template.primary_face_id else None
+            rows.append(
+                TemplateCandidateRow(
+                    template=template,
+                    distance=float(distance),
+                    criminal=criminal,
+                    primary_face=(
+                        PrimaryFaceRow(id=face.id, image_url=face.image_url, is_primary=face.is_primary)
+                        if face is not None
+                        else None
+                    ),
+                )
+            )
+        return rows
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark identify latency with the sequential per-candidate lookups versus the "
+            "single joined nearest-template query."
+        ),
+    )
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=DEFAULT_QUERY_COUNT,
+        help=f"Probe embeddings sampled from face_embeddings (default: {DEFAULT_QUERY_COUNT}).",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=DEFAULT_WARMUP_COUNT,
+        help=f"Untimed identify calls per strategy before measuring (default: {DEFAULT_WARMUP_COUNT}).",
+    )
+    parser.add_argument("--include-debug", action="store_true", help="Benchmark identify with debug output.")
+    parser.add_argument("--embedding-version", help="Only sample probe embeddings from a specific version.")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for probe sampling.")
+    parser.add_argument("--output-json", type=Path, help="Optional path to save the benchmark report as JSON.")
+    return parser
+
+
+async def measure_identify_latency(
+    session,
+    template_repo: IdentityTemplateRepository,
+    query_vectors: list[list[float]],
+    *,
+    warmup: int,
+    include_debug: bool,
+) -> dict[str, Any]:
+    pipeline = FixedEmbeddingPipeline()
+    service = RecognitionService(
+        pipeline,
+        template_repo,
+        FaceRepository(session),
+        CriminalRepository(session),
+        NullAuditRepository(),
+        template_gallery=TemplateGallery(),
+    )
+    image_bytes = cv2.imencode(".png", np.zeros((8, 8, 3), dtype=np.uint8))[1].tobytes()
+
+    latencies_ms: list[float] = []
+    for index, query_vector in enumerate(query_vectors[:warmup] + query_vectors):
+        pipeline.embedding = query_vector
+        started = time.perf_counter()
+        await service.identify_suspects(image_bytes, include_debug=include_debug)
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+        await session.rollback()
+        if index >= warmup:
+            latencies_ms.append(elapsed_ms)
+
+    return summarize_latencies(latencies_ms)
+
+
+async def run_identify_latency_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    async_session = build_async_sessionmaker()
+    rng = random.Random(args.seed)
+
+    async with async_session() as session:
+        query_vectors = await sample_query_vectors(
+            session,
+            count=args.queries,
+            embedding_version=args.embedding_version,
+            rng=rng,
+        )
+        await session.rollback()
+        if not query_vectors:
+            raise SystemExit("No face embeddings available to use as benchmark probes.")
+
+        warmup = min(args.warmup, len(query_vectors))
+        sequential = await measure_identify_latency(
+            session,
+            SequentialLookupTemplateRepository(session, CriminalRepository(session), FaceRepository(session)),
+            query_vectors,
+            warmup=warmup,
+            include_debug=args.include_debug,
+        )
+        joined = await measure_identify_latency(
+            session,
+            IdentityTemplateRepository(session),
+            query_vectors,
+            warmup=warmup,
+            include_debug=args.include_debug,
+        )
+
+    return {
+        "report_type": "identify_latency_benchmark",
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "configuration": {
+            "query_count": len(query_vectors),
+            "warmup": warmup,
+            "include_debug": args.include_debug,
+            "embedding_version": args.embedding_version,
+            "seed": args.seed,
+        },
+        "strategies": {
+            "sequential_lookups": sequential,
+            "joined_query": joined,
+        },
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\nIdentify Latency Benchmark")
+    print("=" * 26)
+    print(f"Queries: {report['configuration']['query_count']} (model inference excluded)")
+    for name, latency in report["strategies"].items():
+        print(f"{name:<20} p50={latency['p50_ms']}ms p99={latency['p99_ms']}ms mean={latency['mean_ms']}ms")
+    print()
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    report = await run_identify_latency_benchmark(args)
+    print_report(report)
+
+    if args.output_json:
+        args.output_json.parent.mkdir(parents=True, exist_ok=True)
+        args.output_json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved JSON report to {args.output_json}")
+
+    return 0
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    return asyncio.run(async_main(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
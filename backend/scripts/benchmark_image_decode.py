@@ -0,0 +1,133 @@
+import argparse
+import json
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+from typing import Any
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from scripts.benchmark_vector_index import summarize_latencies  # noqa: E402
+from src.services.ai.image_ingest import decode_image  # noqa: E402
+
+
+DEFAULT_IMAGE_SIZE = (8000, 6000)
+DEFAULT_TARGET_MAX_SIDE = 1280
+DEFAULT_ITERATIONS = 5
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark upload decoding: the previous full imdecode + cvtColor copy vs the shared image ingest "
+            "at full resolution and reduced to the detector's max side. Uses a synthetic JPEG (48MP by default)."
+        ),
+    )
+    parser.add_argument("--width", type=int, default=DEFAULT_IMAGE_SIZE[0], help="JPEG width.")
+    parser.add_argument("--height", type=int, default=DEFAULT_IMAGE_SIZE[1], help="JPEG height.")
+    parser.add_argument(
+        "--target-max-side",
+        type=int,
+        default=DEFAULT_TARGET_MAX_SIDE,
+        help="Resolution the reduced mode decodes for (the detection max side).",
+    )
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, help="Decodes per mode.")
+    parser.add_argument("--output-json", type=Path, help="Optional path to save the benchmark report as JSON.")
+    return parser
+
+
+def build_jpeg(width: int, height: int) -> bytes:
+    rng = np.random.default_rng(5)
+    noise = rng.integers(0, 255, size=(height // 16, width // 16, 3), dtype=np.uint8)
+    image = cv2.resize(noise, (width, height), interpolation=cv2.INTER_CUBIC)
+    ok, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, 90])
+    if not ok:
+        raise SystemExit("Failed to encode the benchmark JPEG")
+    return encoded.tobytes()
+
+
+def decode_full_copy(image_bytes: bytes) -> np.ndarray:
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+
+
+def run_image_decode_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    image_bytes = build_jpeg(args.width, args.height)
+    source_pixels = args.width * args.height
+    modes = {
+        "imdecode_cvtcolor_copy": decode_full_copy,
+        "ingest_full_resolution": lambda data: decode_image(data, max_decoded_pixels=source_pixels).pixels,
+        "ingest_reduced": lambda data: decode_image(data, target_max_side=args.target_max_side).pixels,
+    }
+
+    runs: list[dict[str, Any]] = []
+    for mode, decode in modes.items():
+        latencies_ms: list[float] = []
+        peak_bytes = 0
+        shape = None
+        for _ in range(args.iterations):
+            tracemalloc.start()
+            started = time.perf_counter()
+            pixels = decode(image_bytes)
+            latencies_ms.append((time.perf_counter() - started) * 1000.0)
+            peak_bytes = max(peak_bytes, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+            shape = list(pixels.shape)
+            del pixels
+        runs.append(
+            {
+                "mode": mode,
+                "decoded_shape": shape,
+                "peak_allocated_mb": round(peak_bytes / (1024 * 1024), 1),
+                "latency": summarize_latencies(latencies_ms),
+            }
+        )
+
+    return {
+        "report_type": "image_decode_benchmark",
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "configuration": {
+            "image_size": [args.width, args.height],
+            "jpeg_bytes": len(image_bytes),
+            "target_max_side": args.target_max_side,
+            "iterations": args.iterations,
+        },
+        "runs": runs,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\nImage Decode Benchmark")
+    print("=" * 22)
+    for run in report["runs"]:
+        latency = run["latency"]
+        print(
+            f"{run['mode']:<24} shape={run['decoded_shape']} peak={run['peak_allocated_mb']}MB "
+            f"p50={latency['p50_ms']}ms"
+        )
+    print()
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_image_decode_benchmark(args)
+    print_report(report)
+
+    if args.output_json:
+        args.output_json.parent.mkdir(parents=True, exist_ok=True)
+        args.output_json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved JSON report to {args.output_json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,224 @@
+import argparse
+import asyncio
+import json
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+from typing import Any
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np  # noqa: E402
+
+from scripts.benchmark_vector_index import summarize_latencies  # noqa: E402
+from src.services.ai.inference_executor import InferenceExecutor  # noqa: E402
+from src.services.ai.micro_batcher import EmbeddingMicroBatcher  # noqa: E402
+from src.services.ai.strategies import DEFAULT_EMBEDDING_VERSION, get_face_embedding_strategy  # noqa: E402
+
+
+DEFAULT_CONCURRENCY_LEVELS = [1, 4, 8, 16, 32]
+DEFAULT_REQUESTS_PER_CLIENT = 10
+DEFAULT_FACES_PER_REQUEST = 1
+DEFAULT_MAX_WAIT_MS = [2.0, 5.0, 10.0]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Load-test face embedding throughput with and without cross-request micro-batching."
+        ),
+    )
+    parser.add_argument(
+        "--embedding-version",
+        default=DEFAULT_EMBEDDING_VERSION,
+        help=f"Embedding model to benchmark (default: {DEFAULT_EMBEDDING_VERSION}).",
+    )
+    parser.add_argument("--model-path", type=Path, help="Optional TraceNet checkpoint path.")
+    parser.add_argument(
+        "--random-weights",
+        action="store_true",
+        help="Benchmark a randomly initialised TraceNet instead of a deployment checkpoint.",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        action="append",
+        dest="concurrency_levels",
+        help=f"Concurrent clients to simulate. Repeat for multiple (default: {DEFAULT_CONCURRENCY_LEVELS}).",
+    )
+    parser.add_argument(
+        "--requests-per-client",
+        type=int,
+        default=DEFAULT_REQUESTS_PER_CLIENT,
+        help=f"Requests each client sends (default: {DEFAULT_REQUESTS_PER_CLIENT}).",
+    )
+    parser.add_argument(
+        "--faces-per-request",
+        type=int,
+        default=DEFAULT_FACES_PER_REQUEST,
+        help=f"Aligned face crops per request (default: {DEFAULT_FACES_PER_REQUEST}).",
+    )
+    parser.add_argument("--max-batch-size", type=int, default=32, help="Micro-batch crop limit (default: 32).")
+    parser.add_argument(
+        "--max-wait-ms",
+        type=float,
+        action="append",
+        dest="max_wait_values",
+        help=f"Micro-batch wait window to scan. Repeat for multiple (default: {DEFAULT_MAX_WAIT_MS}).",
+    )
+    parser.add_argument("--workers", type=int, default=1, help="Inference executor workers (default: 1).")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for synthetic crops.")
+    parser.add_argument("--output-json", type=Path, help="Optional path to save the benchmark report as JSON.")
+    return parser
+
+
+def build_embedder(args: argparse.Namespace, checkpoint_dir: Path):
+    if not args.random_weights:
+        return get_face_embedding_strategy(args.embedding_version, model_path=args.model_path, device="cpu")
+
+    import torch
+
+    from src.services.ai.tracenet_model import TraceNet
+
+    checkpoint_path = checkpoint_dir / "tracenet_random.pth"
+    torch.manual_seed(args.seed)
+    torch.save({"model_state_dict": TraceNet(embedding_size=512).state_dict()}, checkpoint_path)
+    return get_face_embedding_strategy(
+        "tracenet_random",
+        model_path=checkpoint_path,
+        device="cpu",
+    )
+
+
+async def run_load(
+    embed_request,
+    *,
+    concurrency: int,
+    requests_per_client: int,
+    crops: list[np.ndarray],
+    faces_per_request: int,
+) -> dict[str, Any]:
+    latencies_ms: list[float] = []
+
+    async def client(client_index: int) -> None:
+        for request_index in range(requests_per_client):
+            offset = (client_index * requests_per_client + request_index) % len(crops)
+            request_crops = [crops[(offset + index) % len(crops)] for index in range(faces_per_request)]
+            started = time.perf_counter()
+            await embed_request(request_crops)
+            latencies_ms.append((time.perf_counter() - started) * 1000.0)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(index) for index in range(concurrency)))
+    elapsed_seconds = time.perf_counter() - started
+    request_count = concurrency * requests_per_client
+
+    return {
+        "concurrency": concurrency,
+        "requests": request_count,
+        "elapsed_seconds": round(elapsed_seconds, 4),
+        "requests_per_second": round(request_count / elapsed_seconds, 3) if elapsed_seconds else None,
+        "faces_per_second": round(request_count * faces_per_request / elapsed_seconds, 3) if elapsed_seconds else None,
+        "latency": summarize_latencies(latencies_ms),
+    }
+
+
+async def run_micro_batching_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    rng = np.random.default_rng(args.seed)
+    crops = [rng.integers(0, 255, size=(112, 112, 3), dtype=np.uint8) for _ in range(64)]
+    concurrency_levels = args.concurrency_levels or DEFAULT_CONCURRENCY_LEVELS
+    max_wait_values = args.max_wait_values or DEFAULT_MAX_WAIT_MS
+
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        embedder = build_embedder(args, Path(checkpoint_dir))
+        executor = InferenceExecutor(
+            max_workers=args.workers,
+            max_queue_depth=max(concurrency_levels) * 2,
+        )
+        # Warm up allocator and kernels so the first scenario is not penalised.
+        await executor.run(embedder.embed_faces, crops[:4])
+
+        runs: list[dict[str, Any]] = []
+        for concurrency in concurrency_levels:
+            unbatched = await run_load(
+                lambda request_crops: executor.run(embedder.embed_faces, request_crops),
+                concurrency=concurrency,
+                requests_per_client=args.requests_per_client,
+                crops=crops,
+                faces_per_request=args.faces_per_request,
+            )
+            runs.append({"mode": "per_request", "max_wait_ms": None, **unbatched})
+
+            for max_wait_ms in max_wait_values:
+                batcher = EmbeddingMicroBatcher(
+                    embedder,
+                    max_batch_size=args.max_batch_size,
+                    max_wait_ms=max_wait_ms,
+                    inference_executor=executor,
+                )
+                batched = await run_load(
+                    batcher.embed,
+                    concurrency=concurrency,
+                    requests_per_client=args.requests_per_client,
+                    crops=crops,
+                    faces_per_request=args.faces_per_request,
+                )
+                batched["mean_batch_size"] = batcher.metrics()["mean_batch_size"]
+                await batcher.close()
+                runs.append({"mode": "micro_batched", "max_wait_ms": max_wait_ms, **batched})
+
+        executor.shutdown()
+
+    return {
+        "report_type": "micro_batching_benchmark",
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "configuration": {
+            "embedding_version": getattr(embedder, "embedding_version", args.embedding_version),
+            "random_weights": args.random_weights,
+            "requests_per_client": args.requests_per_client,
+            "faces_per_request": args.faces_per_request,
+            "max_batch_size": args.max_batch_size,
+            "workers": args.workers,
+        },
+        "runs": runs,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\nMicro-Batching Benchmark")
+    print("=" * 24)
+    for run in report["runs"]:
+        latency = run["latency"]
+        label = "per-request" if run["mode"] == "per_request" else f"batched({run['max_wait_ms']}ms)"
+        print(
+            f"c={run['concurrency']:>3} {label:<18} {run['requests_per_second']:>9} req/s "
+            f"p50={latency['p50_ms']}ms p99={latency['p99_ms']}ms"
+            + (f" batch={run['mean_batch_size']}" if run.get("mean_batch_size") else "")
+        )
+    print()
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    report = await run_micro_batching_benchmark(args)
+    print_report(report)
+
+    if args.output_json:
+        args.output_json.parent.mkdir(parents=True, exist_ok=True)
+        args.output_json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved JSON report to {args.output_json}")
+
+    return 0
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    return asyncio.run(async_main(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
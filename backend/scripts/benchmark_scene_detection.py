@@ -0,0 +1,219 @@
+import argparse
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+from typing import Any
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from scripts.benchmark_detection_scaling import count_matches, load_images  # noqa: E402
+from scripts.benchmark_vector_index import summarize_latencies  # noqa: E402
+from src.services.ai.pipeline import (  # noqa: E402
+    DEFAULT_TILE_OVERLAP,
+    DEFAULT_TILE_SIZE,
+    FaceProcessingPipeline,
+)
+from src.services.ai.quantization import DEFAULT_CALIBRATION_DIR  # noqa: E402
+from src.services.ai.strategies import MTCNNStrategy  # noqa: E402
+
+
+DEFAULT_SCENE_SIZE = (3840, 2160)
+DEFAULT_SCENES = 3
+DEFAULT_FACES_PER_SCENE = 24
+DEFAULT_FACE_SIZES = (24, 160)
+DEFAULT_MAX_SIDE = 1280
+FACE_SIZE_BUCKETS = [(0, 40), (40, 80), (80, 10_000)]
+# Paste the face with this much context around its detected box, so it still looks like a head.
+FACE_CONTEXT = 0.6
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark scene (crowd/CCTV) detection on synthetic frames built from testfeaces photos pasted at "
+            "known positions and sizes: full-resolution MTCNN vs the downscaled coarse pass vs tiled detection."
+        ),
+    )
+    parser.add_argument(
+        "--image-dir",
+        type=Path,
+        default=DEFAULT_CALIBRATION_DIR,
+        help=f"Face photos to paste (default: {DEFAULT_CALIBRATION_DIR}).",
+    )
+    parser.add_argument("--scenes", type=int, default=DEFAULT_SCENES, help="Synthetic frames to build.")
+    parser.add_argument("--faces-per-scene", type=int, default=DEFAULT_FACES_PER_SCENE, help="Faces pasted per frame.")
+    parser.add_argument("--min-face", type=int, default=DEFAULT_FACE_SIZES[0], help="Smallest pasted face box (px).")
+    parser.add_argument("--max-face", type=int, default=DEFAULT_FACE_SIZES[1], help="Largest pasted face box (px).")
+    parser.add_argument("--width", type=int, default=DEFAULT_SCENE_SIZE[0], help="Frame width.")
+    parser.add_argument("--height", type=int, default=DEFAULT_SCENE_SIZE[1], help="Frame height.")
+    parser.add_argument("--max-side", type=int, default=DEFAULT_MAX_SIDE, help="Coarse pass max side.")
+    parser.add_argument("--tile-size", type=int, default=DEFAULT_TILE_SIZE, help="Tile size for tiled modes.")
+    parser.add_argument("--tile-overlap", type=int, default=DEFAULT_TILE_OVERLAP, help="Tile overlap for tiled modes.")
+    parser.add_argument("--tile-scale", type=float, default=2.0, help="Upsampling for the tiled_upsampled mode.")
+    parser.add_argument("--iou-threshold", type=float, default=0.4, help="IoU for a matched face.")
+    parser.add_argument("--seed", type=int, default=11, help="Random seed for face placement.")
+    parser.add_argument("--output-json", type=Path, help="Optional path to save the benchmark report as JSON.")
+    return parser
+
+
+def collect_face_patches(detector: MTCNNStrategy, images: list[np.ndarray]) -> list[tuple[np.ndarray, tuple]]:
+    """Face patches with context, plus the face box inside each patch."""
+    patches = []
+    for image in images:
+        for detection in detector.detect_faces_with_landmarks(image)[:1]:
+            x, y, w, h = detection["box"]
+            margin_x, margin_y = int(w * FACE_CONTEXT), int(h * FACE_CONTEXT)
+            x1, y1 = max(x - margin_x, 0), max(y - margin_y, 0)
+            x2, y2 = min(x + w + margin_x, image.shape[1]), min(y + h + margin_y, image.shape[0])
+            patches.append((image[y1:y2, x1:x2], (x - x1, y - y1, w, h)))
+    return patches
+
+
+def build_scene(
+    patches: list[tuple[np.ndarray, tuple]],
+    args: argparse.Namespace,
+    rng: np.random.Generator,
+) -> tuple[np.ndarray, list[tuple[int, int, int, int]]]:
+    noise = rng.integers(40, 200, size=(args.height // 8, args.width // 8, 3), dtype=np.uint8)
+    scene = cv2.resize(cv2.GaussianBlur(noise, (5, 5), 2), (args.width, args.height), interpolation=cv2.INTER_CUBIC)
+    occupied = np.zeros((args.height, args.width), dtype=bool)
+    truth: list[tuple[int, int, int, int]] = []
+    for _ in range(args.faces_per_scene * 20):
+        if len(truth) >= args.faces_per_scene:
+            break
+        patch, (face_x, face_y, face_w, _face_h) = patches[int(rng.integers(len(patches)))]
+        face_size = float(np.exp(rng.uniform(np.log(args.min_face), np.log(args.max_face))))
+        scale = face_size / face_w
+        patch_w, patch_h = max(int(patch.shape[1] * scale), 1), max(int(patch.shape[0] * scale), 1)
+        if patch_w >= args.width or patch_h >= args.height:
+            continue
+        left = int(rng.integers(0, args.width - patch_w))
+        top = int(rng.integers(0, args.height - patch_h))
+        if occupied[top:top + patch_h, left:left + patch_w].any():
+            continue
+        occupied[top:top + patch_h, left:left + patch_w] = True
+        scene[top:top + patch_h, left:left + patch_w] = cv2.resize(patch, (patch_w, patch_h), interpolation=cv2.INTER_AREA)
+        truth.append(
+            (
+                left + int(face_x * scale),
+                top + int(face_y * scale),
+                int(face_w * scale),
+                int(_face_h * scale),
+            )
+        )
+    return scene, truth
+
+
+def run_scene_detection_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    detector = MTCNNStrategy(device="cpu")
+    patches = collect_face_patches(detector, load_images(args.image_dir, None))
+    if not patches:
+        raise SystemExit(f"No faces found under {args.image_dir}")
+    rng = np.random.default_rng(args.seed)
+    scenes = [build_scene(patches, args, rng) for _ in range(args.scenes)]
+
+    tiling = {"tile_size": args.tile_size, "tile_overlap": args.tile_overlap}
+    modes = {
+        "full_resolution": (FaceProcessingPipeline(detector, embedder=None), False),
+        "coarse": (FaceProcessingPipeline(detector, embedder=None, detection_max_side=args.max_side), False),
+        "tiled": (FaceProcessingPipeline(detector, embedder=None, detection_max_side=args.max_side, **tiling), True),
+        "tiled_upsampled": (
+            FaceProcessingPipeline(
+                detector,
+                embedder=None,
+                detection_max_side=args.max_side,
+                tile_scale=args.tile_scale,
+                **tiling,
+            ),
+            True,
+        ),
+    }
+
+    runs: list[dict[str, Any]] = []
+    for mode, (face_pipeline, tiled) in modes.items():
+        latencies_ms: list[float] = []
+        stage_timings: list[dict[str, Any]] = []
+        matched_by_bucket = {bucket: [0, 0] for bucket in FACE_SIZE_BUCKETS}
+        for scene, truth in scenes:
+            timings: dict[str, Any] = {}
+            started = time.perf_counter()
+            if tiled:
+                found = face_pipeline.detect_scene_detections(scene, timings=timings)
+            else:
+                found = face_pipeline.detect_face_detections(scene)
+            latencies_ms.append((time.perf_counter() - started) * 1000.0)
+            stage_timings.append(timings)
+
+            found_boxes = [detection["box"] for detection in found]
+            for bucket in FACE_SIZE_BUCKETS:
+                bucket_truth = [box for box in truth if bucket[0] <= box[2] < bucket[1]]
+                matched_by_bucket[bucket][0] += count_matches(bucket_truth, found_boxes, args.iou_threshold)
+                matched_by_bucket[bucket][1] += len(bucket_truth)
+
+        matched = sum(counts[0] for counts in matched_by_bucket.values())
+        total = sum(counts[1] for counts in matched_by_bucket.values())
+        runs.append(
+            {
+                "mode": mode,
+                "recall": round(matched / total, 4) if total else None,
+                "recall_by_face_size": {
+                    f"{low}-{high if high < 10_000 else 'max'}px": round(hits / count, 4) if count else None
+                    for (low, high), (hits, count) in matched_by_bucket.items()
+                },
+                "latency": summarize_latencies(latencies_ms),
+                "stage_timings": stage_timings,
+            }
+        )
+
+    return {
+        "report_type": "scene_detection_benchmark",
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "configuration": {
+            "scene_size": [args.width, args.height],
+            "scenes": args.scenes,
+            "faces": sum(len(truth) for _scene, truth in scenes),
+            "face_sizes": [args.min_face, args.max_face],
+            "max_side": args.max_side,
+            "tile_size": args.tile_size,
+            "tile_overlap": args.tile_overlap,
+            "tile_scale": args.tile_scale,
+        },
+        "runs": runs,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\nScene Detection Benchmark")
+    print("=" * 25)
+    for run in report["runs"]:
+        latency = run["latency"]
+        print(
+            f"{run['mode']:<16} recall={run['recall']} by size={run['recall_by_face_size']} "
+            f"p50={latency['p50_ms']}ms"
+        )
+    print()
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_scene_detection_benchmark(args)
+    print_report(report)
+
+    if args.output_json:
+        args.output_json.parent.mkdir(parents=True, exist_ok=True)
+        args.output_json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved JSON report to {args.output_json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,346 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+from typing import Any, Iterable
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+import numpy as np  # noqa: E402
+from sqlalchemy import func, select, text  # noqa: E402
+
+from scripts.evaluate_embeddings import build_async_sessionmaker  # noqa: E402
+from src.domain.models.face import FaceEmbedding  # noqa: E402
+from src.domain.models.identity_template import IdentityTemplate  # noqa: E402
+from src.infrastructure.repositories.identity_template import IdentityTemplateRepository  # noqa: E402
+from src.services.ai.model_registry import DEFAULT_EMBEDDING_VERSION, normalize_embedding_version  # noqa: E402
+
+
+DEFAULT_K = 10
+DEFAULT_QUERY_COUNT = 200
+DEFAULT_EF_SEARCH_VALUES = [10, 20, 40, 80, 160, 320]
+DEFAULT_PROBES_VALUES = [1, 5, 10, 20, 50]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Benchmark recall@k and latency of the identity-template ANN index "
+            "against an exact sequential scan."
+        ),
+    )
+    parser.add_argument("--k", type=int, default=DEFAULT_K, help=f"Neighbours per query (default: {DEFAULT_K}).")
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=DEFAULT_QUERY_COUNT,
+        help=f"Number of probe embeddings sampled from face_embeddings (default: {DEFAULT_QUERY_COUNT}).",
+    )
+    parser.add_argument(
+        "--ef-search",
+        type=int,
+        action="append",
+        dest="ef_search_values",
+        help=f"hnsw.ef_search value to scan. Repeat for multiple (default: {DEFAULT_EF_SEARCH_VALUES}).",
+    )
+    parser.add_argument(
+        "--probes",
+        type=int,
+        action="append",
+        dest="probes_values",
+        help=f"ivfflat.probes value to scan. Repeat for multiple (default: {DEFAULT_PROBES_VALUES}).",
+    )
+    parser.add_argument(
+        "--embedding-version",
+        default=DEFAULT_EMBEDDING_VERSION,
+        help=(
+            "Embedding version to benchmark: probes are sampled from it and both the exact and the ANN "
+            f"search are scoped to its templates (default: {DEFAULT_EMBEDDING_VERSION})."
+        ),
+    )
+    parser.add_argument(
+        "--halfvec",
+        action="store_true",
+        help="Search through the halfvec indexes (migration 8d3f6a1c2e47) with exact float32 re-scoring.",
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for probe sampling.")
+    parser.add_argument(
+        "--output-json",
+        type=Path,
+        help="Optional path to save the benchmark report as JSON.",
+    )
+    return parser
+
+
+def compute_recall_at_k(
+    exact_ids: list[Any],
+    approximate_ids: list[Any],
+    k: int,
+) -> float | None:
+    expected = list(exact_ids)[:k]
+    if not expected:
+        return None
+    found = set(list(approximate_ids)[:k])
+    return len([item for item in expected if item in found]) / len(expected)
+
+
+def summarize_latencies(latencies_ms: Iterable[float]) -> dict[str, Any]:
+    values = np.asarray(list(latencies_ms), dtype=np.float64)
+    if values.size == 0:
+        return {"count": 0, "mean_ms": None, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+
+    return {
+        "count": int(values.size),
+        "mean_ms": round(float(np.mean(values)), 3),
+        "p50_ms": round(float(np.percentile(values, 50)), 3),
+        "p95_ms": round(float(np.percentile(values, 95)), 3),
+        "p99_ms": round(float(np.percentile(values, 99)), 3),
+        "max_ms": round(float(np.max(values)), 3),
+    }
+
+
+def summarize_setting(
+    *,
+    parameter: str,
+    value: int,
+    exact_results: list[list[Any]],
+    approximate_results: list[list[Any]],
+    latencies_ms: list[float],
+    k: int,
+) -> dict[str, Any]:
+    recalls = [
+        recall
+        for recall in (
+            compute_recall_at_k(exact, approximate, k)
+            for exact, approximate in zip(exact_results, approximate_results)
+        )
+        if recall is not None
+    ]
+    return {
+        "parameter": parameter,
+        "value": value,
+        "recall_at_k": round(float(np.mean(recalls)), 6) if recalls else None,
+        "min_recall_at_k": round(float(np.min(recalls)), 6) if recalls else None,
+        "latency": summarize_latencies(latencies_ms),
+    }
+
+
+async def detect_index_method(session) -> str | None:
+    result = await session.execute(
+        text(
+            "SELECT indexdef FROM pg_indexes "
+            "WHERE tablename = 'identity_templates' AND indexdef ILIKE '%template_embedding%'"
+        )
+    )
+    for (index_definition,) in result.all():
+        lowered = index_definition.lower()
+        if "using hnsw" in lowered:
+            return "hnsw"
+        if "using ivfflat" in lowered:
+            return "ivfflat"
+    return None
+
+
+async def sample_query_vectors(
+    session,
+    *,
+    count: int,
+    embedding_version: str | None,
+    rng: random.Random,
+) -> list[list[float]]:
+    statement = select(FaceEmbedding.embedding)
+    if embedding_version:
+        statement = statement.where(FaceEmbedding.embedding_version == embedding_version)
+    result = await session.execute(statement)
+    vectors = [list(map(float, vector)) for vector in result.scalars().all() if vector is not None]
+    if len(vectors) > count:
+        vectors = rng.sample(vectors, count)
+    return vectors
+
+
+async def run_exact_search(
+    session,
+    query_vector: list[float],
+    k: int,
+    *,
+    embedding_version: str,
+) -> tuple[list[Any], float]:
+    async with session.begin():
+        # Disabling index scans forces the planner onto the exact sequential scan.
+        await session.execute(text("SET LOCAL enable_indexscan = off"))
+        await session.execute(text("SET LOCAL enable_bitmapscan = off"))
+        started = time.perf_counter()
+        result = await session.execute(
+            select(IdentityTemplate.id)
+            .where(IdentityTemplate.embedding_version == embedding_version)
+            .order_by(IdentityTemplate.template_embedding.l2_distance(query_vector))
+            .limit(k)
+        )
+        ids = list(result.scalars().all())
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+    return ids, elapsed_ms
+
+
+async def run_approximate_search(
+    session,
+    query_vector: list[float],
+    k: int,
+    *,
+    embedding_version: str,
+    halfvec: bool = False,
+    ef_search: int | None = None,
+    probes: int | None = None,
+) -> tuple[list[Any], float]:
+    repository = IdentityTemplateRepository(session, embedding_version=embedding_version, halfvec=halfvec)
+    async with session.begin():
+        started = time.perf_counter()
+        matches = await repository.find_nearest_neighbors(
+            query_vector,
+            limit=k,
+            ef_search=ef_search,
+            probes=probes,
+        )
+        elapsed_ms = (time.perf_counter() - started) * 1000.0
+    return [template.id for template, _distance in matches], elapsed_ms
+
+
+async def run_vector_index_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    async_session = build_async_sessionmaker()
+    rng = random.Random(args.seed)
+    embedding_version = normalize_embedding_version(args.embedding_version)
+
+    async with async_session() as session:
+        template_count = int(
+            (
+                await session.execute(
+                    select(func.count())
+                    .select_from(IdentityTemplate)
+                    .where(IdentityTemplate.embedding_version == embedding_version)
+                )
+            ).scalar()
+            or 0
+        )
+        index_method = await detect_index_method(session)
+        query_vectors = await sample_query_vectors(
+            session,
+            count=args.queries,
+            embedding_version=embedding_version,
+            rng=rng,
+        )
+        await session.commit()
+
+        if not query_vectors:
+            raise SystemExit("No face embeddings available to use as benchmark probes.")
+
+        exact_results: list[list[Any]] = []
+        exact_latencies: list[float] = []
+        for query_vector in query_vectors:
+            ids, elapsed_ms = await run_exact_search(
+                session,
+                query_vector,
+                args.k,
+                embedding_version=embedding_version,
+            )
+            exact_results.append(ids)
+            exact_latencies.append(elapsed_ms)
+
+        if index_method == "ivfflat":
+            parameter = "ivfflat.probes"
+            scan_values = args.probes_values or DEFAULT_PROBES_VALUES
+        else:
+            parameter = "hnsw.ef_search"
+            scan_values = args.ef_search_values or DEFAULT_EF_SEARCH_VALUES
+
+        settings_report: list[dict[str, Any]] = []
+        for value in scan_values:
+            approximate_results: list[list[Any]] = []
+            latencies: list[float] = []
+            for query_vector in query_vectors:
+                ids, elapsed_ms = await run_approximate_search(
+                    session,
+                    query_vector,
+                    args.k,
+                    embedding_version=embedding_version,
+                    halfvec=args.halfvec,
+                    ef_search=value if parameter == "hnsw.ef_search" else None,
+                    probes=value if parameter == "ivfflat.probes" else None,
+                )
+                approximate_results.append(ids)
+                latencies.append(elapsed_ms)
+            settings_report.append(
+                summarize_setting(
+                    parameter=parameter,
+                    value=value,
+                    exact_results=exact_results,
+                    approximate_results=approximate_results,
+                    latencies_ms=latencies,
+                    k=args.k,
+                )
+            )
+
+    return {
+        "report_type": "vector_index_benchmark",
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "configuration": {
+            "k": args.k,
+            "query_count": len(query_vectors),
+            "embedding_version": embedding_version,
+            "halfvec": args.halfvec,
+            "seed": args.seed,
+        },
+        "dataset": {
+            "template_count": template_count,
+            "index_method": index_method,
+        },
+        "exact_scan": {
+            "latency": summarize_latencies(exact_latencies),
+        },
+        "approximate_scan": settings_report,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\nVector Index Benchmark")
+    print("=" * 22)
+    print(
+        f"Templates: {report['dataset']['template_count']} | "
+        f"index: {report['dataset']['index_method'] or 'none'} | "
+        f"k={report['configuration']['k']} | queries={report['configuration']['query_count']}"
+    )
+    exact_latency = report["exact_scan"]["latency"]
+    print(f"Exact scan: p50={exact_latency['p50_ms']}ms p99={exact_latency['p99_ms']}ms")
+    for entry in report["approximate_scan"]:
+        latency = entry["latency"]
+        print(
+            f"{entry['parameter']}={entry['value']}: recall@k={entry['recall_at_k']} "
+            f"p50={latency['p50_ms']}ms p99={latency['p99_ms']}ms"
+        )
+    print()
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    report = await run_vector_index_benchmark(args)
+    print_report(report)
+
+    if args.output_json:
+        args.output_json.parent.mkdir(parents=True, exist_ok=True)
+        args.output_json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved JSON report to {args.output_json}")
+
+    return 0
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    return asyncio.run(async_main(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
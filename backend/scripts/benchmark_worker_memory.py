@@ -0,0 +1,145 @@
+import argparse
+import json
+import multiprocessing
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+import sys
+from typing import Any
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.infrastructure.process_memory import read_process_memory  # noqa: E402
+
+
+DEFAULT_WORKERS = 2
+WORKER_TIMEOUT_SECONDS = 600
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Compare per-worker memory when every worker loads its own face models (uvicorn --workers) "
+            "with preload-then-fork, where workers share the master's weight pages."
+        ),
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help=f"Worker processes (default: {DEFAULT_WORKERS}).")
+    parser.add_argument("--embedding-version", help="Embedding version to load (default: FACE_EMBEDDING_VERSION).")
+    parser.add_argument("--model-path", type=Path, help="Optional checkpoint for the embedding version.")
+    parser.add_argument(
+        "--random-weights",
+        action="store_true",
+        help="Load a randomly initialised TraceNet checkpoint instead of the deployment checkpoint.",
+    )
+    parser.add_argument("--output-json", type=Path, help="Optional path to save the benchmark report as JSON.")
+    return parser
+
+
+def run_worker(embedding_version: str | None, model_path: str | None, results, release) -> None:
+    """Loads (or reuses) the pipeline, serves warmup traffic, then reports while all siblings are alive."""
+    from src.services.ai import runtime
+
+    runtime.get_pipeline(embedding_version, model_path=model_path)
+    runtime.warm_up_models(iterations=1, embedding_version=embedding_version, model_path=model_path)
+    results.put(read_process_memory())
+    # PSS splits shared pages between the processes mapping them, so measure before anyone exits.
+    release.wait(WORKER_TIMEOUT_SECONDS)
+
+
+def run_mode(mode: str, args: argparse.Namespace) -> dict[str, Any]:
+    context = multiprocessing.get_context("fork" if mode == "prefork" else "spawn")
+    model_path = str(args.model_path) if args.model_path else None
+    preload = None
+    if mode == "prefork":
+        from src.services.ai import runtime
+
+        preload = runtime.preload_models_for_fork(args.embedding_version, model_path=model_path)
+
+    results = context.Queue()
+    release = context.Event()
+    processes = [
+        context.Process(target=run_worker, args=(args.embedding_version, model_path, results, release))
+        for _ in range(max(args.workers, 1))
+    ]
+    for process in processes:
+        process.start()
+    workers = [results.get(timeout=WORKER_TIMEOUT_SECONDS) for _ in processes]
+    master = read_process_memory()
+    release.set()
+    for process in processes:
+        process.join()
+
+    total_unique = sum(worker["unique_mb"] or 0.0 for worker in workers)
+    total_pss = sum(worker["pss_mb"] or 0.0 for worker in workers)
+    return {
+        "mode": mode,
+        "preload": preload,
+        "master": master,
+        "workers": workers,
+        "mean_worker_unique_mb": round(total_unique / len(workers), 1),
+        "mean_worker_pss_mb": round(total_pss / len(workers), 1),
+        # Master pages are shared with the workers in prefork mode, so count its unique memory once.
+        "total_unique_mb": round(total_unique + ((master["unique_mb"] or 0.0) if mode == "prefork" else 0.0), 1),
+    }
+
+
+def run_worker_memory_benchmark(args: argparse.Namespace) -> dict[str, Any]:
+    with tempfile.TemporaryDirectory() as checkpoint_dir:
+        if args.random_weights:
+            import torch
+
+            from src.services.ai.tracenet_model import TraceNet
+
+            args.model_path = Path(checkpoint_dir) / "tracenet_random.pth"
+            args.embedding_version = args.embedding_version or "tracenet_random"
+            torch.save({"model_state_dict": TraceNet(embedding_size=512).state_dict()}, args.model_path)
+
+        # Independent first: the prefork run loads models into this process.
+        modes = [run_mode("independent", args), run_mode("prefork", args)]
+
+    return {
+        "report_type": "worker_memory_benchmark",
+        "generated_at": datetime.now(timezone.utc).isoformat(),
+        "configuration": {
+            "workers": args.workers,
+            "embedding_version": args.embedding_version,
+            "random_weights": args.random_weights,
+        },
+        "modes": modes,
+    }
+
+
+def print_report(report: dict[str, Any]) -> None:
+    print("\nWorker Memory Benchmark")
+    print("=" * 23)
+    for mode in report["modes"]:
+        print(
+            f"{mode['mode']:<12} per-worker unique={mode['mean_worker_unique_mb']}MB "
+            f"pss={mode['mean_worker_pss_mb']}MB total unique={mode['total_unique_mb']}MB"
+        )
+        for worker in mode["workers"]:
+            print(
+                f"  pid={worker['pid']} rss={worker['rss_mb']}MB unique={worker['unique_mb']}MB "
+                f"shared={worker['shared_mb']}MB"
+            )
+    print()
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    report = run_worker_memory_benchmark(args)
+    print_report(report)
+
+    if args.output_json:
+        args.output_json.parent.mkdir(parents=True, exist_ok=True)
+        args.output_json.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Saved JSON report to {args.output_json}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
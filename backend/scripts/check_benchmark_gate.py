@@ -28,6 +28,14 @@ def build_parser() -> argparse.ArgumentParser:
         "--require-dataset-name",
         help="Optional dataset name that must match the report dataset.",
     )
+    parser.add_argument(
+        "--require-reference-check",
+        action="store_true",
+        help=(
+            "Require the TAR@FAR-versus-reference check written by compare_models.py "
+            "(use for derived models such as tracenet_v1_int8)."
+        ),
+    )
     return parser
 
 
@@ -37,6 +45,7 @@ def evaluate_gate(
     allow_conditional: bool,
     max_age_days: int,
     require_dataset_name: str | None,
+    require_reference_check: bool = False,
 ) -> tuple[bool, list[str]]:
     failures: list[str] = []
 
@@ -64,6 +73,16 @@ def evaluate_gate(
             f"dataset_name_mismatch={dataset.get('name')}!=${require_dataset_name}".replace("$", "")
         )
 
+    reference_check = report.get("checks", {}).get("tar_at_far_vs_reference")
+    if reference_check is None:
+        if require_reference_check:
+            failures.append("missing_reference_tar_check")
+    elif not reference_check.get("passed"):
+        failures.append(
+            f"tar_at_far_drop={reference_check.get('actual')}>{reference_check.get('required')}"
+            f"_vs_{reference_check.get('reference_version')}"
+        )
+
     return (len(failures) == 0), failures
 
 
@@ -77,6 +96,7 @@ def main() -> int:
         allow_conditional=args.allow_conditional,
         max_age_days=args.max_age_days,
         require_dataset_name=args.require_dataset_name,
+        require_reference_check=args.require_reference_check,
     )
 
     if passed:
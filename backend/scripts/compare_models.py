@@ -32,6 +32,9 @@ STATUS_RANK = {
     "conditional": 1,
     "no_go": 0,
 }
+REFERENCE_TAR_CHECK = "tar_at_far_vs_reference"
+DEFAULT_TAR_AT_FAR = "far_le_0.010"
+DEFAULT_MAX_TAR_DROP = 0.01
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -72,6 +75,21 @@ def build_parser() -> argparse.ArgumentParser:
     parser.add_argument("--min-top1-rate", type=float, default=0.9)
     parser.add_argument("--max-match-far", type=float, default=0.01)
     parser.add_argument("--min-evaluated-probe-faces", type=int, default=20)
+    parser.add_argument(
+        "--tar-at-far",
+        default=DEFAULT_TAR_AT_FAR,
+        choices=["far_le_0.001", "far_le_0.010", "far_le_0.050", "far_le_0.100"],
+        help=(
+            "FAR operating point for the reference check applied to derived models such as "
+            f"tracenet_v1_int8 (default: {DEFAULT_TAR_AT_FAR})."
+        ),
+    )
+    parser.add_argument(
+        "--max-tar-drop",
+        type=float,
+        default=DEFAULT_MAX_TAR_DROP,
+        help=f"Largest TAR drop allowed versus the reference model at that FAR (default: {DEFAULT_MAX_TAR_DROP}).",
+    )
     return parser
 
 
@@ -106,6 +124,59 @@ def build_benchmark_args(
     )
 
 
+def resolve_candidates(candidates: list[str]) -> list[str]:
+    """Adds each derived model's reference version ahead of it so its TAR@FAR can be compared."""
+    resolved: list[str] = []
+    for candidate in candidates:
+        reference_version = get_model_version_metadata(candidate).get("reference_version")
+        if reference_version and reference_version not in resolved:
+            resolved.append(reference_version)
+        if candidate not in resolved:
+            resolved.append(candidate)
+    return resolved
+
+
+def build_reference_tar_check(
+    candidate_threshold_report: dict[str, Any],
+    reference_threshold_report: dict[str, Any] | None,
+    *,
+    reference_version: str,
+    far_key: str,
+    max_tar_drop: float,
+) -> dict[str, Any]:
+    candidate_tar = (candidate_threshold_report["pair_threshold_recommendations"].get(far_key) or {}).get("tar")
+    reference_tar = None
+    if reference_threshold_report is not None:
+        reference_tar = (reference_threshold_report["pair_threshold_recommendations"].get(far_key) or {}).get("tar")
+
+    tar_drop = None
+    if candidate_tar is not None and reference_tar is not None:
+        tar_drop = round(float(reference_tar) - float(candidate_tar), 6)
+    return {
+        "passed": tar_drop is not None and tar_drop <= max_tar_drop,
+        "actual": tar_drop,
+        "required": max_tar_drop,
+        "reference_version": reference_version,
+        "far_target": far_key,
+        "reference_tar": reference_tar,
+        "candidate_tar": candidate_tar,
+    }
+
+
+def apply_reference_tar_check(threshold_report: dict[str, Any], check: dict[str, Any]) -> dict[str, Any]:
+    threshold_report["checks"][REFERENCE_TAR_CHECK] = check
+    if not check["passed"]:
+        decision = threshold_report["decision"]
+        decision["status"] = "no_go"
+        if REFERENCE_TAR_CHECK not in decision["failed_checks"]:
+            decision["failed_checks"].append(REFERENCE_TAR_CHECK)
+        decision["summary"] = (
+            f"TAR at {check['far_target']} is not within {check['required']} of "
+            f"{check['reference_version']}; do not roll out."
+        )
+    return threshold_report
+
+
 def choose_winner(candidates: list[dict[str, Any]]) -> dict[str, Any] | None:
     if not candidates:
         return None
@@ -168,11 +239,12 @@ def main() -> int:
     args = parser.parse_args()
     manifest = load_manifest(args.manifest)
     dataset_name = manifest["dataset"]["name"]
-    candidates = args.candidates or [DEFAULT_EMBEDDING_VERSION, FACENET_EMBEDDING_VERSION]
+    candidates = resolve_candidates(args.candidates or [DEFAULT_EMBEDDING_VERSION, FACENET_EMBEDDING_VERSION])
     model_paths = parse_model_paths(args.candidate_model_path)
     artifacts_dir = args.artifacts_dir or PROJECT_ROOT / "uploads" / "benchmarks" / "comparisons" / dataset_name
 
     comparison_entries: list[dict[str, Any]] = []
+    threshold_reports_by_version: dict[str, dict[str, Any]] = {}
     for candidate in candidates:
         safe_candidate = candidate.replace("/", "-")
         benchmark_path = artifacts_dir / f"{safe_candidate}-benchmark.json"
@@ -214,6 +286,19 @@ def main() -> int:
             max_match_far=args.max_match_far,
             min_evaluated_probe_faces=args.min_evaluated_probe_faces,
         )
+        reference_version = get_model_version_metadata(candidate).get("reference_version")
+        if reference_version:
+            apply_reference_tar_check(
+                threshold_report,
+                build_reference_tar_check(
+                    threshold_report,
+                    threshold_reports_by_version.get(reference_version),
+                    reference_version=reference_version,
+                    far_key=args.tar_at_far,
+                    max_tar_drop=args.max_tar_drop,
+                ),
+            )
+        threshold_reports_by_version[candidate] = threshold_report
         threshold_path.write_text(json.dumps(threshold_report, indent=2), encoding="utf-8")
         threshold_md_path.write_text(render_markdown(threshold_report), encoding="utf-8")
 
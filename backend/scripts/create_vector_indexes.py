@@ -0,0 +1,130 @@
+import argparse
+import asyncio
+import math
+from pathlib import Path
+import sys
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from sqlalchemy import text  # noqa: E402
+
+from scripts.evaluate_embeddings import build_async_sessionmaker  # noqa: E402
+from src.infrastructure.vector_indexes import (  # noqa: E402
+    INDEX_METHODS,
+    VECTOR_COLUMNS,
+    ann_index_statements,
+)
+from src.services.ai.model_registry import resolve_embedding_space  # noqa: E402
+
+
+HNSW_MIN_PGVECTOR_VERSION = (0, 5, 0)
+HALFVEC_MIN_PGVECTOR_VERSION = (0, 7, 0)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Create the partial ANN indexes of an embedding version registered after migration "
+            "5b8e2d7f3c19 ran. Without them, searches for that version fall back to a sequential scan."
+        ),
+    )
+    parser.add_argument(
+        "--embedding-version",
+        required=True,
+        help="Embedding version to index, e.g. the --target-version of reembed_all_faces.py.",
+    )
+    parser.add_argument(
+        "--method",
+        choices=INDEX_METHODS,
+        help="Index method (default: hnsw on pgvector >= 0.5, otherwise ivfflat).",
+    )
+    parser.add_argument(
+        "--ivfflat-lists",
+        type=int,
+        help="IVFFlat list count (default: rows / 1000, or sqrt(rows) above 1M rows, at least 10, per table).",
+    )
+    parser.add_argument(
+        "--halfvec",
+        action="store_true",
+        help="Build halfvec expression indexes, for deployments that ran migration 8d3f6a1c2e47 with halfvec.",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print the statements without running them.",
+    )
+    return parser
+
+
+def recommended_ivfflat_lists(row_count: int) -> int:
+    # pgvector guidance, as in migration 5b8e2d7f3c19: rows / 1000 up to 1M rows, sqrt(rows) beyond.
+    if row_count > 1_000_000:
+        return max(int(math.sqrt(row_count)), 10)
+    return max(row_count // 1000, 10)
+
+
+async def _pgvector_version(connection) -> tuple[int, ...]:
+    raw_version = (
+        await connection.execute(text("SELECT extversion FROM pg_extension WHERE extname = 'vector'"))
+    ).scalar()
+    if not raw_version:
+        return (0,)
+    return tuple(int(part) for part in str(raw_version).split(".") if part.isdigit())
+
+
+async def async_main(args: argparse.Namespace) -> int:
+    # ONNX and quantized backends store vectors in their PyTorch model's space, so that is what gets indexed.
+    embedding_version = resolve_embedding_space(args.embedding_version)
+    engine = build_async_sessionmaker().kw["bind"]
+    try:
+        # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+        async with engine.connect() as connection:
+            connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+            pgvector_version = await _pgvector_version(connection)
+            if args.halfvec and pgvector_version < HALFVEC_MIN_PGVECTOR_VERSION:
+                print("❌ halfvec indexes require pgvector >= 0.7.0.")
+                return 1
+            method = args.method or ("hnsw" if pgvector_version >= HNSW_MIN_PGVECTOR_VERSION else "ivfflat")
+
+            ivfflat_lists = {}
+            if method == "ivfflat":
+                for table, *_rest in VECTOR_COLUMNS:
+                    if args.ivfflat_lists:
+                        ivfflat_lists[table] = args.ivfflat_lists
+                        continue
+                    row_count = (
+                        await connection.execute(
+                            text(f"SELECT count(*) FROM {table} WHERE embedding_version = :version"),
+                            {"version": embedding_version},
+                        )
+                    ).scalar()
+                    ivfflat_lists[table] = recommended_ivfflat_lists(int(row_count or 0))
+
+            statements = ann_index_statements(
+                embedding_version,
+                method=method,
+                halfvec=args.halfvec,
+                ivfflat_lists=ivfflat_lists,
+            )
+            for statement in statements:
+                print(statement)
+                if not args.dry_run:
+                    await connection.execute(text(statement))
+    finally:
+        await engine.dispose()
+
+    if not args.dry_run:
+        print(f"✅ ANN indexes for embedding version '{embedding_version}' are in place.")
+    return 0
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    return asyncio.run(async_main(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
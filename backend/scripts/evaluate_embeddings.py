@@ -34,6 +34,14 @@ from src.services.recognition_policy_service import (  # noqa: E402
     DEFAULT_POSSIBLE_MATCH_SEPARATION_MARGIN,
     DEFAULT_POSSIBLE_MATCH_THRESHOLD,
 )
+from src.services.two_stage_retrieval import (  # noqa: E402
+    DEFAULT_COARSE_CANDIDATES,
+    DEFAULT_TEMPLATE_WEIGHT,
+    RERANK_FUSION_MODES,
+    binarize,
+    fuse_distance,
+    hamming_distances,
+)
 
 
 DEFAULT_CURRENT_THRESHOLD = 0.01
@@ -55,6 +63,7 @@ class EmbeddingRecord:
     quality_status: str = "accepted"
     template_role: str = "archived"
     template_distance: float | None = None
+    embedding_migrated_at: datetime | None = None
 
 
 @dataclass(frozen=True)
@@ -140,6 +149,26 @@ def build_parser() -> argparse.ArgumentParser:
         default=5000,
         help="Maximum enrolled faces to evaluate as template probes (default: 5000).",
     )
+    parser.add_argument(
+        "--rerank-fusion",
+        choices=RERANK_FUSION_MODES,
+        help=(
+            "Calibrate the two-stage retrieval instead of the single template ranking: binary-code shortlist "
+            "of --coarse-candidates templates, re-ranked against their faces with this fusion."
+        ),
+    )
+    parser.add_argument(
+        "--coarse-candidates",
+        type=int,
+        default=DEFAULT_COARSE_CANDIDATES,
+        help=f"Two-stage shortlist size per probe (default: {DEFAULT_COARSE_CANDIDATES}).",
+    )
+    parser.add_argument(
+        "--rerank-template-weight",
+        type=float,
+        default=DEFAULT_TEMPLATE_WEIGHT,
+        help=f"Template share of the weighted fusion (default: {DEFAULT_TEMPLATE_WEIGHT}).",
+    )
     parser.add_argument(
         "--seed",
         type=int,
@@ -224,6 +253,7 @@ async def fetch_embedding_records(embedding_version: str | None = None) -> list[
                 quality_status=getattr(face, "quality_status", "accepted"),
                 template_role=getattr(face, "template_role", "archived"),
                 template_distance=getattr(face, "template_distance", None),
+                embedding_migrated_at=getattr(face, "embedding_migrated_at", None),
                 embedding=np.asarray(face.embedding, dtype=np.float32),
             )
         )
@@ -342,6 +372,58 @@ def build_holdout_template_embedding(records: list[EmbeddingRecord]) -> np.ndarr
     return _normalize_vector(np.asarray(template_payload["template_embedding"], dtype=np.float32))
 
 
+def rank_two_stage_candidates(
+    probe_embedding: np.ndarray,
+    candidate_templates: list[dict[str, Any]],
+    *,
+    coarse_candidates: int,
+    fusion: str,
+    template_weight: float,
+) -> list[dict[str, Any]]:
+    """
+    Mirrors recognition's two-stage retrieval: shortlist by Hamming distance between
+    binary template codes, then rank the shortlist by the fused template/face distance.
+    """
+    if not candidate_templates:
+        return []
+
+    codes = np.stack([candidate["binary_code"] for candidate in candidate_templates])
+    hamming = hamming_distances(codes, binarize(probe_embedding))
+    shortlist_size = min(max(coarse_candidates, 1), len(candidate_templates))
+    shortlist = np.argpartition(hamming, shortlist_size - 1)[:shortlist_size]
+
+    ranked_candidates = []
+    for index in shortlist.tolist():
+        candidate = candidate_templates[index]
+        face_embeddings = candidate["face_embeddings"]
+        face_distances = (
+            np.linalg.norm(face_embeddings - probe_embedding, axis=1).tolist() if len(face_embeddings) else []
+        )
+        ranked_candidates.append(
+            {
+                "criminal_id": candidate["criminal_id"],
+                "criminal_name": candidate["criminal_name"],
+                "distance": fuse_distance(
+                    _vector_distance(probe_embedding, candidate["embedding"]),
+                    face_distances,
+                    fusion=fusion,
+                    template_weight=template_weight,
+                ),
+            }
+        )
+    return sorted(ranked_candidates, key=lambda item: item["distance"])
+
+
+def _template_face_embeddings(records: list[EmbeddingRecord]) -> np.ndarray:
+    # Recognition re-ranks against the template's primary and support faces.
+    faces = [
+        record.embedding
+        for record in records
+        if record.template_role in {"primary", "support"} and record.embedding.size > 0
+    ]
+    return np.stack(faces).astype(np.float32) if faces else np.empty((0, 0), dtype=np.float32)
+
+
 def evaluate_template_probes(
     records: list[EmbeddingRecord],
     templates: list[TemplateRecord],
@@ -353,7 +435,16 @@ def evaluate_template_probes(
     max_probes: int,
     rng: random.Random,
     grid_size: int,
+    rerank_fusion: str | None = None,
+    coarse_candidates: int = DEFAULT_COARSE_CANDIDATES,
+    template_weight: float = DEFAULT_TEMPLATE_WEIGHT,
 ) -> dict[str, Any]:
+    """
+    Leave-one-out probes against the live templates (the probe's own template is rebuilt
+    without it). With rerank_fusion the ranking and the calibrated thresholds are those of
+    the two-stage retrieval, and probes whose own identity misses the shortlist count as
+    coarse misses instead of being ranked.
+    """
     grouped_records: dict[UUID, list[EmbeddingRecord]] = {}
     for record in records:
         grouped_records.setdefault(record.criminal_id, []).append(record)
@@ -369,6 +460,10 @@ def evaluate_template_probes(
         for template in templates
         if template.template_embedding.size > 0
     }
+    if rerank_fusion is not None:
+        for criminal_id, template in live_templates.items():
+            template["binary_code"] = binarize(template["embedding"])
+            template["face_embeddings"] = _template_face_embeddings(grouped_records.get(criminal_id, []))
 
     eligible_records = [
         record
@@ -391,6 +486,7 @@ def evaluate_template_probes(
     own_rank_counter: Counter[int] = Counter()
 
     skipped_no_holdout = 0
+    coarse_missed = 0
     own_top1_count = 0
     own_not_top1_count = 0
 
@@ -424,23 +520,37 @@ def evaluate_template_probes(
             if criminal_id != probe.criminal_id
         )
 
-        ranked_candidates = sorted(
-            (
-                {
-                    "criminal_id": candidate["criminal_id"],
-                    "criminal_name": candidate["criminal_name"],
-                    "distance": _vector_distance(probe.embedding, candidate["embedding"]),
-                }
-                for candidate in candidate_templates
-            ),
-            key=lambda item: item["distance"],
-        )
+        if rerank_fusion is None:
+            ranked_candidates = sorted(
+                (
+                    {
+                        "criminal_id": candidate["criminal_id"],
+                        "criminal_name": candidate["criminal_name"],
+                        "distance": _vector_distance(probe.embedding, candidate["embedding"]),
+                    }
+                    for candidate in candidate_templates
+                ),
+                key=lambda item: item["distance"],
+            )
+        else:
+            candidate_templates[0]["binary_code"] = binarize(own_template_embedding)
+            candidate_templates[0]["face_embeddings"] = np.stack(
+                [record.embedding for record in holdout_records]
+            ).astype(np.float32)
+            ranked_candidates = rank_two_stage_candidates(
+                probe.embedding,
+                candidate_templates,
+                coarse_candidates=coarse_candidates,
+                fusion=rerank_fusion,
+                template_weight=template_weight,
+            )
 
         own_index = next(
             (index for index, candidate in enumerate(ranked_candidates) if candidate["criminal_id"] == probe.criminal_id),
             None,
         )
         if own_index is None:
+            coarse_missed += 1
             continue
 
         own_candidate = ranked_candidates[own_index]
@@ -503,6 +613,18 @@ def evaluate_template_probes(
         if positive_array.size
         else None
     )
+    two_stage_report = None
+    if rerank_fusion is not None:
+        ranked_probes = int(positive_array.size) + coarse_missed
+        two_stage_report = {
+            "fusion": rerank_fusion,
+            "coarse_candidates": coarse_candidates,
+            "template_weight": template_weight,
+            "coarse_missed_probe_faces": coarse_missed,
+            "coarse_recall": round(positive_array.size / ranked_probes, 6) if ranked_probes else None,
+            # Top-1 over every probe, counting coarse misses as failures.
+            "end_to_end_top1_rate": round(own_top1_count / ranked_probes, 6) if ranked_probes else None,
+        }
 
     return {
         "dataset": {
@@ -511,6 +633,7 @@ def evaluate_template_probes(
             "evaluated_probe_faces": int(positive_array.size),
             "skipped_no_holdout_faces": skipped_no_holdout,
         },
+        "two_stage": two_stage_report,
         "positive_probe_distances": {
             "distance_summary": summarize_distances(positive_array),
         },
@@ -829,6 +952,9 @@ def build_report(
             "current_match_separation_margin": args.current_match_separation_margin,
             "current_possible_match_separation_margin": args.current_possible_match_separation_margin,
             "max_template_probes": args.max_template_probes,
+            "rerank_fusion": args.rerank_fusion,
+            "coarse_candidates": args.coarse_candidates,
+            "rerank_template_weight": args.rerank_template_weight,
             "seed": args.seed,
         },
         "dataset": {
@@ -938,6 +1064,15 @@ def print_report(report: dict[str, Any]) -> None:
         f"own_template_top1_rate={ranking['own_template_top1_rate']}"
     )
 
+    two_stage = template_calibration.get("two_stage")
+    if two_stage:
+        print(
+            f"two_stage fusion={two_stage['fusion']} N={two_stage['coarse_candidates']} | "
+            f"coarse_recall={two_stage['coarse_recall']} | "
+            f"coarse_missed_probe_faces={two_stage['coarse_missed_probe_faces']} | "
+            f"end_to_end_top1_rate={two_stage['end_to_end_top1_rate']}"
+        )
+
     template_current = template_calibration["threshold_report"]["current_threshold"]
     print("\nCurrent template match threshold")
     print("-------------------------------")
@@ -997,6 +1132,9 @@ async def async_main(args: argparse.Namespace) -> int:
         max_probes=args.max_template_probes,
         rng=rng,
         grid_size=args.grid_size,
+        rerank_fusion=args.rerank_fusion,
+        coarse_candidates=args.coarse_candidates,
+        template_weight=args.rerank_template_weight,
     )
     report = build_report(
         records,
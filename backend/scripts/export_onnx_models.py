@@ -0,0 +1,77 @@
+import argparse
+from pathlib import Path
+import sys
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.services.ai.onnx_export import (  # noqa: E402
+    DEFAULT_OPSET_VERSION,
+    export_inception_resnet_to_onnx,
+    export_tracenet_to_onnx,
+)
+from src.services.ai.strategies import (  # noqa: E402
+    DEFAULT_FACENET_ONNX_PATH,
+    DEFAULT_TRACENET_ONNX_PATH,
+    DEFAULT_TRACENET_PATH,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Export the TraceNet checkpoint and/or the FaceNet InceptionResnetV1 model to ONNX "
+            "for the tracenet_v1_onnx and facenet_vggface2_onnx embedding versions."
+        ),
+    )
+    parser.add_argument(
+        "--model",
+        choices=["tracenet", "facenet", "all"],
+        default="all",
+        help="Which model to export (default: all).",
+    )
+    parser.add_argument(
+        "--tracenet-checkpoint",
+        type=Path,
+        default=DEFAULT_TRACENET_PATH,
+        help=f"TraceNet checkpoint to export (default: {DEFAULT_TRACENET_PATH}).",
+    )
+    parser.add_argument(
+        "--tracenet-output",
+        type=Path,
+        default=DEFAULT_TRACENET_ONNX_PATH,
+        help=f"TraceNet ONNX output path (default: {DEFAULT_TRACENET_ONNX_PATH}).",
+    )
+    parser.add_argument(
+        "--facenet-output",
+        type=Path,
+        default=DEFAULT_FACENET_ONNX_PATH,
+        help=f"FaceNet ONNX output path (default: {DEFAULT_FACENET_ONNX_PATH}).",
+    )
+    parser.add_argument(
+        "--opset",
+        type=int,
+        default=DEFAULT_OPSET_VERSION,
+        help=f"ONNX opset version (default: {DEFAULT_OPSET_VERSION}).",
+    )
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+
+    if args.model in ("tracenet", "all"):
+        output = export_tracenet_to_onnx(args.tracenet_checkpoint, args.tracenet_output, opset_version=args.opset)
+        print(f"Exported TraceNet to {output}")
+
+    if args.model in ("facenet", "all"):
+        output = export_inception_resnet_to_onnx(args.facenet_output, opset_version=args.opset)
+        print(f"Exported InceptionResnetV1 (VGGFace2) to {output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,95 @@
+import argparse
+import tempfile
+from pathlib import Path
+import sys
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.services.ai.onnx_export import export_tracenet_to_onnx  # noqa: E402
+from src.services.ai.pipeline import FaceProcessingPipeline  # noqa: E402
+from src.services.ai.quantization import (  # noqa: E402
+    DEFAULT_CALIBRATION_BATCH_SIZE,
+    DEFAULT_CALIBRATION_DIR,
+    build_tracenet_calibration_batches,
+    collect_calibration_crops,
+    quantize_embedding_graph,
+)
+from src.services.ai.strategies import (  # noqa: E402
+    DEFAULT_TRACENET_INT8_PATH,
+    DEFAULT_TRACENET_ONNX_PATH,
+    DEFAULT_TRACENET_PATH,
+    MTCNNStrategy,
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Build the static INT8 TraceNet graph (tracenet_v1_int8) calibrated on aligned face crops. "
+            "Gate it with compare_models.py before rollout."
+        ),
+    )
+    parser.add_argument(
+        "--checkpoint",
+        type=Path,
+        default=DEFAULT_TRACENET_PATH,
+        help=f"TraceNet checkpoint, exported to fp32 ONNX when --fp32-onnx is missing (default: {DEFAULT_TRACENET_PATH}).",
+    )
+    parser.add_argument(
+        "--fp32-onnx",
+        type=Path,
+        default=DEFAULT_TRACENET_ONNX_PATH,
+        help=f"fp32 TraceNet graph to quantize (default: {DEFAULT_TRACENET_ONNX_PATH}).",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=DEFAULT_TRACENET_INT8_PATH,
+        help=f"INT8 graph output path (default: {DEFAULT_TRACENET_INT8_PATH}).",
+    )
+    parser.add_argument(
+        "--calibration-dir",
+        type=Path,
+        default=DEFAULT_CALIBRATION_DIR,
+        help=f"Directory of face photos used for calibration (default: {DEFAULT_CALIBRATION_DIR}).",
+    )
+    parser.add_argument("--max-crops", type=int, help="Optional cap on calibration face crops.")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_CALIBRATION_BATCH_SIZE,
+        help=f"Calibration batch size (default: {DEFAULT_CALIBRATION_BATCH_SIZE}).",
+    )
+    parser.add_argument("--per-tensor", action="store_true", help="Quantize weights per tensor instead of per channel.")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+
+    detector_pipeline = FaceProcessingPipeline(MTCNNStrategy(device="cpu"), embedder=None)
+    crops = collect_calibration_crops(args.calibration_dir, detector_pipeline, max_crops=args.max_crops)
+    if not crops:
+        raise SystemExit(f"No faces detected under {args.calibration_dir}; cannot calibrate.")
+    batches = build_tracenet_calibration_batches(crops, batch_size=args.batch_size)
+    print(f"Calibrating on {len(crops)} face crops from {args.calibration_dir}")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        fp32_onnx = args.fp32_onnx
+        if not fp32_onnx.exists():
+            fp32_onnx = export_tracenet_to_onnx(args.checkpoint, Path(work_dir) / "tracenet_fp32.onnx")
+        output = quantize_embedding_graph(fp32_onnx, args.output, batches, per_channel=not args.per_tensor)
+
+    print(f"Saved INT8 TraceNet graph to {output}")
+    print(
+        "Gate it before rollout: python scripts/compare_models.py <manifest> "
+        "--candidate tracenet_v1_int8 --output-json <report>"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
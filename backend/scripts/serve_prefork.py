@@ -0,0 +1,135 @@
+import argparse
+from contextlib import suppress
+import os
+import signal
+import socket
+import time
+from pathlib import Path
+import sys
+
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.core.logging import logger  # noqa: E402
+from src.infrastructure.process_memory import read_process_memory  # noqa: E402
+
+
+DEFAULT_WORKERS = 2
+DEFAULT_MEMORY_REPORT_SECONDS = 120
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Serve the API from several worker processes that share one copy of the face model weights: "
+            "models load once in this master process, then workers are forked onto the listening socket."
+        ),
+    )
+    parser.add_argument("--host", default="0.0.0.0", help="Bind address (default: 0.0.0.0).")
+    parser.add_argument("--port", type=int, default=8000, help="Bind port (default: 8000).")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.getenv("API_WORKERS", str(DEFAULT_WORKERS))),
+        help=f"Worker processes (default: API_WORKERS or {DEFAULT_WORKERS}).",
+    )
+    parser.add_argument("--backlog", type=int, default=2048, help="Listen backlog for the shared socket.")
+    parser.add_argument(
+        "--memory-report-seconds",
+        type=int,
+        default=DEFAULT_MEMORY_REPORT_SECONDS,
+        help=(
+            "Log per-worker unique/shared memory this long after the workers start, once warmup has run "
+            f"(default: {DEFAULT_MEMORY_REPORT_SECONDS}; 0 disables)."
+        ),
+    )
+    return parser
+
+
+def bind_socket(host: str, port: int, backlog: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def run_worker(app, sock: socket.socket, args: argparse.Namespace) -> None:
+    import uvicorn
+
+    # uvicorn installs its own handlers; drop the master's before it does.
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    server = uvicorn.Server(uvicorn.Config(app, host=args.host, port=args.port, lifespan="on"))
+    server.run(sockets=[sock])
+
+
+def spawn_worker(app, sock: socket.socket, args: argparse.Namespace) -> int:
+    pid = os.fork()
+    if pid == 0:
+        exit_code = 0
+        try:
+            run_worker(app, sock, args)
+        except BaseException as e:
+            logger.error(f"Worker {os.getpid()} crashed: {e}")
+            exit_code = 1
+        finally:
+            os._exit(exit_code)
+    logger.info(f"Started API worker {pid}")
+    return pid
+
+
+def log_worker_memory(worker_pids: set[int]) -> None:
+    master = read_process_memory()
+    logger.info(f"Master memory: {master}")
+    for pid in sorted(worker_pids):
+        logger.info(f"Worker memory: {read_process_memory(pid)}")
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+
+    from src.main import app
+    from src.services.ai.runtime import preload_models_for_fork
+
+    preload_models_for_fork()
+    sock = bind_socket(args.host, args.port, args.backlog)
+
+    stopping = False
+
+    def handle_stop(signum, _frame) -> None:
+        nonlocal stopping
+        stopping = True
+        for pid in worker_pids:
+            with suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+    worker_pids = {spawn_worker(app, sock, args) for _ in range(max(args.workers, 1))}
+    signal.signal(signal.SIGTERM, handle_stop)
+    signal.signal(signal.SIGINT, handle_stop)
+    memory_report_at = time.monotonic() + args.memory_report_seconds if args.memory_report_seconds > 0 else None
+
+    while worker_pids:
+        pid, status = os.waitpid(-1, os.WNOHANG)
+        if pid == 0:
+            if memory_report_at is not None and time.monotonic() >= memory_report_at:
+                log_worker_memory(worker_pids)
+                memory_report_at = None
+            time.sleep(1.0)
+            continue
+
+        worker_pids.discard(pid)
+        if not stopping:
+            logger.error(f"API worker {pid} exited with status {os.waitstatus_to_exitcode(status)}; restarting")
+            time.sleep(1.0)
+            worker_pids.add(spawn_worker(app, sock, args))
+
+    sock.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import delete as sa_delete
 from sqlmodel import select, col, func
 
+from src.core.config import settings
 from src.infrastructure.database import get_db
 from src.infrastructure.repositories.criminal import CriminalRepository
 from src.infrastructure.repositories.face import FaceRepository
@@ -13,7 +14,9 @@ from src.infrastructure.repositories.audit import AuditRepository
 from src.infrastructure.repositories.review_case import ReviewCaseRepository
 from src.services.criminal_service import CriminalService
 from src.services.criminal_merge_service import CriminalMergeService
+from src.services.ai.analysis_cache import get_face_analysis_cache
 from src.services.ai.face_quality import sort_quality_warnings
+from src.services.ai.inference_executor import inference_executor
 from src.services.duplicate_identity_service import (
     DuplicateIdentityConflictError,
     DuplicateIdentityService,
@@ -21,7 +24,8 @@ from src.services.duplicate_identity_service import (
 from src.services.face_quality_service import FaceQualityService
 from src.services.face_enrollment_service import FaceEnrollmentService, delete_stored_face_image
 from src.services.identity_template_service import IdentityTemplateService
-from src.services.ai.runtime import pipeline
+from src.services.template_gallery import template_gallery
+from src.services.ai.runtime import ACTIVE_EMBEDDING_SPACE, pipeline, require_face_models
 from src.schemas.criminal import (
     CriminalCreate,
     CriminalResponse,
@@ -393,10 +397,10 @@ async def preview_face_quality(
         raise HTTPException(status_code=400, detail="File must be an image")
 
     content = await file.read()
-    service = FaceQualityService(pipeline)
+    service = FaceQualityService(pipeline, analysis_cache=get_face_analysis_cache())
 
     try:
-        return service.preview_image(content)
+        return await inference_executor.run(service.preview_image, content)
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
@@ -477,11 +481,16 @@ async def delete_criminal(
     await db.execute(sa_delete(Offense).where(Offense.criminal_id == criminal_id))
     await db.delete(criminal)
     await db.commit()
+    template_gallery.remove(criminal_id)
 
     return {"status": "success", "message": "Criminal record deleted"}
 
 
-@router.post("/{criminal_id}/faces", response_model=CriminalFaceResponse)
+@router.post(
+    "/{criminal_id}/faces",
+    response_model=CriminalFaceResponse,
+    dependencies=[Depends(require_face_models)],
+)
 async def enroll_criminal_face(
     criminal_id: UUID,
     file: UploadFile = File(...),
@@ -500,7 +509,13 @@ async def enroll_criminal_face(
     face_repo = FaceRepository(db)
     criminal_repo = CriminalRepository(db)
     audit_repo = AuditRepository(db)
-    template_repo = IdentityTemplateRepository(db)
+    # Duplicate detection compares the new face only against templates of the active embedding version.
+    template_repo = IdentityTemplateRepository(
+        db,
+        embedding_version=ACTIVE_EMBEDDING_SPACE,
+        halfvec=settings.VECTOR_INDEX_HALFVEC,
+        halfvec_rerank_factor=settings.VECTOR_INDEX_HALFVEC_RERANK_FACTOR,
+    )
     review_case_repo = ReviewCaseRepository(db)
     template_service = IdentityTemplateService(template_repo, face_repo)
     duplicate_identity_service = DuplicateIdentityService(
@@ -516,6 +531,7 @@ async def enroll_criminal_face(
         audit_repo,
         template_service=template_service,
         duplicate_identity_service=duplicate_identity_service,
+        analysis_cache=get_face_analysis_cache(),
     )
 
     try:
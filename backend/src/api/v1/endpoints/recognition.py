@@ -2,20 +2,24 @@ from typing import Any, Literal
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.core.config import settings
 from src.infrastructure.database import get_db
 from src.infrastructure.repositories.face import FaceRepository
 from src.infrastructure.repositories.identity_template import IdentityTemplateRepository
 from src.infrastructure.repositories.criminal import CriminalRepository
 from src.infrastructure.repositories.audit import AuditRepository
-from src.services.ai.runtime import pipeline
+from src.services.ai.micro_batcher import get_embedding_micro_batcher
+from src.services.ai.runtime import ACTIVE_EMBEDDING_SPACE, pipeline, require_face_models
 from src.services.recognition_service import RecognitionService
+from src.services.template_gallery import template_gallery
+from src.services.two_stage_retrieval import TwoStageRetriever
 from src.api.deps import get_current_user
 from src.domain.models.user import User
 from src.schemas.recognition import RecognitionResponse
 
 router = APIRouter()
 
-@router.post("/identify", response_model=RecognitionResponse)
+@router.post("/identify", response_model=RecognitionResponse, dependencies=[Depends(require_face_models)])
 async def identify_suspect(
     file: UploadFile = File(...),
     debug: bool = Query(False),
@@ -31,12 +35,44 @@ async def identify_suspect(
         
     content = await file.read()
     
-    face_repo = FaceRepository(db)
-    template_repo = IdentityTemplateRepository(db)
+    embedding_version = ACTIVE_EMBEDDING_SPACE
+    face_repo = FaceRepository(
+        db,
+        embedding_version=embedding_version,
+        halfvec=settings.VECTOR_INDEX_HALFVEC,
+        halfvec_rerank_factor=settings.VECTOR_INDEX_HALFVEC_RERANK_FACTOR,
+    )
+    template_repo = IdentityTemplateRepository(
+        db,
+        ef_search=settings.VECTOR_INDEX_EF_SEARCH,
+        probes=settings.VECTOR_INDEX_PROBES,
+        embedding_version=embedding_version,
+        halfvec=settings.VECTOR_INDEX_HALFVEC,
+        halfvec_rerank_factor=settings.VECTOR_INDEX_HALFVEC_RERANK_FACTOR,
+    )
     criminal_repo = CriminalRepository(db)
     audit_repo = AuditRepository(db)
+    # The gallery is per worker: pick up templates other workers enrolled, rebuilt or deleted.
+    await template_gallery.refresh_if_changed(db)
+    two_stage_retriever = None
+    if settings.RECOGNITION_TWO_STAGE_ENABLED:
+        two_stage_retriever = TwoStageRetriever(
+            face_repo,
+            coarse_candidates=settings.RECOGNITION_COARSE_CANDIDATES,
+            fusion=settings.RECOGNITION_RERANK_FUSION,
+            template_weight=settings.RECOGNITION_RERANK_TEMPLATE_WEIGHT,
+        )
     
-    service = RecognitionService(pipeline, template_repo, face_repo, criminal_repo, audit_repo)
+    service = RecognitionService(
+        pipeline,
+        template_repo,
+        face_repo,
+        criminal_repo,
+        audit_repo,
+        embedding_batcher=get_embedding_micro_batcher(getattr(pipeline, "embedder", None)),
+        embedding_version=embedding_version,
+        two_stage_retriever=two_stage_retriever,
+    )
     
     try:
         response = await service.identify_suspects(
@@ -1,5 +1,5 @@
-from typing import List, Union
-from pydantic import AnyHttpUrl, validator
+from typing import List, Optional, Union
+from pydantic import AnyHttpUrl, model_validator, validator
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -13,12 +13,59 @@ class Settings(BaseSettings):
     
     # Database
     DATABASE_URL: str
+    DB_ECHO: bool = False
+    # Size the pool to cover INFERENCE_MAX_WORKERS + INFERENCE_MAX_QUEUE_DEPTH in-flight requests.
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_QUERY_CACHE_SIZE: int = 500
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+
+    # Vector search (pgvector ANN index tuning; None keeps the server default)
+    VECTOR_INDEX_EF_SEARCH: Optional[int] = None
+    VECTOR_INDEX_PROBES: Optional[int] = None
+    # Opt-in halfvec search: the halfvec migration must have been run with VECTOR_INDEX_HALFVEC=true
+    # (startup checks pg_indexes and refuses to serve otherwise)
+    VECTOR_INDEX_HALFVEC: bool = False
+    VECTOR_INDEX_HALFVEC_RERANK_FACTOR: int = 4
+
+    # In-memory template gallery (falls back to pgvector when disabled or not loaded)
+    TEMPLATE_GALLERY_ENABLED: bool = True
+    TEMPLATE_GALLERY_CONSISTENCY_INTERVAL_SECONDS: int = 300
+
+    # Two-stage recognition retrieval: coarse shortlist of N templates, exact re-rank against support faces.
+    # Fusion: support_min | min | weighted. Match thresholds are calibrated per fusion (evaluate_embeddings.py
+    # --rerank-fusion), so there is no default: enabling two-stage requires choosing the calibrated fusion.
+    RECOGNITION_TWO_STAGE_ENABLED: bool = False
+    RECOGNITION_COARSE_CANDIDATES: int = 50
+    RECOGNITION_RERANK_FUSION: Optional[str] = None
+    RECOGNITION_RERANK_TEMPLATE_WEIGHT: float = 0.5
+
+    # Face models load lazily; warmup runs them once in the background at startup and gates /ready
+    MODEL_WARMUP_ENABLED: bool = True
+
+    # Audit logging ("sync" commits per row; "group_commit" waits for the bulk flush; "buffered" does not wait)
+    AUDIT_LOG_DURABILITY: str = "buffered"
+    AUDIT_LOG_FLUSH_INTERVAL_MS: float = 500.0
+    AUDIT_LOG_MAX_BATCH_SIZE: int = 200
+    AUDIT_LOG_MAX_PENDING: int = 10000
     
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = []
 
     # Removed validator since we're using plain strings now
 
+    @model_validator(mode="after")
+    def require_rerank_fusion_for_two_stage(self) -> "Settings":
+        if self.RECOGNITION_TWO_STAGE_ENABLED and self.RECOGNITION_RERANK_FUSION not in ("support_min", "min", "weighted"):
+            raise ValueError(
+                "RECOGNITION_TWO_STAGE_ENABLED needs RECOGNITION_RERANK_FUSION set to support_min, min or weighted, "
+                "with match thresholds recalibrated for it (scripts/evaluate_embeddings.py --rerank-fusion)."
+            )
+        return self
+
     class Config:
         case_sensitive = True
         env_file = ".env"
@@ -0,0 +1,236 @@
+import asyncio
+import time
+from typing import Any, Callable, List, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.core.logging import logger
+from src.domain.models.audit import AuditLog
+
+
+AUDIT_DURABILITY_SYNC = "sync"
+AUDIT_DURABILITY_GROUP_COMMIT = "group_commit"
+AUDIT_DURABILITY_BUFFERED = "buffered"
+AUDIT_DURABILITY_MODES = (
+    AUDIT_DURABILITY_SYNC,
+    AUDIT_DURABILITY_GROUP_COMMIT,
+    AUDIT_DURABILITY_BUFFERED,
+)
+
+DEFAULT_FLUSH_INTERVAL_MS = 500.0
+DEFAULT_MAX_BATCH_SIZE = 200
+DEFAULT_MAX_PENDING = 10000
+
+
+class AuditLogWriter:
+    """
+    Queues AuditLog rows in memory and writes them with one bulk INSERT per flush.
+
+    A flush runs every `flush_interval_ms` or as soon as `max_batch_size` rows are
+    pending, on its own session, so callers never pay for a commit on their request
+    session. Durability modes:
+
+    - "sync": not buffered; AuditRepository commits each row on the caller's session.
+    - "group_commit": the caller waits until the flush holding its row has committed,
+      so nothing is lost, but concurrent writers share one commit.
+    - "buffered": the caller returns immediately; rows still pending when the
+      process dies are lost.
+
+    Until start() is called the writer is inactive and every mode behaves like "sync".
+    """
+
+    def __init__(
+        self,
+        *,
+        durability: str = AUDIT_DURABILITY_BUFFERED,
+        flush_interval_ms: float = DEFAULT_FLUSH_INTERVAL_MS,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_pending: int = DEFAULT_MAX_PENDING,
+    ) -> None:
+        self.configure(
+            durability=durability,
+            flush_interval_ms=flush_interval_ms,
+            max_batch_size=max_batch_size,
+            max_pending=max_pending,
+        )
+        self._session_factory: Callable[[], AsyncSession] | None = None
+        self._pending: List[Tuple[dict[str, Any], asyncio.Future | None]] = []
+        self._flush_lock: asyncio.Lock | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._task: asyncio.Task | None = None
+        self._closing = False
+
+        self._flushed_rows = 0
+        self._flush_count = 0
+        self._failed_flushes = 0
+        self._dropped_rows = 0
+        self._last_flush_ms: float | None = None
+
+    def configure(
+        self,
+        *,
+        durability: str,
+        flush_interval_ms: float,
+        max_batch_size: int,
+        max_pending: int,
+    ) -> None:
+        if durability not in AUDIT_DURABILITY_MODES:
+            raise ValueError(
+                f"Unsupported audit durability mode '{durability}'. "
+                f"Expected one of: {', '.join(AUDIT_DURABILITY_MODES)}"
+            )
+        self.durability = durability
+        self.flush_interval_ms = max(float(flush_interval_ms), 1.0)
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.max_pending = max(int(max_pending), self.max_batch_size)
+
+    @property
+    def is_buffering(self) -> bool:
+        return self._task is not None and not self._closing and self.durability != AUDIT_DURABILITY_SYNC
+
+    def start(self, session_factory: Callable[[], AsyncSession]) -> None:
+        if self._task is not None:
+            return
+
+        self._session_factory = session_factory
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._closing = False
+        if self.durability != AUDIT_DURABILITY_SYNC:
+            self._task = asyncio.create_task(self._run())
+
+    async def submit(self, audit: AuditLog) -> AuditLog:
+        """Queues one row; in group_commit mode, waits until it is committed."""
+        if not self.is_buffering:
+            raise RuntimeError("Audit log writer is not buffering; write through the repository session.")
+
+        if len(self._pending) >= self.max_pending:
+            # Backpressure: a stalled database must not grow the buffer without bound.
+            await self.flush()
+
+        completion = None
+        if self.durability == AUDIT_DURABILITY_GROUP_COMMIT:
+            completion = asyncio.get_running_loop().create_future()
+        self._pending.append((audit.model_dump(), completion))
+        if len(self._pending) >= self.max_batch_size:
+            self._wakeup.set()
+
+        if completion is not None:
+            await completion
+        return audit
+
+    async def flush(self) -> int:
+        """Writes every pending row in one INSERT; returns how many rows were committed."""
+        if self._flush_lock is None:
+            return 0
+
+        async with self._flush_lock:
+            batch, self._pending = self._pending, []
+            if not batch:
+                return 0
+
+            started = time.perf_counter()
+            try:
+                await self._insert_rows([row for row, _completion in batch])
+            except IntegrityError:
+                # One bad row (e.g. its criminal was deleted meanwhile) must not sink the batch.
+                batch = await self._insert_rows_individually(batch)
+            except Exception as e:
+                self._failed_flushes += 1
+                logger.error(f"Audit log flush of {len(batch)} rows failed: {e}")
+                retry = []
+                for row, completion in batch:
+                    if completion is not None:
+                        if not completion.done():
+                            completion.set_exception(e)
+                    else:
+                        retry.append((row, None))
+                # Buffered rows go back to the front of the queue for the next flush.
+                self._pending = retry + self._pending
+                overflow = len(self._pending) - self.max_pending
+                if overflow > 0:
+                    self._dropped_rows += overflow
+                    del self._pending[:overflow]
+                return 0
+
+            self._flush_count += 1
+            self._flushed_rows += len(batch)
+            self._last_flush_ms = (time.perf_counter() - started) * 1000.0
+            for _row, completion in batch:
+                if completion is not None and not completion.done():
+                    completion.set_result(None)
+            return len(batch)
+
+    async def _insert_rows(self, rows: List[dict[str, Any]]) -> None:
+        async with self._session_factory() as session:
+            await session.execute(insert(AuditLog), rows)
+            await session.commit()
+
+    async def _insert_rows_individually(
+        self,
+        batch: List[Tuple[dict[str, Any], asyncio.Future | None]],
+    ) -> List[Tuple[dict[str, Any], asyncio.Future | None]]:
+        written = []
+        for row, completion in batch:
+            try:
+                await self._insert_rows([row])
+            except IntegrityError as e:
+                self._dropped_rows += 1
+                logger.error(f"Dropping audit log row {row.get('action')} rejected by the database: {e}")
+                if completion is not None and not completion.done():
+                    completion.set_exception(e)
+                continue
+            written.append((row, completion))
+        return written
+
+    async def close(self) -> None:
+        """Stops the timer and flushes whatever is still pending (lifespan shutdown)."""
+        task, self._task = self._task, None
+        self._closing = True
+        if task is not None:
+            self._wakeup.set()
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        await self.flush()
+        if self._pending:
+            logger.error(f"Dropping {len(self._pending)} audit log rows that could not be flushed on shutdown")
+            self._dropped_rows += len(self._pending)
+            for _row, completion in self._pending:
+                if completion is not None and not completion.done():
+                    completion.set_exception(RuntimeError("Audit log writer closed before the row was written"))
+            self._pending = []
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "durability": self.durability,
+            "buffering": self.is_buffering,
+            "pending": len(self._pending),
+            "flushed_rows": self._flushed_rows,
+            "flush_count": self._flush_count,
+            "failed_flushes": self._failed_flushes,
+            "dropped_rows": self._dropped_rows,
+            "last_flush_ms": round(self._last_flush_ms, 3) if self._last_flush_ms is not None else None,
+            "flush_interval_ms": self.flush_interval_ms,
+            "max_batch_size": self.max_batch_size,
+        }
+
+    async def _run(self) -> None:
+        while not self._closing:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval_ms / 1000.0)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if self._closing:
+                break
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Audit log writer flush loop error: {e}")
+
+
+audit_log_writer = AuditLogWriter()
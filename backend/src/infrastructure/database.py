@@ -3,13 +3,32 @@ from sqlalchemy.orm import sessionmaker
 from sqlmodel import SQLModel
 
 from src.core.config import settings
+from src.infrastructure.pool_metrics import InstrumentedAsyncAdaptedQueuePool, collect_pool_metrics
 
-engine = create_async_engine(settings.DATABASE_URL, echo=True, future=True)
+engine = create_async_engine(
+    settings.DATABASE_URL,
+    echo=settings.DB_ECHO,
+    future=True,
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT_SECONDS,
+    pool_recycle=settings.DB_POOL_RECYCLE_SECONDS,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
+    connect_args={
+        # asyncpg prepared statements cached per connection (0 disables, e.g. behind pgbouncer).
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
+    },
+)
 
 AsyncSessionLocal = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
 )
 
+def get_pool_metrics() -> dict:
+    return collect_pool_metrics(engine.pool)
+
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
@@ -0,0 +1,40 @@
+import os
+from pathlib import Path
+from typing import Any
+
+
+# smaps_rollup fields (kB) summed into each reported figure.
+_MEMORY_FIELDS = {
+    "rss_mb": ("Rss",),
+    "pss_mb": ("Pss",),
+    "unique_mb": ("Private_Clean", "Private_Dirty"),
+    "shared_mb": ("Shared_Clean", "Shared_Dirty"),
+    "swap_mb": ("Swap",),
+}
+
+
+def read_process_memory(pid: int | None = None) -> dict[str, Any]:
+    """
+    Memory of one process from /proc/<pid>/smaps_rollup (Linux only).
+
+    `unique_mb` (USS) is what the process would free on exit, so it is the
+    figure to compare across workers; RSS double-counts pages shared after fork.
+    """
+    resolved_pid = pid or os.getpid()
+    rollup_path = Path(f"/proc/{resolved_pid}/smaps_rollup")
+    report: dict[str, Any] = {"pid": resolved_pid, **{key: None for key in _MEMORY_FIELDS}}
+    try:
+        lines = rollup_path.read_text(encoding="utf-8").splitlines()
+    except OSError:
+        return report
+
+    values_kb: dict[str, int] = {}
+    for line in lines:
+        name, _, rest = line.partition(":")
+        parts = rest.split()
+        if len(parts) == 2 and parts[1] == "kB":
+            values_kb[name.strip()] = int(parts[0])
+
+    for key, fields in _MEMORY_FIELDS.items():
+        report[key] = round(sum(values_kb.get(field, 0) for field in fields) / 1024.0, 1)
+    return report
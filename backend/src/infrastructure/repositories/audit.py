@@ -4,10 +4,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from sqlmodel import select, desc
 
 from src.domain.models.audit import AuditLog
+from src.infrastructure.audit_writer import AuditLogWriter, audit_log_writer
 
 class AuditRepository:
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, writer: AuditLogWriter | None = None):
         self.session = session
+        self.writer = writer if writer is not None else audit_log_writer
 
     async def get_recent_identifications_count(self, hours: int = 24) -> int:
         from datetime import datetime, timedelta
@@ -17,6 +19,10 @@ class AuditRepository:
         return len(result.scalars().all())
 
     async def create(self, audit: AuditLog) -> AuditLog:
+        if self.writer.is_buffering:
+            # Bulk-written by the audit writer; no commit on the caller's session.
+            return await self.writer.submit(audit)
+
         self.session.add(audit)
         await self.session.commit()
         await self.session.refresh(audit)
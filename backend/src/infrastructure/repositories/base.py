@@ -16,6 +16,14 @@ class BaseRepository(Generic[ModelType]):
         result = await self.session.execute(statement)
         return result.scalar_one_or_none()
 
+    async def get_many(self, ids: List[UUID]) -> List[ModelType]:
+        if not ids:
+            return []
+
+        statement = select(self.model).where(self.model.id.in_(ids))
+        result = await self.session.execute(statement)
+        return result.scalars().all()
+
     async def get_all(self, skip: int = 0, limit: int = 100) -> List[ModelType]:
         statement = select(self.model).offset(skip).limit(limit)
         result = await self.session.execute(statement)
@@ -5,24 +5,52 @@ from sqlalchemy import update, desc
 from sqlmodel import select
 
 from src.infrastructure.repositories.base import BaseRepository
+from src.infrastructure.repositories.vector_search import DEFAULT_HALFVEC_RERANK_FACTOR, nearest_neighbors_select
 from src.domain.models.face import FaceEmbedding
 
 class FaceRepository(BaseRepository[FaceEmbedding]):
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        embedding_version: str | None = None,
+        halfvec: bool = False,
+        halfvec_rerank_factor: int = DEFAULT_HALFVEC_RERANK_FACTOR,
+    ):
         super().__init__(session, FaceEmbedding)
+        # Searches only rank faces of this embedding version (None searches every version).
+        self.embedding_version = embedding_version
+        # halfvec: shortlist through the half-precision expression index, re-score in float32.
+        self.halfvec = halfvec
+        self.halfvec_rerank_factor = halfvec_rerank_factor
 
-    async def find_nearest_neighbors(self, query_vector: List[float], limit: int = 5) -> List[Tuple[FaceEmbedding, float]]:
+    async def find_nearest_neighbors(
+        self,
+        query_vector: List[float],
+        limit: int = 5,
+        *,
+        embedding_version: str | None = None,
+    ) -> List[Tuple[FaceEmbedding, float]]:
         """
         Returns a list of (FaceEmbedding, distance) tuples.
         Sorts by L2 distance (Euclidean). Lower is closer.
+        With an embedding_version only that version's partial ANN index is searched.
         """
         # Using the <-> operator for L2 distance in pgvector
-        statement = select(
-            FaceEmbedding, 
-            FaceEmbedding.embedding.l2_distance(query_vector).label("distance")
-        ).order_by(
-            FaceEmbedding.embedding.l2_distance(query_vector)
-        ).limit(limit)
+        nearest = nearest_neighbors_select(
+            FaceEmbedding,
+            "embedding",
+            query_vector,
+            limit,
+            embedding_version=embedding_version if embedding_version is not None else self.embedding_version,
+            halfvec=self.halfvec,
+            rerank_factor=self.halfvec_rerank_factor,
+        ).subquery("nearest_faces")
+        statement = (
+            select(FaceEmbedding, nearest.c.distance)
+            .join(nearest, nearest.c.id == FaceEmbedding.id)
+            .order_by(nearest.c.distance)
+        )
 
         result = await self.session.execute(statement)
         return result.all()
@@ -66,6 +94,36 @@ class FaceRepository(BaseRepository[FaceEmbedding]):
         result = await self.session.execute(statement)
         return result.scalars().all()
 
+    async def get_primary_faces_by_ids(self, face_ids: List[UUID]) -> List[Any]:
+        """
+        Returns lightweight (id, criminal_id, image_url, is_primary) rows for the given faces.
+        Skips the embedding column, which recognition enrichment never reads.
+        """
+        if not face_ids:
+            return []
+
+        statement = select(
+            FaceEmbedding.id,
+            FaceEmbedding.criminal_id,
+            FaceEmbedding.image_url,
+            FaceEmbedding.is_primary,
+        ).where(FaceEmbedding.id.in_(face_ids))
+        result = await self.session.execute(statement)
+        return result.all()
+
+    async def get_embeddings_by_ids(self, face_ids: List[UUID]) -> List[Any]:
+        """Returns (id, criminal_id, embedding) rows for the given faces in one statement."""
+        if not face_ids:
+            return []
+
+        statement = select(
+            FaceEmbedding.id,
+            FaceEmbedding.criminal_id,
+            FaceEmbedding.embedding,
+        ).where(FaceEmbedding.id.in_(face_ids))
+        result = await self.session.execute(statement)
+        return result.all()
+
     async def bulk_update_template_membership(
         self,
         updates: dict[UUID, dict[str, Any]],
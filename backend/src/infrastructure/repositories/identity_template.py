@@ -1,17 +1,57 @@
 from datetime import datetime, timezone
-from typing import Any, List, Optional, Tuple
+from typing import Any, List, NamedTuple, Optional, Tuple
 from uuid import UUID
 
+from pgvector.sqlalchemy import Vector
+from sqlalchemy import Text, cast, func, true
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import defer
 from sqlmodel import select
 
+from src.domain.models.criminal import Criminal
+from src.domain.models.face import FaceEmbedding
 from src.domain.models.identity_template import IdentityTemplate
 from src.infrastructure.repositories.base import BaseRepository
+from src.infrastructure.repositories.vector_search import (
+    DEFAULT_HALFVEC_RERANK_FACTOR,
+    halfvec_candidate_limit,
+    nearest_neighbors_select,
+)
+
+
+class PrimaryFaceRow(NamedTuple):
+    id: UUID
+    image_url: str
+    is_primary: bool
+
+
+class TemplateCandidateRow(NamedTuple):
+    template: IdentityTemplate
+    distance: float
+    criminal: Criminal | None
+    primary_face: PrimaryFaceRow | None
 
 
 class IdentityTemplateRepository(BaseRepository[IdentityTemplate]):
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        ef_search: int | None = None,
+        probes: int | None = None,
+        embedding_version: str | None = None,
+        halfvec: bool = False,
+        halfvec_rerank_factor: int = DEFAULT_HALFVEC_RERANK_FACTOR,
+    ):
         super().__init__(session, IdentityTemplate)
+        self.ef_search = ef_search
+        self.probes = probes
+        # Searches only rank templates of this embedding version (None searches every version).
+        self.embedding_version = embedding_version
+        # halfvec: shortlist through the half-precision expression index, re-score in float32.
+        self.halfvec = halfvec
+        self.halfvec_rerank_factor = halfvec_rerank_factor
 
     async def get_by_criminal(self, criminal_id: UUID) -> Optional[IdentityTemplate]:
         statement = select(IdentityTemplate).where(IdentityTemplate.criminal_id == criminal_id)
@@ -22,17 +62,200 @@ class IdentityTemplateRepository(BaseRepository[IdentityTemplate]):
         self,
         query_vector: List[float],
         limit: int = 5,
+        *,
+        ef_search: int | None = None,
+        probes: int | None = None,
+        embedding_version: str | None = None,
     ) -> List[Tuple[IdentityTemplate, float]]:
+        """
+        Returns (IdentityTemplate, L2 distance) tuples, closest first.
+
+        The ORDER BY is served by the ANN index on template_embedding (HNSW, or
+        IVFFlat on older pgvector). ef_search/probes trade recall for latency for
+        this query only; unset values fall back to the repository defaults.
+        With an embedding_version (argument or repository default) only that
+        version's partial index is searched, so vectors from another embedding
+        space are never compared. With halfvec the index shortlists candidates
+        and the returned distances are still exact float32 ones.
+        """
+        await self._apply_search_tuning(
+            limit=limit,
+            ef_search=ef_search if ef_search is not None else self.ef_search,
+            probes=probes if probes is not None else self.probes,
+        )
+        nearest = self._nearest_templates(query_vector, limit, embedding_version).subquery("nearest_templates")
+        statement = (
+            select(IdentityTemplate, nearest.c.distance)
+            .join(nearest, nearest.c.id == IdentityTemplate.id)
+            .order_by(nearest.c.distance)
+        )
+        result = await self.session.execute(statement)
+        return result.all()
+
+    async def find_nearest_candidates(
+        self,
+        query_vector: List[float],
+        limit: int = 5,
+        *,
+        ef_search: int | None = None,
+        probes: int | None = None,
+        embedding_version: str | None = None,
+    ) -> List[TemplateCandidateRow]:
+        """
+        Nearest templates joined to their criminal and primary face in one statement.
+
+        Same ordering and distances as find_nearest_neighbors, but recognition gets the
+        profile data it renders without follow-up lookups. The template embedding is
+        deferred because nothing reads it after ranking.
+        """
+        await self._apply_search_tuning(
+            limit=limit,
+            ef_search=ef_search if ef_search is not None else self.ef_search,
+            probes=probes if probes is not None else self.probes,
+        )
+        # KNN runs in a LIMITed subquery so the ANN index drives it; joins touch only k rows.
+        nearest = self._nearest_templates(query_vector, limit, embedding_version).subquery("nearest_templates")
         statement = (
             select(
                 IdentityTemplate,
-                IdentityTemplate.template_embedding.l2_distance(query_vector).label("distance"),
+                nearest.c.distance,
+                Criminal,
+                FaceEmbedding.id,
+                FaceEmbedding.image_url,
+                FaceEmbedding.is_primary,
             )
-            .order_by(IdentityTemplate.template_embedding.l2_distance(query_vector))
-            .limit(limit)
+            .join(nearest, nearest.c.id == IdentityTemplate.id)
+            .outerjoin(Criminal, Criminal.id == IdentityTemplate.criminal_id)
+            .outerjoin(FaceEmbedding, FaceEmbedding.id == IdentityTemplate.primary_face_id)
+            .options(defer(IdentityTemplate.template_embedding))
+            .order_by(nearest.c.distance)
         )
         result = await self.session.execute(statement)
-        return result.all()
+        return [
+            TemplateCandidateRow(
+                template=template,
+                distance=float(row_distance),
+                criminal=criminal,
+                primary_face=(
+                    PrimaryFaceRow(id=face_id, image_url=image_url, is_primary=bool(is_primary))
+                    if face_id is not None
+                    else None
+                ),
+            )
+            for template, row_distance, criminal, face_id, image_url, is_primary in result.all()
+        ]
+
+    async def find_nearest_candidates_batch(
+        self,
+        query_vectors: List[List[float]],
+        limit: int = 5,
+        *,
+        ef_search: int | None = None,
+        probes: int | None = None,
+        embedding_version: str | None = None,
+    ) -> List[List[TemplateCandidateRow]]:
+        """
+        find_nearest_candidates for several query vectors in one round-trip.
+
+        Returns one candidate list per query vector, in input order. The vectors are
+        unnested into a probe table and each probe runs its own LIMITed KNN through a
+        LATERAL join, so every probe is still served by the ANN index.
+        """
+        if not query_vectors:
+            return []
+
+        await self._apply_search_tuning(
+            limit=limit,
+            ef_search=ef_search if ef_search is not None else self.ef_search,
+            probes=probes if probes is not None else self.probes,
+        )
+        # pgvector's text form "[x,y,...]" lets the whole batch bind as a single text[] parameter.
+        probe_vectors = (
+            func.unnest(cast([self._vector_literal(vector) for vector in query_vectors], ARRAY(Text)))
+            .table_valued("query_vector", with_ordinality="query_index")
+            .render_derived(name="probe_vectors")
+        )
+        nearest = (
+            self._nearest_templates(cast(probe_vectors.c.query_vector, Vector()), limit, embedding_version)
+            .correlate(probe_vectors)
+            .lateral("nearest_templates")
+        )
+        statement = (
+            select(
+                probe_vectors.c.query_index,
+                IdentityTemplate,
+                nearest.c.distance,
+                Criminal,
+                FaceEmbedding.id,
+                FaceEmbedding.image_url,
+                FaceEmbedding.is_primary,
+            )
+            .select_from(probe_vectors)
+            .join(nearest, true())
+            .join(IdentityTemplate, IdentityTemplate.id == nearest.c.id)
+            .outerjoin(Criminal, Criminal.id == IdentityTemplate.criminal_id)
+            .outerjoin(FaceEmbedding, FaceEmbedding.id == IdentityTemplate.primary_face_id)
+            .options(defer(IdentityTemplate.template_embedding))
+            .order_by(probe_vectors.c.query_index, nearest.c.distance)
+        )
+        result = await self.session.execute(statement)
+
+        candidates: List[List[TemplateCandidateRow]] = [[] for _vector in query_vectors]
+        for query_index, template, row_distance, criminal, face_id, image_url, is_primary in result.all():
+            # WITH ORDINALITY numbers rows from 1.
+            candidates[int(query_index) - 1].append(
+                TemplateCandidateRow(
+                    template=template,
+                    distance=float(row_distance),
+                    criminal=criminal,
+                    primary_face=(
+                        PrimaryFaceRow(id=face_id, image_url=image_url, is_primary=bool(is_primary))
+                        if face_id is not None
+                        else None
+                    ),
+                )
+            )
+        return candidates
+
+    def _nearest_templates(self, query_vector: Any, limit: int, embedding_version: str | None) -> Any:
+        return nearest_neighbors_select(
+            IdentityTemplate,
+            "template_embedding",
+            query_vector,
+            limit,
+            embedding_version=embedding_version if embedding_version is not None else self.embedding_version,
+            halfvec=self.halfvec,
+            rerank_factor=self.halfvec_rerank_factor,
+        )
+
+    @staticmethod
+    def _vector_literal(vector: List[float]) -> str:
+        return "[" + ",".join(repr(float(value)) for value in vector) + "]"
+
+    async def _apply_search_tuning(
+        self,
+        *,
+        limit: int,
+        ef_search: int | None,
+        probes: int | None,
+    ) -> None:
+        # set_config(..., true) behaves like SET LOCAL: the value only lives until the
+        # current transaction ends, so pooled connections never leak tuning.
+        if ef_search is not None:
+            # HNSW never returns more than ef_search rows, so keep it >= the rows the index must produce.
+            candidate_limit = halfvec_candidate_limit(
+                limit,
+                halfvec=self.halfvec,
+                rerank_factor=self.halfvec_rerank_factor,
+            )
+            resolved_ef_search = max(int(ef_search), candidate_limit)
+            await self.session.execute(
+                select(func.set_config("hnsw.ef_search", str(resolved_ef_search), True))
+            )
+        if probes is not None:
+            await self.session.execute(
+                select(func.set_config("ivfflat.probes", str(max(int(probes), 1)), True))
+            )
 
     async def upsert_template(
         self,
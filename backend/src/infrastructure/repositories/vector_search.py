@@ -0,0 +1,76 @@
+from typing import Any
+
+from pgvector.sqlalchemy import HALFVEC
+from sqlalchemy import cast, literal
+from sqlalchemy.orm import aliased
+from sqlmodel import select
+
+
+# halfvec search shortlists this many candidates per requested neighbour before the
+# exact float32 re-score; fp16 rounding only reorders near-ties, so a small factor suffices.
+DEFAULT_HALFVEC_RERANK_FACTOR = 4
+
+
+def embedding_version_predicate(column: Any, embedding_version: str) -> Any:
+    """
+    `column = '<version>'` with the version rendered inline (literal_execute).
+
+    The per-version partial ANN indexes are only usable when the planner can prove
+    the query's predicate implies the index's WHERE clause; a bound parameter would
+    hide the value from generic (prepared, cached) plans.
+    """
+    return column == literal(embedding_version, literal_execute=True)
+
+
+def halfvec_candidate_limit(limit: int, *, halfvec: bool, rerank_factor: int) -> int:
+    """Rows the ANN index has to produce for `limit` results (HNSW ef_search must cover it)."""
+    return int(limit) * max(int(rerank_factor), 1) if halfvec else int(limit)
+
+
+def nearest_neighbors_select(
+    model: Any,
+    embedding_attribute: str,
+    query_vector: Any,
+    limit: int,
+    *,
+    embedding_version: str | None = None,
+    halfvec: bool = False,
+    rerank_factor: int = DEFAULT_HALFVEC_RERANK_FACTOR,
+) -> Any:
+    """
+    SELECT of (id, distance) for the `limit` rows of `model` closest to `query_vector`,
+    closest first, with distance always the exact float32 L2 distance.
+
+    With `halfvec` the ANN index on `(embedding::halfvec(n))` shortlists
+    limit * rerank_factor rows and only those are re-scored from the float32 column.
+    The halfvec migration drops the float32 ANN indexes; if one were left, the planner
+    could serve the re-score's ORDER BY from it and filter the shortlist afterwards, so
+    the API refuses to start with halfvec on such a database (verify_halfvec_indexes).
+    `query_vector` may be a list or a SQL expression (e.g. a LATERAL probe column);
+    the statement is left correlatable for the caller.
+    """
+    embedding = getattr(model, embedding_attribute)
+    exact_distance = embedding.l2_distance(query_vector)
+    statement = select(model.id.label("id"), exact_distance.label("distance"))
+    if not halfvec:
+        if embedding_version:
+            statement = statement.where(embedding_version_predicate(model.embedding_version, embedding_version))
+        return statement.order_by(exact_distance).limit(limit)
+
+    # The shortlist scans an alias so it is never correlated to the outer row it feeds.
+    shortlisted = aliased(model)
+    halfvec_type = HALFVEC(embedding.type.dim)
+    approximate_distance = cast(getattr(shortlisted, embedding_attribute), halfvec_type).l2_distance(
+        cast(query_vector, halfvec_type)
+    )
+    shortlist = select(shortlisted.id)
+    if embedding_version:
+        shortlist = shortlist.where(embedding_version_predicate(shortlisted.embedding_version, embedding_version))
+    shortlist = shortlist.order_by(approximate_distance).limit(
+        halfvec_candidate_limit(limit, halfvec=True, rerank_factor=rerank_factor)
+    )
+    return (
+        statement.where(model.id.in_(shortlist.scalar_subquery()))
+        .order_by(exact_distance)
+        .limit(limit)
+    )
@@ -0,0 +1,115 @@
+import re
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+# (table, vector column, float32 index prefix, halfvec index prefix), as built by
+# migrations 5b8e2d7f3c19 (float32) and 8d3f6a1c2e47 (halfvec), one index per embedding version.
+VECTOR_COLUMNS = [
+    ("identity_templates", "template_embedding", "ix_identity_templates_ann", "ix_identity_templates_ann_half"),
+    ("face_embeddings", "embedding", "ix_face_embeddings_ann", "ix_face_embeddings_ann_half"),
+]
+POSTGRES_MAX_IDENTIFIER_LENGTH = 63
+EMBEDDING_DIMENSIONS = 512
+# Versions are interpolated into the index predicate, as in the migrations.
+EMBEDDING_VERSION_PATTERN = re.compile(r"^[a-z0-9][a-z0-9_.\-]{0,63}$")
+INDEX_METHODS = ("hnsw", "ivfflat")
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 64
+
+
+class VectorIndexMismatchError(RuntimeError):
+    """The ANN indexes in the database do not serve the configured search mode."""
+
+
+def ann_index_name(prefix: str, embedding_version: str) -> str:
+    slug = re.sub(r"[^a-z0-9_]", "_", embedding_version)
+    return f"{prefix}_{slug}"[:POSTGRES_MAX_IDENTIFIER_LENGTH]
+
+
+def ann_index_names(embedding_version: str, *, halfvec: bool) -> list[str]:
+    """The partial ANN index names of one embedding version, float32 or halfvec."""
+    return [
+        ann_index_name(halfvec_prefix if halfvec else prefix, embedding_version)
+        for _table, _column, prefix, halfvec_prefix in VECTOR_COLUMNS
+    ]
+
+
+def ann_index_statements(
+    embedding_version: str,
+    *,
+    method: str = "hnsw",
+    halfvec: bool = False,
+    ivfflat_lists: dict[str, int] | None = None,
+) -> list[str]:
+    """
+    CREATE INDEX statements for the partial ANN indexes of one embedding version, matching
+    what migrations 5b8e2d7f3c19 (float32) and 8d3f6a1c2e47 (halfvec) build. They use
+    CONCURRENTLY, so they must run outside a transaction, and IF NOT EXISTS, so reruns are no-ops.
+    `ivfflat_lists` maps table name to list count.
+    """
+    if not EMBEDDING_VERSION_PATTERN.match(embedding_version):
+        raise ValueError(f"Invalid embedding version for an index predicate: {embedding_version!r}")
+    if method not in INDEX_METHODS:
+        raise ValueError(f"Unknown vector index method {method!r}; expected one of {', '.join(INDEX_METHODS)}")
+
+    statements = []
+    for table, column, prefix, halfvec_prefix in VECTOR_COLUMNS:
+        if halfvec:
+            name = ann_index_name(halfvec_prefix, embedding_version)
+            indexed = f"({column}::halfvec({EMBEDDING_DIMENSIONS})) halfvec_l2_ops"
+        else:
+            name = ann_index_name(prefix, embedding_version)
+            indexed = f"{column} vector_l2_ops"
+        if method == "hnsw":
+            options = f"m = {HNSW_M}, ef_construction = {HNSW_EF_CONSTRUCTION}"
+        else:
+            options = f"lists = {max(int((ivfflat_lists or {}).get(table, 10)), 1)}"
+        statements.append(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {table} "
+            f"USING {method} ({indexed}) WITH ({options}) "
+            f"WHERE embedding_version = '{embedding_version}'"
+        )
+    return statements
+
+
+async def list_ann_indexes(session: AsyncSession) -> set[str]:
+    tables = ", ".join(f"'{table}'" for table, *_rest in VECTOR_COLUMNS)
+    result = await session.execute(text(f"SELECT indexname FROM pg_indexes WHERE tablename IN ({tables})"))
+    return {index_name for (index_name,) in result.all()}
+
+
+async def find_missing_ann_indexes(
+    session: AsyncSession,
+    embedding_version: str,
+    *,
+    halfvec: bool = False,
+) -> list[str]:
+    existing = await list_ann_indexes(session)
+    return [name for name in ann_index_names(embedding_version, halfvec=halfvec) if name not in existing]
+
+
+async def verify_halfvec_indexes(session: AsyncSession, embedding_version: str) -> None:
+    """
+    Raises VectorIndexMismatchError unless migration 8d3f6a1c2e47 built the halfvec
+    indexes for `embedding_version` and dropped its float32 ones.
+
+    halfvec search shortlists through the halfvec index and re-scores with an outer
+    ORDER BY on the float32 column. A missing halfvec index makes the shortlist a
+    sequential scan; a leftover float32 index can serve the outer ORDER BY and filter
+    the shortlist afterwards, silently returning fewer rows than requested.
+    """
+    existing = await list_ann_indexes(session)
+    missing = [name for name in ann_index_names(embedding_version, halfvec=True) if name not in existing]
+    leftover = [name for name in ann_index_names(embedding_version, halfvec=False) if name in existing]
+    if missing or leftover:
+        details = []
+        if missing:
+            details.append(f"missing halfvec indexes {', '.join(missing)}")
+        if leftover:
+            details.append(f"float32 indexes still present {', '.join(leftover)}")
+        raise VectorIndexMismatchError(
+            f"VECTOR_INDEX_HALFVEC=true but embedding version '{embedding_version}' has {'; '.join(details)}. "
+            "Run migration 8d3f6a1c2e47 with VECTOR_INDEX_HALFVEC=true, or unset VECTOR_INDEX_HALFVEC."
+        )
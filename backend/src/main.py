@@ -1,21 +1,126 @@
+import asyncio
 from pathlib import Path
-from contextlib import asynccontextmanager
-from fastapi import FastAPI
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 
+from src.api.deps import get_current_active_admin
 from src.core.config import settings
 from src.core.logging import logger
-from src.infrastructure.database import init_db
+from src.infrastructure.audit_writer import audit_log_writer
+from src.infrastructure.database import AsyncSessionLocal, get_pool_metrics, init_db
+from src.infrastructure.process_memory import read_process_memory
+from src.infrastructure.vector_indexes import find_missing_ann_indexes, verify_halfvec_indexes
+from src.services.ai.analysis_cache import get_face_analysis_cache
+from src.services.ai.inference_executor import InferenceQueueFullError, inference_executor
+from src.services.ai.micro_batcher import close_embedding_micro_batchers, list_embedding_micro_batchers
+from src.services.ai.runtime import (
+    ACTIVE_EMBEDDING_SPACE,
+    FaceModelsLoadingError,
+    get_readiness,
+    mark_ready_without_warmup,
+    warm_up_models,
+)
+from src.services.template_gallery import template_gallery
+
+
+async def load_template_gallery() -> None:
+    try:
+        async with AsyncSessionLocal() as session:
+            await template_gallery.load(session)
+    except Exception as e:
+        # Recognition keeps using pgvector until the gallery loads.
+        logger.error(f"Template gallery load failed, using database search: {e}")
+
+
+async def run_template_gallery_consistency_checks(interval_seconds: int) -> None:
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            async with AsyncSessionLocal() as session:
+                if template_gallery.is_loaded:
+                    await template_gallery.check_consistency(session, repair=True)
+                else:
+                    await template_gallery.load(session)
+        except Exception as e:
+            logger.error(f"Template gallery consistency check failed: {e}")
+
+
+async def warn_about_missing_ann_indexes(embedding_version: str) -> None:
+    # Migration 5b8e2d7f3c19 only indexes the versions known when it ran; a newer one seq-scans.
+    try:
+        async with AsyncSessionLocal() as session:
+            missing = await find_missing_ann_indexes(session, embedding_version)
+    except Exception as e:
+        logger.error(f"ANN index check failed: {e}")
+        return
+    if missing:
+        logger.warning(
+            f"Embedding version '{embedding_version}' has no ANN indexes ({', '.join(missing)}); "
+            f"searches fall back to a sequential scan. Run "
+            f"`python scripts/create_vector_indexes.py --embedding-version {embedding_version}`."
+        )
+
+
+async def warm_up_face_models() -> None:
+    try:
+        # Same thread pool as requests, so the warmed kernels and allocator caches are the ones used.
+        await inference_executor.run(warm_up_models)
+    except Exception as e:
+        logger.error(f"Face model warmup failed; /ready stays false: {e}")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup
     logger.info("Initializing Database...")
     await init_db()
+    if settings.VECTOR_INDEX_HALFVEC:
+        # Fail fast instead of serving halfvec searches the indexes cannot answer.
+        async with AsyncSessionLocal() as session:
+            await verify_halfvec_indexes(session, ACTIVE_EMBEDDING_SPACE)
+    else:
+        await warn_about_missing_ann_indexes(ACTIVE_EMBEDDING_SPACE)
+
+    audit_log_writer.configure(
+        durability=settings.AUDIT_LOG_DURABILITY,
+        flush_interval_ms=settings.AUDIT_LOG_FLUSH_INTERVAL_MS,
+        max_batch_size=settings.AUDIT_LOG_MAX_BATCH_SIZE,
+        max_pending=settings.AUDIT_LOG_MAX_PENDING,
+    )
+    audit_log_writer.start(AsyncSessionLocal)
+
+    # Models load in the background: /health answers at once, /ready once they are hot.
+    warmup_task = None
+    if settings.MODEL_WARMUP_ENABLED:
+        warmup_task = asyncio.create_task(warm_up_face_models())
+    else:
+        mark_ready_without_warmup()
+
+    consistency_task = None
+    if settings.TEMPLATE_GALLERY_ENABLED:
+        logger.info("Loading identity template gallery...")
+        await load_template_gallery()
+        if settings.TEMPLATE_GALLERY_CONSISTENCY_INTERVAL_SECONDS > 0:
+            consistency_task = asyncio.create_task(
+                run_template_gallery_consistency_checks(settings.TEMPLATE_GALLERY_CONSISTENCY_INTERVAL_SECONDS)
+            )
     yield
     # Shutdown
     logger.info("Shutting down...")
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await warmup_task
+    if consistency_task is not None:
+        consistency_task.cancel()
+        with suppress(asyncio.CancelledError):
+            await consistency_task
+    await close_embedding_micro_batchers()
+    inference_executor.shutdown(wait=True)
+    await audit_log_writer.close()
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -37,6 +142,22 @@ if settings.BACKEND_CORS_ORIGINS:
         allow_headers=["*"],
     )
 
+@app.exception_handler(InferenceQueueFullError)
+async def inference_queue_full_handler(_request: Request, exc: InferenceQueueFullError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after_seconds)},
+    )
+
+@app.exception_handler(FaceModelsLoadingError)
+async def face_models_loading_handler(_request: Request, exc: FaceModelsLoadingError):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": str(exc)},
+        headers={"Retry-After": str(exc.retry_after_seconds)},
+    )
+
 from src.api.v1.api import api_router
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
@@ -68,3 +189,34 @@ async def health_check(db: AsyncSession = Depends(get_db)):
             "api": "online"
         }
     }
+
+@app.get("/ready")
+async def readiness_check():
+    readiness = get_readiness()
+    return JSONResponse(status_code=200 if readiness["ready"] else 503, content=readiness)
+
+# Metrics expose queue depths, pool state, memory and cache locations; admins only.
+@app.get("/metrics/inference", dependencies=[Depends(get_current_active_admin)])
+async def inference_metrics():
+    return {
+        **inference_executor.metrics(),
+        "micro_batching": [batcher.metrics() for batcher in list_embedding_micro_batchers()],
+    }
+
+@app.get("/metrics/database", dependencies=[Depends(get_current_active_admin)])
+async def database_metrics():
+    return get_pool_metrics()
+
+@app.get("/metrics/audit", dependencies=[Depends(get_current_active_admin)])
+async def audit_metrics():
+    return audit_log_writer.metrics()
+
+@app.get("/metrics/memory", dependencies=[Depends(get_current_active_admin)])
+async def memory_metrics():
+    # Per worker: behind the prefork server each request reports the worker that served it.
+    return read_process_memory()
+
+@app.get("/metrics/analysis-cache", dependencies=[Depends(get_current_active_admin)])
+async def analysis_cache_metrics():
+    analysis_cache = get_face_analysis_cache()
+    return analysis_cache.metrics() if analysis_cache is not None else {"enabled": False}
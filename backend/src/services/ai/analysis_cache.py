@@ -0,0 +1,277 @@
+"""
+Content-addressed cache of face analysis results.
+
+Operators preview an image and then enroll it, or identify the same photo with
+and without debug, so the same bytes go through MTCNN and the embedder several
+times. Results are keyed by the sha256 of the upload plus everything that shapes
+the result (detector configuration, decoded size, embedding version, ...).
+Values are stored serialized, which bounds memory exactly, hands every caller its
+own copy, and lets the optional disk tier reuse the same bytes. The encoding is
+plain JSON with tagged tuples and base64 float arrays, never pickle: the disk
+directory may be shared between workers, and a file planted there must not be
+able to run code when it is read back.
+"""
+
+import base64
+import binascii
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from src.core.logging import logger
+
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_DISK_MAX_ENTRIES = 4096
+# The disk tier is pruned every this many writes rather than listed on every put.
+DISK_PRUNE_INTERVAL = 64
+DISK_SUFFIX = ".json"
+_TUPLE_TAG = "__tuple__"
+_FLOATS_TAG = "__f8__"
+_NDARRAY_TAG = "__ndarray__"
+_DICT_TAG = "__dict__"
+
+
+class CacheEncodingError(ValueError):
+    """A value cannot be cached, or a cached payload is not a valid entry."""
+
+
+def image_digest(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def build_cache_key(digest: str, stage: str, *parts: Any) -> str:
+    """Filesystem-safe key for one analysis stage of one upload."""
+    material = "|".join([digest, stage, *(repr(part) for part in parts)])
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def _encode(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        buffer = io.BytesIO()
+        np.save(buffer, value, allow_pickle=False)
+        return {_NDARRAY_TAG: base64.b64encode(buffer.getvalue()).decode("ascii")}
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_encode(item) for item in value]}
+    if isinstance(value, list):
+        # Embeddings dominate the payload; packed float64 is exact and about half the size of JSON text.
+        if value and all(type(item) is float for item in value):
+            packed = np.asarray(value, dtype="<f8").tobytes()
+            return {_FLOATS_TAG: base64.b64encode(packed).decode("ascii")}
+        return [_encode(item) for item in value]
+    if isinstance(value, dict):
+        if not all(isinstance(name, str) for name in value):
+            raise CacheEncodingError("Cached dicts must have string keys")
+        return {_DICT_TAG: {name: _encode(item) for name, item in value.items()}}
+    raise CacheEncodingError(f"Cannot cache values of type {type(value).__name__}")
+
+
+def _decode(value: Any) -> Any:
+    if isinstance(value, list):
+        return [_decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    if len(value) != 1:
+        raise CacheEncodingError("Untagged object in cache payload")
+    (tag, body), = value.items()
+    if tag == _DICT_TAG and isinstance(body, dict):
+        return {name: _decode(item) for name, item in body.items()}
+    if tag == _TUPLE_TAG and isinstance(body, list):
+        return tuple(_decode(item) for item in body)
+    if tag == _FLOATS_TAG and isinstance(body, str):
+        return np.frombuffer(base64.b64decode(body, validate=True), dtype="<f8").tolist()
+    if tag == _NDARRAY_TAG and isinstance(body, str):
+        return np.load(io.BytesIO(base64.b64decode(body, validate=True)), allow_pickle=False)
+    raise CacheEncodingError(f"Unknown tag {tag!r} in cache payload")
+
+
+def serialize_value(value: Any) -> bytes:
+    return json.dumps(_encode(value), separators=(",", ":")).encode("utf-8")
+
+
+def deserialize_value(payload: bytes) -> Any:
+    """Inverse of serialize_value; only data is rebuilt, nothing in the payload is executed."""
+    try:
+        return _decode(json.loads(payload))
+    except (UnicodeDecodeError, binascii.Error, EOFError, ValueError) as e:
+        raise CacheEncodingError(f"Invalid cache payload: {e}") from e
+
+
+class FaceAnalysisCache:
+    """
+    Thread-safe LRU bounded by entry count and serialized bytes, with an optional disk tier.
+
+    Disk entries survive restarts and are shared by API workers on the same volume;
+    a memory miss that hits disk is promoted back into memory.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        disk_dir: str | Path | None = None,
+        disk_max_entries: int = DEFAULT_DISK_MAX_ENTRIES,
+    ) -> None:
+        self.max_entries = max(int(max_entries), 1)
+        self.max_bytes = max(int(max_bytes), 1)
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+        self.disk_max_entries = max(int(disk_max_entries), 1)
+        if self.disk_dir is not None:
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._disk_writes = 0
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key: str) -> Any | None:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return deserialize_value(payload)
+
+        payload = self._read_disk(key)
+        value = None
+        if payload is not None:
+            try:
+                value = deserialize_value(payload)
+            except CacheEncodingError as e:
+                logger.warning(f"Ignoring unreadable analysis cache disk entry {key}: {e}")
+                payload = None
+        with self._lock:
+            if payload is None:
+                self._misses += 1
+                return None
+            self._disk_hits += 1
+            self._store(key, payload)
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        try:
+            payload = serialize_value(value)
+        except CacheEncodingError as e:
+            logger.warning(f"Not caching analysis result {key}: {e}")
+            return
+        with self._lock:
+            self._store(key, payload)
+        self._write_disk(key, payload)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self._hits + self._disk_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "hit_rate": round((self._hits + self._disk_hits) / lookups, 4) if lookups else None,
+                "disk_dir": str(self.disk_dir) if self.disk_dir is not None else None,
+            }
+
+    def _store(self, key: str, payload: bytes) -> None:
+        if len(payload) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = payload
+        self._bytes += len(payload)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _evicted_key, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self._evictions += 1
+
+    def _read_disk(self, key: str) -> bytes | None:
+        if self.disk_dir is None:
+            return None
+        try:
+            return (self.disk_dir / f"{key}{DISK_SUFFIX}").read_bytes()
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Analysis cache disk read failed for {key}: {e}")
+            return None
+
+    def _write_disk(self, key: str, payload: bytes) -> None:
+        if self.disk_dir is None:
+            return
+        path = self.disk_dir / f"{key}{DISK_SUFFIX}"
+        temp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            temp_path.write_bytes(payload)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Analysis cache disk write failed for {key}: {e}")
+            return
+
+        with self._lock:
+            self._disk_writes += 1
+            prune = self._disk_writes % DISK_PRUNE_INTERVAL == 0
+        if prune:
+            self._prune_disk()
+
+    def _prune_disk(self) -> None:
+        entries = []
+        for path in self.disk_dir.glob(f"*{DISK_SUFFIX}"):
+            try:
+                entries.append((path.stat().st_mtime, path))
+            except FileNotFoundError:
+                continue
+        entries.sort()
+        for _mtime, path in entries[:max(len(entries) - self.disk_max_entries, 0)]:
+            path.unlink(missing_ok=True)
+
+
+ANALYSIS_CACHE_ENABLED = os.getenv("FACE_ANALYSIS_CACHE_ENABLED", "true").strip().lower() in {"1", "true", "yes"}
+ANALYSIS_CACHE_MAX_ENTRIES = int(os.getenv("FACE_ANALYSIS_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES)))
+ANALYSIS_CACHE_MAX_MB = float(os.getenv("FACE_ANALYSIS_CACHE_MAX_MB", str(DEFAULT_MAX_BYTES // (1024 * 1024))))
+ANALYSIS_CACHE_DIR = os.getenv("FACE_ANALYSIS_CACHE_DIR", "").strip() or None
+ANALYSIS_CACHE_DISK_MAX_ENTRIES = int(
+    os.getenv("FACE_ANALYSIS_CACHE_DISK_MAX_ENTRIES", str(DEFAULT_DISK_MAX_ENTRIES))
+)
+_shared_cache: FaceAnalysisCache | None = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_face_analysis_cache() -> FaceAnalysisCache | None:
+    """The process-wide cache, or None when FACE_ANALYSIS_CACHE_ENABLED is off."""
+    global _shared_cache
+    if not ANALYSIS_CACHE_ENABLED:
+        return None
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = FaceAnalysisCache(
+                    max_entries=ANALYSIS_CACHE_MAX_ENTRIES,
+                    max_bytes=int(ANALYSIS_CACHE_MAX_MB * 1024 * 1024),
+                    disk_dir=ANALYSIS_CACHE_DIR,
+                    disk_max_entries=ANALYSIS_CACHE_DISK_MAX_ENTRIES,
+                )
+    return _shared_cache
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import Literal
+from typing import Literal, Sequence
 
 import cv2
 import numpy as np
@@ -90,31 +90,97 @@ class FaceQualityAssessor:
         *,
         landmarks: list[tuple[float, float]] | None = None,
     ) -> FaceQualityReport:
+        return self.assess_batch(image, [box], [landmarks])[0]
+
+    def assess_batch(
+        self,
+        image: np.ndarray,
+        boxes: Sequence[tuple[int, int, int, int]],
+        landmarks: Sequence[list[tuple[float, float]] | None] | None = None,
+    ) -> list[FaceQualityReport]:
+        """
+        Assess every face of one image together.
+
+        Grayscale conversion is shared (one conversion of the region covering all
+        faces when that is cheaper than converting each crop), pose is computed
+        for all faces at once, and the landmark patches of all faces are scored
+        as stacked arrays instead of one patch at a time.
+        """
+        if landmarks is None:
+            landmarks = [None] * len(boxes)
+        if len(landmarks) != len(boxes):
+            raise ValueError("assess_batch needs one landmarks entry (or None) per box.")
+
         image_height, image_width = image.shape[:2]
-        x, y, w, h = (int(value) for value in box)
-
-        x1 = max(0, x)
-        y1 = max(0, y)
-        x2 = min(image_width, x + w)
-        y2 = min(image_height, y + h)
-        face_crop = image[y1:y2, x1:x2]
-
-        if face_crop.size == 0:
-            return FaceQualityReport(
-                status="rejected",
-                quality_score=0.0,
-                blur_score=0.0,
-                brightness_score=0.0,
-                face_area_ratio=0.0,
-                rejection_reasons=["invalid_face_crop"],
-            )
+        faces = []
+        for box in boxes:
+            x, y, w, h = (int(value) for value in box)
+            faces.append((x, y, w, h, max(0, x), max(0, y), min(image_width, x + w), min(image_height, y + h)))
+        valid = [index for index, face in enumerate(faces) if face[6] > face[4] and face[7] > face[5]]
+        gray_by_face = dict(zip(valid, self._gray_crops(image, [faces[index][4:] for index in valid])))
+
+        points = [self._parse_landmarks(face_landmarks) for face_landmarks in landmarks]
+        pose_metrics = self._compute_pose_metrics_batch(points)
+        occlusion_metrics = self._compute_occlusion_metrics_batch(gray_by_face, faces, points)
+
+        reports: list[FaceQualityReport] = []
+        for index, (x, y, w, h, *_clipped) in enumerate(faces):
+            gray_crop = gray_by_face.get(index)
+            if gray_crop is None:
+                reports.append(
+                    FaceQualityReport(
+                        status="rejected",
+                        quality_score=0.0,
+                        blur_score=0.0,
+                        brightness_score=0.0,
+                        face_area_ratio=0.0,
+                        rejection_reasons=["invalid_face_crop"],
+                    )
+                )
+                continue
 
-        gray_crop = cv2.cvtColor(face_crop, cv2.COLOR_RGB2GRAY)
-        blur_score = float(cv2.Laplacian(gray_crop, cv2.CV_64F).var())
-        brightness_score = float(gray_crop.mean())
-        face_area_ratio = float((w * h) / max(image_width * image_height, 1))
-        pose_metrics = self._compute_pose_metrics(landmarks)
-        occlusion_metrics = self._compute_occlusion_metrics(gray_crop, box, landmarks)
+            reports.append(
+                self._build_report(
+                    w=w,
+                    h=h,
+                    blur_score=float(cv2.Laplacian(gray_crop, cv2.CV_64F).var()),
+                    brightness_score=float(gray_crop.mean()),
+                    face_area_ratio=float((w * h) / max(image_width * image_height, 1)),
+                    pose_metrics=pose_metrics.get(index),
+                    occlusion_metrics=occlusion_metrics.get(index),
+                )
+            )
+        return reports
+
+    def _gray_crops(self, image: np.ndarray, regions: list[tuple[int, int, int, int]]) -> list[np.ndarray]:
+        if not regions:
+            return []
+        union_x1 = min(region[0] for region in regions)
+        union_y1 = min(region[1] for region in regions)
+        union_x2 = max(region[2] for region in regions)
+        union_y2 = max(region[3] for region in regions)
+        crop_pixels = sum((x2 - x1) * (y2 - y1) for x1, y1, x2, y2 in regions)
+        if len(regions) == 1 or crop_pixels < (union_x2 - union_x1) * (union_y2 - union_y1):
+            # Faces spread over a large frame: converting only the crops touches fewer pixels.
+            return [cv2.cvtColor(image[y1:y2, x1:x2], cv2.COLOR_RGB2GRAY) for x1, y1, x2, y2 in regions]
+
+        gray_region = cv2.cvtColor(image[union_y1:union_y2, union_x1:union_x2], cv2.COLOR_RGB2GRAY)
+        return [
+            gray_region[y1 - union_y1:y2 - union_y1, x1 - union_x1:x2 - union_x1]
+            for x1, y1, x2, y2 in regions
+        ]
+
+    def _build_report(
+        self,
+        *,
+        w: int,
+        h: int,
+        blur_score: float,
+        brightness_score: float,
+        face_area_ratio: float,
+        pose_metrics: dict[str, float] | None,
+        occlusion_metrics: dict[str, float] | None,
+    ) -> FaceQualityReport:
         pose_score = float(pose_metrics["pose_score"]) if pose_metrics else 100.0
         occlusion_score = float(occlusion_metrics["occlusion_score"]) if occlusion_metrics else 100.0
 
@@ -215,86 +281,100 @@ class FaceQualityAssessor:
         )
         return round(score * 100.0, 2)
 
-    def _compute_pose_metrics(
+    def _compute_pose_metrics_batch(
         self,
-        landmarks: list[tuple[float, float]] | None,
-    ) -> dict[str, float] | None:
-        points = self._parse_landmarks(landmarks)
-        if points is None:
-            return None
-
-        left_eye, right_eye, nose, left_mouth, right_mouth = points
+        points: list[np.ndarray | None],
+    ) -> dict[int, dict[str, float]]:
+        indices = [index for index, face_points in enumerate(points) if face_points is not None]
+        if not indices:
+            return {}
+
+        # Landmark geometry in float32 like the points, scores in float64.
+        stacked = np.stack([points[index] for index in indices])
+        left_eye, right_eye, nose = stacked[:, 0], stacked[:, 1], stacked[:, 2]
         eye_delta = right_eye - left_eye
-        eye_distance = max(float(np.linalg.norm(eye_delta)), 1e-6)
-        roll_angle_degrees = abs(float(np.degrees(np.arctan2(eye_delta[1], eye_delta[0]))))
-        left_eye_to_nose = abs(float(nose[0] - left_eye[0]))
-        right_eye_to_nose = abs(float(right_eye[0] - nose[0]))
-        yaw_asymmetry = abs(left_eye_to_nose - right_eye_to_nose) / eye_distance
+        eye_distance = np.maximum(np.linalg.norm(eye_delta, axis=1).astype(np.float64), 1e-6)
+        roll_angle_degrees = np.abs(np.degrees(np.arctan2(eye_delta[:, 1], eye_delta[:, 0])).astype(np.float64))
+        left_eye_to_nose = np.abs((nose[:, 0] - left_eye[:, 0]).astype(np.float64))
+        right_eye_to_nose = np.abs((right_eye[:, 0] - nose[:, 0]).astype(np.float64))
+        yaw_asymmetry = np.abs(left_eye_to_nose - right_eye_to_nose) / eye_distance
 
-        roll_component = min(1.0, roll_angle_degrees / self.MAX_ROLL_REJECT_DEGREES)
-        yaw_component = min(1.0, yaw_asymmetry / self.MAX_YAW_REJECT)
-        pose_score = max(0.0, 100.0 * (1.0 - ((0.45 * roll_component) + (0.55 * yaw_component))))
+        roll_component = np.minimum(1.0, roll_angle_degrees / self.MAX_ROLL_REJECT_DEGREES)
+        yaw_component = np.minimum(1.0, yaw_asymmetry / self.MAX_YAW_REJECT)
+        pose_score = np.maximum(0.0, 100.0 * (1.0 - ((0.45 * roll_component) + (0.55 * yaw_component))))
 
         return {
-            "pose_score": pose_score,
-            "roll_angle_degrees": roll_angle_degrees,
-            "yaw_asymmetry": yaw_asymmetry,
+            index: {
+                "pose_score": float(pose_score[row]),
+                "roll_angle_degrees": float(roll_angle_degrees[row]),
+                "yaw_asymmetry": float(yaw_asymmetry[row]),
+            }
+            for row, index in enumerate(indices)
         }
 
-    def _compute_occlusion_metrics(
+    def _compute_occlusion_metrics_batch(
         self,
-        gray_crop: np.ndarray,
-        box: tuple[int, int, int, int],
-        landmarks: list[tuple[float, float]] | None,
-    ) -> dict[str, float] | None:
-        points = self._parse_landmarks(landmarks)
-        if points is None:
-            return None
-
-        crop_height, crop_width = gray_crop.shape[:2]
-        x, y, _w, _h = (int(value) for value in box)
-        patch_radius = max(4, int(min(crop_height, crop_width) * 0.08))
-        visibility_scores: list[float] = []
-
-        for point in points:
-            rel_x = int(round(float(point[0] - x)))
-            rel_y = int(round(float(point[1] - y)))
-
-            min_margin = min(rel_x, rel_y, (crop_width - 1) - rel_x, (crop_height - 1) - rel_y)
-            if min_margin < patch_radius * 0.5:
-                visibility_scores.append(0.0)
-                continue
-
-            x1 = max(0, rel_x - patch_radius)
-            y1 = max(0, rel_y - patch_radius)
-            x2 = min(crop_width, rel_x + patch_radius + 1)
-            y2 = min(crop_height, rel_y + patch_radius + 1)
-            patch = gray_crop[y1:y2, x1:x2]
-            if patch.size == 0:
-                visibility_scores.append(0.0)
+        gray_by_face: dict[int, np.ndarray],
+        faces: list[tuple[int, ...]],
+        points: list[np.ndarray | None],
+    ) -> dict[int, dict[str, float]]:
+        """
+        Landmark visibility for every face. Patches of the same shape (all interior
+        landmarks of one face, and of equally sized faces) are stacked and scored
+        together; the Laplacian is taken on each patch with reflect-101 borders,
+        like cv2.Laplacian on the patch alone.
+        """
+        visibility: dict[int, np.ndarray] = {}
+        patches_by_shape: dict[tuple[int, int], list[tuple[int, int, np.ndarray]]] = {}
+        for index, gray_crop in gray_by_face.items():
+            face_points = points[index]
+            if face_points is None:
                 continue
 
-            local_contrast = float(np.std(patch))
-            local_sharpness = float(cv2.Laplacian(patch, cv2.CV_64F).var())
-            clipped_ratio = float(np.mean((patch <= 10) | (patch >= 245)))
-
-            contrast_component = min(1.0, local_contrast / 24.0)
-            sharpness_component = min(1.0, local_sharpness / 60.0)
-            exposure_component = max(0.0, 1.0 - clipped_ratio)
-            visibility_scores.append(
-                (0.45 * contrast_component)
-                + (0.35 * sharpness_component)
-                + (0.20 * exposure_component)
+            crop_height, crop_width = gray_crop.shape[:2]
+            x, y = faces[index][0], faces[index][1]
+            patch_radius = max(4, int(min(crop_height, crop_width) * 0.08))
+            visibility[index] = np.zeros(len(face_points), dtype=np.float64)
+            for point_index, point in enumerate(face_points):
+                rel_x = int(round(float(point[0] - x)))
+                rel_y = int(round(float(point[1] - y)))
+                min_margin = min(rel_x, rel_y, (crop_width - 1) - rel_x, (crop_height - 1) - rel_y)
+                if min_margin < patch_radius * 0.5:
+                    continue
+
+                patch = gray_crop[
+                    max(0, rel_y - patch_radius):min(crop_height, rel_y + patch_radius + 1),
+                    max(0, rel_x - patch_radius):min(crop_width, rel_x + patch_radius + 1),
+                ]
+                if patch.size:
+                    patches_by_shape.setdefault(patch.shape, []).append((index, point_index, patch))
+
+        for entries in patches_by_shape.values():
+            stack = np.stack([patch for _index, _point_index, patch in entries])
+            values = stack.astype(np.float64)
+            padded = np.pad(values, ((0, 0), (1, 1), (1, 1)), mode="reflect")
+            laplacian = (
+                padded[:, :-2, 1:-1] + padded[:, 2:, 1:-1] + padded[:, 1:-1, :-2] + padded[:, 1:-1, 2:]
+                - 4.0 * values
             )
+            local_contrast = values.std(axis=(1, 2))
+            local_sharpness = laplacian.var(axis=(1, 2))
+            clipped_ratio = ((stack <= 10) | (stack >= 245)).mean(axis=(1, 2))
+
+            scores = (
+                (0.45 * np.minimum(1.0, local_contrast / 24.0))
+                + (0.35 * np.minimum(1.0, local_sharpness / 60.0))
+                + (0.20 * np.maximum(0.0, 1.0 - clipped_ratio))
+            )
+            for (index, point_index, _patch), score in zip(entries, scores):
+                visibility[index][point_index] = score
 
-        if not visibility_scores:
-            return None
-
-        visible_landmark_ratio = sum(score >= 0.35 for score in visibility_scores) / len(visibility_scores)
-        occlusion_score = float(np.mean(visibility_scores) * 100.0)
         return {
-            "occlusion_score": occlusion_score,
-            "visible_landmark_ratio": visible_landmark_ratio,
+            index: {
+                "occlusion_score": float(np.mean(scores) * 100.0),
+                "visible_landmark_ratio": float(np.count_nonzero(scores >= 0.35) / len(scores)),
+            }
+            for index, scores in visibility.items()
         }
 
     def _parse_landmarks(
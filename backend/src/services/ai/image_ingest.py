@@ -0,0 +1,153 @@
+"""
+Shared decoding for uploaded images.
+
+The header is read first, so oversized uploads are rejected before any pixels
+are decoded. JPEGs much larger than the detector needs are decoded at 1/2,
+1/4 or 1/8 scale by libjpeg itself (IMREAD_REDUCED_COLOR_*). That means the
+full-resolution frame is never materialised. Boxes found on the decoded image
+are mapped back to the original's coordinates with DecodedImage.box_to_original.
+"""
+
+import os
+import struct
+from dataclasses import dataclass
+from typing import Any, Iterable, Tuple
+
+import cv2
+import numpy as np
+
+
+# Largest original image accepted at all (decompression-bomb guard).
+MAX_SOURCE_PIXELS = int(os.getenv("IMAGE_MAX_SOURCE_PIXELS", str(120_000_000)))
+# Largest frame ever decoded; JPEGs are reduced further to fit, other formats are rejected.
+MAX_DECODED_PIXELS = int(os.getenv("IMAGE_MAX_DECODED_PIXELS", str(24_000_000)))
+
+_REDUCED_DECODE_FLAGS = {
+    1: cv2.IMREAD_COLOR,
+    2: cv2.IMREAD_REDUCED_COLOR_2,
+    4: cv2.IMREAD_REDUCED_COLOR_4,
+    8: cv2.IMREAD_REDUCED_COLOR_8,
+}
+_JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class ImageTooLargeError(ValueError):
+    """The upload exceeds the pixel budget; a ValueError so endpoints answer 400."""
+
+
+@dataclass(frozen=True)
+class ImageHeader:
+    format: str
+    width: int
+    height: int
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
+
+@dataclass(frozen=True)
+class DecodedImage:
+    """RGB pixels plus how they relate to the uploaded original."""
+
+    pixels: np.ndarray
+    original_size: Tuple[int, int]
+    scale: float
+
+    def box_to_original(self, box: Iterable[float]) -> Tuple[int, int, int, int]:
+        x, y, w, h = box
+        if self.scale == 1.0:
+            return int(x), int(y), int(w), int(h)
+        factor = 1.0 / self.scale
+        x1, y1 = int(round(x * factor)), int(round(y * factor))
+        return x1, y1, int(round((x + w) * factor)) - x1, int(round((y + h) * factor)) - y1
+
+    def landmarks_to_original(self, landmarks: Any) -> Any:
+        if not landmarks or self.scale == 1.0:
+            return landmarks
+        factor = 1.0 / self.scale
+        return [(float(x) * factor, float(y) * factor) for x, y in landmarks]
+
+
+def read_image_header(image_bytes: bytes) -> ImageHeader | None:
+    """Dimensions from a JPEG SOF or PNG IHDR segment, without decoding; None for other formats."""
+    if image_bytes.startswith(_PNG_SIGNATURE) and len(image_bytes) >= 24 and image_bytes[12:16] == b"IHDR":
+        width, height = struct.unpack(">II", image_bytes[16:24])
+        return ImageHeader("png", width, height)
+
+    if not image_bytes.startswith(b"\xff\xd8"):
+        return None
+    offset = 2
+    while offset + 4 <= len(image_bytes):
+        if image_bytes[offset] != 0xFF:
+            return None
+        marker = image_bytes[offset + 1]
+        if marker == 0xFF:
+            offset += 1
+            continue
+        if marker in (0x01, *range(0xD0, 0xD8)):
+            offset += 2
+            continue
+        (segment_length,) = struct.unpack(">H", image_bytes[offset + 2:offset + 4])
+        if marker in _JPEG_SOF_MARKERS and offset + 9 <= len(image_bytes):
+            height, width = struct.unpack(">HH", image_bytes[offset + 5:offset + 9])
+            return ImageHeader("jpeg", width, height)
+        offset += 2 + segment_length
+    return None
+
+
+def choose_jpeg_reduction(header: ImageHeader, target_max_side: int | None, max_decoded_pixels: int) -> int:
+    """Largest libjpeg reduction that keeps the longer side >= target and the frame within budget."""
+    reduction = 1
+    for candidate in (2, 4, 8):
+        fits_target = target_max_side is not None and max(header.width, header.height) / candidate >= target_max_side
+        over_budget = header.pixels / (reduction * reduction) > max_decoded_pixels
+        if fits_target or over_budget:
+            reduction = candidate
+    return reduction
+
+
+def decode_image(
+    image_bytes: bytes,
+    *,
+    target_max_side: int | None = None,
+    max_source_pixels: int = MAX_SOURCE_PIXELS,
+    max_decoded_pixels: int = MAX_DECODED_PIXELS,
+) -> DecodedImage:
+    """
+    Decode an upload to RGB.
+
+    `target_max_side` is the resolution the consumer actually needs (e.g. the
+    detector's max side): JPEGs at least twice that size are decoded reduced,
+    never below it. None decodes at full resolution within the pixel budget.
+    """
+    header = read_image_header(image_bytes)
+    reduction = 1
+    if header is not None:
+        if header.pixels > max_source_pixels:
+            raise ImageTooLargeError(
+                f"Image is {header.width}x{header.height}; uploads are limited to {max_source_pixels:,} pixels"
+            )
+        if header.format == "jpeg":
+            reduction = choose_jpeg_reduction(header, target_max_side, max_decoded_pixels)
+        if header.pixels / (reduction * reduction) > max_decoded_pixels:
+            raise ImageTooLargeError(
+                f"Image is {header.width}x{header.height}; decoded images are limited to {max_decoded_pixels:,} pixels"
+            )
+
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), _REDUCED_DECODE_FLAGS[reduction])
+    if image is None:
+        raise ValueError("Invalid image data")
+    if header is None and image.shape[0] * image.shape[1] > max_decoded_pixels:
+        raise ImageTooLargeError(f"Decoded images are limited to {max_decoded_pixels:,} pixels")
+
+    # In place: the decoded BGR buffer is not needed again, so skip the second full-frame allocation.
+    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+    decoded_height, decoded_width = image.shape[:2]
+    if header is None:
+        return DecodedImage(image, (decoded_width, decoded_height), 1.0)
+
+    # Measure the scale on the longer sides: EXIF orientation may have swapped width and height.
+    scale = 1.0 if reduction == 1 else max(decoded_width, decoded_height) / max(header.width, header.height)
+    return DecodedImage(image, (header.width, header.height), scale)
@@ -0,0 +1,176 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, TypeVar
+
+import numpy as np
+
+from src.core.logging import logger
+
+
+T = TypeVar("T")
+
+DEFAULT_MAX_WORKERS = 1
+DEFAULT_MAX_QUEUE_DEPTH = 16
+DEFAULT_RETRY_AFTER_SECONDS = 2
+LATENCY_SAMPLE_SIZE = 1024
+
+
+class InferenceQueueFullError(RuntimeError):
+    def __init__(self, max_queue_depth: int, retry_after_seconds: int) -> None:
+        self.max_queue_depth = max_queue_depth
+        self.retry_after_seconds = retry_after_seconds
+        super().__init__(
+            f"Face inference queue is full ({max_queue_depth} requests waiting). Retry shortly."
+        )
+
+
+class _LatencyStats:
+    def __init__(self, sample_size: int = LATENCY_SAMPLE_SIZE) -> None:
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: deque[float] = deque(maxlen=sample_size)
+
+    def record(self, elapsed_ms: float) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.samples.append(elapsed_ms)
+
+    def snapshot(self) -> dict[str, Any]:
+        if not self.count:
+            return {"count": 0, "mean_ms": None, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None}
+
+        samples = np.asarray(self.samples, dtype=np.float64)
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 3),
+            "p50_ms": round(float(np.percentile(samples, 50)), 3),
+            "p95_ms": round(float(np.percentile(samples, 95)), 3),
+            "p99_ms": round(float(np.percentile(samples, 99)), 3),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class InferenceExecutor:
+    """
+    Bounded thread pool for CPU-bound detection/embedding work.
+
+    Running inference here keeps the asyncio event loop free for other requests.
+    At most `max_workers` calls run at once and at most `max_queue_depth` more may
+    wait; beyond that `run()` raises InferenceQueueFullError, which the API maps to
+    HTTP 503 so clients back off instead of piling up behind slow requests.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        max_queue_depth: int = DEFAULT_MAX_QUEUE_DEPTH,
+        retry_after_seconds: int = DEFAULT_RETRY_AFTER_SECONDS,
+        thread_name_prefix: str = "inference",
+    ) -> None:
+        self.max_workers = max(int(max_workers), 1)
+        self.max_queue_depth = max(int(max_queue_depth), 0)
+        self.retry_after_seconds = max(int(retry_after_seconds), 1)
+        self._thread_name_prefix = thread_name_prefix
+        self._executor: ThreadPoolExecutor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._rejected = 0
+        self._wait_stats = _LatencyStats()
+        self._run_stats = _LatencyStats()
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_queue_depth:
+                self._rejected += 1
+                raise InferenceQueueFullError(self.max_queue_depth, self.retry_after_seconds)
+            self._in_flight += 1
+            executor = self._get_executor()
+
+        submitted_at = time.perf_counter()
+
+        def timed_call() -> T:
+            started_at = time.perf_counter()
+            with self._lock:
+                self._running += 1
+                self._wait_stats.record((started_at - submitted_at) * 1000.0)
+            succeeded = False
+            try:
+                result = func(*args, **kwargs)
+                succeeded = True
+                return result
+            finally:
+                elapsed_ms = (time.perf_counter() - started_at) * 1000.0
+                with self._lock:
+                    self._running -= 1
+                    self._run_stats.record(elapsed_ms)
+                    if succeeded:
+                        self._completed += 1
+                    else:
+                        self._failed += 1
+
+        # Release the slot when the work itself finishes (or is cancelled before it
+        # starts), not when the awaiting request goes away.
+        try:
+            future = executor.submit(timed_call)
+        except Exception:
+            self._release_slot(None)
+            raise
+        future.add_done_callback(self._release_slot)
+        return await asyncio.wrap_future(future)
+
+    def _release_slot(self, _future: Any) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    def metrics(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue_depth": self.max_queue_depth,
+                "in_flight": self._in_flight,
+                "running": self._running,
+                "queued": max(self._in_flight - self._running, 0),
+                "completed": self._completed,
+                "failed": self._failed,
+                "rejected": self._rejected,
+                "wait_time": self._wait_stats.snapshot(),
+                "run_time": self._run_stats.snapshot(),
+            }
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor = self._executor
+            self._executor = None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            logger.info(
+                "Starting inference executor with %s workers and queue depth %s.",
+                self.max_workers,
+                self.max_queue_depth,
+            )
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=self._thread_name_prefix,
+            )
+        return self._executor
+
+
+# Torch already parallelises a single forward across cores, so one worker is the
+# default; raise INFERENCE_MAX_WORKERS on hosts with spare cores or a GPU.
+inference_executor = InferenceExecutor(
+    max_workers=int(os.getenv("INFERENCE_MAX_WORKERS", str(DEFAULT_MAX_WORKERS))),
+    max_queue_depth=int(os.getenv("INFERENCE_MAX_QUEUE_DEPTH", str(DEFAULT_MAX_QUEUE_DEPTH))),
+    retry_after_seconds=int(os.getenv("INFERENCE_RETRY_AFTER_SECONDS", str(DEFAULT_RETRY_AFTER_SECONDS))),
+)
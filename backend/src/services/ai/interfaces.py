@@ -19,3 +19,10 @@ class FaceEmbeddingStrategy(ABC):
         Returns a 512-dimensional list of floats.
         """
         pass
+
+    def embed_faces(self, face_images: List[np.ndarray]) -> List[List[float]]:
+        """
+        Generates embeddings for several aligned face images, in input order.
+        Strategies backed by a batched model override this with a single forward pass.
+        """
+        return [self.embed_face(face_image) for face_image in face_images]
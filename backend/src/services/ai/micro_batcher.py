@@ -0,0 +1,202 @@
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Any, List
+
+import numpy as np
+
+from src.core.logging import logger
+from src.services.ai.inference_executor import InferenceExecutor, inference_executor as shared_inference_executor
+from src.services.ai.interfaces import FaceEmbeddingStrategy
+
+
+DEFAULT_MAX_BATCH_SIZE = 32
+DEFAULT_MAX_WAIT_MS = 5.0
+
+
+@dataclass
+class _PendingCrops:
+    face_images: List[np.ndarray]
+    future: asyncio.Future = field(repr=False)
+
+
+class EmbeddingMicroBatcher:
+    """
+    Cross-request micro-batching for face embeddings.
+
+    Concurrent callers hand over their aligned crops; the batcher waits at most
+    `max_wait_ms` (or until `max_batch_size` crops are queued), runs one
+    `embed_faces` forward on the inference executor and scatters the embeddings
+    back to each caller in order. Under load this trades a few milliseconds of
+    latency for far fewer, larger forward passes on CPU-only nodes.
+    """
+
+    def __init__(
+        self,
+        embedder: FaceEmbeddingStrategy,
+        *,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        max_wait_ms: float = DEFAULT_MAX_WAIT_MS,
+        inference_executor: InferenceExecutor | None = None,
+    ) -> None:
+        self.embedder = embedder
+        self.max_batch_size = max(int(max_batch_size), 1)
+        self.max_wait_ms = max(float(max_wait_ms), 0.0)
+        self.inference_executor = inference_executor or shared_inference_executor
+        self._queue: asyncio.Queue[_PendingCrops] | None = None
+        self._worker: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._batch_count = 0
+        self._crop_count = 0
+        self._request_count = 0
+        self._largest_batch = 0
+
+    async def embed(self, face_images: List[np.ndarray]) -> List[List[float] | None]:
+        """
+        Returns one embedding per crop, or None where that crop could not be embedded,
+        matching FaceProcessingPipeline.embed_face_regions.
+        """
+        if not face_images:
+            return []
+
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await queue.put(_PendingCrops(face_images=list(face_images), future=future))
+        return await future
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "embedding_version": getattr(self.embedder, "embedding_version", None),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "batches": self._batch_count,
+            "requests": self._request_count,
+            "crops": self._crop_count,
+            "mean_batch_size": round(self._crop_count / self._batch_count, 3) if self._batch_count else None,
+            "largest_batch": self._largest_batch,
+            "queued_requests": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def close(self) -> None:
+        worker = self._worker
+        self._worker = None
+        self._queue = None
+        self._loop = None
+        if worker is not None and not worker.done():
+            worker.cancel()
+            try:
+                await worker
+            except asyncio.CancelledError:
+                pass
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    async def _run(self) -> None:
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        while True:
+            pending = [await queue.get()]
+            crop_count = len(pending[0].face_images)
+            deadline = loop.time() + (self.max_wait_ms / 1000.0)
+
+            while crop_count < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0 and queue.empty():
+                    break
+                try:
+                    if remaining > 0:
+                        item = await asyncio.wait_for(queue.get(), timeout=remaining)
+                    else:
+                        item = queue.get_nowait()
+                except (asyncio.TimeoutError, asyncio.QueueEmpty):
+                    break
+                pending.append(item)
+                crop_count += len(item.face_images)
+
+            await self._flush(pending)
+
+    async def _flush(self, pending: List[_PendingCrops]) -> None:
+        pending = [item for item in pending if not item.future.done()]
+        if not pending:
+            return
+
+        face_images = [face_image for item in pending for face_image in item.face_images]
+        self._batch_count += 1
+        self._request_count += len(pending)
+        self._crop_count += len(face_images)
+        self._largest_batch = max(self._largest_batch, len(face_images))
+
+        try:
+            embeddings = await self.inference_executor.run(self._embed_batch, face_images)
+        except Exception as exc:
+            for item in pending:
+                if not item.future.done():
+                    item.future.set_exception(exc)
+            return
+
+        offset = 0
+        for item in pending:
+            item_embeddings = embeddings[offset:offset + len(item.face_images)]
+            offset += len(item.face_images)
+            if not item.future.done():
+                item.future.set_result(item_embeddings)
+
+    def _embed_batch(self, face_images: List[np.ndarray]) -> List[List[float] | None]:
+        embed_faces = getattr(self.embedder, "embed_faces", None)
+        embeddings: List[List[float] | None] = []
+        for start in range(0, len(face_images), self.max_batch_size):
+            chunk = face_images[start:start + self.max_batch_size]
+            if callable(embed_faces):
+                try:
+                    embeddings.extend(embed_faces(chunk))
+                    continue
+                except Exception as e:
+                    logger.warning(f"Micro-batched embedding of {len(chunk)} faces failed, retrying per face: {e}")
+
+            for face_image in chunk:
+                try:
+                    embeddings.append(self.embedder.embed_face(face_image))
+                except Exception as e:
+                    logger.error(f"Failed to embed face in micro-batch: {e}")
+                    embeddings.append(None)
+
+        return embeddings
+
+
+MICRO_BATCH_ENABLED = os.getenv("EMBEDDING_MICRO_BATCH_ENABLED", "true").strip().lower() in {"1", "true", "yes"}
+MICRO_BATCH_MAX_SIZE = int(os.getenv("EMBEDDING_MICRO_BATCH_MAX_SIZE", str(DEFAULT_MAX_BATCH_SIZE)))
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("EMBEDDING_MICRO_BATCH_MAX_WAIT_MS", str(DEFAULT_MAX_WAIT_MS)))
+_batcher_cache: dict[int, EmbeddingMicroBatcher] = {}
+
+
+def get_embedding_micro_batcher(embedder: FaceEmbeddingStrategy | None) -> EmbeddingMicroBatcher | None:
+    """Shared batcher per embedder, or None when micro-batching is disabled."""
+    if not MICRO_BATCH_ENABLED or embedder is None:
+        return None
+
+    cached_batcher = _batcher_cache.get(id(embedder))
+    if cached_batcher is not None and cached_batcher.embedder is embedder:
+        return cached_batcher
+
+    batcher = EmbeddingMicroBatcher(
+        embedder,
+        max_batch_size=MICRO_BATCH_MAX_SIZE,
+        max_wait_ms=MICRO_BATCH_MAX_WAIT_MS,
+    )
+    _batcher_cache[id(embedder)] = batcher
+    return batcher
+
+
+def list_embedding_micro_batchers() -> list[EmbeddingMicroBatcher]:
+    return list(_batcher_cache.values())
+
+
+async def close_embedding_micro_batchers() -> None:
+    for batcher in list(_batcher_cache.values()):
+        await batcher.close()
@@ -0,0 +1,129 @@
+"""
+Embedding model versions and their metadata.
+
+Kept free of torch/model imports so API modules, services and scripts can resolve
+versions without paying for the model stack; strategies.py builds the models.
+"""
+
+from pathlib import Path
+from typing import Any
+
+
+# Default path to the trained TraceNet checkpoint
+_MODELS_DIR = Path(__file__).resolve().parents[3] / "models"
+DEFAULT_TRACENET_PATH = _MODELS_DIR / "TraceNet_deployment.pth"
+DEFAULT_TRACENET_ONNX_PATH = _MODELS_DIR / "TraceNet_deployment.onnx"
+DEFAULT_FACENET_ONNX_PATH = _MODELS_DIR / "InceptionResnetV1_vggface2.onnx"
+DEFAULT_TRACENET_INT8_PATH = _MODELS_DIR / "TraceNet_deployment_int8.onnx"
+DEFAULT_EMBEDDING_VERSION = "tracenet_v1"
+FACENET_EMBEDDING_VERSION = "facenet_vggface2"
+TRACENET_ONNX_EMBEDDING_VERSION = "tracenet_v1_onnx"
+FACENET_ONNX_EMBEDDING_VERSION = "facenet_vggface2_onnx"
+TRACENET_INT8_EMBEDDING_VERSION = "tracenet_v1_int8"
+
+MODEL_VERSION_REGISTRY: dict[str, dict[str, Any]] = {
+    DEFAULT_EMBEDDING_VERSION: {
+        "display_name": "TraceNet v1",
+        "family": "tracenet",
+        "embedding_dimensions": 512,
+        "default_template_version": "tracenet_template_v1",
+        "notes": "Custom TraceNet deployment checkpoint.",
+    },
+    FACENET_EMBEDDING_VERSION: {
+        "display_name": "FaceNet VGGFace2",
+        "family": "facenet",
+        "embedding_dimensions": 512,
+        "default_template_version": "facenet_template_v1",
+        "notes": "facenet-pytorch InceptionResnetV1 VGGFace2 baseline.",
+    },
+    # ONNX Runtime backends reproduce their PyTorch model's embeddings, so stored
+    # faces and templates keep the embedding_space version.
+    TRACENET_ONNX_EMBEDDING_VERSION: {
+        "display_name": "TraceNet v1 (ONNX Runtime)",
+        "family": "tracenet",
+        "embedding_dimensions": 512,
+        "default_template_version": "tracenet_template_v1",
+        "runtime": "onnxruntime",
+        "embedding_space": DEFAULT_EMBEDDING_VERSION,
+        "model_path": str(DEFAULT_TRACENET_ONNX_PATH),
+        "notes": "TraceNet exported with scripts/export_onnx_models.py, run on the ONNX Runtime CPU provider.",
+    },
+    FACENET_ONNX_EMBEDDING_VERSION: {
+        "display_name": "FaceNet VGGFace2 (ONNX Runtime)",
+        "family": "facenet",
+        "embedding_dimensions": 512,
+        "default_template_version": "facenet_template_v1",
+        "runtime": "onnxruntime",
+        "embedding_space": FACENET_EMBEDDING_VERSION,
+        "model_path": str(DEFAULT_FACENET_ONNX_PATH),
+        "notes": "InceptionResnetV1 exported with scripts/export_onnx_models.py, run on the ONNX Runtime CPU provider.",
+    },
+    # INT8 embeddings drift slightly from fp32, so they are versioned on their own and
+    # only ship when compare_models.py shows TAR@FAR within tolerance of reference_version.
+    TRACENET_INT8_EMBEDDING_VERSION: {
+        "display_name": "TraceNet v1 INT8 (ONNX Runtime)",
+        "family": "tracenet",
+        "embedding_dimensions": 512,
+        "default_template_version": "tracenet_int8_template_v1",
+        "runtime": "onnxruntime",
+        "quantization": "int8_static",
+        "reference_version": DEFAULT_EMBEDDING_VERSION,
+        "model_path": str(DEFAULT_TRACENET_INT8_PATH),
+        "notes": "Static INT8 TraceNet calibrated on testfeaces with scripts/quantize_tracenet.py.",
+    },
+}
+
+
+def normalize_embedding_version(embedding_version: str | None) -> str:
+    if not embedding_version:
+        return DEFAULT_EMBEDDING_VERSION
+
+    normalized = embedding_version.strip().lower()
+    aliases = {
+        "tracenet": DEFAULT_EMBEDDING_VERSION,
+        "tracenet_v1": DEFAULT_EMBEDDING_VERSION,
+        "facenet": FACENET_EMBEDDING_VERSION,
+        "facenet_vggface2": FACENET_EMBEDDING_VERSION,
+        "inceptionresnet_vggface2": FACENET_EMBEDDING_VERSION,
+        "tracenet_onnx": TRACENET_ONNX_EMBEDDING_VERSION,
+        "tracenet_v1_onnx": TRACENET_ONNX_EMBEDDING_VERSION,
+        "facenet_onnx": FACENET_ONNX_EMBEDDING_VERSION,
+        "facenet_vggface2_onnx": FACENET_ONNX_EMBEDDING_VERSION,
+        "tracenet_int8": TRACENET_INT8_EMBEDDING_VERSION,
+        "tracenet_v1_int8": TRACENET_INT8_EMBEDDING_VERSION,
+    }
+    return aliases.get(normalized, normalized)
+
+
+def resolve_embedding_space(embedding_version: str | None) -> str:
+    """Version stored with vectors from this backend (ONNX backends share their PyTorch model's space)."""
+    normalized = normalize_embedding_version(embedding_version)
+    return normalize_embedding_version(MODEL_VERSION_REGISTRY.get(normalized, {}).get("embedding_space", normalized))
+
+
+def get_model_version_metadata(embedding_version: str) -> dict[str, Any]:
+    normalized = normalize_embedding_version(embedding_version)
+    if normalized in MODEL_VERSION_REGISTRY:
+        return {
+            "version": normalized,
+            **MODEL_VERSION_REGISTRY[normalized],
+        }
+
+    return {
+        "version": normalized,
+        "display_name": normalized,
+        "family": "custom",
+        "embedding_dimensions": 512,
+        "default_template_version": f"{normalized}_template_v1",
+        "notes": "Custom checkpoint or external embedding model.",
+    }
+
+
+def list_supported_model_versions() -> list[dict[str, Any]]:
+    return [
+        {
+            "version": version,
+            **metadata,
+        }
+        for version, metadata in MODEL_VERSION_REGISTRY.items()
+    ]
@@ -0,0 +1,107 @@
+"""
+Export of the face embedding models to ONNX for the ONNX Runtime backend.
+
+The exported graph takes a float32 NCHW batch that has already been preprocessed
+exactly as the PyTorch strategies do it, and returns L2-normalized embeddings.
+The batch dimension is dynamic so one graph serves every micro-batch size.
+"""
+
+import inspect
+from pathlib import Path
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+from src.services.ai.tracenet_model import TraceNet
+
+
+ONNX_INPUT_NAME = "faces"
+ONNX_OUTPUT_NAME = "embeddings"
+DEFAULT_OPSET_VERSION = 17
+TRACENET_INPUT_SIZE = 112
+FACENET_INPUT_SIZE = 160
+
+
+class L2NormalizedEmbedding(nn.Module):
+    """Folds the strategies' F.normalize step into the exported graph."""
+
+    def __init__(self, model: nn.Module) -> None:
+        super().__init__()
+        self.model = model
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        return F.normalize(self.model(x), p=2, dim=1)
+
+
+def load_tracenet_checkpoint(checkpoint_path: str | Path) -> TraceNet:
+    model = TraceNet(embedding_size=512)
+    checkpoint = torch.load(str(checkpoint_path), map_location="cpu", weights_only=True)
+    if isinstance(checkpoint, dict) and "model_state_dict" in checkpoint:
+        model.load_state_dict(checkpoint["model_state_dict"])
+    else:
+        model.load_state_dict(checkpoint)
+    return model.eval()
+
+
+def export_embedding_model(
+    model: nn.Module,
+    output_path: str | Path,
+    *,
+    input_size: int,
+    opset_version: int = DEFAULT_OPSET_VERSION,
+) -> Path:
+    resolved_output = Path(output_path)
+    resolved_output.parent.mkdir(parents=True, exist_ok=True)
+
+    wrapped = L2NormalizedEmbedding(model.eval().cpu()).eval()
+    # BatchNorm1d in TraceNet rejects a batch of one while tracing, so trace with two.
+    sample = torch.zeros(2, 3, input_size, input_size, dtype=torch.float32)
+    export_kwargs = {}
+    if "dynamo" in inspect.signature(torch.onnx.export).parameters:
+        # The TorchScript exporter handles dynamic_axes for these plain CNNs directly.
+        export_kwargs["dynamo"] = False
+
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapped,
+            (sample,),
+            str(resolved_output),
+            input_names=[ONNX_INPUT_NAME],
+            output_names=[ONNX_OUTPUT_NAME],
+            dynamic_axes={ONNX_INPUT_NAME: {0: "batch"}, ONNX_OUTPUT_NAME: {0: "batch"}},
+            opset_version=opset_version,
+            do_constant_folding=True,
+            **export_kwargs,
+        )
+    return resolved_output
+
+
+def export_tracenet_to_onnx(
+    checkpoint_path: str | Path,
+    output_path: str | Path,
+    *,
+    opset_version: int = DEFAULT_OPSET_VERSION,
+) -> Path:
+    return export_embedding_model(
+        load_tracenet_checkpoint(checkpoint_path),
+        output_path,
+        input_size=TRACENET_INPUT_SIZE,
+        opset_version=opset_version,
+    )
+
+
+def export_inception_resnet_to_onnx(
+    output_path: str | Path,
+    *,
+    pretrained: str | None = "vggface2",
+    opset_version: int = DEFAULT_OPSET_VERSION,
+) -> Path:
+    from facenet_pytorch import InceptionResnetV1
+
+    return export_embedding_model(
+        InceptionResnetV1(pretrained=pretrained),
+        output_path,
+        input_size=FACENET_INPUT_SIZE,
+        opset_version=opset_version,
+    )
@@ -1,51 +1,229 @@
+import time
+
+import cv2
 import numpy as np
 from typing import List, Dict, Any, Tuple
 
+from src.services.ai.analysis_cache import FaceAnalysisCache, build_cache_key
 from src.services.ai.face_alignment import align_face_to_template
 from src.services.ai.interfaces import FaceDetectionStrategy, FaceEmbeddingStrategy
+from src.services.ai.model_registry import normalize_embedding_version
 from src.core.logging import logger
 
+DEFAULT_MAX_EMBEDDING_BATCH_SIZE = 16
+DEFAULT_TILE_SIZE = 640
+DEFAULT_TILE_OVERLAP = 128
+DEFAULT_TILE_BATCH_SIZE = 4
+# Tiles flatter than this (grayscale std) are sky, walls or floor and are not searched.
+TILE_MIN_CONTENT_STD = 8.0
+# Detections overlapping by more than this share of the smaller box are one face seen twice.
+TILE_MERGE_OVERLAP = 0.5
+
+
 class FaceProcessingPipeline:
     def __init__(
         self, 
         detector: FaceDetectionStrategy, 
-        embedder: FaceEmbeddingStrategy
+        embedder: FaceEmbeddingStrategy,
+        max_batch_size: int = DEFAULT_MAX_EMBEDDING_BATCH_SIZE,
+        detection_max_side: int | None = None,
+        tile_size: int = DEFAULT_TILE_SIZE,
+        tile_overlap: int = DEFAULT_TILE_OVERLAP,
+        tile_scale: float = 1.0,
+        tile_batch_size: int = DEFAULT_TILE_BATCH_SIZE,
+        analysis_cache: FaceAnalysisCache | None = None,
     ):
         self.detector = detector
         self.embedder = embedder
+        self.max_batch_size = max(int(max_batch_size), 1)
+        # Detection runs on a copy whose longer side is at most this; crops still come from full resolution.
+        self.detection_max_side = int(detection_max_side) if detection_max_side else None
+        # Tiled scene detection: full-resolution (or upsampled, tile_scale > 1) tiles catch faces
+        # too small for the coarse pass; the overlap should exceed the largest face tiles must find.
+        self.tile_size = max(int(tile_size), 64)
+        self.tile_overlap = min(max(int(tile_overlap), 0), self.tile_size // 2)
+        self.tile_scale = max(float(tile_scale), 1.0)
+        self.tile_batch_size = max(int(tile_batch_size), 1)
+        # Consulted only for calls that pass the upload's `image_digest`.
+        self.analysis_cache = analysis_cache
 
-    def process_image(self, image: np.ndarray) -> List[Dict[str, Any]]:
+    def process_image(
+        self,
+        image: np.ndarray,
+        *,
+        tiled: bool = False,
+        timings: Dict[str, Any] | None = None,
+        image_digest: str | None = None,
+    ) -> List[Dict[str, Any]]:
         """
         Full pipeline: Detect -> Crop -> Embed.
         Returns a list of dicts: {'box': (x,y,w,h), 'embedding': [...]}
+
+        With `image_digest` (sha256 of the upload) and an analysis cache, a repeat
+        of the same image skips detection and embedding entirely.
         """
+        cached_faces = self.load_cached_faces(image, image_digest=image_digest, tiled=tiled, timings=timings)
+        if cached_faces is not None:
+            return cached_faces
+
         logger.info("Starting Face Processing Pipeline...")
-        face_regions = self.extract_face_regions(image)
+        face_regions = self.extract_face_regions(image, tiled=tiled, timings=timings, image_digest=image_digest)
         logger.info(f"Detected {len(face_regions)} usable faces.")
 
+        embeddings = self.embed_face_regions(face_regions)
+        results = self.assemble_results(face_regions, embeddings)
+        self.cache_faces(image, results, image_digest=image_digest, tiled=tiled)
+        return results
+
+    def load_cached_faces(
+        self,
+        image: np.ndarray,
+        *,
+        image_digest: str | None,
+        tiled: bool = False,
+        timings: Dict[str, Any] | None = None,
+    ) -> List[Dict[str, Any]] | None:
+        """Embedded faces previously computed for this upload, or None."""
+        cache_key = self._faces_cache_key(image, image_digest, tiled)
+        if cache_key is None:
+            return None
+        cached_faces = self.analysis_cache.get(cache_key)
+        if cached_faces is not None and timings is not None:
+            timings["analysis_cache"] = "faces_hit"
+        return cached_faces
+
+    def cache_faces(
+        self,
+        image: np.ndarray,
+        results: List[Dict[str, Any]],
+        *,
+        image_digest: str | None,
+        tiled: bool = False,
+    ) -> None:
+        cache_key = self._faces_cache_key(image, image_digest, tiled)
+        if cache_key is not None:
+            self.analysis_cache.put(cache_key, results)
+
+    @property
+    def embedding_version(self) -> str:
+        """Embedding space of this pipeline's vectors; searches only compare within it."""
+        raw_version = getattr(self.embedder, "embedding_version", None)
+        return normalize_embedding_version(raw_version if isinstance(raw_version, str) else None)
+
+    def detector_signature(self) -> Tuple[Any, ...]:
+        """Everything besides the pixels that changes which faces are found."""
+        return (
+            type(self.detector).__name__,
+            self.detection_max_side,
+            self.tile_size,
+            self.tile_overlap,
+            self.tile_scale,
+        )
+
+    def embedder_signature(self) -> Tuple[Any, ...]:
+        return (
+            type(self.embedder).__name__,
+            getattr(self.embedder, "backend_version", None),
+            getattr(self.embedder, "embedding_version", None),
+            str(getattr(self.embedder, "model_path", None)),
+        )
+
+    def _detections_cache_key(self, image: np.ndarray, image_digest: str | None, tiled: bool) -> str | None:
+        if self.analysis_cache is None or not image_digest:
+            return None
+        return build_cache_key(image_digest, "detections", image.shape, tiled, self.detector_signature())
+
+    def _faces_cache_key(self, image: np.ndarray, image_digest: str | None, tiled: bool) -> str | None:
+        if self.analysis_cache is None or not image_digest:
+            return None
+        return build_cache_key(
+            image_digest,
+            "faces",
+            image.shape,
+            tiled,
+            self.detector_signature(),
+            self.embedder_signature(),
+        )
+
+    def assemble_results(
+        self,
+        face_regions: List[Dict[str, Any]],
+        embeddings: List[List[float] | None],
+    ) -> List[Dict[str, Any]]:
+        """Pair extracted regions with their embeddings, dropping faces that failed to embed."""
         results = []
-        for face_region in face_regions:
-            try:
-                embedding = self.embedder.embed_face(face_region["crop"])
-                results.append({
-                    "box": face_region["box"],
-                    "embedding": embedding,
-                    "landmarks": face_region.get("landmarks"),
-                    "alignment_applied": bool(face_region.get("alignment_applied")),
-                })
-            except Exception as e:
-                x, y, _w, _h = face_region["box"]
-                logger.error(f"Failed to embed face at {x},{y}: {e}")
+        for face_region, embedding in zip(face_regions, embeddings):
+            if embedding is None:
+                continue
+            results.append({
+                "box": face_region["box"],
+                "embedding": embedding,
+                "landmarks": face_region.get("landmarks"),
+                "alignment_applied": bool(face_region.get("alignment_applied")),
+            })
 
         return results
 
-    def extract_face_regions(self, image: np.ndarray) -> List[Dict[str, Any]]:
+    def embed_face_regions(self, face_regions: List[Dict[str, Any]]) -> List[List[float] | None]:
+        """
+        Embed face crops in batches of at most `max_batch_size`.
+        Returns one embedding per region, or None where that face could not be embedded.
+        """
+        embed_faces = getattr(self.embedder, "embed_faces", None)
+        embeddings: List[List[float] | None] = []
+        for start in range(0, len(face_regions), self.max_batch_size):
+            chunk = face_regions[start:start + self.max_batch_size]
+            if callable(embed_faces) and len(chunk) > 1:
+                try:
+                    embeddings.extend(embed_faces([face_region["crop"] for face_region in chunk]))
+                    continue
+                except Exception as e:
+                    logger.warning(f"Batched embedding of {len(chunk)} faces failed, retrying per face: {e}")
+
+            embeddings.extend(self._embed_single_face(face_region) for face_region in chunk)
+
+        return embeddings
+
+    def _embed_single_face(self, face_region: Dict[str, Any]) -> List[float] | None:
+        try:
+            return self.embedder.embed_face(face_region["crop"])
+        except Exception as e:
+            x, y, _w, _h = face_region["box"]
+            logger.error(f"Failed to embed face at {x},{y}: {e}")
+            return None
+
+    def extract_face_regions(
+        self,
+        image: np.ndarray,
+        *,
+        tiled: bool = False,
+        timings: Dict[str, Any] | None = None,
+        image_digest: str | None = None,
+    ) -> List[Dict[str, Any]]:
         """
         Detect faces and return usable cropped regions before embedding.
         Returns a list of dicts: {'box': (x,y,w,h), 'crop': np.ndarray}
+
+        `tiled` adds the tiled scene pass (see detect_scene_detections); when
+        `timings` is given it is filled with per-stage detection timings.
+        Detections are cached by `image_digest`; crops are always cut from `image`.
         """
         logger.info("Extracting face regions from image...")
-        detections = self._detect_face_detections(image)
+        cache_key = self._detections_cache_key(image, image_digest, tiled)
+        detections = self.analysis_cache.get(cache_key) if cache_key is not None else None
+        if detections is not None:
+            if timings is not None:
+                timings["analysis_cache"] = "detections_hit"
+        else:
+            if tiled:
+                detections = self.detect_scene_detections(image, timings=timings)
+            else:
+                started = time.perf_counter()
+                detections = self.detect_face_detections(image)
+                if timings is not None:
+                    timings["detect_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+            if cache_key is not None:
+                self.analysis_cache.put(cache_key, detections)
         logger.info(f"Detector found {len(detections)} raw faces.")
 
         results: List[Dict[str, Any]] = []
@@ -81,7 +259,109 @@ class FaceProcessingPipeline:
 
         return results
 
-    def _detect_face_detections(self, image: np.ndarray) -> List[Dict[str, Any]]:
+    def detect_face_detections(self, image: np.ndarray) -> List[Dict[str, Any]]:
+        """Detect faces, downscaling large images first; boxes and landmarks are in `image` coordinates."""
+        h_img, w_img = image.shape[:2]
+        longest_side = max(h_img, w_img)
+        if not self.detection_max_side or longest_side <= self.detection_max_side:
+            return self._run_detector(image)
+
+        scale = self.detection_max_side / longest_side
+        detection_image = cv2.resize(
+            image,
+            (max(int(round(w_img * scale)), 1), max(int(round(h_img * scale)), 1)),
+            interpolation=cv2.INTER_AREA,
+        )
+        return [
+            rescale_detection(detection, 1.0 / scale)
+            for detection in self._run_detector(detection_image)
+        ]
+
+    def detect_scene_detections(
+        self,
+        image: np.ndarray,
+        *,
+        timings: Dict[str, Any] | None = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Detection for crowd and CCTV frames.
+
+        A coarse pass (detect_face_detections, downscaled to detection_max_side) finds
+        the larger faces. Overlapping tiles at full resolution, or upsampled by
+        tile_scale, then find faces the coarse pass is too low-res for. Flat tiles
+        are skipped, tiles are detected in batches, and duplicates across tile
+        borders and passes are merged with NMS.
+        """
+        stage_timings: Dict[str, Any] = {}
+        started = time.perf_counter()
+        detections = self.detect_face_detections(image)
+        stage_timings["coarse_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+        stage_timings["coarse_faces"] = len(detections)
+
+        h_img, w_img = image.shape[:2]
+        coarse_downscaled = bool(self.detection_max_side) and max(h_img, w_img) > self.detection_max_side
+        if coarse_downscaled or self.tile_scale > 1.0:
+            started = time.perf_counter()
+            tile_origins = [
+                (x, y)
+                for y in _tile_starts(h_img, self.tile_size, self.tile_overlap)
+                for x in _tile_starts(w_img, self.tile_size, self.tile_overlap)
+            ]
+            tile_h, tile_w = min(self.tile_size, h_img), min(self.tile_size, w_img)
+            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+            searched_origins = [
+                (x, y) for x, y in tile_origins
+                if float(gray[y:y + tile_h, x:x + tile_w].std()) >= TILE_MIN_CONTENT_STD
+            ]
+            stage_timings["tile_select_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+            stage_timings["tiles_total"] = len(tile_origins)
+            stage_timings["tiles_searched"] = len(searched_origins)
+
+            started = time.perf_counter()
+            detections = detections + self._detect_tiles(image, searched_origins, tile_w, tile_h)
+            stage_timings["tiles_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+
+            started = time.perf_counter()
+            detections = merge_detections(detections)
+            stage_timings["merge_ms"] = round((time.perf_counter() - started) * 1000.0, 3)
+
+        stage_timings["faces"] = len(detections)
+        if timings is not None:
+            timings.update(stage_timings)
+        return detections
+
+    def _detect_tiles(
+        self,
+        image: np.ndarray,
+        origins: List[Tuple[int, int]],
+        tile_w: int,
+        tile_h: int,
+    ) -> List[Dict[str, Any]]:
+        detect_batch = getattr(self.detector, "detect_faces_with_landmarks_batch", None)
+        scaled_size = (int(round(tile_w * self.tile_scale)), int(round(tile_h * self.tile_scale)))
+        detections: List[Dict[str, Any]] = []
+        for start in range(0, len(origins), self.tile_batch_size):
+            chunk = origins[start:start + self.tile_batch_size]
+            tiles = []
+            for x, y in chunk:
+                tile = image[y:y + tile_h, x:x + tile_w]
+                if self.tile_scale > 1.0:
+                    tile = cv2.resize(tile, scaled_size, interpolation=cv2.INTER_LINEAR)
+                tiles.append(tile)
+
+            if callable(detect_batch):
+                tile_detections = detect_batch(tiles)
+            else:
+                tile_detections = [self._run_detector(tile) for tile in tiles]
+
+            for (x, y), found in zip(chunk, tile_detections):
+                detections.extend(
+                    rescale_detection(detection, 1.0 / self.tile_scale, offset=(x, y))
+                    for detection in found
+                )
+        return detections
+
+    def _run_detector(self, image: np.ndarray) -> List[Dict[str, Any]]:
         detector_with_landmarks = getattr(self.detector, "detect_faces_with_landmarks", None)
         if callable(detector_with_landmarks):
             return detector_with_landmarks(image)
@@ -93,3 +373,66 @@ class FaceProcessingPipeline:
             }
             for box in self.detector.detect_faces(image)
         ]
+
+
+def rescale_detection(
+    detection: Dict[str, Any],
+    factor: float,
+    offset: Tuple[float, float] = (0.0, 0.0),
+) -> Dict[str, Any]:
+    """Map a detection found on a resized (and/or cropped at `offset`) image back to the original image."""
+    offset_x, offset_y = offset
+    x, y, w, h = detection["box"]
+    x1, y1 = int(round(x * factor + offset_x)), int(round(y * factor + offset_y))
+    x2, y2 = int(round((x + w) * factor + offset_x)), int(round((y + h) * factor + offset_y))
+    landmarks = detection.get("landmarks")
+    return {
+        **detection,
+        "box": (x1, y1, x2 - x1, y2 - y1),
+        "landmarks": [
+            (float(point_x) * factor + offset_x, float(point_y) * factor + offset_y)
+            for point_x, point_y in landmarks
+        ] if landmarks else landmarks,
+    }
+
+
+def merge_detections(
+    detections: List[Dict[str, Any]],
+    overlap_threshold: float = TILE_MERGE_OVERLAP,
+) -> List[Dict[str, Any]]:
+    """
+    Greedy NMS on intersection over the smaller box, so a face cut by a tile border
+    is dropped in favour of the complete, more confident detection of it.
+    """
+    ordered = sorted(
+        detections,
+        key=lambda detection: (
+            detection.get("confidence") or 0.0,
+            detection["box"][2] * detection["box"][3],
+        ),
+        reverse=True,
+    )
+    kept: List[Dict[str, Any]] = []
+    for detection in ordered:
+        if all(_overlap_of_smaller(detection["box"], other["box"]) <= overlap_threshold for other in kept):
+            kept.append(detection)
+    return kept
+
+
+def _overlap_of_smaller(first: Tuple[int, int, int, int], second: Tuple[int, int, int, int]) -> float:
+    ax, ay, aw, ah = first
+    bx, by, bw, bh = second
+    overlap_w = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    overlap_h = max(0, min(ay + ah, by + bh) - max(ay, by))
+    smaller_area = min(aw * ah, bw * bh)
+    return (overlap_w * overlap_h) / smaller_area if smaller_area > 0 else 0.0
+
+
+def _tile_starts(length: int, tile_size: int, overlap: int) -> List[int]:
+    """Tile origins covering [0, length); the last tile sits flush with the edge so every tile is full size."""
+    if length <= tile_size:
+        return [0]
+    stride = tile_size - overlap
+    starts = list(range(0, length - tile_size, stride))
+    starts.append(length - tile_size)
+    return starts
@@ -0,0 +1,92 @@
+"""
+Batched embedder preprocessing on uint8 RGB crops, without PIL round-trips.
+
+Crops of the same shape are stacked once, resized in one uint8 `F.interpolate`
+call only when they are not already at the model's input size, and written
+straight into a preallocated float32 batch that is normalised in place.
+Antialiased uint8 interpolation reproduces the PIL resize the models were
+trained and enrolled with.
+"""
+
+import threading
+from typing import List
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+
+
+TRACENET_INPUT_SIZE = 112
+FACENET_INPUT_SIZE = 160
+
+
+class FaceBatchPreprocessor:
+    """
+    Turns a list of HxWx3 uint8 RGB crops into an (N, 3, S, S) float32 model input.
+
+    Args:
+        input_size: Square model input size S.
+        resize_mode: Interpolation for crops that are not SxS ("bilinear" or "bicubic").
+        normalization: "tracenet" maps [0, 255] to [-1, 1]; "facenet" whitens each image.
+
+    The returned tensor is a view of a per-thread buffer that the next call on the
+    same thread overwrites, so consume it (forward pass / session run) before then.
+    """
+
+    def __init__(self, input_size: int, *, resize_mode: str, normalization: str) -> None:
+        if normalization not in ("tracenet", "facenet"):
+            raise ValueError(f"Unsupported normalization '{normalization}'.")
+        self.input_size = int(input_size)
+        self.resize_mode = resize_mode
+        self.normalization = normalization
+        self._local = threading.local()
+
+    def __call__(self, face_images: List[np.ndarray]) -> torch.Tensor:
+        batch = self._buffer(len(face_images))
+        if not face_images:
+            return batch
+        size = (self.input_size, self.input_size)
+        indices_by_shape: dict[tuple[int, ...], List[int]] = {}
+        for index, face_image in enumerate(face_images):
+            indices_by_shape.setdefault(face_image.shape, []).append(index)
+
+        for shape, indices in indices_by_shape.items():
+            faces = torch.from_numpy(np.stack([face_images[index] for index in indices])).permute(0, 3, 1, 2)
+            if tuple(shape[:2]) != size:
+                # uint8 antialiased interpolation reproduces PIL's resize to within one level.
+                faces = F.interpolate(
+                    faces,
+                    size=size,
+                    mode=self.resize_mode,
+                    align_corners=False,
+                    antialias=True,
+                )
+            if len(indices) == len(face_images):
+                batch.copy_(faces)
+            else:
+                batch[indices] = faces.float()
+
+        if self.normalization == "tracenet":
+            # ToTensor + Normalize(0.5, 0.5) fused: x / 255 * 2 - 1.
+            batch.mul_(2.0 / 255.0).sub_(1.0)
+        else:
+            std, mean = torch.std_mean(batch.view(len(face_images), -1), dim=1)
+            batch.sub_(mean.view(-1, 1, 1, 1)).div_(std.view(-1, 1, 1, 1))
+        return batch
+
+    def _buffer(self, batch_size: int) -> torch.Tensor:
+        buffer = getattr(self._local, "buffer", None)
+        if buffer is None or buffer.shape[0] < batch_size:
+            buffer = torch.empty((max(batch_size, 1), 3, self.input_size, self.input_size), dtype=torch.float32)
+            self._local.buffer = buffer
+        return buffer[:batch_size]
+
+
+def build_tracenet_preprocessor() -> FaceBatchPreprocessor:
+    """TraceNet preprocessing — must match training: 112×112 bilinear, [0.5]*3 mean/std."""
+    return FaceBatchPreprocessor(TRACENET_INPUT_SIZE, resize_mode="bilinear", normalization="tracenet")
+
+
+def build_facenet_preprocessor() -> FaceBatchPreprocessor:
+    """InceptionResnetV1 preprocessing: 160×160 bicubic resize and per-image whitening."""
+    return FaceBatchPreprocessor(FACENET_INPUT_SIZE, resize_mode="bicubic", normalization="facenet")
@@ -0,0 +1,112 @@
+"""
+Static INT8 quantization of the exported TraceNet graph for ONNX Runtime.
+
+Activation ranges are calibrated on real aligned face crops (by default the
+repo's `testfeaces` gallery) preprocessed exactly as TraceNet expects, so the
+quantized graph keeps the fp32 graph's input/output contract.
+"""
+
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List
+
+import cv2
+import numpy as np
+
+from src.core.logging import logger
+from src.services.ai.onnx_export import ONNX_INPUT_NAME
+from src.services.ai.preprocessing import build_tracenet_preprocessor
+
+
+DEFAULT_CALIBRATION_DIR = Path(__file__).resolve().parents[4] / "testfeaces"
+DEFAULT_CALIBRATION_BATCH_SIZE = 8
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+
+def iter_calibration_images(image_dir: str | Path) -> Iterator[Path]:
+    for path in sorted(Path(image_dir).rglob("*")):
+        if path.is_file() and path.suffix.lower() in IMAGE_SUFFIXES:
+            yield path
+
+
+def collect_calibration_crops(
+    image_dir: str | Path,
+    face_pipeline: Any,
+    *,
+    max_crops: int | None = None,
+) -> List[np.ndarray]:
+    """Detects and aligns faces in every image under `image_dir`, like enrollment does."""
+    crops: List[np.ndarray] = []
+    for image_path in iter_calibration_images(image_dir):
+        image_bgr = cv2.imread(str(image_path))
+        if image_bgr is None:
+            logger.warning(f"Skipping unreadable calibration image {image_path}")
+            continue
+        image_rgb = cv2.cvtColor(image_bgr, cv2.COLOR_BGR2RGB)
+        for face_region in face_pipeline.extract_face_regions(image_rgb):
+            crops.append(face_region["crop"])
+            if max_crops is not None and len(crops) >= max_crops:
+                return crops
+    return crops
+
+
+def build_tracenet_calibration_batches(
+    crops: Iterable[np.ndarray],
+    *,
+    batch_size: int = DEFAULT_CALIBRATION_BATCH_SIZE,
+) -> List[np.ndarray]:
+    preprocess = build_tracenet_preprocessor()
+    crop_list = list(crops)
+    step = max(int(batch_size), 1)
+    # Copy out of the preprocessor's reusable buffer: calibration holds every batch.
+    return [
+        preprocess(crop_list[start:start + step]).numpy().copy()
+        for start in range(0, len(crop_list), step)
+    ]
+
+
+def quantize_embedding_graph(
+    fp32_model_path: str | Path,
+    output_path: str | Path,
+    calibration_batches: List[np.ndarray],
+    *,
+    per_channel: bool = True,
+) -> Path:
+    """Writes a QDQ INT8 graph (int8 weights, uint8 activations) next to the fp32 one."""
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        CalibrationMethod,
+        QuantFormat,
+        QuantType,
+        quant_pre_process,
+        quantize_static,
+    )
+
+    if not calibration_batches:
+        raise ValueError("At least one calibration batch is required for static INT8 quantization.")
+
+    class _BatchReader(CalibrationDataReader):
+        def __init__(self, batches: List[np.ndarray]) -> None:
+            self._batches = iter(batches)
+
+        def get_next(self):
+            batch = next(self._batches, None)
+            return None if batch is None else {ONNX_INPUT_NAME: batch}
+
+    resolved_output = Path(output_path)
+    resolved_output.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Shape inference + graph cleanup first, as ORT recommends before quantize_static.
+        preprocessed_path = Path(work_dir) / "preprocessed.onnx"
+        quant_pre_process(str(fp32_model_path), str(preprocessed_path), skip_symbolic_shape=True)
+        quantize_static(
+            str(preprocessed_path),
+            str(resolved_output),
+            _BatchReader(calibration_batches),
+            quant_format=QuantFormat.QDQ,
+            activation_type=QuantType.QUInt8,
+            weight_type=QuantType.QInt8,
+            per_channel=per_channel,
+            calibrate_method=CalibrationMethod.MinMax,
+        )
+    return resolved_output
@@ -1,23 +1,79 @@
+import gc
 import os
+import threading
+import time
 from pathlib import Path
+from typing import Any, TYPE_CHECKING
 
-from src.services.ai.pipeline import FaceProcessingPipeline
-from src.services.ai.strategies import (
+import numpy as np
+
+from src.core.logging import logger
+from src.services.ai.analysis_cache import get_face_analysis_cache
+from src.services.ai.inference_executor import inference_executor
+from src.services.ai.model_registry import (
     DEFAULT_EMBEDDING_VERSION,
-    MTCNNStrategy,
-    get_face_embedding_strategy,
+    get_model_version_metadata,
     normalize_embedding_version,
+    resolve_embedding_space,
+)
+from src.services.ai.pipeline import (
+    DEFAULT_MAX_EMBEDDING_BATCH_SIZE,
+    DEFAULT_TILE_OVERLAP,
+    DEFAULT_TILE_SIZE,
+    FaceProcessingPipeline,
 )
 
+if TYPE_CHECKING:
+    from src.services.ai.strategies import MTCNNStrategy
+
 
 ACTIVE_EMBEDDING_VERSION = normalize_embedding_version(
     os.getenv("FACE_EMBEDDING_VERSION", DEFAULT_EMBEDDING_VERSION)
 )
+# Version stored with the active pipeline's vectors (pipeline.embedding_version), known without loading it.
+ACTIVE_EMBEDDING_SPACE = resolve_embedding_space(ACTIVE_EMBEDDING_VERSION)
+EMBEDDING_MAX_BATCH_SIZE = int(
+    os.getenv("FACE_EMBEDDING_MAX_BATCH_SIZE", str(DEFAULT_MAX_EMBEDDING_BATCH_SIZE))
+)
+DETECTION_MAX_SIDE = int(os.getenv("FACE_DETECTION_MAX_SIDE", "1280")) or None
+SCENE_TILE_SIZE = int(os.getenv("FACE_SCENE_TILE_SIZE", str(DEFAULT_TILE_SIZE)))
+SCENE_TILE_OVERLAP = int(os.getenv("FACE_SCENE_TILE_OVERLAP", str(DEFAULT_TILE_OVERLAP)))
+SCENE_TILE_SCALE = float(os.getenv("FACE_SCENE_TILE_SCALE", "1.0"))
+ONNX_INTRA_OP_THREADS = int(os.getenv("FACE_EMBEDDING_ONNX_THREADS", "0")) or None
+WARMUP_ITERATIONS = int(os.getenv("FACE_MODEL_WARMUP_ITERATIONS", "2"))
+WARMUP_IMAGE_SIZE = (480, 640)
+
 _pipeline_cache: dict[tuple[str, str | None], FaceProcessingPipeline] = {}
+_load_lock = threading.RLock()
+_detector: "MTCNNStrategy | None" = None
+_readiness: dict[str, Any] = {
+    "ready": False,
+    "status": "not_loaded",
+    "embedding_version": ACTIVE_EMBEDDING_VERSION,
+    "load_seconds": None,
+    "warmup_seconds": None,
+    "error": None,
+}
 
 
-# Load the detector once per process so recognition, enrollment, and migrations share it.
-mtcnn = MTCNNStrategy()
+class FaceModelsLoadingError(RuntimeError):
+    def __init__(self, status: str, retry_after_seconds: int = 5) -> None:
+        self.status = status
+        self.retry_after_seconds = retry_after_seconds
+        super().__init__(f"Face models are not ready yet ({status}). Retry shortly.")
+
+
+def get_detector() -> "MTCNNStrategy":
+    """The detector is loaded once per process so recognition, enrollment, and migrations share it."""
+    global _detector
+    if _detector is None:
+        with _load_lock:
+            if _detector is None:
+                # Deferred so importing the API does not pull in torch or load weights.
+                from src.services.ai.strategies import MTCNNStrategy
+
+                _detector = MTCNNStrategy()
+    return _detector
 
 
 def get_pipeline(
@@ -31,14 +87,166 @@ def get_pipeline(
     if cached_pipeline is not None:
         return cached_pipeline
 
-    embedder = get_face_embedding_strategy(
-        resolved_version,
-        model_path=model_path,
-        device=getattr(mtcnn, "device", None),
+    with _load_lock:
+        cached_pipeline = _pipeline_cache.get(cache_key)
+        if cached_pipeline is not None:
+            return cached_pipeline
+
+        from src.services.ai.strategies import get_face_embedding_strategy
+
+        detector = get_detector()
+        embedder = get_face_embedding_strategy(
+            resolved_version,
+            model_path=model_path,
+            device=getattr(detector, "device", None),
+            intra_op_num_threads=ONNX_INTRA_OP_THREADS,
+        )
+        face_pipeline = FaceProcessingPipeline(
+            detector,
+            embedder,
+            max_batch_size=EMBEDDING_MAX_BATCH_SIZE,
+            detection_max_side=DETECTION_MAX_SIDE,
+            tile_size=SCENE_TILE_SIZE,
+            tile_overlap=SCENE_TILE_OVERLAP,
+            tile_scale=SCENE_TILE_SCALE,
+            analysis_cache=get_face_analysis_cache(),
+        )
+        _pipeline_cache[cache_key] = face_pipeline
+        return face_pipeline
+
+
+class LazyPipeline:
+    """
+    Stand-in for the active pipeline that loads it on first attribute access.
+
+    Endpoints keep `from src.services.ai.runtime import pipeline`; the models are
+    only built when a request (or warm_up_models in the lifespan) first needs them.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_pipeline(), name)
+
+    @property
+    def is_loaded(self) -> bool:
+        return bool(_pipeline_cache)
+
+
+pipeline = LazyPipeline()
+
+
+async def require_face_models() -> None:
+    """
+    Route dependency for endpoints that touch `pipeline` on the event loop.
+
+    Attribute access on the lazy pipeline builds the models (or waits on _load_lock
+    while the startup warmup builds them), which would stall the loop. Until the
+    models are loaded the request gets FaceModelsLoadingError (503); with warmup
+    disabled the first request loads them on the inference thread instead.
+    """
+    if pipeline.is_loaded:
+        return
+    status = _readiness["status"]
+    if status != "lazy":
+        raise FaceModelsLoadingError(status)
+    await inference_executor.run(get_pipeline)
+
+
+def warm_up_models(
+    iterations: int = WARMUP_ITERATIONS,
+    *,
+    embedding_version: str | None = None,
+    model_path: str | Path | None = None,
+) -> dict[str, Any]:
+    """
+    Loads the active pipeline and runs dummy forward passes through the detector and
+    every embedding batch shape the pipeline uses, so allocator pools and kernels are
+    initialised before traffic. Blocking; call it on the inference thread.
+    """
+    _readiness.update({"ready": False, "status": "loading", "error": None})
+    try:
+        started = time.perf_counter()
+        face_pipeline = get_pipeline(embedding_version, model_path=model_path)
+        load_seconds = time.perf_counter() - started
+        _readiness.update(
+            {
+                "status": "warming",
+                "embedding_version": normalize_embedding_version(embedding_version or ACTIVE_EMBEDDING_VERSION),
+                "load_seconds": round(load_seconds, 3),
+            }
+        )
+
+        started = time.perf_counter()
+        blank_image = np.zeros((*WARMUP_IMAGE_SIZE, 3), dtype=np.uint8)
+        rng = np.random.default_rng(0)
+        for _ in range(max(int(iterations), 1)):
+            face_pipeline.detector.detect_faces(blank_image)
+            for batch_size in sorted({1, face_pipeline.max_batch_size}):
+                crops = [rng.integers(0, 255, size=(112, 112, 3), dtype=np.uint8) for _ in range(batch_size)]
+                face_pipeline.embedder.embed_faces(crops)
+        warmup_seconds = time.perf_counter() - started
+    except Exception as e:
+        logger.error(f"Model warmup failed: {e}")
+        _readiness.update({"ready": False, "status": "failed", "error": str(e)})
+        raise
+
+    _readiness.update(
+        {
+            "ready": True,
+            "status": "ready",
+            "warmup_seconds": round(warmup_seconds, 3),
+        }
     )
-    face_pipeline = FaceProcessingPipeline(mtcnn, embedder)
-    _pipeline_cache[cache_key] = face_pipeline
-    return face_pipeline
+    logger.info(f"Face models ready: load {load_seconds:.2f}s, warmup {warmup_seconds:.2f}s")
+    return get_readiness()
+
+
+def preload_models_for_fork(
+    embedding_version: str | None = None,
+    *,
+    model_path: str | Path | None = None,
+) -> dict[str, Any]:
+    """
+    Loads the active models in a master process before it forks API workers.
+
+    Torch weights are frozen and moved to shared memory, and the surviving heap is
+    moved out of the collector's reach (gc.freeze) so workers do not dirty those
+    pages. No inference runs here: each worker warms up in its own lifespan, which
+    keeps the torch and ONNX Runtime thread pools out of the fork. ONNX Runtime
+    sessions own native threads, so those embedders are left for each worker to load.
+    """
+    from src.services.ai.strategies import share_model_weights
+
+    started = time.perf_counter()
+    detector = get_detector()
+    strategies: list[Any] = [detector]
+    resolved_version = normalize_embedding_version(embedding_version or ACTIVE_EMBEDDING_VERSION)
+    preloaded_embedder = get_model_version_metadata(resolved_version).get("runtime") != "onnxruntime"
+    if preloaded_embedder:
+        strategies.append(get_pipeline(resolved_version, model_path=model_path).embedder)
+
+    shared_bytes = share_model_weights(*strategies)
+    gc.collect()
+    gc.freeze()
+    summary = {
+        "embedding_version": resolved_version,
+        "preloaded_embedder": preloaded_embedder,
+        "shared_weight_bytes": shared_bytes,
+        "load_seconds": round(time.perf_counter() - started, 3),
+    }
+    logger.info(f"Preloaded face models for forked workers: {summary}")
+    return summary
+
+
+def mark_ready_without_warmup() -> None:
+    _readiness.update({"ready": True, "status": "lazy"})
+
+
+def get_readiness() -> dict[str, Any]:
+    return dict(_readiness)
 
 
-pipeline = get_pipeline()
+def __getattr__(name: str) -> Any:
+    # Backwards-compatible access to the shared detector, loaded on demand.
+    if name == "mtcnn":
+        return get_detector()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
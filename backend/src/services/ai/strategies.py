@@ -3,38 +3,30 @@ from pathlib import Path
 import torch
 import torch.nn.functional as F
 import numpy as np
-from PIL import Image
 from typing import Any, List, Tuple, cast
-from torchvision import transforms
 from facenet_pytorch import MTCNN, InceptionResnetV1
 
 from src.services.ai.interfaces import FaceDetectionStrategy, FaceEmbeddingStrategy
+from src.services.ai.model_registry import (  # noqa: F401 - re-exported for existing importers
+    DEFAULT_EMBEDDING_VERSION,
+    DEFAULT_FACENET_ONNX_PATH,
+    DEFAULT_TRACENET_INT8_PATH,
+    DEFAULT_TRACENET_ONNX_PATH,
+    DEFAULT_TRACENET_PATH,
+    FACENET_EMBEDDING_VERSION,
+    FACENET_ONNX_EMBEDDING_VERSION,
+    MODEL_VERSION_REGISTRY,
+    TRACENET_INT8_EMBEDDING_VERSION,
+    TRACENET_ONNX_EMBEDDING_VERSION,
+    _MODELS_DIR,
+    get_model_version_metadata,
+    list_supported_model_versions,
+    normalize_embedding_version,
+)
+from src.services.ai.preprocessing import build_facenet_preprocessor, build_tracenet_preprocessor
 from src.services.ai.tracenet_model import TraceNet
 from src.core.logging import logger
 
-# Default path to the trained TraceNet checkpoint
-_MODELS_DIR = Path(__file__).resolve().parents[3] / "models"
-DEFAULT_TRACENET_PATH = _MODELS_DIR / "TraceNet_deployment.pth"
-DEFAULT_EMBEDDING_VERSION = "tracenet_v1"
-FACENET_EMBEDDING_VERSION = "facenet_vggface2"
-
-MODEL_VERSION_REGISTRY: dict[str, dict[str, Any]] = {
-    DEFAULT_EMBEDDING_VERSION: {
-        "display_name": "TraceNet v1",
-        "family": "tracenet",
-        "embedding_dimensions": 512,
-        "default_template_version": "tracenet_template_v1",
-        "notes": "Custom TraceNet deployment checkpoint.",
-    },
-    FACENET_EMBEDDING_VERSION: {
-        "display_name": "FaceNet VGGFace2",
-        "family": "facenet",
-        "embedding_dimensions": 512,
-        "default_template_version": "facenet_template_v1",
-        "notes": "facenet-pytorch InceptionResnetV1 VGGFace2 baseline.",
-    },
-}
-
 
 class MTCNNStrategy(FaceDetectionStrategy):
     """Face detection using MTCNN from facenet-pytorch."""
@@ -53,6 +45,11 @@ class MTCNNStrategy(FaceDetectionStrategy):
             thresholds=[0.6, 0.7, 0.7]
         )
 
+    @staticmethod
+    def _as_tensor(image: np.ndarray) -> torch.Tensor:
+        # MTCNN takes HxWx3 tensors directly; this shares the frame's memory instead of copying it into PIL.
+        return torch.from_numpy(np.ascontiguousarray(image))
+
     def detect_faces(self, image: np.ndarray) -> List[Tuple[int, int, int, int]]:
         """Detect faces in an RGB numpy array.
 
@@ -60,8 +57,7 @@ class MTCNNStrategy(FaceDetectionStrategy):
             List of bounding boxes as (x, y, w, h) tuples.
         """
         try:
-            pil_img = Image.fromarray(image)
-            boxes, _ = self.mtcnn.detect(pil_img)
+            boxes, _ = self.mtcnn.detect(self._as_tensor(image))
             
             if boxes is None:
                 return []
@@ -81,35 +77,53 @@ class MTCNNStrategy(FaceDetectionStrategy):
     def detect_faces_with_landmarks(self, image: np.ndarray) -> List[dict[str, Any]]:
         """Detect faces and return bounding boxes with five-point landmarks."""
         try:
-            pil_img = Image.fromarray(image)
-            boxes, _probs, landmarks = self.mtcnn.detect(pil_img, landmarks=True)
-
-            if boxes is None:
-                return []
-
-            results: List[dict[str, Any]] = []
-            for index, box in enumerate(boxes):
-                x1, y1, x2, y2 = [int(b) for b in box]
-                w = x2 - x1
-                h = y2 - y1
-                landmark_points = None
-                if landmarks is not None and len(landmarks) > index:
-                    landmark_points = [
-                        (float(point[0]), float(point[1]))
-                        for point in landmarks[index]
-                    ]
-                results.append(
-                    {
-                        "box": (x1, y1, w, h),
-                        "landmarks": landmark_points,
-                    }
-                )
+            boxes, probs, landmarks = self.mtcnn.detect(self._as_tensor(image), landmarks=True)
+            return self._build_detections(boxes, probs, landmarks)
+        except Exception as e:
+            logger.error(f"MTCNN Detection Error: {e}")
+            raise RuntimeError(f"MTCNN Face Detection failed: {e}") from e
 
-            return results
+    def detect_faces_with_landmarks_batch(self, images: List[np.ndarray]) -> List[List[dict[str, Any]]]:
+        """Detect faces in several equally sized images (e.g. scene tiles) in one MTCNN pass."""
+        if not images:
+            return []
+        try:
+            batch = torch.from_numpy(np.stack(images))
+            batch_boxes, batch_probs, batch_landmarks = self.mtcnn.detect(batch, landmarks=True)
+            return [
+                self._build_detections(boxes, probs, landmarks)
+                for boxes, probs, landmarks in zip(batch_boxes, batch_probs, batch_landmarks)
+            ]
         except Exception as e:
             logger.error(f"MTCNN Detection Error: {e}")
             raise RuntimeError(f"MTCNN Face Detection failed: {e}") from e
 
+    @staticmethod
+    def _build_detections(boxes: Any, probs: Any, landmarks: Any) -> List[dict[str, Any]]:
+        if boxes is None:
+            return []
+
+        results: List[dict[str, Any]] = []
+        for index, box in enumerate(boxes):
+            x1, y1, x2, y2 = [int(b) for b in box]
+            w = x2 - x1
+            h = y2 - y1
+            landmark_points = None
+            if landmarks is not None and len(landmarks) > index:
+                landmark_points = [
+                    (float(point[0]), float(point[1]))
+                    for point in landmarks[index]
+                ]
+            results.append(
+                {
+                    "box": (x1, y1, w, h),
+                    "landmarks": landmark_points,
+                    "confidence": float(probs[index]) if probs is not None else None,
+                }
+            )
+
+        return results
+
 
 class InceptionResnetStrategy(FaceEmbeddingStrategy):
     """Face embedding using InceptionResnetV1 (VGGFace2 pretrained).
@@ -126,31 +140,28 @@ class InceptionResnetStrategy(FaceEmbeddingStrategy):
             
         logger.info(f"Initializing FaceNet (InceptionResnetV1) on device: {self.device}")
         self.resnet = InceptionResnetV1(pretrained='vggface2').eval().to(self.device)
+        self.preprocess = build_facenet_preprocessor()
 
     def embed_face(self, face_image: np.ndarray) -> List[float]:
         """Generate embedding from a cropped face image (RGB).
 
         Resizes to 160×160 and applies per-image whitening normalization.
         """
+        return self.embed_faces([face_image])[0]
+
+    def embed_faces(self, face_images: List[np.ndarray]) -> List[List[float]]:
+        """Generate embeddings for several cropped faces in one forward pass."""
+        if not face_images:
+            return []
+
         try:
-            pil_img = Image.fromarray(face_image)
-            pil_img = pil_img.resize((160, 160))
-            
-            img_tensor = torch.from_numpy(np.array(pil_img)).float()
-            img_tensor = img_tensor.permute(2, 0, 1)  # HWC -> CHW
-            
-            # Per-image whitening
-            mean = img_tensor.mean()
-            std = img_tensor.std()
-            img_tensor = (img_tensor - mean) / std
-            
-            img_tensor = img_tensor.unsqueeze(0).to(self.device)
-            
+            batch = self.preprocess(face_images).to(self.device)
+
             with torch.no_grad():
-                embedding = self.resnet(img_tensor)
-                embedding = F.normalize(embedding, p=2, dim=1)
+                embeddings = self.resnet(batch)
+                embeddings = F.normalize(embeddings, p=2, dim=1)
 
-            return cast(List[float], embedding[0].cpu().numpy().tolist())
+            return cast(List[List[float]], embeddings.cpu().numpy().tolist())
 
         except Exception as e:
             logger.error(f"FaceNet Embedding Error: {e}")
@@ -184,6 +195,7 @@ class TraceNetStrategy(FaceEmbeddingStrategy):
         )["display_name"]
 
         resolved_path = Path(model_path) if model_path else DEFAULT_TRACENET_PATH
+        self.model_path = resolved_path
         logger.info(
             f"Initializing TraceNet on device: {self.device}, "
             f"checkpoint: {resolved_path}"
@@ -213,12 +225,8 @@ class TraceNetStrategy(FaceEmbeddingStrategy):
         self.model.eval().to(self.device)
         logger.info("✅ TraceNet model loaded successfully!")
 
-        # Preprocessing transform — must match training exactly
-        self.transform = transforms.Compose([
-            transforms.Resize((112, 112)),
-            transforms.ToTensor(),
-            transforms.Normalize([0.5, 0.5, 0.5], [0.5, 0.5, 0.5]),
-        ])
+        # Preprocessing — must match training exactly
+        self.preprocess = build_tracenet_preprocessor()
 
     def embed_face(self, face_image: np.ndarray) -> List[float]:
         """Generate a 512-dim L2-normalized embedding from a cropped face (RGB).
@@ -229,64 +237,116 @@ class TraceNetStrategy(FaceEmbeddingStrategy):
         Returns:
             512-dimensional list of floats (L2-normalized).
         """
+        return self.embed_faces([face_image])[0]
+
+    def embed_faces(self, face_images: List[np.ndarray]) -> List[List[float]]:
+        """Generate embeddings for several cropped faces in one forward pass.
+
+        Args:
+            face_images: Cropped faces as RGB numpy arrays (any size).
+
+        Returns:
+            One 512-dimensional L2-normalized embedding per face, in input order.
+        """
+        if not face_images:
+            return []
+
         try:
-            pil_img = Image.fromarray(face_image)
-            img_tensor: torch.Tensor = self.transform(pil_img)
-            img_tensor = img_tensor.unsqueeze(0).to(self.device)
+            batch = self.preprocess(face_images).to(self.device)
 
             with torch.no_grad():
-                embedding = self.model(img_tensor)
+                embeddings = self.model(batch)
                 # L2-normalize, matching the notebook's extract_embedding()
-                embedding = F.normalize(embedding, p=2, dim=1)
+                embeddings = F.normalize(embeddings, p=2, dim=1)
 
-            return cast(List[float], embedding[0].cpu().numpy().tolist())
+            return cast(List[List[float]], embeddings.cpu().numpy().tolist())
 
         except Exception as e:
             logger.error(f"TraceNet Embedding Error: {e}")
             raise e
 
 
-def normalize_embedding_version(embedding_version: str | None) -> str:
-    if not embedding_version:
-        return DEFAULT_EMBEDDING_VERSION
+class OnnxEmbeddingStrategy(FaceEmbeddingStrategy):
+    """Face embedding on ONNX Runtime's CPU provider from a graph exported by onnx_export.
 
-    normalized = embedding_version.strip().lower()
-    aliases = {
-        "tracenet": DEFAULT_EMBEDDING_VERSION,
-        "tracenet_v1": DEFAULT_EMBEDDING_VERSION,
-        "facenet": FACENET_EMBEDDING_VERSION,
-        "facenet_vggface2": FACENET_EMBEDDING_VERSION,
-        "inceptionresnet_vggface2": FACENET_EMBEDDING_VERSION,
-    }
-    return aliases.get(normalized, normalized)
+    Preprocessing is shared with the PyTorch strategy of the same family, and the
+    graph already L2-normalizes, so embeddings match eager PyTorch to float
+    precision. The graph has a dynamic batch dimension, so embed_faces runs any
+    batch in one session call.
 
+    Args:
+        model_path: Path to the exported .onnx graph.
+        family: "tracenet" or "facenet"; selects preprocessing.
+        embedding_version: Registry version reported for this backend.
+        intra_op_num_threads: ONNX Runtime intra-op threads (None keeps ORT's default).
+    """
 
-def get_model_version_metadata(embedding_version: str) -> dict[str, Any]:
-    normalized = normalize_embedding_version(embedding_version)
-    if normalized in MODEL_VERSION_REGISTRY:
-        return {
-            "version": normalized,
-            **MODEL_VERSION_REGISTRY[normalized],
-        }
-
-    return {
-        "version": normalized,
-        "display_name": normalized,
-        "family": "custom",
-        "embedding_dimensions": 512,
-        "default_template_version": f"{normalized}_template_v1",
-        "notes": "Custom checkpoint or external embedding model.",
-    }
-
-
-def list_supported_model_versions() -> list[dict[str, Any]]:
-    return [
-        {
-            "version": version,
-            **metadata,
-        }
-        for version, metadata in MODEL_VERSION_REGISTRY.items()
-    ]
+    def __init__(
+        self,
+        model_path: str | Path,
+        *,
+        family: str,
+        embedding_version: str,
+        intra_op_num_threads: int | None = None,
+    ) -> None:
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError(
+                "onnxruntime is required for ONNX embedding versions. Install it with `pip install onnxruntime`."
+            ) from e
+
+        resolved_path = Path(model_path)
+        if not resolved_path.exists():
+            raise FileNotFoundError(
+                f"ONNX embedding graph not found at {resolved_path}. "
+                f"Export it with `python scripts/export_onnx_models.py` "
+                f"(INT8 graphs: `python scripts/quantize_tracenet.py`)."
+            )
+        if family not in ("tracenet", "facenet"):
+            raise ValueError(f"Unsupported ONNX embedding family '{family}'.")
+
+        metadata = MODEL_VERSION_REGISTRY.get(embedding_version, {})
+        self.device = "cpu"
+        self.family = family
+        self.embedding_version = metadata.get("embedding_space", embedding_version)
+        self.backend_version = embedding_version
+        self.model_name = metadata.get("display_name", embedding_version)
+        self.model_path = resolved_path
+
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        if intra_op_num_threads:
+            session_options.intra_op_num_threads = int(intra_op_num_threads)
+
+        logger.info(f"Initializing {self.model_name} on ONNX Runtime CPU, graph: {resolved_path}")
+        self.session = ort.InferenceSession(
+            str(resolved_path),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_name = self.session.get_inputs()[0].name
+
+        self.preprocess = build_tracenet_preprocessor() if family == "tracenet" else build_facenet_preprocessor()
+
+    def embed_face(self, face_image: np.ndarray) -> List[float]:
+        """Generate a 512-dim L2-normalized embedding from a cropped face (RGB)."""
+        return self.embed_faces([face_image])[0]
+
+    def embed_faces(self, face_images: List[np.ndarray]) -> List[List[float]]:
+        """Generate embeddings for several cropped faces in one session run."""
+        if not face_images:
+            return []
+
+        try:
+            batch = self.preprocess(face_images).numpy()
+            embeddings = self.session.run(None, {self.input_name: batch})[0]
+            return cast(List[List[float]], embeddings.tolist())
+
+        except Exception as e:
+            logger.error(f"ONNX Runtime Embedding Error: {e}")
+            raise e
 
 
 def get_face_embedding_strategy(
@@ -294,9 +354,20 @@ def get_face_embedding_strategy(
     *,
     model_path: str | Path | None = None,
     device: str | None = None,
+    intra_op_num_threads: int | None = None,
 ) -> FaceEmbeddingStrategy:
     normalized = normalize_embedding_version(embedding_version)
 
+    metadata = MODEL_VERSION_REGISTRY.get(normalized, {})
+    if metadata.get("runtime") == "onnxruntime":
+        # ONNX Runtime backends are CPU-only; `device` is ignored.
+        return OnnxEmbeddingStrategy(
+            model_path=model_path or metadata["model_path"],
+            family=metadata["family"],
+            embedding_version=normalized,
+            intra_op_num_threads=intra_op_num_threads,
+        )
+
     if normalized == FACENET_EMBEDDING_VERSION:
         return InceptionResnetStrategy(device=device)
 
@@ -312,3 +383,25 @@ def get_face_embedding_strategy(
         f"Supported versions: {', '.join(version['version'] for version in list_supported_model_versions())}. "
         f"If you are loading a custom TraceNet checkpoint, pass --model-path with a custom version label."
     )
+
+
+def share_model_weights(*strategies: Any) -> int:
+    """Freezes the torch modules held by `strategies` and moves their weights to shared memory.
+
+    Used before forking workers so every worker maps the same weight pages.
+    Only CPU modules can be shared this way; returns the number of bytes shared.
+    """
+    shared_bytes = 0
+    for strategy in strategies:
+        for module in vars(strategy).values():
+            if not isinstance(module, torch.nn.Module):
+                continue
+            tensors = [*module.parameters(), *module.buffers()]
+            if any(tensor.device.type != "cpu" for tensor in tensors):
+                raise ValueError(
+                    f"{type(strategy).__name__} holds weights on a non-CPU device; "
+                    "preload-then-fork only shares CPU weights."
+                )
+            module.eval().requires_grad_(False).share_memory()
+            shared_bytes += sum(tensor.numel() * tensor.element_size() for tensor in tensors)
+    return shared_bytes
@@ -17,6 +17,7 @@ from src.infrastructure.repositories.criminal import CriminalRepository
 from src.infrastructure.repositories.face import FaceRepository
 from src.infrastructure.repositories.review_case import ReviewCaseRepository
 from src.services.identity_template_service import IdentityTemplateService
+from src.services.template_gallery import TemplateGallery, template_gallery as shared_template_gallery
 
 
 THREAT_LEVEL_RANK = {
@@ -43,12 +44,14 @@ class CriminalMergeService:
         review_case_repo: ReviewCaseRepository,
         audit_repo: AuditRepository,
         template_service: IdentityTemplateService | None = None,
+        template_gallery: TemplateGallery | None = None,
     ) -> None:
         self.criminal_repo = criminal_repo
         self.face_repo = face_repo
         self.review_case_repo = review_case_repo
         self.audit_repo = audit_repo
         self.template_service = template_service
+        self.template_gallery = template_gallery if template_gallery is not None else shared_template_gallery
         self.session = criminal_repo.session
 
     async def merge_from_review_case(
@@ -127,6 +130,7 @@ class CriminalMergeService:
         await self.session.delete(duplicate)
         await self.session.commit()
         await self.session.refresh(survivor)
+        self.template_gallery.remove(duplicate_criminal_id)
 
         if self.template_service is not None:
             await self.template_service.rebuild_for_criminal(survivor_criminal_id)
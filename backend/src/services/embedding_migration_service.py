@@ -12,7 +12,7 @@ from src.domain.models.face import FaceEmbedding
 from src.domain.models.identity_template import IdentityTemplate
 from src.infrastructure.repositories.face import FaceRepository
 from src.infrastructure.repositories.identity_template import IdentityTemplateRepository
-from src.services.ai.strategies import get_model_version_metadata, normalize_embedding_version
+from src.services.ai.model_registry import get_model_version_metadata, normalize_embedding_version
 from src.services.identity_template_service import IdentityTemplateService
 
 
@@ -1,24 +1,28 @@
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Tuple
 from uuid import UUID, uuid4
 
-import cv2
-import numpy as np
-
 from src.core.logging import logger
 from src.domain.models.audit import AuditLog
 from src.domain.models.face import FaceEmbedding
 from src.infrastructure.repositories.audit import AuditRepository
 from src.infrastructure.repositories.criminal import CriminalRepository
 from src.infrastructure.repositories.face import FaceRepository
+from src.services.ai.analysis_cache import FaceAnalysisCache, image_digest
 from src.services.ai.face_quality import FaceQualityAssessor, FaceQualityReport
+from src.services.ai.image_ingest import DecodedImage, decode_image
+from src.services.ai.inference_executor import InferenceExecutor, inference_executor as shared_inference_executor
 from src.services.ai.pipeline import FaceProcessingPipeline
-from src.services.ai.strategies import get_model_version_metadata, normalize_embedding_version
+from src.services.ai.model_registry import get_model_version_metadata, normalize_embedding_version
 from src.services.duplicate_identity_service import (
     DuplicateIdentityConflictError,
     DuplicateIdentityService,
 )
-from src.services.face_quality_service import get_quality_reason_message, serialize_quality_report
+from src.services.face_quality_service import (
+    assess_face_quality,
+    get_quality_reason_message,
+    serialize_quality_report,
+)
 from src.services.identity_template_service import IdentityTemplateService
 from src.schemas.identity_template import IdentityTemplateResponse
 
@@ -45,6 +49,8 @@ class FaceEnrollmentService:
         quality_assessor: FaceQualityAssessor | None = None,
         template_service: IdentityTemplateService | None = None,
         duplicate_identity_service: DuplicateIdentityService | None = None,
+        inference_executor: InferenceExecutor | None = None,
+        analysis_cache: FaceAnalysisCache | None = None,
     ) -> None:
         self.pipeline = pipeline
         self.face_repo = face_repo
@@ -53,6 +59,8 @@ class FaceEnrollmentService:
         self.quality_assessor = quality_assessor or FaceQualityAssessor()
         self.template_service = template_service
         self.duplicate_identity_service = duplicate_identity_service
+        self.inference_executor = inference_executor or shared_inference_executor
+        self.analysis_cache = analysis_cache
 
     async def enroll_face(
         self,
@@ -66,8 +74,10 @@ class FaceEnrollmentService:
         if not criminal:
             raise ValueError("Criminal not found")
 
-        image = self._decode_image(image_bytes)
-        processed_faces = self.pipeline.process_image(image)
+        decoded, processed_faces, quality_report = await self.inference_executor.run(
+            self._analyze_upload,
+            image_bytes,
+        )
 
         if not processed_faces:
             raise ValueError("No face detected in the uploaded image")
@@ -76,11 +86,6 @@ class FaceEnrollmentService:
 
         face_data = processed_faces[0]
         x, y, w, h = (int(value) for value in face_data["box"])
-        quality_report = self.quality_assessor.assess(
-            image,
-            (x, y, w, h),
-            landmarks=face_data.get("landmarks"),
-        )
         if quality_report.should_reject:
             raise ValueError(self._format_quality_rejection(quality_report))
 
@@ -103,6 +108,8 @@ class FaceEnrollmentService:
                 duplicate_review = self._serialize_duplicate_review(review_case, duplicate_assessment)
 
         face_id = uuid4()
+        # Stored boxes refer to the uploaded file, which may have been decoded reduced to fit the pixel budget.
+        original_box = decoded.box_to_original((x, y, w, h))
         image_url = self._store_image(criminal_id, face_id, image_bytes, filename)
 
         if is_primary:
@@ -118,10 +125,10 @@ class FaceEnrollmentService:
             is_primary=is_primary,
             embedding_version=embedding_version,
             embedding_model_name=model_metadata["display_name"],
-            box_x=x,
-            box_y=y,
-            box_w=w,
-            box_h=h,
+            box_x=original_box[0],
+            box_y=original_box[1],
+            box_w=original_box[2],
+            box_h=original_box[3],
             quality_status=quality_report.status,
             quality_score=quality_report.quality_score,
             blur_score=quality_report.blur_score,
@@ -166,7 +173,7 @@ class FaceEnrollmentService:
             "is_primary": created_face.is_primary,
             "embedding_version": created_face.embedding_version,
             "created_at": created_face.created_at,
-            "box": face_data["box"],
+            "box": original_box,
             "exclude_from_template": bool(getattr(created_face, "exclude_from_template", False)),
             "operator_review_status": getattr(created_face, "operator_review_status", "normal"),
             "operator_review_notes": getattr(created_face, "operator_review_notes", None),
@@ -176,6 +183,32 @@ class FaceEnrollmentService:
             "duplicate_review": duplicate_review,
         }
 
+    def _analyze_upload(
+        self,
+        image_bytes: bytes,
+    ) -> Tuple[DecodedImage, List[Dict[str, Any]], FaceQualityReport | None]:
+        """
+        Decode, detect, embed and (for a single face) assess quality in one inference executor call,
+        so none of the CPU-bound steps run on the event loop.
+        """
+        decoded = decode_image(image_bytes)
+        # Keyed by content, so an enrollment right after its quality preview reuses the detection.
+        digest = image_digest(image_bytes)
+        processed_faces = self.pipeline.process_image(decoded.pixels, image_digest=digest)
+        if len(processed_faces) != 1:
+            return decoded, processed_faces, None
+
+        face_data = processed_faces[0]
+        quality_report = assess_face_quality(
+            self.quality_assessor,
+            decoded.pixels,
+            tuple(int(value) for value in face_data["box"]),
+            face_data.get("landmarks"),
+            analysis_cache=self.analysis_cache,
+            digest=digest,
+        )
+        return decoded, processed_faces, quality_report
+
     async def delete_face(
         self,
         criminal_id: UUID,
@@ -353,13 +386,6 @@ class FaceEnrollmentService:
             "template": self._serialize_template_response(template),
         }
 
-    def _decode_image(self, image_bytes: bytes) -> np.ndarray:
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        img_np = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        if img_np is None:
-            raise ValueError("Invalid image data")
-        return cv2.cvtColor(img_np, cv2.COLOR_BGR2RGB)
-
     def _store_image(
         self,
         criminal_id: UUID,
@@ -1,9 +1,9 @@
+from dataclasses import asdict
 from typing import Any
 
-import cv2
-import numpy as np
-
+from src.services.ai.analysis_cache import FaceAnalysisCache, build_cache_key, image_digest
 from src.services.ai.face_quality import FaceQualityAssessor, FaceQualityReport, sort_quality_warnings
+from src.services.ai.image_ingest import decode_image
 from src.services.ai.pipeline import FaceProcessingPipeline
 
 
@@ -41,18 +41,53 @@ def serialize_quality_report(quality_report: FaceQualityReport) -> dict[str, Any
     }
 
 
+def assess_face_quality(
+    quality_assessor: FaceQualityAssessor,
+    image: Any,
+    box: tuple[int, int, int, int],
+    landmarks: Any = None,
+    *,
+    analysis_cache: FaceAnalysisCache | None = None,
+    digest: str | None = None,
+) -> FaceQualityReport:
+    """Quality report for one face, shared through the analysis cache between preview and enrollment."""
+    cache_key = None
+    if analysis_cache is not None and digest:
+        cache_key = build_cache_key(
+            digest,
+            "quality",
+            image.shape,
+            tuple(int(value) for value in box),
+            landmarks,
+            type(quality_assessor).__name__,
+        )
+        cached_report = analysis_cache.get(cache_key)
+        if cached_report is not None:
+            return FaceQualityReport(**cached_report)
+
+    quality_report = quality_assessor.assess(image, box, landmarks=landmarks)
+    if cache_key is not None:
+        analysis_cache.put(cache_key, asdict(quality_report))
+    return quality_report
+
+
 class FaceQualityService:
     def __init__(
         self,
         pipeline: FaceProcessingPipeline,
         quality_assessor: FaceQualityAssessor | None = None,
+        analysis_cache: FaceAnalysisCache | None = None,
     ) -> None:
         self.pipeline = pipeline
         self.quality_assessor = quality_assessor or FaceQualityAssessor()
+        self.analysis_cache = analysis_cache
 
     def preview_image(self, image_bytes: bytes) -> dict[str, Any]:
-        image = self._decode_image(image_bytes)
-        face_regions = self.pipeline.extract_face_regions(image)
+        # Full resolution (within the pixel budget): quality metrics are calibrated on native face sizes.
+        decoded = decode_image(image_bytes)
+        image = decoded.pixels
+        digest = image_digest(image_bytes)
+        face_regions = self.pipeline.extract_face_regions(image, image_digest=digest)
 
         if not face_regions:
             return {
@@ -75,10 +110,13 @@ class FaceQualityService:
             }
 
         face_region = face_regions[0]
-        quality_report = self.quality_assessor.assess(
+        quality_report = assess_face_quality(
+            self.quality_assessor,
             image,
             face_region["box"],
-            landmarks=face_region.get("landmarks"),
+            face_region.get("landmarks"),
+            analysis_cache=self.analysis_cache,
+            digest=digest,
         )
         decision_reason = quality_report.primary_rejection_reason or quality_report.status
 
@@ -87,13 +125,6 @@ class FaceQualityService:
             "detected_face_count": 1,
             "decision_reason": decision_reason,
             "message": get_quality_reason_message(decision_reason),
-            "box": face_region["box"],
+            "box": decoded.box_to_original(face_region["box"]),
             "quality": serialize_quality_report(quality_report),
         }
-
-    def _decode_image(self, image_bytes: bytes) -> np.ndarray:
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        img_np = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        if img_np is None:
-            raise ValueError("Invalid image data")
-        return cv2.cvtColor(img_np, cv2.COLOR_BGR2RGB)
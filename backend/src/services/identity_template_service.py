@@ -9,6 +9,7 @@ from src.domain.models.face import FaceEmbedding
 from src.domain.models.identity_template import IdentityTemplate
 from src.infrastructure.repositories.face import FaceRepository
 from src.infrastructure.repositories.identity_template import IdentityTemplateRepository
+from src.services.template_gallery import TemplateGallery, template_gallery as shared_template_gallery
 
 
 TEMPLATE_VERSION = "tracenet_template_v1"
@@ -23,14 +24,17 @@ class IdentityTemplateService:
         self,
         template_repo: IdentityTemplateRepository,
         face_repo: FaceRepository,
+        template_gallery: TemplateGallery | None = None,
     ) -> None:
         self.template_repo = template_repo
         self.face_repo = face_repo
+        self.template_gallery = template_gallery if template_gallery is not None else shared_template_gallery
 
     async def rebuild_for_criminal(self, criminal_id: UUID) -> IdentityTemplate | None:
         faces = await self.face_repo.list_by_criminal(criminal_id)
         if not faces:
             await self.template_repo.delete_by_criminal(criminal_id)
+            self.template_gallery.remove(criminal_id)
             return None
 
         build_result = self._build_template(faces)
@@ -39,9 +43,11 @@ class IdentityTemplateService:
         template_payload = build_result.get("template_payload")
         if template_payload is None:
             await self.template_repo.delete_by_criminal(criminal_id)
+            self.template_gallery.remove(criminal_id)
             return None
 
         template = await self.template_repo.upsert_template(criminal_id, template_payload)
+        self.template_gallery.upsert(template)
         logger.info(
             "Rebuilt identity template for criminal %s using %s active faces (%s outliers).",
             criminal_id,
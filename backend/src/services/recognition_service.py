@@ -1,7 +1,10 @@
-from typing import List, Dict, Any
-import cv2
+from typing import List, Dict, Any, Tuple
 import numpy as np
 
+from src.services.ai.analysis_cache import image_digest
+from src.services.ai.image_ingest import DecodedImage, decode_image
+from src.services.ai.inference_executor import InferenceExecutor, inference_executor as shared_inference_executor
+from src.services.ai.micro_batcher import EmbeddingMicroBatcher
 from src.services.ai.pipeline import FaceProcessingPipeline
 from src.services.candidate_reranker import CandidateReranker
 from src.services.recognition_policy_service import (
@@ -15,6 +18,8 @@ from src.infrastructure.repositories.face import FaceRepository
 from src.infrastructure.repositories.identity_template import IdentityTemplateRepository
 from src.infrastructure.repositories.criminal import CriminalRepository
 from src.infrastructure.repositories.audit import AuditRepository
+from src.services.template_gallery import TemplateGallery, template_gallery as shared_template_gallery
+from src.services.two_stage_retrieval import TwoStageRetriever
 from src.domain.models.audit import AuditLog
 from src.core.logging import logger
 
@@ -29,6 +34,11 @@ class RecognitionService:
         audit_repo: AuditRepository,
         policy_service: RecognitionPolicyService | None = None,
         candidate_reranker: CandidateReranker | None = None,
+        template_gallery: TemplateGallery | None = None,
+        inference_executor: InferenceExecutor | None = None,
+        embedding_batcher: EmbeddingMicroBatcher | None = None,
+        embedding_version: str | None = None,
+        two_stage_retriever: TwoStageRetriever | None = None,
     ):
         self.pipeline = pipeline
         self.template_repo = template_repo
@@ -37,6 +47,13 @@ class RecognitionService:
         self.audit_repo = audit_repo
         self.policy_service = policy_service or RecognitionPolicyService()
         self.candidate_reranker = candidate_reranker or CandidateReranker()
+        self.template_gallery = template_gallery if template_gallery is not None else shared_template_gallery
+        self.inference_executor = inference_executor or shared_inference_executor
+        self.embedding_batcher = embedding_batcher
+        # Gallery scans only rank this embedding version; the database path is scoped by template_repo.
+        self.embedding_version = embedding_version
+        # Set: shortlist coarse_candidates templates, then re-rank them against support faces.
+        self.two_stage_retriever = two_stage_retriever
 
     async def identify_suspects(
         self,
@@ -54,31 +71,60 @@ class RecognitionService:
         2. Query Vector DB for matches.
         3. Enrich with Criminal Profile data.
         """
-        # Convert bytes to numpy
-        nparr = np.frombuffer(image_bytes, np.uint8)
-        img_np = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-        if img_np is None:
-            raise ValueError("Invalid image data")
-        
-        # Convert BGR to RGB (OpenCV default is BGR, AI usually expects RGB or handles it)
-        img_rgb = cv2.cvtColor(img_np, cv2.COLOR_BGR2RGB)
-        
-        processed_faces = self.pipeline.process_image(img_rgb)
+        # Scene mode looks for every face, including small ones in crowds, so it adds the tiled pass.
+        detection_timings: Dict[str, Any] = {}
+        decoded, processed_faces = await self._process_image(
+            image_bytes,
+            single_face_only=single_face_only,
+            timings=detection_timings,
+        )
         detected_face_count = len(processed_faces)
         if single_face_only and processed_faces:
             processed_faces = [self._select_largest_face(processed_faces)]
         
+        if len(processed_faces) == 1:
+            candidates_per_face = [await self._rank_criminal_candidates(processed_faces[0]['embedding'], limit=10)]
+        else:
+            candidates_per_face = await self._rank_criminal_candidates_batch(
+                [face_data['embedding'] for face_data in processed_faces],
+                limit=10,
+            )
+        candidates_per_face = await self._drop_stale_candidates(candidates_per_face)
+
+        face_rankings = []
+        for face_data, candidates in zip(processed_faces, candidates_per_face):
+            ranked_candidates = self.candidate_reranker.rerank(candidates)
+            decision = None
+            if ranked_candidates:
+                decision = self.policy_service.evaluate(
+                    best_distance=float(ranked_candidates[0]["distance"]),
+                    second_best_distance=(
+                        float(ranked_candidates[1]["distance"]) if len(ranked_candidates) > 1 else None
+                    ),
+                    match_threshold=threshold,
+                    possible_match_threshold=possible_match_threshold,
+                    match_separation_margin=match_separation_margin,
+                    possible_match_separation_margin=possible_match_separation_margin,
+                )
+            face_rankings.append((face_data, ranked_candidates, decision))
+
+        # Fetch every criminal/primary face any face needs in one bulk lookup each.
+        candidates_to_enrich = []
+        for _face_data, ranked_candidates, decision in face_rankings:
+            if not ranked_candidates:
+                continue
+            if include_debug:
+                candidates_to_enrich.extend(ranked_candidates[:3])
+            elif decision.status != "unknown":
+                candidates_to_enrich.append(ranked_candidates[0])
+        candidate_records = await self._load_candidate_records(candidates_to_enrich)
+
         final_results = []
         debug_faces = []
         
-        for face_data in processed_faces:
-            embedding = face_data['embedding']
-            box = tuple(int(value) for value in face_data['box'])
+        for face_data, ranked_candidates, decision in face_rankings:
+            box = decoded.box_to_original(face_data['box'])
             area = int(box[2] * box[3])
-            
-            ranked_candidates = self.candidate_reranker.rerank(
-                await self._rank_criminal_candidates(embedding, limit=10)
-            )
 
             if not ranked_candidates:
                 decision_reason = "no_candidate_embeddings"
@@ -107,19 +153,11 @@ class RecognitionService:
             second_best_other_distance = (
                 float(ranked_candidates[1]["distance"]) if len(ranked_candidates) > 1 else None
             )
-            decision = self.policy_service.evaluate(
-                best_distance=distance,
-                second_best_distance=second_best_other_distance,
-                match_threshold=threshold,
-                possible_match_threshold=possible_match_threshold,
-                match_separation_margin=match_separation_margin,
-                possible_match_separation_margin=possible_match_separation_margin,
-            )
 
             if decision.status == "unknown":
                 debug_top_candidates = []
                 if include_debug:
-                    debug_top_candidates = await self._enrich_candidates(ranked_candidates[:3])
+                    debug_top_candidates = self._enrich_candidates(ranked_candidates[:3], candidate_records)
                 result = {
                     "box": box,
                     "status": "unknown",
@@ -140,7 +178,7 @@ class RecognitionService:
                     })
                 continue
 
-            best_candidate_data = await self._enrich_candidate(best_candidate)
+            best_candidate_data = self._enrich_candidate(best_candidate, candidate_records)
             if best_candidate_data is None:
                 logger.warning(
                     "Recognition candidate referenced missing criminal record: %s",
@@ -176,7 +214,7 @@ class RecognitionService:
             }
             final_results.append(result)
             if include_debug:
-                debug_top_candidates = await self._enrich_candidates(ranked_candidates[:3])
+                debug_top_candidates = self._enrich_candidates(ranked_candidates[:3], candidate_records)
                 debug_faces.append({
                     "box": box,
                     "area": area,
@@ -205,6 +243,7 @@ class RecognitionService:
                 "possible_match_separation_margin": possible_match_separation_margin,
                 "single_face_only": single_face_only,
                 "detected_face_count": detected_face_count,
+                "detection_timings": detection_timings,
                 "analyzed_face_count": len(processed_faces),
                 "faces": debug_faces,
             }
@@ -214,6 +253,54 @@ class RecognitionService:
             "debug": debug_payload,
         }
 
+    async def _process_image(
+        self,
+        image_bytes: bytes,
+        *,
+        single_face_only: bool = True,
+        timings: Dict[str, Any] | None = None,
+    ) -> Tuple[DecodedImage, List[Dict[str, Any]]]:
+        # Single-face uploads only need the detector's resolution, so large JPEGs are decoded reduced;
+        # scene mode keeps full resolution for the tiled pass over small faces.
+        target_max_side = getattr(self.pipeline, "detection_max_side", None) if single_face_only else None
+        tiled = not single_face_only
+
+        # Decoding and hashing happen in the same executor call as detection, never on the event loop.
+        if self.embedding_batcher is None:
+            def decode_and_process() -> Tuple[DecodedImage, List[Dict[str, Any]]]:
+                decoded = decode_image(image_bytes, target_max_side=target_max_side)
+                return decoded, self.pipeline.process_image(
+                    decoded.pixels,
+                    tiled=tiled,
+                    timings=timings,
+                    image_digest=image_digest(image_bytes),
+                )
+
+            return await self.inference_executor.run(decode_and_process)
+
+        def decode_and_extract() -> Tuple[DecodedImage, str, List[Dict[str, Any]] | None, List[Dict[str, Any]]]:
+            decoded = decode_image(image_bytes, target_max_side=target_max_side)
+            digest = image_digest(image_bytes)
+            cached_faces = self.pipeline.load_cached_faces(
+                decoded.pixels, image_digest=digest, tiled=tiled, timings=timings
+            )
+            if cached_faces is not None:
+                return decoded, digest, cached_faces, []
+            face_regions = self.pipeline.extract_face_regions(
+                decoded.pixels, tiled=tiled, timings=timings, image_digest=digest
+            )
+            return decoded, digest, None, face_regions
+
+        decoded, digest, cached_faces, face_regions = await self.inference_executor.run(decode_and_extract)
+        if cached_faces is not None:
+            return decoded, cached_faces
+
+        # Detection stays per request; embedding joins the cross-request micro-batch.
+        embeddings = await self.embedding_batcher.embed([face_region["crop"] for face_region in face_regions])
+        processed_faces = self.pipeline.assemble_results(face_regions, embeddings)
+        self.pipeline.cache_faces(decoded.pixels, processed_faces, image_digest=digest, tiled=tiled)
+        return decoded, processed_faces
+
     def _select_largest_face(self, processed_faces: List[Dict[str, Any]]) -> Dict[str, Any]:
         return max(processed_faces, key=lambda face: face["box"][2] * face["box"][3])
 
@@ -232,7 +319,67 @@ class RecognitionService:
         embedding: List[float],
         limit: int = 10,
     ) -> List[Dict[str, Any]]:
-        matches = await self.template_repo.find_nearest_neighbors(embedding, limit=limit)
+        if self.two_stage_retriever is not None:
+            return (await self._rank_criminal_candidates_two_stage([embedding], limit=limit))[0]
+
+        matches = self.template_gallery.search(embedding, limit=limit, embedding_version=self.embedding_version)
+        if matches is not None:
+            return self._gallery_candidates(matches)
+
+        # Database path: one statement returns the templates with their profile data.
+        rows = await self.template_repo.find_nearest_candidates(embedding, limit=limit)
+        return self._row_candidates(rows)
+
+    async def _rank_criminal_candidates_batch(
+        self,
+        embeddings: List[List[float]],
+        limit: int = 10,
+    ) -> List[List[Dict[str, Any]]]:
+        """Scene mode: rank every face with one gallery scan or one database round-trip."""
+        if not embeddings:
+            return []
+        if self.two_stage_retriever is not None:
+            return await self._rank_criminal_candidates_two_stage(embeddings, limit=limit)
+
+        matches_per_face = self.template_gallery.search_many(
+            embeddings,
+            limit=limit,
+            embedding_version=self.embedding_version,
+        )
+        if matches_per_face is not None:
+            return [self._gallery_candidates(matches) for matches in matches_per_face]
+
+        rows_per_face = await self.template_repo.find_nearest_candidates_batch(embeddings, limit=limit)
+        return [self._row_candidates(rows) for rows in rows_per_face]
+
+    async def _rank_criminal_candidates_two_stage(
+        self,
+        embeddings: List[List[float]],
+        limit: int = 10,
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Stage one: binary-code gallery scan (or the ANN index) for coarse_candidates
+        templates per face. Stage two: exact re-rank against their support faces.
+        """
+        coarse_limit = max(self.two_stage_retriever.coarse_candidates, limit)
+        matches_per_face = self.template_gallery.coarse_search_many(
+            embeddings,
+            limit=coarse_limit,
+            embedding_version=self.embedding_version,
+        )
+        if matches_per_face is not None:
+            candidates_per_face = [self._gallery_candidates(matches) for matches in matches_per_face]
+        elif len(embeddings) == 1:
+            rows = await self.template_repo.find_nearest_candidates(embeddings[0], limit=coarse_limit)
+            candidates_per_face = [self._row_candidates(rows)]
+        else:
+            rows_per_face = await self.template_repo.find_nearest_candidates_batch(embeddings, limit=coarse_limit)
+            candidates_per_face = [self._row_candidates(rows) for rows in rows_per_face]
+
+        reranked = await self.two_stage_retriever.rerank_many(embeddings, candidates_per_face)
+        return [candidates[:limit] for candidates in reranked]
+
+    def _gallery_candidates(self, matches: List[Any]) -> List[Dict[str, Any]]:
         return [
             {
                 "criminal_id": str(template.criminal_id),
@@ -242,29 +389,119 @@ class RecognitionService:
             for template, distance in matches
         ]
 
-    async def _enrich_candidates(
+    def _row_candidates(self, rows: List[Any]) -> List[Dict[str, Any]]:
+        return [
+            {
+                "criminal_id": str(row.template.criminal_id),
+                "template": row.template,
+                "distance": float(row.distance),
+                "criminal": row.criminal,
+                "primary_face": row.primary_face,
+            }
+            for row in rows
+        ]
+
+    async def _drop_stale_candidates(
+        self,
+        candidates_per_face: List[List[Dict[str, Any]]],
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        Gallery candidates are checked against the criminals table before any decision.
+
+        A worker's in-memory gallery only hears about deletes and merges made in that
+        process, so until its next consistency refresh it may still rank a criminal that
+        no longer exists. Those candidates are dropped; the rest get their criminal
+        attached, so enrichment does not look it up again. Candidates from the joined
+        database search already carry a live criminal.
+        """
+        criminal_ids = list(dict.fromkeys(
+            candidate["template"].criminal_id
+            for candidates in candidates_per_face
+            for candidate in candidates
+            if "criminal" not in candidate
+        ))
+        if not criminal_ids:
+            return candidates_per_face
+
+        criminals = {criminal.id: criminal for criminal in await self.criminal_repo.get_many(criminal_ids)}
+        live_candidates_per_face = []
+        for candidates in candidates_per_face:
+            live_candidates = []
+            for candidate in candidates:
+                if "criminal" not in candidate:
+                    criminal = criminals.get(candidate["template"].criminal_id)
+                    if criminal is None:
+                        continue
+                    candidate = {**candidate, "criminal": criminal}
+                live_candidates.append(candidate)
+            live_candidates_per_face.append(live_candidates)
+        return live_candidates_per_face
+
+    async def _load_candidate_records(
+        self,
+        ranked_candidates: List[Dict[str, Any]],
+    ) -> Dict[str, Dict[Any, Any]]:
+        # Candidates from the joined search already carry their criminal and primary face.
+        criminals = {
+            candidate["template"].criminal_id: candidate["criminal"]
+            for candidate in ranked_candidates
+            if "criminal" in candidate and candidate["criminal"] is not None
+        }
+        primary_faces = {
+            candidate["template"].primary_face_id: candidate["primary_face"]
+            for candidate in ranked_candidates
+            if "primary_face" in candidate and candidate["primary_face"] is not None
+        }
+
+        criminal_ids = list(dict.fromkeys(
+            candidate["template"].criminal_id
+            for candidate in ranked_candidates
+            if "criminal" not in candidate
+        ))
+        primary_face_ids = list(dict.fromkeys(
+            candidate["template"].primary_face_id
+            for candidate in ranked_candidates
+            if "primary_face" not in candidate and getattr(candidate["template"], "primary_face_id", None)
+        ))
+
+        if criminal_ids:
+            criminals.update(
+                (criminal.id, criminal) for criminal in await self.criminal_repo.get_many(criminal_ids)
+            )
+        if primary_face_ids:
+            primary_faces.update(
+                (face.id, face) for face in await self.face_repo.get_primary_faces_by_ids(primary_face_ids)
+            )
+        return {
+            "criminals": criminals,
+            "primary_faces": primary_faces,
+        }
+
+    def _enrich_candidates(
         self,
         ranked_candidates: List[Dict[str, Any]],
+        candidate_records: Dict[str, Dict[Any, Any]],
     ) -> List[Dict[str, Any]]:
         enriched_candidates: List[Dict[str, Any]] = []
         for candidate in ranked_candidates:
-            enriched_candidate = await self._enrich_candidate(candidate)
+            enriched_candidate = self._enrich_candidate(candidate, candidate_records)
             if enriched_candidate is not None:
                 enriched_candidates.append(enriched_candidate)
         return enriched_candidates
 
-    async def _enrich_candidate(
+    def _enrich_candidate(
         self,
         ranked_candidate: Dict[str, Any],
+        candidate_records: Dict[str, Dict[Any, Any]],
     ) -> Dict[str, Any] | None:
         template = ranked_candidate["template"]
-        criminal = await self.criminal_repo.get(template.criminal_id)
+        criminal = candidate_records["criminals"].get(template.criminal_id)
         if not criminal:
             return None
 
         primary_face = None
         if getattr(template, "primary_face_id", None):
-            primary_face = await self.face_repo.get(template.primary_face_id)
+            primary_face = candidate_records["primary_faces"].get(template.primary_face_id)
 
         return {
             "criminal": {
@@ -0,0 +1,445 @@
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterable, List, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import func
+from sqlmodel import select
+
+from src.core.logging import logger
+from src.domain.models.identity_template import IdentityTemplate
+from src.services.two_stage_retrieval import binarize, hamming_distances
+
+
+INITIAL_CAPACITY = 1024
+
+
+@dataclass(frozen=True)
+class GalleryTemplate:
+    """Detached copy of the IdentityTemplate columns recognition needs after ranking."""
+
+    id: UUID
+    criminal_id: UUID
+    template_version: str
+    embedding_version: str
+    primary_face_id: UUID | None
+    support_face_ids: str | None
+    active_face_count: int
+    support_face_count: int
+    archived_face_count: int
+    outlier_face_count: int
+    updated_at: datetime | None
+
+    @classmethod
+    def from_template(cls, template: Any) -> "GalleryTemplate":
+        return cls(
+            id=template.id,
+            criminal_id=template.criminal_id,
+            template_version=template.template_version,
+            embedding_version=template.embedding_version,
+            primary_face_id=getattr(template, "primary_face_id", None),
+            support_face_ids=getattr(template, "support_face_ids", None),
+            active_face_count=int(getattr(template, "active_face_count", 0) or 0),
+            support_face_count=int(getattr(template, "support_face_count", 0) or 0),
+            archived_face_count=int(getattr(template, "archived_face_count", 0) or 0),
+            outlier_face_count=int(getattr(template, "outlier_face_count", 0) or 0),
+            updated_at=getattr(template, "updated_at", None),
+        )
+
+
+class TemplateGallery:
+    """
+    Memory-resident copy of every identity template embedding.
+
+    Rows live in one contiguous float32 matrix so a probe is ranked with a single
+    matmul + argpartition instead of a pgvector round-trip. The gallery only answers
+    queries after `load()`; until then (or when the probe dimension does not match)
+    `search()` returns None and callers fall back to IdentityTemplateRepository.
+    Each row also carries a small integer code for its embedding_version so a
+    search can be scoped to one embedding space, like the repository's partial indexes.
+    Sign-binarized copies of the rows back `coarse_search_many`, the first stage of
+    two-stage retrieval.
+
+    Every API worker holds its own gallery, and `upsert`/`remove` only reach the
+    process that called them; `refresh_if_changed` picks up the other workers' writes.
+    """
+
+    def __init__(self, initial_capacity: int = INITIAL_CAPACITY) -> None:
+        self._lock = threading.RLock()
+        self._initial_capacity = max(int(initial_capacity), 1)
+        self._matrix: np.ndarray | None = None
+        self._squared_norms: np.ndarray | None = None
+        self._version_codes: np.ndarray | None = None
+        self._binary_codes: np.ndarray | None = None
+        self._version_ids: dict[str, int] = {}
+        self._templates: list[GalleryTemplate] = []
+        self._rows_by_criminal: dict[UUID, int] = {}
+        # Newest updated_at among the loaded rows; refresh_if_changed fetches rows past it.
+        self._watermark: datetime | None = None
+        self._loaded = False
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def size(self) -> int:
+        return len(self._templates)
+
+    @property
+    def dimension(self) -> int | None:
+        return None if self._matrix is None else int(self._matrix.shape[1])
+
+    async def load(self, session: AsyncSession) -> int:
+        result = await session.execute(select(IdentityTemplate))
+        templates = result.scalars().all()
+        self.load_templates(templates)
+        logger.info("Loaded %s identity templates into the in-memory gallery.", self.size)
+        return self.size
+
+    def load_templates(self, templates: Iterable[Any]) -> None:
+        templates = [template for template in templates if template.template_embedding is not None]
+        with self._lock:
+            if not templates:
+                self._matrix = None
+                self._squared_norms = None
+                self._version_codes = None
+                self._binary_codes = None
+                self._version_ids = {}
+                self._templates = []
+                self._rows_by_criminal = {}
+                self._watermark = None
+                self._loaded = True
+                return
+
+            embeddings = np.asarray(
+                [np.asarray(template.template_embedding, dtype=np.float32) for template in templates],
+                dtype=np.float32,
+            )
+            capacity = max(self._initial_capacity, len(templates))
+            matrix = np.zeros((capacity, embeddings.shape[1]), dtype=np.float32)
+            matrix[: len(templates)] = embeddings
+            squared_norms = np.zeros(capacity, dtype=np.float32)
+            squared_norms[: len(templates)] = np.einsum("ij,ij->i", embeddings, embeddings)
+
+            self._matrix = matrix
+            self._squared_norms = squared_norms
+            self._templates = [GalleryTemplate.from_template(template) for template in templates]
+            self._version_ids = {}
+            self._version_codes = np.zeros(capacity, dtype=np.int32)
+            self._version_codes[: len(templates)] = [
+                self._version_code(template.embedding_version) for template in self._templates
+            ]
+            self._binary_codes = binarize(matrix)
+            self._rows_by_criminal = {
+                template.criminal_id: row for row, template in enumerate(self._templates)
+            }
+            self._watermark = max(
+                (template.updated_at for template in self._templates if template.updated_at is not None),
+                default=None,
+            )
+            self._loaded = True
+
+    def upsert(self, template: Any) -> None:
+        """Insert or replace a criminal's template row. No-op until the gallery is loaded."""
+        if not self._loaded or template is None or template.template_embedding is None:
+            return
+
+        embedding = np.asarray(template.template_embedding, dtype=np.float32).reshape(-1)
+        with self._lock:
+            if self._matrix is None:
+                self._matrix = np.zeros((self._initial_capacity, embedding.shape[0]), dtype=np.float32)
+                self._squared_norms = np.zeros(self._initial_capacity, dtype=np.float32)
+                self._version_codes = np.zeros(self._initial_capacity, dtype=np.int32)
+                self._binary_codes = binarize(self._matrix)
+            if embedding.shape[0] != self._matrix.shape[1]:
+                logger.warning(
+                    "Skipping gallery update for criminal %s: embedding dimension %s != %s.",
+                    template.criminal_id,
+                    embedding.shape[0],
+                    self._matrix.shape[1],
+                )
+                return
+
+            row = self._rows_by_criminal.get(template.criminal_id)
+            if row is None:
+                row = len(self._templates)
+                self._ensure_capacity(row + 1)
+                self._templates.append(GalleryTemplate.from_template(template))
+                self._rows_by_criminal[template.criminal_id] = row
+            else:
+                self._templates[row] = GalleryTemplate.from_template(template)
+
+            self._matrix[row] = embedding
+            self._squared_norms[row] = float(np.dot(embedding, embedding))
+            self._version_codes[row] = self._version_code(self._templates[row].embedding_version)
+            self._binary_codes[row] = binarize(embedding)
+            updated_at = self._templates[row].updated_at
+            if updated_at is not None and (self._watermark is None or updated_at > self._watermark):
+                self._watermark = updated_at
+
+    def remove(self, criminal_id: UUID) -> bool:
+        """Drop a criminal's row by swapping the last row into its slot."""
+        if not self._loaded:
+            return False
+
+        with self._lock:
+            row = self._rows_by_criminal.pop(criminal_id, None)
+            if row is None:
+                return False
+
+            last_row = len(self._templates) - 1
+            if row != last_row:
+                moved_template = self._templates[last_row]
+                self._matrix[row] = self._matrix[last_row]
+                self._squared_norms[row] = self._squared_norms[last_row]
+                self._version_codes[row] = self._version_codes[last_row]
+                self._binary_codes[row] = self._binary_codes[last_row]
+                self._templates[row] = moved_template
+                self._rows_by_criminal[moved_template.criminal_id] = row
+            self._templates.pop()
+            return True
+
+    def search(
+        self,
+        query_vector: List[float],
+        limit: int = 5,
+        *,
+        embedding_version: str | None = None,
+    ) -> List[Tuple[GalleryTemplate, float]] | None:
+        """
+        Returns (GalleryTemplate, L2 distance) tuples, closest first, matching
+        IdentityTemplateRepository.find_nearest_neighbors. Returns None when the
+        gallery cannot answer the query and the caller should use the database.
+        With an embedding_version only templates of that version are ranked.
+        """
+        matches = self.search_many([query_vector], limit=limit, embedding_version=embedding_version)
+        return matches[0] if matches is not None else None
+
+    def search_many(
+        self,
+        query_vectors: List[List[float]],
+        limit: int = 5,
+        *,
+        embedding_version: str | None = None,
+    ) -> List[List[Tuple[GalleryTemplate, float]]] | None:
+        """
+        Batched search: one result list per query vector, in input order, scored
+        with a single matrix product. Returns None under the same conditions as search.
+        """
+        if not self._loaded:
+            return None
+        if not query_vectors:
+            return []
+
+        queries = np.asarray(query_vectors, dtype=np.float32)
+        if queries.ndim != 2:
+            return None
+        with self._lock:
+            count = len(self._templates)
+            if count == 0:
+                return [[] for _query in query_vectors]
+            if queries.shape[1] != self._matrix.shape[1]:
+                return None
+
+            # ||t - q||^2 = ||t||^2 - 2 t.q + ||q||^2, with ||t||^2 cached per row.
+            squared_distances = self._squared_norms[:count] - 2.0 * (queries @ self._matrix[:count].T)
+            squared_distances += np.einsum("ij,ij->i", queries, queries)[:, None]
+            top_k = min(max(int(limit), 0), count)
+            if embedding_version is not None:
+                version_code = self._version_ids.get(embedding_version)
+                if version_code is None:
+                    return [[] for _query in query_vectors]
+                other_versions = self._version_codes[:count] != version_code
+                if other_versions.any():
+                    # Pushed past every real distance; top_k never reaches them.
+                    squared_distances[:, other_versions] = np.inf
+                    top_k = min(top_k, count - int(np.count_nonzero(other_versions)))
+            if top_k == 0:
+                return [[] for _query in query_vectors]
+            if top_k < count:
+                candidate_rows = np.argpartition(squared_distances, top_k - 1, axis=1)[:, :top_k]
+            else:
+                candidate_rows = np.broadcast_to(np.arange(count), squared_distances.shape)
+            candidate_distances = np.take_along_axis(squared_distances, candidate_rows, axis=1)
+            order = np.argsort(candidate_distances, axis=1, kind="stable")
+            candidate_rows = np.take_along_axis(candidate_rows, order, axis=1)
+            distances = np.sqrt(np.maximum(np.take_along_axis(candidate_distances, order, axis=1), 0.0))
+            return [
+                [
+                    (self._templates[row], float(distance))
+                    for row, distance in zip(rows.tolist(), row_distances.tolist())
+                ]
+                for rows, row_distances in zip(candidate_rows, distances)
+            ]
+
+    def coarse_search_many(
+        self,
+        query_vectors: List[List[float]],
+        limit: int = 50,
+        *,
+        embedding_version: str | None = None,
+    ) -> List[List[Tuple[GalleryTemplate, float]]] | None:
+        """
+        search_many whose ranking pass reads only the binary codes: Hamming distance
+        between sign bits picks `limit` templates per query, and only those rows get
+        exact float32 distances (returned closest first). Returns None under the same
+        conditions as search.
+        """
+        if not self._loaded:
+            return None
+        if not query_vectors:
+            return []
+
+        queries = np.asarray(query_vectors, dtype=np.float32)
+        if queries.ndim != 2:
+            return None
+        with self._lock:
+            count = len(self._templates)
+            if count == 0:
+                return [[] for _query in query_vectors]
+            if queries.shape[1] != self._matrix.shape[1]:
+                return None
+
+            eligible_rows = None
+            if embedding_version is not None:
+                version_code = self._version_ids.get(embedding_version)
+                if version_code is None:
+                    return [[] for _query in query_vectors]
+                eligible_rows = np.flatnonzero(self._version_codes[:count] == version_code)
+            codes = self._binary_codes[:count] if eligible_rows is None else self._binary_codes[eligible_rows]
+            top_k = min(max(int(limit), 0), len(codes))
+            if top_k == 0:
+                return [[] for _query in query_vectors]
+
+            matches_per_query = []
+            for query, query_code in zip(queries, binarize(queries)):
+                hamming = hamming_distances(codes, query_code)
+                shortlist = (
+                    np.argpartition(hamming, top_k - 1)[:top_k] if top_k < len(codes) else np.arange(len(codes))
+                )
+                rows = shortlist if eligible_rows is None else eligible_rows[shortlist]
+                squared_distances = (
+                    self._squared_norms[rows] - 2.0 * (self._matrix[rows] @ query) + float(np.dot(query, query))
+                )
+                order = np.argsort(squared_distances, kind="stable")
+                distances = np.sqrt(np.maximum(squared_distances[order], 0.0))
+                matches_per_query.append([
+                    (self._templates[row], float(distance))
+                    for row, distance in zip(rows[order].tolist(), distances.tolist())
+                ])
+            return matches_per_query
+
+    async def refresh_if_changed(self, session: AsyncSession) -> bool:
+        """
+        Brings the gallery up to date with identity_templates before it serves a request.
+
+        One aggregate query (row count and newest updated_at) detects writes made by
+        other workers. Templates enrolled or rebuilt since the gallery's watermark are
+        upserted; when the row count still differs afterwards (a template was deleted),
+        the gallery is reloaded. Returns True when anything was refreshed.
+        """
+        if not self._loaded:
+            return False
+
+        result = await session.execute(
+            select(func.count(IdentityTemplate.id), func.max(IdentityTemplate.updated_at))
+        )
+        database_count, latest_updated_at = result.one()
+        with self._lock:
+            watermark = self._watermark
+            gallery_count = len(self._templates)
+        if database_count == gallery_count and latest_updated_at == watermark:
+            return False
+
+        if latest_updated_at is not None and (watermark is None or latest_updated_at > watermark):
+            statement = select(IdentityTemplate)
+            if watermark is not None:
+                statement = statement.where(IdentityTemplate.updated_at >= watermark)
+            changed = (await session.execute(statement)).scalars().all()
+            for template in changed:
+                self.upsert(template)
+            logger.info("Refreshed %s identity templates written by other workers.", len(changed))
+        if self.size != database_count:
+            await self.load(session)
+        return True
+
+    async def check_consistency(
+        self,
+        session: AsyncSession,
+        *,
+        repair: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Compares gallery rows against identity_templates by criminal_id and updated_at.
+        Writers outside this process (migration/rebuild scripts) only show up here.
+        """
+        result = await session.execute(
+            select(IdentityTemplate.criminal_id, IdentityTemplate.updated_at)
+        )
+        database_rows = {criminal_id: updated_at for criminal_id, updated_at in result.all()}
+
+        with self._lock:
+            gallery_rows = {
+                template.criminal_id: template.updated_at for template in self._templates
+            }
+
+        missing_from_gallery = [criminal_id for criminal_id in database_rows if criminal_id not in gallery_rows]
+        missing_from_database = [criminal_id for criminal_id in gallery_rows if criminal_id not in database_rows]
+        stale = [
+            criminal_id
+            for criminal_id, updated_at in database_rows.items()
+            if criminal_id in gallery_rows and gallery_rows[criminal_id] != updated_at
+        ]
+        consistent = not (missing_from_gallery or missing_from_database or stale)
+
+        report = {
+            "consistent": consistent,
+            "database_count": len(database_rows),
+            "gallery_count": len(gallery_rows),
+            "missing_from_gallery": [str(value) for value in missing_from_gallery],
+            "missing_from_database": [str(value) for value in missing_from_database],
+            "stale": [str(value) for value in stale],
+            "repaired": False,
+        }
+
+        if not consistent:
+            logger.warning(
+                "Template gallery drifted from database: %s missing, %s extra, %s stale.",
+                len(missing_from_gallery),
+                len(missing_from_database),
+                len(stale),
+            )
+            if repair:
+                await self.load(session)
+                report["repaired"] = True
+
+        return report
+
+    def _ensure_capacity(self, required_rows: int) -> None:
+        capacity = self._matrix.shape[0]
+        if required_rows <= capacity:
+            return
+
+        new_capacity = max(required_rows, capacity * 2)
+        matrix = np.zeros((new_capacity, self._matrix.shape[1]), dtype=np.float32)
+        matrix[:capacity] = self._matrix
+        squared_norms = np.zeros(new_capacity, dtype=np.float32)
+        squared_norms[:capacity] = self._squared_norms
+        version_codes = np.zeros(new_capacity, dtype=np.int32)
+        version_codes[:capacity] = self._version_codes
+        binary_codes = np.zeros((new_capacity, self._binary_codes.shape[1]), dtype=np.uint8)
+        binary_codes[:capacity] = self._binary_codes
+        self._matrix = matrix
+        self._squared_norms = squared_norms
+        self._version_codes = version_codes
+        self._binary_codes = binary_codes
+
+    def _version_code(self, embedding_version: str) -> int:
+        return self._version_ids.setdefault(embedding_version, len(self._version_ids))
+
+
+template_gallery = TemplateGallery()
@@ -0,0 +1,148 @@
+from typing import Any, Iterable, List
+from uuid import UUID
+
+import numpy as np
+
+from src.infrastructure.repositories.face import FaceRepository
+
+
+DEFAULT_COARSE_CANDIDATES = 50
+DEFAULT_FUSION = "weighted"
+DEFAULT_TEMPLATE_WEIGHT = 0.5
+# template: template distance only (single-vector ranking, no support-face query)
+# support_min: nearest support face
+# min: closer of the template and the nearest support face
+# weighted: template_weight * template + (1 - template_weight) * nearest support face
+FUSION_MODES = ("template", "support_min", "min", "weighted")
+# TwoStageRetriever refuses "template": it would skip the re-rank and keep only the lossy shortlist.
+RERANK_FUSION_MODES = ("support_min", "min", "weighted")
+_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def binarize(vectors: np.ndarray) -> np.ndarray:
+    """Sign bits packed 8 per byte: 64 bytes for a 512-d embedding instead of 2KB."""
+    return np.packbits(np.asarray(vectors) > 0, axis=-1)
+
+
+def hamming_distances(codes: np.ndarray, query_code: np.ndarray) -> np.ndarray:
+    differing = np.bitwise_xor(codes, query_code)
+    bitwise_count = getattr(np, "bitwise_count", None)
+    counts = bitwise_count(differing) if bitwise_count is not None else _POPCOUNT[differing]
+    return counts.sum(axis=-1, dtype=np.int32)
+
+
+def parse_face_ids(serialized: str | None) -> List[UUID]:
+    """Template face id lists are stored "|"-joined (IdentityTemplateService)."""
+    if not serialized:
+        return []
+    return [UUID(value) for value in serialized.split("|") if value]
+
+
+def template_face_ids(template: Any) -> List[UUID]:
+    """The faces a template averages: its primary face plus support_face_ids (which excludes the primary)."""
+    face_ids = parse_face_ids(getattr(template, "support_face_ids", None))
+    primary_face_id = getattr(template, "primary_face_id", None)
+    if primary_face_id is not None and primary_face_id not in face_ids:
+        face_ids.insert(0, primary_face_id)
+    return face_ids
+
+
+def fuse_distance(
+    template_distance: float,
+    support_distances: Iterable[float],
+    *,
+    fusion: str = DEFAULT_FUSION,
+    template_weight: float = DEFAULT_TEMPLATE_WEIGHT,
+) -> float:
+    """Combines a template distance with the identity's support-face distances."""
+    support_distances = list(support_distances)
+    if fusion == "template" or not support_distances:
+        return float(template_distance)
+
+    nearest_support = min(support_distances)
+    if fusion == "support_min":
+        return float(nearest_support)
+    if fusion == "min":
+        return float(min(template_distance, nearest_support))
+    return float(template_weight * template_distance + (1.0 - template_weight) * nearest_support)
+
+
+class TwoStageRetriever:
+    """
+    Second stage of recognition retrieval: exact multi-vector re-rank of a shortlist.
+
+    Stage one (TemplateGallery.coarse_search_many, or the ANN index on the database
+    path) returns `coarse_candidates` templates per probe. Here every shortlisted
+    identity's primary and support faces are loaded in one bulk query and each candidate's
+    distance becomes the fusion of its template and support-face distances.
+    Match thresholds are calibrated on the fused distance, so re-run
+    scripts/evaluate_embeddings.py after changing the fusion.
+    """
+
+    def __init__(
+        self,
+        face_repo: FaceRepository,
+        *,
+        coarse_candidates: int = DEFAULT_COARSE_CANDIDATES,
+        fusion: str = DEFAULT_FUSION,
+        template_weight: float = DEFAULT_TEMPLATE_WEIGHT,
+    ) -> None:
+        if fusion not in RERANK_FUSION_MODES:
+            raise ValueError(f"Unsupported rerank fusion '{fusion}'. Supported: {', '.join(RERANK_FUSION_MODES)}.")
+        self.face_repo = face_repo
+        self.coarse_candidates = max(int(coarse_candidates), 1)
+        self.fusion = fusion
+        self.template_weight = min(max(float(template_weight), 0.0), 1.0)
+
+    async def rerank_many(
+        self,
+        embeddings: List[List[float]],
+        candidates_per_face: List[List[dict[str, Any]]],
+    ) -> List[List[dict[str, Any]]]:
+        """
+        Re-ranks each probe's candidates by fused distance, closest first.
+
+        Candidates keep their stage-one distance as `template_distance`, and
+        `support_distance` holds the nearest support face (None without any).
+        """
+        support_ids_by_candidate = [
+            [template_face_ids(candidate["template"]) for candidate in candidates]
+            for candidates in candidates_per_face
+        ]
+        face_ids = list(dict.fromkeys(
+            face_id
+            for candidate_ids in support_ids_by_candidate
+            for face_ids in candidate_ids
+            for face_id in face_ids
+        ))
+        rows = await self.face_repo.get_embeddings_by_ids(face_ids)
+        support_embeddings = {
+            face_id: np.asarray(embedding, dtype=np.float32)
+            for face_id, _criminal_id, embedding in rows
+            if embedding is not None
+        }
+
+        reranked: List[List[dict[str, Any]]] = []
+        for embedding, candidates, candidate_ids in zip(embeddings, candidates_per_face, support_ids_by_candidate):
+            probe = np.asarray(embedding, dtype=np.float32)
+            fused_candidates = []
+            for candidate, face_ids in zip(candidates, candidate_ids):
+                vectors = [support_embeddings[face_id] for face_id in face_ids if face_id in support_embeddings]
+                support_distances = (
+                    np.linalg.norm(np.stack(vectors) - probe, axis=1).tolist() if vectors else []
+                )
+                template_distance = float(candidate["distance"])
+                fused_candidates.append({
+                    **candidate,
+                    "distance": fuse_distance(
+                        template_distance,
+                        support_distances,
+                        fusion=self.fusion,
+                        template_weight=self.template_weight,
+                    ),
+                    "template_distance": template_distance,
+                    "support_distance": float(min(support_distances)) if support_distances else None,
+                })
+            fused_candidates.sort(key=lambda candidate: candidate["distance"])
+            reranked.append(fused_candidates)
+        return reranked
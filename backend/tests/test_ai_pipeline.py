@@ -1,6 +1,7 @@
 import numpy as np
 
-from src.services.ai.pipeline import FaceProcessingPipeline
+from src.services.ai.analysis_cache import FaceAnalysisCache
+from src.services.ai.pipeline import FaceProcessingPipeline, merge_detections
 
 
 class DetectorWithLandmarks:
@@ -53,3 +54,198 @@ def test_pipeline_falls_back_to_raw_crop_without_landmarks():
 
     assert len(results) == 1
     assert embedder.last_shape == (70, 60, 3)
+
+
+class DetectorWithManyFaces:
+    def detect_faces(self, _image):
+        return [(index * 30, 10, 25, 25) for index in range(5)]
+
+
+class BatchRecordingEmbedder(RecordingEmbedder):
+    def __init__(self, fail_batches=False):
+        super().__init__()
+        self.batch_sizes = []
+        self.fail_batches = fail_batches
+
+    def embed_faces(self, face_images):
+        self.batch_sizes.append(len(face_images))
+        if self.fail_batches:
+            raise RuntimeError("batch failed")
+        return [[float(index)] for index in range(len(face_images))]
+
+
+def test_pipeline_embeds_faces_in_batches_capped_by_max_batch_size():
+    image = np.zeros((60, 160, 3), dtype=np.uint8)
+    embedder = BatchRecordingEmbedder()
+    pipeline = FaceProcessingPipeline(DetectorWithManyFaces(), embedder, max_batch_size=2)
+
+    results = pipeline.process_image(image)
+
+    assert embedder.batch_sizes == [2, 2]
+    assert [result["embedding"] for result in results] == [[0.0], [1.0], [0.0], [1.0], [0.1, 0.2, 0.3]]
+    assert [result["box"][0] for result in results] == [0, 30, 60, 90, 120]
+
+
+def test_pipeline_falls_back_to_single_face_embedding_when_batch_fails():
+    image = np.zeros((60, 160, 3), dtype=np.uint8)
+    embedder = BatchRecordingEmbedder(fail_batches=True)
+    pipeline = FaceProcessingPipeline(DetectorWithManyFaces(), embedder, max_batch_size=8)
+
+    results = pipeline.process_image(image)
+
+    assert embedder.batch_sizes == [5]
+    assert len(results) == 5
+    assert all(result["embedding"] == [0.1, 0.2, 0.3] for result in results)
+
+
+def test_tracenet_embed_faces_matches_single_face_embeddings(tmp_path):
+    import torch
+
+    from src.services.ai.strategies import TraceNetStrategy
+    from src.services.ai.tracenet_model import TraceNet
+
+    torch.manual_seed(0)
+    checkpoint_path = tmp_path / "tracenet.pth"
+    torch.save({"model_state_dict": TraceNet(embedding_size=512).state_dict()}, checkpoint_path)
+    strategy = TraceNetStrategy(model_path=checkpoint_path, device="cpu")
+
+    rng = np.random.default_rng(3)
+    faces = [rng.integers(0, 255, size=(112, 112, 3), dtype=np.uint8) for _ in range(3)]
+
+    batched = np.asarray(strategy.embed_faces(faces))
+    single = np.asarray([strategy.embed_face(face) for face in faces])
+
+    assert batched.shape == (3, 512)
+    np.testing.assert_allclose(batched, single, atol=1e-5)
+
+
+class RecordingDetectorWithLandmarks(DetectorWithLandmarks):
+    def __init__(self):
+        self.seen_shapes = []
+
+    def detect_faces_with_landmarks(self, image):
+        self.seen_shapes.append(image.shape)
+        return super().detect_faces_with_landmarks(image)
+
+
+def test_pipeline_detects_on_downscaled_image_and_maps_boxes_back():
+    image = np.zeros((320, 640, 3), dtype=np.uint8)
+    detector = RecordingDetectorWithLandmarks()
+    pipeline = FaceProcessingPipeline(detector, RecordingEmbedder(), detection_max_side=160)
+
+    regions = pipeline.extract_face_regions(image)
+
+    assert detector.seen_shapes == [(80, 160, 3)]
+    assert regions[0]["box"] == (40, 80, 240, 280)
+    assert regions[0]["landmarks"][0] == (120.0, 180.0)
+    assert regions[0]["raw_crop"].shape == (240, 240, 3)
+
+
+def test_pipeline_keeps_small_images_at_native_resolution():
+    image = np.zeros((160, 160, 3), dtype=np.uint8)
+    detector = RecordingDetectorWithLandmarks()
+    pipeline = FaceProcessingPipeline(detector, RecordingEmbedder(), detection_max_side=640)
+
+    regions = pipeline.extract_face_regions(image)
+
+    assert detector.seen_shapes == [(160, 160, 3)]
+    assert regions[0]["box"] == (10, 20, 60, 70)
+
+
+class TileRecordingDetector:
+    """Finds a face only where the image has a bright 30x30 patch, like MTCNN missing it at low res."""
+
+    def __init__(self):
+        self.batch_shapes = []
+
+    def detect_faces_with_landmarks(self, image):
+        return self._find(image)
+
+    def detect_faces_with_landmarks_batch(self, images):
+        self.batch_shapes.append([image.shape for image in images])
+        return [self._find(image) for image in images]
+
+    @staticmethod
+    def _find(image):
+        ys, xs = np.nonzero(image[:, :, 0] > 200)
+        if len(xs) < 900:
+            return []
+        return [{"box": (int(xs.min()), int(ys.min()), 30, 30), "landmarks": None, "confidence": 0.99}]
+
+
+def test_scene_detection_finds_small_faces_in_batched_full_resolution_tiles():
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 120, size=(600, 1000, 3), dtype=np.uint8)
+    image[100:130, 700:730] = 255
+    detector = TileRecordingDetector()
+    pipeline = FaceProcessingPipeline(
+        detector,
+        RecordingEmbedder(),
+        detection_max_side=250,
+        tile_size=400,
+        tile_overlap=100,
+        tile_batch_size=4,
+    )
+    timings = {}
+
+    detections = pipeline.detect_scene_detections(image, timings=timings)
+
+    assert [detection["box"] for detection in detections] == [(700, 100, 30, 30)]
+    assert timings["coarse_faces"] == 0
+    assert timings["tiles_total"] == timings["tiles_searched"] == 6
+    assert [len(shapes) for shapes in detector.batch_shapes] == [4, 2]
+    assert all(shape == (400, 400, 3) for shapes in detector.batch_shapes for shape in shapes)
+    assert {"coarse_ms", "tiles_ms", "merge_ms"} <= timings.keys()
+
+
+def test_scene_detection_skips_flat_tiles():
+    image = np.zeros((600, 1000, 3), dtype=np.uint8)
+    detector = TileRecordingDetector()
+    pipeline = FaceProcessingPipeline(detector, RecordingEmbedder(), detection_max_side=250, tile_size=400)
+    timings = {}
+
+    assert pipeline.detect_scene_detections(image, timings=timings) == []
+    assert timings["tiles_searched"] == 0
+    assert detector.batch_shapes == []
+
+
+def test_merge_detections_keeps_the_confident_whole_face_over_a_tile_cut():
+    whole = {"box": (100, 100, 60, 60), "confidence": 0.999}
+    cut = {"box": (100, 100, 25, 60), "confidence": 0.95}
+    other = {"box": (300, 100, 60, 60), "confidence": 0.97}
+
+    assert merge_detections([cut, other, whole]) == [whole, other]
+
+
+class CountingDetector(DetectorWithLandmarks):
+    def __init__(self):
+        self.calls = 0
+
+    def detect_faces_with_landmarks(self, image):
+        self.calls += 1
+        return super().detect_faces_with_landmarks(image)
+
+
+def test_pipeline_reuses_cached_detections_and_embeddings_for_the_same_upload():
+    image = np.zeros((160, 160, 3), dtype=np.uint8)
+    detector = CountingDetector()
+    embedder = RecordingEmbedder()
+    pipeline = FaceProcessingPipeline(detector, embedder, analysis_cache=FaceAnalysisCache())
+
+    # Quality preview detects; the enrollment that follows only embeds.
+    regions = pipeline.extract_face_regions(image, image_digest="digest")
+    timings = {}
+    first = pipeline.process_image(image, image_digest="digest", timings=timings)
+    assert detector.calls == 1
+    assert timings["analysis_cache"] == "detections_hit"
+    assert first[0]["box"] == regions[0]["box"]
+
+    embedder.last_shape = None
+    timings = {}
+    assert pipeline.process_image(image, image_digest="digest", timings=timings) == first
+    assert timings["analysis_cache"] == "faces_hit"
+    assert embedder.last_shape is None
+
+    pipeline.process_image(np.zeros((120, 160, 3), dtype=np.uint8), image_digest="digest")
+    pipeline.process_image(image)
+    assert detector.calls == 3
@@ -0,0 +1,119 @@
+import pickle
+
+import numpy as np
+
+from src.services.ai.analysis_cache import FaceAnalysisCache, build_cache_key, image_digest
+from src.services.ai.face_quality import FaceQualityReport
+from src.services.face_quality_service import assess_face_quality
+
+
+def test_cache_evicts_least_recently_used_entries_past_the_entry_bound():
+    cache = FaceAnalysisCache(max_entries=2)
+    cache.put("a", [1])
+    cache.put("b", [2])
+    assert cache.get("a") == [1]
+
+    cache.put("c", [3])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1]
+    assert cache.get("c") == [3]
+    assert cache.metrics()["evictions"] == 1
+
+
+def test_cache_bounds_serialized_bytes_and_returns_independent_copies():
+    cache = FaceAnalysisCache(max_bytes=600)
+    cache.put("small", {"box": (1, 2, 3, 4), "embedding": [0.5] * 4})
+    cache.put("large", [0.25] * 200)
+
+    assert cache.get("large") is None
+    cached = cache.get("small")
+    cached["embedding"].append(1.0)
+    assert cache.get("small")["embedding"] == [0.5] * 4
+    assert cache.metrics()["bytes"] <= 600
+
+
+def test_disk_tier_serves_entries_to_a_fresh_cache(tmp_path):
+    key = build_cache_key(image_digest(b"image"), "faces", (10, 10, 3))
+    FaceAnalysisCache(disk_dir=tmp_path).put(key, [{"box": (1, 2, 3, 4)}])
+
+    restarted = FaceAnalysisCache(disk_dir=tmp_path)
+
+    assert restarted.get(key) == [{"box": (1, 2, 3, 4)}]
+    assert restarted.get(key) == [{"box": (1, 2, 3, 4)}]
+    metrics = restarted.metrics()
+    assert (metrics["disk_hits"], metrics["hits"], metrics["misses"]) == (1, 1, 0)
+
+
+def test_cache_round_trips_faces_without_changing_their_types():
+    cache = FaceAnalysisCache()
+    faces = [{
+        "box": (np.int64(1), 2, 3, 4),
+        "embedding": [0.1, -2.5e-7, 1.0 / 3.0],
+        "landmarks": [(10.5, 20.25)],
+        "alignment_applied": True,
+        "crop": np.arange(6, dtype=np.uint8).reshape(2, 3),
+    }]
+    cache.put("faces", faces)
+
+    cached = cache.get("faces")[0]
+
+    assert cached["box"] == (1, 2, 3, 4)
+    assert cached["embedding"] == [0.1, -2.5e-7, 1.0 / 3.0]
+    assert cached["landmarks"] == [(10.5, 20.25)]
+    assert cached["alignment_applied"] is True
+    np.testing.assert_array_equal(cached["crop"], faces[0]["crop"])
+
+
+EXPLOIT_CALLS = []
+
+
+def _record_exploit():
+    EXPLOIT_CALLS.append("ran")
+
+
+class _Exploit:
+    def __reduce__(self):
+        return (_record_exploit, ())
+
+
+def test_disk_tier_never_unpickles_planted_files(tmp_path):
+    key = build_cache_key(image_digest(b"image"), "faces")
+    (tmp_path / f"{key}.json").write_bytes(pickle.dumps(_Exploit()))
+    (tmp_path / f"{key}.pkl").write_bytes(pickle.dumps(_Exploit()))
+    cache = FaceAnalysisCache(disk_dir=tmp_path)
+
+    assert cache.get(key) is None
+    assert EXPLOIT_CALLS == []
+    assert cache.metrics()["misses"] == 1
+
+    (tmp_path / f"{key}.json").write_text('{"__ndarray__": "not base64!"}')
+    assert cache.get(key) is None
+
+
+def test_assess_face_quality_reuses_the_cached_report():
+    class CountingAssessor:
+        calls = 0
+
+        def assess(self, image, box, landmarks=None):
+            CountingAssessor.calls += 1
+            return FaceQualityReport(
+                status="accepted",
+                quality_score=90.0,
+                blur_score=100.0,
+                brightness_score=120.0,
+                face_area_ratio=0.3,
+            )
+
+    class Image:
+        shape = (100, 100, 3)
+
+    cache = FaceAnalysisCache()
+    assessor = CountingAssessor()
+    first = assess_face_quality(assessor, Image(), (10, 20, 40, 50), analysis_cache=cache, digest="abc")
+    second = assess_face_quality(assessor, Image(), (10, 20, 40, 50), analysis_cache=cache, digest="abc")
+    assess_face_quality(assessor, Image(), (10, 20, 40, 50), analysis_cache=cache, digest="other")
+
+    assert second == first
+    assert isinstance(second, FaceQualityReport)
+    assert CountingAssessor.calls == 2
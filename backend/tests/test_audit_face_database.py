@@ -1,11 +1,25 @@
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
 from uuid import uuid4
 
 import numpy as np
 import pytest
 
 from scripts.audit_face_database import (
+    _block_rows,
+    _block_scan_state,
+    _init_block_scan,
+    _scan_block,
     build_duplicate_audit_report,
+    build_incremental_audit_report,
+    changed_records_since,
     classify_pair_risk,
+    embedding_fingerprint,
+    find_candidate_pairs_blockwise,
+    open_review_cases,
+    pair_distance,
 )
 from scripts.evaluate_embeddings import EmbeddingRecord
 
@@ -101,3 +115,201 @@ def test_build_duplicate_audit_report_rejects_invalid_threshold_order():
             top_face_pairs_per_group=3,
             embedding_version=None,
         )
+
+
+def test_find_candidate_pairs_blockwise_matches_pairwise_scan_across_blocks():
+    rng = np.random.default_rng(3)
+    criminals = [uuid4() for _index in range(8)]
+    records = [
+        make_record(criminals[index % 8], rng.normal(scale=0.003, size=4), f"Person {index % 8}")
+        for index in range(40)
+    ]
+
+    expected = [
+        (left_index, right_index)
+        for left_index, left in enumerate(records)
+        for right_index in range(left_index + 1, len(records))
+        if records[right_index].criminal_id != left.criminal_id
+        and pair_distance(left, records[right_index]) <= 0.005
+    ]
+    candidates = find_candidate_pairs_blockwise(records, 0.005, memory_budget_mb=0.001)
+
+    assert expected
+    assert [pair for pair in candidates if pair_distance(records[pair[0]], records[pair[1]]) <= 0.005] == expected
+    assert candidates == sorted(candidates)
+    assert all(records[left].criminal_id != records[right].criminal_id for left, right in candidates)
+
+
+def test_find_candidate_pairs_blockwise_matches_single_process_scan_with_workers():
+    rng = np.random.default_rng(5)
+    criminals = [uuid4() for _index in range(8)]
+    records = [
+        make_record(criminals[index % 8], rng.normal(scale=0.003, size=4), f"Person {index % 8}")
+        for index in range(60)
+    ]
+
+    for row_indices in (None, [3, 17, 41]):
+        single = find_candidate_pairs_blockwise(records, 0.005, row_indices=row_indices, memory_budget_mb=0.001)
+        pooled = find_candidate_pairs_blockwise(
+            records, 0.005, row_indices=row_indices, memory_budget_mb=0.001, workers=2
+        )
+
+        assert single
+        assert pooled == single
+
+
+def test_scan_block_stays_within_memory_budget():
+    record_count, dimension, memory_budget_mb = 2000, 64, 2
+    embeddings = np.random.default_rng(7).normal(size=(record_count, dimension))
+    block_rows = _block_rows(record_count, dimension, memory_budget_mb)
+
+    for upper_triangle in (True, False):
+        _init_block_scan(embeddings, np.arange(record_count), 0.01, np.arange(record_count), upper_triangle)
+        try:
+            tracemalloc.start()
+            _scan_block((0, block_rows))
+            _current, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+            _block_scan_state.clear()
+
+        assert peak <= memory_budget_mb * 1024 * 1024
+
+
+def test_build_duplicate_audit_report_accepts_ann_candidate_pairs():
+    criminal_a = uuid4()
+    criminal_b = uuid4()
+    records = [
+        make_record(criminal_a, [0.0, 0.0], "Alpha One"),
+        make_record(criminal_a, [0.0, 0.01], "Alpha One"),
+        make_record(criminal_b, [0.0, 0.002], "Beta Two"),
+        make_record(criminal_b, [0.0, 0.003], "Beta Two"),
+    ]
+    arguments = dict(
+        records=records,
+        probable_threshold=0.004,
+        review_threshold=0.005,
+        top_criminal_pairs=10,
+        top_face_pairs_per_group=3,
+        embedding_version="tracenet_v1",
+    )
+
+    exhaustive = build_duplicate_audit_report(**arguments)
+    ann_pairs = [
+        (records[2].face_id, records[0].face_id),
+        (records[0].face_id, records[2].face_id),
+        (records[1].face_id, records[0].face_id),
+    ]
+    partial = build_duplicate_audit_report(**arguments, candidate_face_pairs=ann_pairs)
+
+    assert exhaustive["summary"]["suspicious_face_pair_count"] == 2
+    assert partial["summary"]["suspicious_face_pair_count"] == 1
+    assert partial["suspicious_criminal_pairs"][0]["minimum_distance"] == exhaustive["suspicious_criminal_pairs"][0]["minimum_distance"]
+
+
+def test_incremental_audit_scans_only_changed_faces_and_matches_full_audit():
+    enrolled_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    criminals = [uuid4() for _index in range(6)]
+    rng = np.random.default_rng(9)
+    records = [
+        replace(
+            make_record(criminals[index % 6], rng.normal(scale=0.003, size=4), f"Person {index % 6}"),
+            created_at=enrolled_at - timedelta(hours=index),
+        )
+        for index in range(24)
+    ]
+    arguments = dict(
+        probable_threshold=0.004,
+        review_threshold=0.005,
+        top_criminal_pairs=50,
+        top_face_pairs_per_group=50,
+        embedding_version="tracenet_v1",
+    )
+    first = build_incremental_audit_report(records, **arguments)
+    assert first["incremental_state"]["scanned_face_count"] == 24
+    assert first["incremental_state"]["watermark"] == enrolled_at.isoformat()
+
+    next_day = enrolled_at + timedelta(days=1)
+    records[0] = replace(records[0], embedding=np.asarray([5.0, 5.0, 5.0, 5.0], dtype=np.float32), embedding_migrated_at=next_day)
+    records.append(replace(make_record(criminals[1], records[2].embedding + 0.0001, "Person 1"), created_at=next_day))
+    second = build_incremental_audit_report(records, **arguments, previous_report=first)
+    full = build_duplicate_audit_report(records, **arguments)
+
+    assert second["incremental_state"]["scanned_face_count"] == 2
+    assert second["incremental_state"]["new_suspicious_face_pair_count"] >= 1
+    assert second["summary"] == full["summary"]
+    assert second["suspicious_criminal_pairs"] == full["suspicious_criminal_pairs"]
+    assert "incremental_state" not in full
+
+
+def test_changed_records_since_requires_matching_configuration():
+    record = replace(make_record(uuid4(), [0.0, 0.0], "Alpha One"), created_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+    previous_report = {
+        "configuration": {"embedding_version": "tracenet_v1", "review_threshold": 0.005},
+        "incremental_state": {
+            "watermark": "2026-01-02T00:00:00+00:00",
+            "suspicious_face_pairs": [],
+            "face_fingerprints": {str(record.face_id): embedding_fingerprint(record)},
+        },
+    }
+
+    assert changed_records_since([record], previous_report, review_threshold=0.005, embedding_version="tracenet_v1") == []
+    assert changed_records_since([record], previous_report, review_threshold=0.006, embedding_version="tracenet_v1") is None
+    assert changed_records_since([record], None, review_threshold=0.005, embedding_version="tracenet_v1") is None
+
+
+def test_incremental_audit_rescans_faces_restored_with_older_timestamps():
+    enrolled_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    alpha, bravo, charlie = uuid4(), uuid4(), uuid4()
+    records = [
+        replace(make_record(alpha, [0.0, 0.0], "Alpha One"), created_at=enrolled_at - timedelta(days=3)),
+        replace(make_record(bravo, [1.0, 1.0], "Bravo Two"), created_at=enrolled_at - timedelta(days=3)),
+        replace(make_record(charlie, [5.0, 5.0], "Charlie Three"), created_at=enrolled_at),
+    ]
+    arguments = dict(
+        probable_threshold=0.004,
+        review_threshold=0.005,
+        top_criminal_pairs=50,
+        top_face_pairs_per_group=50,
+        embedding_version="tracenet_v1",
+    )
+    first = build_incremental_audit_report(records, **arguments)
+    assert first["summary"]["suspicious_face_pair_count"] == 0
+
+    # A snapshot rollback puts back an older vector together with its older migration stamp.
+    records[1] = replace(
+        records[1],
+        embedding=np.asarray([0.001, 0.0], dtype=np.float32),
+        embedding_migrated_at=enrolled_at - timedelta(days=1),
+    )
+    second = build_incremental_audit_report(records, **arguments, previous_report=first)
+    full = build_duplicate_audit_report(records, **arguments)
+
+    # Charlie is rescanned by the watermark overlap, Bravo only by its fingerprint.
+    assert second["incremental_state"]["scanned_face_count"] == 2
+    assert second["summary"] == full["summary"]
+    assert second["summary"]["suspicious_face_pair_count"] == 1
+    assert second["suspicious_criminal_pairs"] == full["suspicious_criminal_pairs"]
+
+
+@pytest.mark.asyncio
+async def test_open_review_cases_handles_findings_without_face_pairs():
+    alpha, bravo = uuid4(), uuid4()
+    records = [make_record(alpha, [0.0, 0.0], "Alpha One"), make_record(bravo, [0.001, 0.0], "Bravo Two")]
+    report = build_duplicate_audit_report(
+        records,
+        probable_threshold=0.004,
+        review_threshold=0.005,
+        top_criminal_pairs=50,
+        top_face_pairs_per_group=0,
+        embedding_version="tracenet_v1",
+    )
+    review_case_repo = AsyncMock()
+    review_case_repo.get_open_duplicate_case.return_value = None
+
+    assert await open_review_cases(report, review_case_repo) == 1
+
+    review_case = review_case_repo.create.await_args.args[0]
+    assert review_case.source_face_id is None
+    assert review_case.matched_face_id is None
+    assert review_case.embedding_version == "tracenet_v1"
@@ -0,0 +1,95 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.domain.models.audit import AuditLog
+from src.infrastructure.audit_writer import AuditLogWriter
+from src.infrastructure.repositories.audit import AuditRepository
+
+
+class RecordingSessionFactory:
+    def __init__(self, fail_times: int = 0) -> None:
+        self.batches: list[list[dict]] = []
+        self.fail_times = fail_times
+
+    def __call__(self):
+        factory = self
+        session = MagicMock()
+
+        async def execute(_statement, rows):
+            if factory.fail_times:
+                factory.fail_times -= 1
+                raise ConnectionError("database unavailable")
+            factory.batches.append(list(rows))
+
+        session.execute = AsyncMock(side_effect=execute)
+        session.commit = AsyncMock()
+        context = MagicMock()
+        context.__aenter__ = AsyncMock(return_value=session)
+        context.__aexit__ = AsyncMock(return_value=False)
+        return context
+
+
+@pytest.mark.asyncio
+async def test_buffered_writes_skip_request_session_and_flush_on_size():
+    sessions = RecordingSessionFactory()
+    writer = AuditLogWriter(durability="buffered", flush_interval_ms=60_000, max_batch_size=3)
+    writer.start(sessions)
+    request_session = AsyncMock()
+    repo = AuditRepository(request_session, writer=writer)
+
+    for index in range(3):
+        await repo.create(AuditLog(action="IDENTIFY", details=f"request {index}"))
+    await asyncio.sleep(0.01)
+
+    request_session.commit.assert_not_awaited()
+    assert [[row["details"] for row in batch] for batch in sessions.batches] == [
+        ["request 0", "request 1", "request 2"]
+    ]
+    await writer.close()
+
+
+@pytest.mark.asyncio
+async def test_close_flushes_pending_rows_and_reverts_to_sync_writes():
+    sessions = RecordingSessionFactory()
+    writer = AuditLogWriter(durability="buffered", flush_interval_ms=60_000, max_batch_size=100)
+    writer.start(sessions)
+
+    await writer.submit(AuditLog(action="FACE_ENROLL"))
+    assert sessions.batches == []
+
+    await writer.close()
+
+    assert [row["action"] for row in sessions.batches[0]] == ["FACE_ENROLL"]
+    assert writer.is_buffering is False
+    request_session = AsyncMock()
+    request_session.add = MagicMock()
+    await AuditRepository(request_session, writer=writer).create(AuditLog(action="IDENTIFY"))
+    request_session.commit.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_group_commit_waits_for_flush_and_buffered_rows_survive_failures():
+    sessions = RecordingSessionFactory()
+    writer = AuditLogWriter(durability="group_commit", flush_interval_ms=5, max_batch_size=100)
+    writer.start(sessions)
+
+    await asyncio.gather(*(writer.submit(AuditLog(action="IDENTIFY")) for _ in range(4)))
+    assert sum(len(batch) for batch in sessions.batches) == 4
+    await writer.close()
+
+    failing = RecordingSessionFactory(fail_times=1)
+    buffered = AuditLogWriter(durability="buffered", flush_interval_ms=60_000)
+    buffered.start(failing)
+    await buffered.submit(AuditLog(action="CRIMINAL_MERGE"))
+    assert await buffered.flush() == 0
+    assert buffered.metrics()["pending"] == 1
+    assert await buffered.flush() == 1
+    assert buffered.metrics()["failed_flushes"] == 1
+    await buffered.close()
+
+
+def test_unknown_durability_mode_is_rejected():
+    with pytest.raises(ValueError):
+        AuditLogWriter(durability="eventually")
@@ -50,3 +50,34 @@ def test_evaluate_gate_allows_conditional_when_requested():
 
     assert passed is True
     assert failures == []
+
+
+def test_evaluate_gate_enforces_reference_tar_check():
+    report = make_report(status="go")
+    passed, failures = evaluate_gate(
+        report,
+        allow_conditional=False,
+        max_age_days=30,
+        require_dataset_name=None,
+        require_reference_check=True,
+    )
+    assert passed is False
+    assert failures == ["missing_reference_tar_check"]
+
+    report["checks"] = {
+        "tar_at_far_vs_reference": {
+            "passed": False,
+            "actual": 0.04,
+            "required": 0.01,
+            "reference_version": "tracenet_v1",
+        }
+    }
+    passed, failures = evaluate_gate(
+        report,
+        allow_conditional=False,
+        max_age_days=30,
+        require_dataset_name=None,
+        require_reference_check=True,
+    )
+    assert passed is False
+    assert failures == ["tar_at_far_drop=0.04>0.01_vs_tracenet_v1"]
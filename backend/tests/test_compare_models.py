@@ -1,6 +1,13 @@
 from pathlib import Path
 
-from scripts.compare_models import choose_winner, parse_model_paths, render_comparison_markdown
+from scripts.compare_models import (
+    apply_reference_tar_check,
+    build_reference_tar_check,
+    choose_winner,
+    parse_model_paths,
+    render_comparison_markdown,
+    resolve_candidates,
+)
 
 
 def test_parse_model_paths_parses_version_mapping(tmp_path: Path):
@@ -72,3 +79,37 @@ def test_render_comparison_markdown_mentions_winner():
     assert "Model Comparison Report" in markdown
     assert "TraceNet v1" in markdown
     assert "face-2-heldout" in markdown
+
+
+def test_resolve_candidates_adds_reference_before_quantized_model():
+    assert resolve_candidates(["tracenet_v1_int8", "facenet_vggface2"]) == [
+        "tracenet_v1",
+        "tracenet_v1_int8",
+        "facenet_vggface2",
+    ]
+
+
+def test_reference_tar_check_turns_go_into_no_go_when_tar_drops_too_far():
+    def threshold_report(tar):
+        return {
+            "pair_threshold_recommendations": {"far_le_0.010": {"tar": tar, "far": 0.008}},
+            "checks": {},
+            "decision": {"status": "go", "failed_checks": [], "summary": "Benchmark supports rollout."},
+        }
+
+    reference = threshold_report(0.95)
+    within = threshold_report(0.945)
+    apply_reference_tar_check(
+        within,
+        build_reference_tar_check(within, reference, reference_version="tracenet_v1", far_key="far_le_0.010", max_tar_drop=0.01),
+    )
+    degraded = threshold_report(0.9)
+    apply_reference_tar_check(
+        degraded,
+        build_reference_tar_check(degraded, reference, reference_version="tracenet_v1", far_key="far_le_0.010", max_tar_drop=0.01),
+    )
+
+    assert within["decision"]["status"] == "go"
+    assert within["checks"]["tar_at_far_vs_reference"]["actual"] == 0.005
+    assert degraded["decision"]["status"] == "no_go"
+    assert degraded["decision"]["failed_checks"] == ["tar_at_far_vs_reference"]
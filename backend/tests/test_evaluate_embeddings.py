@@ -180,3 +180,38 @@ def test_evaluate_template_probes_uses_holdout_identity_templates():
     assert report["nearest_other_template_distances"]["distance_summary"]["min"] > 1.5
     assert report["top1_positive_separation_gaps"]["distance_summary"]["min"] > 1.5
     assert report["recommended_policy"]["match_threshold"] <= report["recommended_policy"]["possible_match_threshold"]
+
+
+def test_evaluate_template_probes_two_stage_reports_coarse_recall():
+    criminal_a = uuid4()
+    criminal_b = uuid4()
+    records = [
+        make_record(criminal_a, [1.0, 0.0], criminal_name="Alpha"),
+        make_record(criminal_a, [0.99, 0.01], criminal_name="Alpha"),
+        make_record(criminal_b, [-1.0, 0.0], criminal_name="Bravo"),
+        make_record(criminal_b, [-0.99, -0.01], criminal_name="Bravo"),
+    ]
+    templates = [
+        make_template(criminal_a, [0.999, 0.001], criminal_name="Alpha"),
+        make_template(criminal_b, [-0.999, -0.001], criminal_name="Bravo"),
+    ]
+
+    report = evaluate_template_probes(
+        records,
+        templates,
+        current_match_threshold=0.2,
+        current_possible_match_threshold=0.4,
+        current_match_separation_margin=0.05,
+        current_possible_match_separation_margin=0.02,
+        max_probes=10,
+        rng=random.Random(42),
+        grid_size=20,
+        rerank_fusion="min",
+        coarse_candidates=2,
+    )
+
+    assert report["two_stage"]["fusion"] == "min"
+    assert report["two_stage"]["coarse_missed_probe_faces"] == 0
+    assert report["two_stage"]["coarse_recall"] == 1.0
+    assert report["two_stage"]["end_to_end_top1_rate"] == 1.0
+    assert report["ranking"]["own_template_top1_count"] == 4
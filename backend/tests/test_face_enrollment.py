@@ -1,6 +1,7 @@
 import importlib
 import io
 import sys
+import threading
 import types
 from datetime import datetime, timezone
 from types import SimpleNamespace
@@ -32,6 +33,12 @@ def load_criminals_endpoint_module(monkeypatch: pytest.MonkeyPatch):
 
     fake_runtime = types.ModuleType("src.services.ai.runtime")
     fake_runtime.pipeline = object()
+    fake_runtime.ACTIVE_EMBEDDING_SPACE = "tracenet_v1"
+
+    async def fake_require_face_models():
+        return None
+
+    fake_runtime.require_face_models = fake_require_face_models
     monkeypatch.setitem(sys.modules, "src.services.ai.runtime", fake_runtime)
 
     fake_database = types.ModuleType("src.infrastructure.database")
@@ -558,7 +565,7 @@ async def test_enroll_criminal_face_endpoint_maps_duplicate_conflict(monkeypatch
     monkeypatch.setattr(criminals_module, "FaceRepository", lambda _db: object())
     monkeypatch.setattr(criminals_module, "CriminalRepository", lambda _db: object())
     monkeypatch.setattr(criminals_module, "AuditRepository", lambda _db: object())
-    monkeypatch.setattr(criminals_module, "IdentityTemplateRepository", lambda _db: object())
+    monkeypatch.setattr(criminals_module, "IdentityTemplateRepository", lambda _db, **_kwargs: object())
     monkeypatch.setattr(criminals_module, "ReviewCaseRepository", lambda _db: object())
 
     upload = UploadFile(
@@ -1359,3 +1366,46 @@ async def test_list_criminals_includes_primary_face_thumbnail(monkeypatch):
 
     assert result["items"][0]["primary_face_image_url"] == "uploads/faces/john.jpg"
     assert result["items"][0]["first_name"] == "John"
+
+
+@pytest.mark.asyncio
+@patch("cv2.cvtColor")
+async def test_enroll_face_decodes_and_assesses_quality_on_the_inference_executor(mock_cvtColor):
+    mock_cvtColor.return_value = np.zeros((100, 100, 3), dtype=np.uint8)
+    event_loop_thread = threading.current_thread()
+    worker_threads = []
+
+    def recording_imdecode(*args, **kwargs):
+        worker_threads.append(("decode", threading.current_thread()))
+        return np.zeros((100, 100, 3), dtype=np.uint8)
+
+    def recording_assess(*args, **kwargs):
+        worker_threads.append(("quality", threading.current_thread()))
+        return FaceQualityReport(
+            status="rejected",
+            quality_score=12.0,
+            blur_score=10.0,
+            brightness_score=120.0,
+            face_area_ratio=0.2,
+            rejection_reasons=["face_too_blurry"],
+        )
+
+    pipeline = MagicMock()
+    pipeline.process_image.return_value = [{"box": (10, 20, 40, 50), "embedding": [0.1] * 512}]
+    quality_assessor = MagicMock()
+    quality_assessor.assess.side_effect = recording_assess
+    criminal_repo = AsyncMock()
+    criminal_repo.get.return_value = SimpleNamespace(id=uuid4())
+
+    service = FaceEnrollmentService(
+        pipeline,
+        AsyncMock(),
+        criminal_repo,
+        AsyncMock(),
+        quality_assessor=quality_assessor,
+    )
+    with patch("cv2.imdecode", side_effect=recording_imdecode), pytest.raises(ValueError):
+        await service.enroll_face(uuid4(), b"fake-image")
+
+    assert [stage for stage, _thread in worker_threads] == ["decode", "quality"]
+    assert all(thread is not event_loop_thread for _stage, thread in worker_threads)
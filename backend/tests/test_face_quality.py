@@ -1,5 +1,6 @@
 import numpy as np
 import cv2
+import pytest
 
 from src.services.ai.face_quality import FaceQualityAssessor
 
@@ -99,3 +100,71 @@ def test_face_quality_assessor_sorts_warnings_by_priority():
 
     assert report.status == "accepted_with_warnings"
     assert report.warnings == ["poor_lighting", "face_is_blurry", "face_small_in_frame"]
+
+
+def reference_face_metrics(image, box, landmarks):
+    """Per-face metrics computed one crop and one landmark patch at a time with cv2."""
+    x, y, w, h = box
+    gray_crop = cv2.cvtColor(image[max(0, y):y + h, max(0, x):x + w], cv2.COLOR_RGB2GRAY)
+    crop_height, crop_width = gray_crop.shape
+    patch_radius = max(4, int(min(crop_height, crop_width) * 0.08))
+    visibility_scores = []
+    for point_x, point_y in landmarks:
+        rel_x, rel_y = int(round(point_x - x)), int(round(point_y - y))
+        if min(rel_x, rel_y, (crop_width - 1) - rel_x, (crop_height - 1) - rel_y) < patch_radius * 0.5:
+            visibility_scores.append(0.0)
+            continue
+        patch = gray_crop[
+            max(0, rel_y - patch_radius):rel_y + patch_radius + 1,
+            max(0, rel_x - patch_radius):rel_x + patch_radius + 1,
+        ]
+        visibility_scores.append(
+            0.45 * min(1.0, float(np.std(patch)) / 24.0)
+            + 0.35 * min(1.0, float(cv2.Laplacian(patch, cv2.CV_64F).var()) / 60.0)
+            + 0.20 * (1.0 - float(np.mean((patch <= 10) | (patch >= 245))))
+        )
+
+    (left_x, left_y), (right_x, right_y), (nose_x, _nose_y) = landmarks[:3]
+    eye_distance = float(np.hypot(right_x - left_x, right_y - left_y))
+    roll = abs(float(np.degrees(np.arctan2(right_y - left_y, right_x - left_x))))
+    yaw = abs(abs(nose_x - left_x) - abs(right_x - nose_x)) / eye_distance
+    return {
+        "blur_score": round(float(cv2.Laplacian(gray_crop, cv2.CV_64F).var()), 4),
+        "brightness_score": round(float(gray_crop.mean()), 4),
+        "occlusion_score": round(float(np.mean(visibility_scores)) * 100.0, 2),
+        "pose_score": round(100.0 * (1.0 - (0.45 * min(1.0, roll / 18.0) + 0.55 * min(1.0, yaw / 0.35))), 2),
+    }
+
+
+def test_assess_batch_matches_per_face_reference_computation():
+    assessor = FaceQualityAssessor()
+    # Low-contrast noise keeps the patch contrast and sharpness below their caps, so
+    # the occlusion score depends on every per-patch value.
+    rng = np.random.default_rng(3)
+    image = np.clip(128 + rng.normal(scale=12, size=(440, 440, 3)), 0, 255).astype(np.uint8)
+    image = cv2.GaussianBlur(image, (3, 3), 0)
+    landmarks = build_landmarks()
+    shifted = [(x + 220.0, y + 220.0) for x, y in landmarks]
+    tilted = [(x + 220.0, y + 6.0 * index) for index, (x, y) in enumerate(landmarks)]
+    boxes = [(50, 60, 120, 120), (60, 70, 100, 110), (270, 280, 120, 120), (262, 52, 130, 140), (500, 500, 40, 40)]
+    face_landmarks = [landmarks, landmarks, shifted, tilted, None]
+
+    reports = assessor.assess_batch(image, boxes, face_landmarks)
+
+    for report, box, points in zip(reports[:4], boxes[:4], face_landmarks[:4]):
+        expected = reference_face_metrics(image, box, points)
+        assert report.blur_score == pytest.approx(expected["blur_score"], abs=1e-4)
+        assert report.brightness_score == pytest.approx(expected["brightness_score"], abs=1e-4)
+        assert report.occlusion_score == pytest.approx(expected["occlusion_score"], abs=0.01)
+        assert report.pose_score == pytest.approx(expected["pose_score"], abs=0.01)
+    assert reports[4].rejection_reasons == ["invalid_face_crop"]
+    # Overlapping faces share one grayscale conversion of their union.
+    assert assessor.assess_batch(image, boxes[:2], face_landmarks[:2]) == reports[:2]
+    assert assessor.assess(image, boxes[2], landmarks=shifted) == reports[2]
+
+
+def test_assess_batch_requires_landmarks_per_box():
+    assessor = FaceQualityAssessor()
+
+    with pytest.raises(ValueError):
+        assessor.assess_batch(build_face_image(), [(50, 60, 120, 120)], [None, None])
@@ -0,0 +1,145 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from src.infrastructure.repositories.face import FaceRepository
+from src.infrastructure.repositories.identity_template import (
+    IdentityTemplateRepository,
+    PrimaryFaceRow,
+    TemplateCandidateRow,
+)
+
+
+@pytest.mark.asyncio
+async def test_find_nearest_candidates_joins_profile_data_in_one_statement():
+    template = SimpleNamespace(criminal_id=uuid4(), primary_face_id=uuid4())
+    criminal = SimpleNamespace(id=template.criminal_id)
+    session = MagicMock()
+    result = MagicMock()
+    result.all.return_value = [
+        (template, 0.25, criminal, template.primary_face_id, "uploads/faces/a.jpg", True),
+        (template, 0.5, None, None, None, None),
+    ]
+    session.execute = AsyncMock(return_value=result)
+
+    rows = await IdentityTemplateRepository(session).find_nearest_candidates([0.1] * 512, limit=2)
+
+    session.execute.assert_awaited_once()
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "LEFT OUTER JOIN criminals" in sql
+    assert "LEFT OUTER JOIN face_embeddings ON face_embeddings.id = identity_templates.primary_face_id" in sql
+    assert rows == [
+        TemplateCandidateRow(
+            template=template,
+            distance=0.25,
+            criminal=criminal,
+            primary_face=PrimaryFaceRow(id=template.primary_face_id, image_url="uploads/faces/a.jpg", is_primary=True),
+        ),
+        TemplateCandidateRow(template=template, distance=0.5, criminal=None, primary_face=None),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_find_nearest_candidates_batch_runs_one_lateral_statement_for_all_queries():
+    first = SimpleNamespace(criminal_id=uuid4(), primary_face_id=None)
+    second = SimpleNamespace(criminal_id=uuid4(), primary_face_id=None)
+    session = MagicMock()
+    result = MagicMock()
+    result.all.return_value = [
+        (1, first, 0.1, None, None, None, None),
+        (1, second, 0.4, None, None, None, None),
+        (3, second, 0.2, None, None, None, None),
+    ]
+    session.execute = AsyncMock(return_value=result)
+
+    rows = await IdentityTemplateRepository(session).find_nearest_candidates_batch(
+        [[0.1] * 512, [0.2] * 512, [0.3] * 512],
+        limit=2,
+    )
+
+    session.execute.assert_awaited_once()
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "WITH ORDINALITY AS probe_vectors(query_vector, query_index)" in sql
+    assert "JOIN LATERAL" in sql
+    assert [[row.template for row in face_rows] for face_rows in rows] == [[first, second], [], [second]]
+    assert rows[2][0].distance == 0.2
+
+
+@pytest.mark.asyncio
+async def test_find_nearest_candidates_batch_skips_database_without_queries():
+    session = MagicMock()
+    session.execute = AsyncMock()
+
+    assert await IdentityTemplateRepository(session).find_nearest_candidates_batch([]) == []
+    session.execute.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_nearest_searches_filter_on_inline_embedding_version():
+    session = MagicMock()
+    result = MagicMock()
+    result.all.return_value = []
+    session.execute = AsyncMock(return_value=result)
+    repository = IdentityTemplateRepository(session, embedding_version="tracenet_v1")
+
+    await repository.find_nearest_neighbors([0.1] * 512, limit=3)
+    await repository.find_nearest_candidates([0.1] * 512, limit=3, embedding_version="facenet_vggface2")
+    await repository.find_nearest_candidates_batch([[0.1] * 512], limit=3)
+    await FaceRepository(session, embedding_version="tracenet_v1_int8").find_nearest_neighbors([0.1] * 512)
+
+    sqls = [
+        str(call.args[0].compile(dialect=postgresql.dialect(), compile_kwargs={"render_postcompile": True}))
+        for call in session.execute.await_args_list
+    ]
+    # Rendered as literals, so the planner can match the per-version partial ANN indexes.
+    assert "identity_templates.embedding_version = 'tracenet_v1'" in sqls[0]
+    assert "identity_templates.embedding_version = 'facenet_vggface2'" in sqls[1]
+    assert "identity_templates.embedding_version = 'tracenet_v1'" in sqls[2]
+    assert "face_embeddings.embedding_version = 'tracenet_v1_int8'" in sqls[3]
+
+
+@pytest.mark.asyncio
+async def test_nearest_neighbors_unscoped_without_embedding_version():
+    session = MagicMock()
+    result = MagicMock()
+    result.all.return_value = []
+    session.execute = AsyncMock(return_value=result)
+
+    await IdentityTemplateRepository(session).find_nearest_neighbors([0.1] * 512, limit=3)
+
+    sql = str(session.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+    assert "embedding_version" not in sql.split("FROM", 1)[1]
+
+
+@pytest.mark.asyncio
+async def test_halfvec_search_shortlists_through_halfvec_and_rescores_exactly():
+    session = MagicMock()
+    result = MagicMock()
+    result.all.return_value = []
+    session.execute = AsyncMock(return_value=result)
+    repository = IdentityTemplateRepository(
+        session,
+        ef_search=10,
+        embedding_version="tracenet_v1",
+        halfvec=True,
+        halfvec_rerank_factor=4,
+    )
+
+    await repository.find_nearest_candidates([0.1] * 512, limit=5)
+
+    tuning_sql = str(session.execute.await_args_list[0].args[0].compile(compile_kwargs={"literal_binds": True}))
+    # HNSW has to produce the whole 5 * 4 shortlist.
+    assert "set_config('hnsw.ef_search', '20', true)" in tuning_sql
+    sql = str(
+        session.execute.await_args_list[1].args[0].compile(
+            dialect=postgresql.dialect(),
+            compile_kwargs={"render_postcompile": True},
+        )
+    )
+    assert "ORDER BY CAST(identity_templates_1.template_embedding AS HALFVEC(512)) <-> CAST(" in sql
+    assert "identity_templates_1.embedding_version = 'tracenet_v1'" in sql
+    assert "WHERE identity_templates.id IN (SELECT identity_templates_1.id" in sql
+    assert "ORDER BY identity_templates.template_embedding <->" in sql
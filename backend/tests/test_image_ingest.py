@@ -0,0 +1,68 @@
+import cv2
+import numpy as np
+import pytest
+
+from src.services.ai.image_ingest import (
+    DecodedImage,
+    ImageTooLargeError,
+    decode_image,
+    read_image_header,
+)
+
+
+def _encode(extension: str, width: int, height: int) -> bytes:
+    image = np.zeros((height, width, 3), dtype=np.uint8)
+    image[:, : width // 2] = (255, 0, 0)  # blue in BGR, so the decoded RGB has it in the last channel
+    ok, encoded = cv2.imencode(extension, image)
+    assert ok
+    return encoded.tobytes()
+
+
+def test_read_image_header_parses_jpeg_and_png_dimensions():
+    jpeg = read_image_header(_encode(".jpg", 320, 200))
+    png = read_image_header(_encode(".png", 64, 48))
+
+    assert (jpeg.format, jpeg.width, jpeg.height) == ("jpeg", 320, 200)
+    assert (png.format, png.width, png.height) == ("png", 64, 48)
+    assert read_image_header(b"not an image") is None
+
+
+def test_decode_image_reduces_large_jpeg_to_target_and_maps_boxes_back():
+    decoded = decode_image(_encode(".jpg", 2600, 1000), target_max_side=640)
+
+    # 1/4 keeps the long side at 650 >= 640; 1/8 would drop below the detector's resolution.
+    assert decoded.pixels.shape == (250, 650, 3)
+    assert decoded.original_size == (2600, 1000)
+    assert decoded.scale == pytest.approx(0.25)
+    assert decoded.pixels[10, 10, 2] > 200
+    assert decoded.box_to_original((100, 50, 40, 60)) == (400, 200, 160, 240)
+    assert decoded.landmarks_to_original([(10.0, 20.0)]) == [(40.0, 80.0)]
+
+
+def test_decode_image_keeps_full_resolution_without_target():
+    decoded = decode_image(_encode(".jpg", 900, 600))
+
+    assert decoded.pixels.shape == (600, 900, 3)
+    assert decoded.scale == 1.0
+    assert decoded.box_to_original((1.0, 2.0, 3.0, 4.0)) == (1, 2, 3, 4)
+
+
+def test_decode_image_enforces_pixel_budgets():
+    reduced = decode_image(_encode(".jpg", 1600, 1200), max_decoded_pixels=500_000)
+    assert reduced.pixels.shape == (600, 800, 3)
+
+    with pytest.raises(ImageTooLargeError):
+        decode_image(_encode(".png", 1600, 1200), max_decoded_pixels=500_000)
+    with pytest.raises(ImageTooLargeError):
+        decode_image(_encode(".jpg", 1600, 1200), max_source_pixels=1_000_000)
+
+
+def test_decode_image_rejects_invalid_data():
+    with pytest.raises(ValueError, match="Invalid image data"):
+        decode_image(b"\xff\xd8 truncated")
+
+
+def test_decoded_image_identity_mapping():
+    decoded = DecodedImage(np.zeros((4, 4, 3), dtype=np.uint8), (4, 4), 1.0)
+
+    assert decoded.landmarks_to_original(None) is None
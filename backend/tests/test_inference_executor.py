@@ -0,0 +1,62 @@
+import asyncio
+import threading
+
+import pytest
+
+from src.services.ai.inference_executor import InferenceExecutor, InferenceQueueFullError
+
+
+@pytest.mark.asyncio
+async def test_run_executes_off_the_event_loop_thread_and_records_metrics():
+    executor = InferenceExecutor(max_workers=1, max_queue_depth=2)
+    loop_thread = threading.get_ident()
+
+    worker_thread = await executor.run(threading.get_ident)
+    metrics = executor.metrics()
+    executor.shutdown()
+
+    assert worker_thread != loop_thread
+    assert metrics["completed"] == 1
+    assert metrics["in_flight"] == 0
+    assert metrics["wait_time"]["count"] == 1
+    assert metrics["run_time"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_run_rejects_when_queue_depth_is_exhausted():
+    executor = InferenceExecutor(max_workers=1, max_queue_depth=1, retry_after_seconds=5)
+    release = threading.Event()
+
+    running = asyncio.ensure_future(executor.run(release.wait, 5))
+    queued = asyncio.ensure_future(executor.run(lambda: "queued"))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(InferenceQueueFullError) as exc_info:
+        await executor.run(lambda: "rejected")
+
+    release.set()
+    assert await running is True
+    assert await queued == "queued"
+    metrics = executor.metrics()
+    executor.shutdown()
+
+    assert exc_info.value.retry_after_seconds == 5
+    assert metrics["rejected"] == 1
+    assert metrics["completed"] == 2
+    assert metrics["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_run_propagates_errors_and_counts_failures():
+    executor = InferenceExecutor()
+
+    def explode():
+        raise ValueError("Invalid image data")
+
+    with pytest.raises(ValueError, match="Invalid image data"):
+        await executor.run(explode)
+    metrics = executor.metrics()
+    executor.shutdown()
+
+    assert metrics["failed"] == 1
+    assert metrics["in_flight"] == 0
@@ -0,0 +1,100 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.services.ai.inference_executor import InferenceExecutor, InferenceQueueFullError
+from src.services.ai.micro_batcher import EmbeddingMicroBatcher
+
+
+class ValueEmbedder:
+    """Embeds each crop as [pixel value] so results can be traced back to inputs."""
+
+    def __init__(self, fail_batches=False):
+        self.batch_sizes = []
+        self.fail_batches = fail_batches
+
+    def embed_face(self, face_image):
+        if int(face_image[0, 0, 0]) == 99:
+            raise RuntimeError("bad crop")
+        return [float(face_image[0, 0, 0])]
+
+    def embed_faces(self, face_images):
+        self.batch_sizes.append(len(face_images))
+        if self.fail_batches:
+            raise RuntimeError("batch failed")
+        return [self.embed_face(face_image) for face_image in face_images]
+
+
+def crop(value):
+    return np.full((4, 4, 3), value, dtype=np.uint8)
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_share_one_batched_forward():
+    embedder = ValueEmbedder()
+    executor = InferenceExecutor()
+    batcher = EmbeddingMicroBatcher(embedder, max_batch_size=16, max_wait_ms=50, inference_executor=executor)
+
+    results = await asyncio.gather(
+        batcher.embed([crop(1), crop(2)]),
+        batcher.embed([crop(3)]),
+        batcher.embed([crop(4), crop(5), crop(6)]),
+    )
+    metrics = batcher.metrics()
+    await batcher.close()
+    executor.shutdown()
+
+    assert results == [[[1.0], [2.0]], [[3.0]], [[4.0], [5.0], [6.0]]]
+    assert embedder.batch_sizes == [6]
+    assert metrics["batches"] == 1
+    assert metrics["requests"] == 3
+
+
+@pytest.mark.asyncio
+async def test_batch_flushes_once_max_batch_size_is_reached():
+    embedder = ValueEmbedder()
+    executor = InferenceExecutor()
+    batcher = EmbeddingMicroBatcher(embedder, max_batch_size=2, max_wait_ms=1000, inference_executor=executor)
+
+    results = await asyncio.wait_for(
+        asyncio.gather(batcher.embed([crop(1)]), batcher.embed([crop(2)])),
+        timeout=0.5,
+    )
+    await batcher.close()
+    executor.shutdown()
+
+    assert results == [[[1.0]], [[2.0]]]
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_falls_back_to_per_face_embedding():
+    embedder = ValueEmbedder(fail_batches=True)
+    executor = InferenceExecutor()
+    batcher = EmbeddingMicroBatcher(embedder, max_wait_ms=0, inference_executor=executor)
+
+    result = await batcher.embed([crop(7), crop(99)])
+    await batcher.close()
+    executor.shutdown()
+
+    assert result == [[7.0], None]
+
+
+@pytest.mark.asyncio
+async def test_executor_backpressure_is_raised_to_every_waiting_request():
+    embedder = ValueEmbedder()
+    executor = InferenceExecutor()
+    batcher = EmbeddingMicroBatcher(embedder, max_wait_ms=20, inference_executor=executor)
+
+    async def reject(*_args, **_kwargs):
+        raise InferenceQueueFullError(0, 1)
+
+    executor.run = reject
+    results = await asyncio.gather(
+        batcher.embed([crop(1)]),
+        batcher.embed([crop(2)]),
+        return_exceptions=True,
+    )
+    await batcher.close()
+
+    assert all(isinstance(result, InferenceQueueFullError) for result in results)
@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("onnxruntime")
+
+import torch  # noqa: E402
+
+from src.services.ai.onnx_export import export_tracenet_to_onnx  # noqa: E402
+from src.services.ai.strategies import (  # noqa: E402
+    OnnxEmbeddingStrategy,
+    TraceNetStrategy,
+    get_face_embedding_strategy,
+    normalize_embedding_version,
+)
+from src.services.ai.tracenet_model import TraceNet  # noqa: E402
+
+
+MAX_EMBEDDING_DELTA = 1e-4
+
+
+@pytest.fixture
+def tracenet_checkpoint(tmp_path):
+    torch.manual_seed(0)
+    checkpoint_path = tmp_path / "tracenet.pth"
+    torch.save({"model_state_dict": TraceNet(embedding_size=512).state_dict()}, checkpoint_path)
+    return checkpoint_path
+
+
+def test_onnx_tracenet_matches_pytorch_embeddings(tmp_path, tracenet_checkpoint):
+    onnx_path = export_tracenet_to_onnx(tracenet_checkpoint, tmp_path / "tracenet.onnx")
+    pytorch_strategy = TraceNetStrategy(model_path=tracenet_checkpoint, device="cpu")
+    onnx_strategy = get_face_embedding_strategy("tracenet_onnx", model_path=onnx_path)
+
+    rng = np.random.default_rng(5)
+    faces = [rng.integers(0, 255, size=(rng.integers(80, 200), rng.integers(80, 200), 3), dtype=np.uint8) for _ in range(5)]
+
+    expected = np.asarray(pytorch_strategy.embed_faces(faces))
+    actual = np.asarray(onnx_strategy.embed_faces(faces))
+
+    assert isinstance(onnx_strategy, OnnxEmbeddingStrategy)
+    assert actual.shape == (5, 512)
+    assert float(np.max(np.abs(expected - actual))) < MAX_EMBEDDING_DELTA
+    # Dynamic batch axis: a single face runs through the same graph.
+    np.testing.assert_allclose(onnx_strategy.embed_face(faces[0]), actual[0], atol=1e-5)
+
+
+def test_onnx_backend_keeps_the_pytorch_embedding_space(tmp_path, tracenet_checkpoint):
+    onnx_path = export_tracenet_to_onnx(tracenet_checkpoint, tmp_path / "tracenet.onnx")
+
+    strategy = get_face_embedding_strategy("tracenet_v1_onnx", model_path=onnx_path)
+
+    assert normalize_embedding_version("TraceNet_ONNX") == "tracenet_v1_onnx"
+    assert strategy.embedding_version == "tracenet_v1"
+    assert strategy.backend_version == "tracenet_v1_onnx"
+
+
+def test_missing_onnx_graph_raises_with_export_hint(tmp_path):
+    with pytest.raises(FileNotFoundError, match="export_onnx_models.py"):
+        get_face_embedding_strategy("tracenet_v1_onnx", model_path=tmp_path / "missing.onnx")
+
+
+def test_int8_tracenet_is_versioned_separately_and_tracks_fp32(tmp_path, tracenet_checkpoint):
+    from src.services.ai.quantization import build_tracenet_calibration_batches, quantize_embedding_graph
+
+    rng = np.random.default_rng(9)
+    faces = [rng.integers(0, 255, size=(112, 112, 3), dtype=np.uint8) for _ in range(8)]
+    fp32_path = export_tracenet_to_onnx(tracenet_checkpoint, tmp_path / "tracenet.onnx")
+    int8_path = quantize_embedding_graph(
+        fp32_path,
+        tmp_path / "tracenet_int8.onnx",
+        build_tracenet_calibration_batches(faces, batch_size=4),
+    )
+
+    fp32_strategy = get_face_embedding_strategy("tracenet_v1_onnx", model_path=fp32_path)
+    int8_strategy = get_face_embedding_strategy("tracenet_int8", model_path=int8_path)
+
+    assert int8_strategy.embedding_version == "tracenet_v1_int8"
+    cosine = np.sum(
+        np.asarray(fp32_strategy.embed_faces(faces)) * np.asarray(int8_strategy.embed_faces(faces)),
+        axis=1,
+    )
+    assert float(cosine.min()) > 0.98
@@ -0,0 +1,51 @@
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import exc
+
+from src.infrastructure.pool_metrics import InstrumentedQueuePool, collect_pool_metrics
+
+
+def build_pool(**kwargs):
+    return InstrumentedQueuePool(lambda: MagicMock(), **kwargs)
+
+
+def test_collect_pool_metrics_reports_checkouts_and_overflow():
+    pool = build_pool(pool_size=1, max_overflow=1, timeout=0.01)
+
+    first = pool.connect()
+    second = pool.connect()
+    metrics = collect_pool_metrics(pool)
+
+    assert metrics["pool_size"] == 1
+    assert metrics["checked_out"] == 2
+    assert metrics["overflow"] == 1
+    assert metrics["max_overflow"] == 1
+    assert metrics["wait"]["checkouts"] == 2
+
+    first.close()
+    second.close()
+    assert collect_pool_metrics(pool)["checked_out"] == 0
+
+
+def test_exhausted_pool_records_timeouts_with_wait_time():
+    pool = build_pool(pool_size=1, max_overflow=0, timeout=0.02)
+    held = pool.connect()
+
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+
+    wait = collect_pool_metrics(pool)["wait"]
+    assert wait["timeouts"] == 1
+    assert wait["max_wait_ms"] >= 15.0
+    held.close()
+
+
+def test_recreated_pool_keeps_wait_stats():
+    pool = build_pool(pool_size=1, max_overflow=0)
+    pool.connect().close()
+
+    recreated = pool.recreate()
+
+    assert recreated.wait_stats is pool.wait_stats
+    assert collect_pool_metrics(recreated)["wait"]["checkouts"] == 1
@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+import torch
+from PIL import Image
+from torchvision import transforms
+
+from src.services.ai.preprocessing import build_facenet_preprocessor, build_tracenet_preprocessor
+
+
+@pytest.fixture
+def face_crops():
+    rng = np.random.default_rng(3)
+    frame = rng.integers(0, 255, size=(300, 260, 3), dtype=np.uint8)
+    return [
+        rng.integers(0, 255, size=(112, 112, 3), dtype=np.uint8),
+        rng.integers(0, 255, size=(150, 130, 3), dtype=np.uint8),
+        rng.integers(0, 255, size=(80, 90, 3), dtype=np.uint8),
+        frame[10:200, 20:150],  # non-contiguous slice, like an unaligned raw crop
+    ]
+
+
+def test_tracenet_preprocessor_matches_torchvision_pil_transform(face_crops):
+    reference_transform = transforms.Compose([
+        transforms.Resize((112, 112)),
+        transforms.ToTensor(),
+        transforms.Normalize([0.5, 0.5, 0.5], [0.5, 0.5, 0.5]),
+    ])
+    expected = torch.stack([reference_transform(Image.fromarray(np.ascontiguousarray(crop))) for crop in face_crops])
+
+    actual = build_tracenet_preprocessor()(face_crops)
+
+    assert actual.shape == (4, 3, 112, 112)
+    # At most one uint8 level of resize rounding, i.e. 1 / 127.5 after normalisation.
+    assert torch.max(torch.abs(actual - expected)).item() <= 2.0 / 255.0 + 1e-6
+
+
+def test_facenet_preprocessor_matches_pil_resize_and_whitening(face_crops):
+    expected = []
+    for crop in face_crops:
+        resized = torch.from_numpy(np.array(Image.fromarray(np.ascontiguousarray(crop)).resize((160, 160)))).float()
+        resized = resized.permute(2, 0, 1)
+        expected.append((resized - resized.mean()) / resized.std())
+
+    actual = build_facenet_preprocessor()(face_crops)
+
+    assert actual.shape == (4, 3, 160, 160)
+    assert torch.mean(torch.abs(actual - torch.stack(expected))).item() < 1e-3
+
+
+def test_preprocessor_reuses_its_buffer_for_smaller_batches(face_crops):
+    preprocess = build_tracenet_preprocessor()
+
+    first = preprocess(face_crops)
+    second = preprocess(face_crops[:2])
+
+    assert second.shape[0] == 2
+    assert second.data_ptr() == first.data_ptr()
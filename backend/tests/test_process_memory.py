@@ -0,0 +1,38 @@
+import os
+
+from src.infrastructure import process_memory
+from src.infrastructure.process_memory import read_process_memory
+
+
+def test_read_process_memory_sums_smaps_rollup_fields(tmp_path, monkeypatch):
+    rollup = tmp_path / "smaps_rollup"
+    rollup.write_text(
+        "00400000-7ffd [rollup]\n"
+        "Rss:              204800 kB\n"
+        "Pss:              153600 kB\n"
+        "Shared_Clean:      81920 kB\n"
+        "Shared_Dirty:      20480 kB\n"
+        "Private_Clean:     10240 kB\n"
+        "Private_Dirty:     92160 kB\n"
+        "Swap:                  0 kB\n",
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(process_memory, "Path", lambda _path: rollup)
+
+    report = read_process_memory(1234)
+
+    assert report == {
+        "pid": 1234,
+        "rss_mb": 200.0,
+        "pss_mb": 150.0,
+        "unique_mb": 100.0,
+        "shared_mb": 100.0,
+        "swap_mb": 0.0,
+    }
+
+
+def test_read_process_memory_reports_none_when_proc_is_unavailable():
+    report = read_process_memory(2**22 + os.getpid())
+
+    assert report["unique_mb"] is None
+    assert report["rss_mb"] is None
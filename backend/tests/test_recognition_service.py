@@ -1,8 +1,12 @@
+import threading
 import pytest
 from unittest.mock import AsyncMock, MagicMock, patch
+import cv2
 import numpy as np
 from uuid import uuid4
+from src.infrastructure.repositories.identity_template import PrimaryFaceRow, TemplateCandidateRow
 from src.services.recognition_service import RecognitionService
+from src.services.template_gallery import TemplateGallery
 from src.domain.models.audit import AuditLog
 
 @pytest.mark.asyncio
@@ -36,20 +40,20 @@ async def test_identify_suspects_success(mock_cvtColor, mock_imdecode):
     mock_template.active_face_count = 2
     mock_template.support_face_count = 1
     mock_template.outlier_face_count = 0
-    template_repo.find_nearest_neighbors.return_value = [(mock_template, 0.4)]
-    face_repo.get.return_value = MagicMock(
-        id=primary_face_id,
-        image_url="uploads/faces/john.jpg",
-        is_primary=True,
-    )
-    
     mock_criminal = MagicMock()
     mock_criminal.id = criminal_id
     mock_criminal.first_name = "John"
     mock_criminal.last_name = "Doe"
     mock_criminal.nic = "123456789V"
     mock_criminal.threat_level = "HIGH"
-    criminal_repo.get.return_value = mock_criminal
+    template_repo.find_nearest_candidates.return_value = [
+        TemplateCandidateRow(
+            template=mock_template,
+            distance=0.4,
+            criminal=mock_criminal,
+            primary_face=PrimaryFaceRow(id=primary_face_id, image_url="uploads/faces/john.jpg", is_primary=True),
+        )
+    ]
     
     service = RecognitionService(pipeline, template_repo, face_repo, criminal_repo, audit_repo)
     
@@ -63,6 +67,8 @@ async def test_identify_suspects_success(mock_cvtColor, mock_imdecode):
     assert results[0]['criminal']['name'] == "John Doe"
     assert results[0]['distance'] == 0.4
     assert results[0]['decision_reason'] == 'matched'
+    criminal_repo.get_many.assert_not_called()
+    face_repo.get_primary_faces_by_ids.assert_not_called()
     
     # Verify audit log was created
     audit_repo.create.assert_called_once()
@@ -100,20 +106,20 @@ async def test_identify_suspects_uses_largest_face_only(mock_cvtColor, mock_imde
     mock_template.active_face_count = 2
     mock_template.support_face_count = 1
     mock_template.outlier_face_count = 0
-    template_repo.find_nearest_neighbors.return_value = [(mock_template, 0.3)]
-    face_repo.get.return_value = MagicMock(
-        id=primary_face_id,
-        image_url="uploads/faces/jane.jpg",
-        is_primary=True,
-    )
-
     mock_criminal = MagicMock()
     mock_criminal.id = criminal_id
     mock_criminal.first_name = "Jane"
     mock_criminal.last_name = "Doe"
     mock_criminal.nic = "987654321V"
     mock_criminal.threat_level = "HIGH"
-    criminal_repo.get.return_value = mock_criminal
+    template_repo.find_nearest_candidates.return_value = [
+        TemplateCandidateRow(
+            template=mock_template,
+            distance=0.3,
+            criminal=mock_criminal,
+            primary_face=PrimaryFaceRow(id=primary_face_id, image_url="uploads/faces/jane.jpg", is_primary=True),
+        )
+    ]
 
     service = RecognitionService(pipeline, template_repo, face_repo, criminal_repo, audit_repo)
     response = await service.identify_suspects(b"fake_bytes", include_debug=True)
@@ -123,7 +129,7 @@ async def test_identify_suspects_uses_largest_face_only(mock_cvtColor, mock_imde
     assert results[0]['box'] == (10, 10, 120, 120)
     assert response["debug"]["detected_face_count"] == 3
     assert response["debug"]["analyzed_face_count"] == 1
-    template_repo.find_nearest_neighbors.assert_awaited_once_with([0.2] * 128, limit=10)
+    template_repo.find_nearest_candidates.assert_awaited_once_with([0.2] * 128, limit=10)
 
 
 @pytest.mark.asyncio
@@ -146,8 +152,8 @@ async def test_identify_suspects_rejects_over_threshold_match(mock_cvtColor, moc
     best_template = MagicMock()
     best_template.criminal_id = uuid4()
     best_template.primary_face_id = uuid4()
-    template_repo.find_nearest_neighbors.return_value = [
-        (best_template, 0.91),
+    template_repo.find_nearest_candidates.return_value = [
+        TemplateCandidateRow(template=best_template, distance=0.91, criminal=None, primary_face=None),
     ]
 
     service = RecognitionService(pipeline, template_repo, face_repo, criminal_repo, audit_repo)
@@ -162,7 +168,7 @@ async def test_identify_suspects_rejects_over_threshold_match(mock_cvtColor, moc
     assert results[0]['status'] == 'unknown'
     assert results[0]['confidence'] == 0.0
     assert results[0]['decision_reason'] == 'over_possible_threshold'
-    criminal_repo.get.assert_not_called()
+    criminal_repo.get_many.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -192,16 +198,20 @@ async def test_identify_suspects_returns_possible_match_for_threshold_band(mock_
     mock_template.active_face_count = 3
     mock_template.support_face_count = 2
     mock_template.outlier_face_count = 0
-    template_repo.find_nearest_neighbors.return_value = [(mock_template, 0.82)]
-    face_repo.get.return_value = MagicMock(id=primary_face_id, image_url="uploads/faces/possible.jpg", is_primary=True)
-
     mock_criminal = MagicMock()
     mock_criminal.id = criminal_id
     mock_criminal.first_name = "Possible"
     mock_criminal.last_name = "Match"
     mock_criminal.nic = "555555555V"
     mock_criminal.threat_level = "MEDIUM"
-    criminal_repo.get.return_value = mock_criminal
+    template_repo.find_nearest_candidates.return_value = [
+        TemplateCandidateRow(
+            template=mock_template,
+            distance=0.82,
+            criminal=mock_criminal,
+            primary_face=PrimaryFaceRow(id=primary_face_id, image_url="uploads/faces/possible.jpg", is_primary=True),
+        )
+    ]
 
     service = RecognitionService(pipeline, template_repo, face_repo, criminal_repo, audit_repo)
     response = await service.identify_suspects(
@@ -254,18 +264,11 @@ async def test_identify_suspects_scene_mode_analyzes_all_faces(mock_cvtColor, mo
     template_two.support_face_count = 1
     template_two.outlier_face_count = 0
 
-    template_repo.find_nearest_neighbors.side_effect = [
-        [(template_one, 0.75)],
-        [(template_two, 0.82)],
-    ]
-    face_repo.get.side_effect = [
-        MagicMock(id=template_one.primary_face_id, image_url="uploads/faces/one.jpg", is_primary=True),
-        MagicMock(id=template_two.primary_face_id, image_url="uploads/faces/two.jpg", is_primary=True),
-    ]
-
-    criminal_repo.get.side_effect = [
-        MagicMock(id=template_one.criminal_id, first_name="Face", last_name="One", nic="111", threat_level="HIGH"),
-        MagicMock(id=template_two.criminal_id, first_name="Face", last_name="Two", nic="222", threat_level="LOW"),
+    criminal_one = MagicMock(id=template_one.criminal_id, first_name="Face", last_name="One", nic="111", threat_level="HIGH")
+    criminal_two = MagicMock(id=template_two.criminal_id, first_name="Face", last_name="Two", nic="222", threat_level="LOW")
+    template_repo.find_nearest_candidates_batch.return_value = [
+        [TemplateCandidateRow(template_one, 0.75, criminal_one, None)],
+        [TemplateCandidateRow(template_two, 0.82, criminal_two, None)],
     ]
 
     service = RecognitionService(pipeline, template_repo, face_repo, criminal_repo, audit_repo)
@@ -280,4 +283,169 @@ async def test_identify_suspects_scene_mode_analyzes_all_faces(mock_cvtColor, mo
     assert len(results) == 2
     assert results[0]["status"] == "match"
     assert results[1]["status"] == "possible_match"
-    assert template_repo.find_nearest_neighbors.await_count == 2
+    template_repo.find_nearest_candidates_batch.assert_awaited_once_with([[0.1] * 128, [0.2] * 128], limit=10)
+    template_repo.find_nearest_candidates.assert_not_called()
+    assert pipeline.process_image.call_args.kwargs["tiled"] is True
+
+
+@pytest.mark.asyncio
+@patch('cv2.imdecode')
+@patch('cv2.cvtColor')
+async def test_identify_suspects_bulk_loads_profiles_for_gallery_candidates(mock_cvtColor, mock_imdecode):
+    mock_imdecode.return_value = np.zeros((200, 200, 3), dtype=np.uint8)
+    mock_cvtColor.return_value = np.zeros((200, 200, 3), dtype=np.uint8)
+
+    pipeline = MagicMock()
+    template_repo = AsyncMock()
+    face_repo = AsyncMock()
+    criminal_repo = AsyncMock()
+    audit_repo = AsyncMock()
+
+    pipeline.process_image.return_value = [
+        {'box': [0, 0, 40, 40], 'embedding': [1.0, 0.0]},
+        {'box': [10, 10, 120, 120], 'embedding': [0.0, 1.0]},
+    ]
+
+    templates = [
+        MagicMock(
+            id=uuid4(),
+            criminal_id=uuid4(),
+            primary_face_id=uuid4(),
+            template_version="tracenet_template_v1",
+            embedding_version="tracenet_v1",
+            active_face_count=1,
+            support_face_count=0,
+            archived_face_count=0,
+            outlier_face_count=0,
+            updated_at=None,
+            template_embedding=embedding,
+        )
+        for embedding in ([1.0, 0.0], [0.0, 1.0])
+    ]
+    gallery = TemplateGallery()
+    gallery.load_templates(templates)
+
+    criminal_repo.get_many.return_value = [
+        MagicMock(id=template.criminal_id, first_name="Face", last_name=str(index), nic=str(index), threat_level="LOW")
+        for index, template in enumerate(templates)
+    ]
+    face_repo.get_primary_faces_by_ids.return_value = [
+        MagicMock(id=template.primary_face_id, image_url=f"uploads/faces/{index}.jpg", is_primary=True)
+        for index, template in enumerate(templates)
+    ]
+
+    service = RecognitionService(
+        pipeline,
+        template_repo,
+        face_repo,
+        criminal_repo,
+        audit_repo,
+        template_gallery=gallery,
+    )
+    response = await service.identify_suspects(b"fake_bytes", single_face_only=False, include_debug=True)
+
+    assert [result["criminal"]["name"] for result in response["results"]] == ["Face 0", "Face 1"]
+    template_repo.find_nearest_candidates.assert_not_called()
+    template_repo.find_nearest_candidates_batch.assert_not_called()
+    criminal_repo.get_many.assert_awaited_once()
+    assert set(criminal_repo.get_many.await_args.args[0]) == {template.criminal_id for template in templates}
+    face_repo.get_primary_faces_by_ids.assert_awaited_once()
+    criminal_repo.get.assert_not_called()
+    face_repo.get.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_identify_suspects_decodes_large_jpeg_reduced_and_reports_original_boxes():
+    ok, encoded = cv2.imencode(".jpg", np.zeros((1000, 2600, 3), dtype=np.uint8))
+    assert ok
+
+    pipeline = MagicMock()
+    pipeline.detection_max_side = 640
+    pipeline.process_image.return_value = [{'box': [100, 50, 40, 60], 'embedding': [0.1] * 128}]
+    template_repo = AsyncMock()
+    template_repo.find_nearest_candidates.return_value = []
+
+    service = RecognitionService(pipeline, template_repo, AsyncMock(), AsyncMock(), AsyncMock())
+    response = await service.identify_suspects(encoded.tobytes())
+
+    assert pipeline.process_image.call_args.args[0].shape == (250, 650, 3)
+    assert response["results"][0]["box"] == (400, 200, 160, 240)
+
+
+@pytest.mark.asyncio
+@patch('cv2.imdecode')
+@patch('cv2.cvtColor')
+async def test_identify_suspects_skips_gallery_candidates_of_deleted_criminals(mock_cvtColor, mock_imdecode):
+    mock_imdecode.return_value = np.zeros((200, 200, 3), dtype=np.uint8)
+    mock_cvtColor.return_value = np.zeros((200, 200, 3), dtype=np.uint8)
+
+    pipeline = MagicMock()
+    template_repo = AsyncMock()
+    face_repo = AsyncMock()
+    criminal_repo = AsyncMock()
+    audit_repo = AsyncMock()
+
+    pipeline.process_image.return_value = [{'box': [10, 10, 120, 120], 'embedding': [1.0, 0.0]}]
+
+    # Another worker deleted (or merged away) the first criminal; this gallery still holds its template.
+    deleted_template, live_template = [
+        MagicMock(
+            id=uuid4(),
+            criminal_id=uuid4(),
+            primary_face_id=None,
+            template_version="tracenet_template_v1",
+            embedding_version="tracenet_v1",
+            active_face_count=1,
+            support_face_count=0,
+            archived_face_count=0,
+            outlier_face_count=0,
+            updated_at=None,
+            template_embedding=embedding,
+        )
+        for embedding in ([1.0, 0.0], [0.998, 0.063])
+    ]
+    gallery = TemplateGallery()
+    gallery.load_templates([deleted_template, live_template])
+    criminal_repo.get_many.return_value = [
+        MagicMock(id=live_template.criminal_id, first_name="Live", last_name="Person", nic="1", threat_level="LOW")
+    ]
+
+    service = RecognitionService(
+        pipeline,
+        template_repo,
+        face_repo,
+        criminal_repo,
+        audit_repo,
+        template_gallery=gallery,
+    )
+    response = await service.identify_suspects(b"fake_bytes")
+
+    [result] = response["results"]
+    assert result["status"] == "match"
+    assert result["criminal"]["name"] == "Live Person"
+    criminal_repo.get_many.assert_awaited_once()
+    assert set(criminal_repo.get_many.await_args.args[0]) == {deleted_template.criminal_id, live_template.criminal_id}
+
+
+@pytest.mark.asyncio
+async def test_identify_suspects_decodes_on_the_inference_executor():
+    ok, encoded = cv2.imencode(".png", np.zeros((120, 160, 3), dtype=np.uint8))
+    assert ok
+    event_loop_thread = threading.current_thread()
+    decode_threads = []
+    real_imdecode = cv2.imdecode
+
+    def recording_imdecode(*args, **kwargs):
+        decode_threads.append(threading.current_thread())
+        return real_imdecode(*args, **kwargs)
+
+    pipeline = MagicMock()
+    pipeline.detection_max_side = 640
+    pipeline.process_image.return_value = []
+
+    service = RecognitionService(pipeline, AsyncMock(), AsyncMock(), AsyncMock(), AsyncMock())
+    with patch("cv2.imdecode", side_effect=recording_imdecode):
+        await service.identify_suspects(encoded.tobytes())
+
+    assert decode_threads
+    assert event_loop_thread not in decode_threads
@@ -0,0 +1,130 @@
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import numpy as np
+import pytest
+
+from src.services.ai import runtime
+
+
+@pytest.fixture
+def fake_pipeline(monkeypatch):
+    detector = MagicMock()
+    embedder = MagicMock()
+    face_pipeline = SimpleNamespace(detector=detector, embedder=embedder, max_batch_size=4)
+    monkeypatch.setattr(runtime, "_pipeline_cache", {(runtime.ACTIVE_EMBEDDING_VERSION, None): face_pipeline})
+    monkeypatch.setattr(runtime, "_readiness", dict(runtime._readiness))
+    return face_pipeline
+
+
+def test_importing_runtime_does_not_import_torch():
+    completed = subprocess.run(
+        [sys.executable, "-c", "import sys, src.services.ai.runtime; print('torch' in sys.modules)"],
+        cwd=Path(__file__).resolve().parents[1],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    assert completed.stdout.strip() == "False"
+    assert isinstance(runtime.pipeline, runtime.LazyPipeline)
+
+
+def test_lazy_pipeline_delegates_to_loaded_pipeline(fake_pipeline):
+    assert runtime.pipeline.is_loaded is True
+    assert runtime.pipeline.max_batch_size == 4
+
+
+def test_warm_up_models_runs_every_batch_shape_and_marks_ready(fake_pipeline):
+    readiness = runtime.warm_up_models(iterations=2)
+
+    assert readiness["ready"] is True
+    assert readiness["status"] == "ready"
+    assert readiness["warmup_seconds"] is not None
+    assert fake_pipeline.detector.detect_faces.call_count == 2
+    batch_sizes = [len(call.args[0]) for call in fake_pipeline.embedder.embed_faces.call_args_list]
+    assert batch_sizes == [1, 4, 1, 4]
+    warmup_image = fake_pipeline.detector.detect_faces.call_args.args[0]
+    assert warmup_image.shape == (*runtime.WARMUP_IMAGE_SIZE, 3)
+    assert warmup_image.dtype == np.uint8
+
+
+def test_warm_up_models_records_failure(fake_pipeline):
+    fake_pipeline.embedder.embed_faces.side_effect = RuntimeError("bad graph")
+
+    with pytest.raises(RuntimeError):
+        runtime.warm_up_models(iterations=1)
+
+    readiness = runtime.get_readiness()
+    assert readiness["ready"] is False
+    assert readiness["status"] == "failed"
+    assert readiness["error"] == "bad graph"
+
+
+def test_preload_models_for_fork_shares_detector_and_torch_embedder(fake_pipeline, monkeypatch):
+    from src.services.ai import strategies
+
+    shared = []
+    monkeypatch.setattr(runtime, "_detector", fake_pipeline.detector)
+    monkeypatch.setattr(strategies, "share_model_weights", lambda *items: shared.extend(items) or 1024)
+    monkeypatch.setattr(runtime.gc, "freeze", lambda: None)
+
+    summary = runtime.preload_models_for_fork()
+
+    assert shared == [fake_pipeline.detector, fake_pipeline.embedder]
+    assert summary["preloaded_embedder"] is True
+    assert summary["shared_weight_bytes"] == 1024
+    fake_pipeline.embedder.embed_faces.assert_not_called()
+
+
+def test_share_model_weights_freezes_cpu_modules():
+    import torch
+
+    from src.services.ai.strategies import share_model_weights
+
+    strategy = SimpleNamespace(model=torch.nn.Linear(4, 2), device="cpu")
+
+    shared_bytes = share_model_weights(strategy)
+
+    assert shared_bytes == (4 * 2 + 2) * 4
+    assert strategy.model.training is False
+    assert all(parameter.is_shared() and not parameter.requires_grad for parameter in strategy.model.parameters())
+
+
+def test_active_embedding_space_maps_onnx_backends_to_their_model_space():
+    from src.services.ai.model_registry import resolve_embedding_space
+
+    assert resolve_embedding_space("tracenet_v1_onnx") == "tracenet_v1"
+    assert resolve_embedding_space("facenet_vggface2") == "facenet_vggface2"
+    assert runtime.ACTIVE_EMBEDDING_SPACE == resolve_embedding_space(runtime.ACTIVE_EMBEDDING_VERSION)
+
+
+@pytest.mark.asyncio
+async def test_require_face_models_rejects_requests_while_warmup_loads(monkeypatch):
+    monkeypatch.setattr(runtime, "_pipeline_cache", {})
+    monkeypatch.setattr(runtime, "_readiness", {**runtime._readiness, "status": "loading"})
+    load = MagicMock()
+    monkeypatch.setattr(runtime, "get_pipeline", load)
+
+    with pytest.raises(runtime.FaceModelsLoadingError):
+        await runtime.require_face_models()
+    load.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_require_face_models_loads_lazily_on_the_inference_executor(monkeypatch):
+    monkeypatch.setattr(runtime, "_pipeline_cache", {})
+    monkeypatch.setattr(runtime, "_readiness", {**runtime._readiness, "status": "lazy"})
+    load = MagicMock()
+    executor = MagicMock()
+    executor.run = AsyncMock()
+    monkeypatch.setattr(runtime, "get_pipeline", load)
+    monkeypatch.setattr(runtime, "inference_executor", executor)
+
+    await runtime.require_face_models()
+
+    executor.run.assert_awaited_once_with(load)
+    load.assert_not_called()
@@ -0,0 +1,255 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+
+from src.services.recognition_service import RecognitionService
+from src.services.template_gallery import TemplateGallery
+
+
+def build_template(embedding, *, criminal_id=None, updated_at=None, embedding_version="tracenet_v1"):
+    return SimpleNamespace(
+        id=uuid4(),
+        criminal_id=criminal_id or uuid4(),
+        template_version="tracenet_template_v1",
+        embedding_version=embedding_version,
+        primary_face_id=uuid4(),
+        support_face_ids=None,
+        active_face_count=1,
+        support_face_count=0,
+        archived_face_count=0,
+        outlier_face_count=0,
+        updated_at=updated_at or datetime.now(timezone.utc),
+        template_embedding=list(embedding),
+    )
+
+
+def test_search_matches_brute_force_ranking():
+    rng = np.random.default_rng(7)
+    embeddings = rng.normal(size=(50, 16)).astype(np.float32)
+    templates = [build_template(row) for row in embeddings]
+    gallery = TemplateGallery(initial_capacity=4)
+    gallery.load_templates(templates)
+
+    query = rng.normal(size=16).astype(np.float32)
+    matches = gallery.search(query.tolist(), limit=5)
+
+    expected_distances = np.linalg.norm(embeddings - query, axis=1)
+    expected_rows = np.argsort(expected_distances)[:5]
+    assert [match.criminal_id for match, _distance in matches] == [
+        templates[row].criminal_id for row in expected_rows
+    ]
+    assert [distance for _match, distance in matches] == pytest.approx(
+        expected_distances[expected_rows].tolist(), abs=1e-4
+    )
+
+
+def test_search_many_matches_single_query_search():
+    rng = np.random.default_rng(11)
+    templates = [build_template(row) for row in rng.normal(size=(30, 8)).astype(np.float32)]
+    gallery = TemplateGallery()
+    gallery.load_templates(templates)
+
+    queries = rng.normal(size=(4, 8)).astype(np.float32).tolist()
+    batched = gallery.search_many(queries, limit=3)
+
+    assert len(batched) == 4
+    for query, matches in zip(queries, batched):
+        expected = gallery.search(query, limit=3)
+        assert [match.criminal_id for match, _distance in matches] == [
+            match.criminal_id for match, _distance in expected
+        ]
+        assert [distance for _match, distance in matches] == pytest.approx(
+            [distance for _match, distance in expected], abs=1e-5
+        )
+    assert TemplateGallery().search_many(queries, limit=3) is None
+
+
+def test_search_returns_none_until_loaded_or_on_dimension_mismatch():
+    gallery = TemplateGallery()
+    assert gallery.search([0.1, 0.2], limit=3) is None
+
+    gallery.load_templates([build_template([1.0, 0.0, 0.0])])
+    assert gallery.search([0.1, 0.2], limit=3) is None
+
+
+def test_upsert_and_remove_update_gallery_incrementally():
+    first = build_template([1.0, 0.0])
+    second = build_template([0.0, 1.0])
+    gallery = TemplateGallery(initial_capacity=1)
+    gallery.load_templates([first])
+
+    gallery.upsert(second)
+    assert gallery.size == 2
+    [(best, distance)] = gallery.search([0.0, 1.0], limit=1)
+    assert best.criminal_id == second.criminal_id
+    assert distance == pytest.approx(0.0)
+
+    replacement = build_template([1.0, 0.0], criminal_id=second.criminal_id)
+    gallery.upsert(replacement)
+    assert gallery.size == 2
+    assert gallery.search([0.0, 1.0], limit=1)[0][1] == pytest.approx(np.sqrt(2.0))
+
+    assert gallery.remove(first.criminal_id) is True
+    assert gallery.remove(first.criminal_id) is False
+    assert [match.criminal_id for match, _distance in gallery.search([1.0, 0.0], limit=5)] == [
+        second.criminal_id
+    ]
+
+
+
+def test_search_scoped_to_embedding_version_skips_other_versions():
+    tracenet = build_template([1.0, 0.0])
+    facenet = build_template([0.9, 0.1], embedding_version="facenet_vggface2")
+    gallery = TemplateGallery(initial_capacity=1)
+    gallery.load_templates([tracenet])
+    gallery.upsert(facenet)
+    late_tracenet = build_template([0.0, 1.0])
+    gallery.upsert(late_tracenet)
+
+    scoped = gallery.search([0.9, 0.1], limit=5, embedding_version="tracenet_v1")
+    assert [match.criminal_id for match, _distance in scoped] == [
+        tracenet.criminal_id,
+        late_tracenet.criminal_id,
+    ]
+    assert gallery.search_many([[0.9, 0.1]], limit=5, embedding_version="facenet_vggface2")[0][0][1] == pytest.approx(0.0)
+    assert gallery.search([0.9, 0.1], limit=5, embedding_version="tracenet_v1_int8") == []
+
+    gallery.remove(tracenet.criminal_id)
+    assert [match.criminal_id for match, _distance in gallery.search([0.9, 0.1], limit=1, embedding_version="tracenet_v1")] == [
+        late_tracenet.criminal_id
+    ]
+
+
+def test_coarse_search_many_returns_exact_distances_for_full_shortlist():
+    rng = np.random.default_rng(3)
+    templates = [build_template(row) for row in rng.normal(size=(40, 32)).astype(np.float32)]
+    gallery = TemplateGallery(initial_capacity=8)
+    gallery.load_templates(templates)
+
+    queries = rng.normal(size=(3, 32)).astype(np.float32).tolist()
+    coarse = gallery.coarse_search_many(queries, limit=40)
+    exact = gallery.search_many(queries, limit=40)
+    for coarse_matches, exact_matches in zip(coarse, exact):
+        assert [match.criminal_id for match, _distance in coarse_matches] == [
+            match.criminal_id for match, _distance in exact_matches
+        ]
+
+    [shortlist] = gallery.coarse_search_many([templates[5].template_embedding], limit=4)
+    assert len(shortlist) == 4
+    assert shortlist[0][0].criminal_id == templates[5].criminal_id
+    assert shortlist[0][1] == pytest.approx(0.0, abs=1e-3)
+    assert gallery.coarse_search_many(queries, limit=4, embedding_version="facenet_vggface2") == [[], [], []]
+    assert TemplateGallery().coarse_search_many(queries, limit=4) is None
+
+
+@pytest.mark.asyncio
+async def test_check_consistency_reports_and_repairs_drift():
+    kept = build_template([1.0, 0.0])
+    removed = build_template([0.0, 1.0])
+    gallery = TemplateGallery()
+    gallery.load_templates([kept, removed])
+
+    added = build_template([0.5, 0.5])
+    consistency_result = MagicMock()
+    consistency_result.all.return_value = [
+        (kept.criminal_id, kept.updated_at),
+        (added.criminal_id, added.updated_at),
+    ]
+    load_result = MagicMock()
+    load_result.scalars.return_value.all.return_value = [kept, added]
+    session = AsyncMock()
+    session.execute.side_effect = [consistency_result, load_result]
+
+    report = await gallery.check_consistency(session, repair=True)
+
+    assert report["consistent"] is False
+    assert report["missing_from_gallery"] == [str(added.criminal_id)]
+    assert report["missing_from_database"] == [str(removed.criminal_id)]
+    assert report["repaired"] is True
+    assert gallery.size == 2
+    assert gallery.search([0.5, 0.5], limit=1)[0][0].criminal_id == added.criminal_id
+
+
+@pytest.mark.asyncio
+async def test_rank_criminal_candidates_prefers_loaded_gallery():
+    template = build_template([0.2] * 4)
+    gallery = TemplateGallery()
+    gallery.load_templates([template])
+    template_repo = AsyncMock()
+
+    service = RecognitionService(
+        MagicMock(),
+        template_repo,
+        AsyncMock(),
+        AsyncMock(),
+        AsyncMock(),
+        template_gallery=gallery,
+    )
+    candidates = await service._rank_criminal_candidates([0.2] * 4, limit=10)
+
+    template_repo.find_nearest_candidates.assert_not_awaited()
+    assert candidates[0]["criminal_id"] == str(template.criminal_id)
+    assert candidates[0]["distance"] == pytest.approx(0.0)
+
+
+def gallery_session(*results):
+    session = AsyncMock()
+    session_results = []
+    for rows in results:
+        result = MagicMock()
+        if isinstance(rows, tuple):
+            result.one.return_value = rows
+        else:
+            result.scalars.return_value.all.return_value = rows
+        session_results.append(result)
+    session.execute.side_effect = session_results
+    return session
+
+
+@pytest.mark.asyncio
+async def test_refresh_if_changed_picks_up_templates_written_by_another_worker():
+    enrolled_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    existing = build_template([1.0, 0.0, 0.0], updated_at=enrolled_at)
+    enrolling_worker = TemplateGallery()
+    searching_worker = TemplateGallery()
+    enrolling_worker.load_templates([existing])
+    searching_worker.load_templates([existing])
+
+    # Worker one enrolls a new identity and rebuilds the existing one.
+    enrolled = build_template([0.0, 1.0, 0.0], updated_at=enrolled_at + timedelta(minutes=1))
+    rebuilt = build_template([0.0, 0.0, 1.0], criminal_id=existing.criminal_id, updated_at=enrolled_at + timedelta(minutes=2))
+    enrolling_worker.upsert(enrolled)
+    enrolling_worker.upsert(rebuilt)
+    assert searching_worker.search([0.0, 1.0, 0.0], limit=1)[0][0].criminal_id == existing.criminal_id
+
+    session = gallery_session((2, rebuilt.updated_at), [enrolled, rebuilt])
+    assert await searching_worker.refresh_if_changed(session) is True
+
+    assert searching_worker.search([0.0, 1.0, 0.0], limit=1)[0][0].criminal_id == enrolled.criminal_id
+    [match] = searching_worker.search([0.0, 0.0, 1.0], limit=1)
+    assert match[0].criminal_id == existing.criminal_id
+    assert match[1] == pytest.approx(0.0)
+
+    # In sync now, and the enrolling worker already was: one aggregate query each, nothing reloaded.
+    for gallery in (searching_worker, enrolling_worker):
+        session = gallery_session((2, rebuilt.updated_at))
+        assert await gallery.refresh_if_changed(session) is False
+        session.execute.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_refresh_if_changed_reloads_after_a_delete_in_another_worker():
+    kept = build_template([1.0, 0.0])
+    deleted = build_template([0.0, 1.0])
+    gallery = TemplateGallery()
+    gallery.load_templates([kept, deleted])
+
+    session = gallery_session((1, kept.updated_at), [kept])
+    assert await gallery.refresh_if_changed(session) is True
+
+    assert gallery.size == 1
+    assert gallery.search([0.0, 1.0], limit=5)[0][0].criminal_id == kept.criminal_id
@@ -0,0 +1,131 @@
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+from uuid import uuid4
+
+import numpy as np
+import pytest
+from pydantic import ValidationError
+
+from src.services.recognition_service import RecognitionService
+from src.services.template_gallery import TemplateGallery
+from src.services.two_stage_retrieval import (
+    TwoStageRetriever,
+    binarize,
+    fuse_distance,
+    hamming_distances,
+    template_face_ids,
+)
+
+
+def build_template(embedding, *, primary_face_id=None, support_face_ids=()):
+    return SimpleNamespace(
+        id=uuid4(),
+        criminal_id=uuid4(),
+        template_version="tracenet_template_v1",
+        embedding_version="tracenet_v1",
+        primary_face_id=primary_face_id,
+        support_face_ids="|".join(str(face_id) for face_id in support_face_ids) or None,
+        active_face_count=1 + len(support_face_ids),
+        support_face_count=len(support_face_ids),
+        archived_face_count=0,
+        outlier_face_count=0,
+        updated_at=None,
+        template_embedding=list(embedding),
+    )
+
+
+def test_hamming_distances_count_differing_sign_bits():
+    codes = binarize(np.asarray([[1.0, -1.0, 1.0, -1.0], [-1.0, -1.0, -1.0, -1.0]]))
+    query_code = binarize(np.asarray([1.0, 1.0, 1.0, 1.0]))
+
+    assert hamming_distances(codes, query_code).tolist() == [2, 4]
+
+
+def test_fuse_distance_modes():
+    assert fuse_distance(0.8, [0.5, 0.3], fusion="template") == pytest.approx(0.8)
+    assert fuse_distance(0.8, [0.5, 0.3], fusion="support_min") == pytest.approx(0.3)
+    assert fuse_distance(0.2, [0.5, 0.3], fusion="min") == pytest.approx(0.2)
+    assert fuse_distance(0.8, [0.5, 0.3], fusion="weighted", template_weight=0.25) == pytest.approx(0.425)
+    assert fuse_distance(0.8, [], fusion="weighted") == pytest.approx(0.8)
+
+
+def test_template_face_ids_include_primary_face_first():
+    primary_face_id = uuid4()
+    support_face_id = uuid4()
+    template = build_template([0.0], primary_face_id=primary_face_id, support_face_ids=[support_face_id])
+
+    assert template_face_ids(template) == [primary_face_id, support_face_id]
+
+
+def test_retriever_rejects_unknown_and_template_fusion():
+    with pytest.raises(ValueError):
+        TwoStageRetriever(AsyncMock(), fusion="mean")
+    # Template fusion would re-rank nothing and only lose recall to the binary shortlist.
+    with pytest.raises(ValueError):
+        TwoStageRetriever(AsyncMock(), fusion="template")
+
+
+def test_two_stage_settings_require_a_rerank_fusion(monkeypatch):
+    required = {"SECRET_KEY": "secret", "DATABASE_URL": "postgresql+asyncpg://localhost/test"}
+    for name, value in required.items():
+        monkeypatch.setenv(name, value)
+    from src.core.config import Settings
+
+    for fusion in (None, "template"):
+        with pytest.raises(ValidationError):
+            Settings(**required, RECOGNITION_TWO_STAGE_ENABLED=True, RECOGNITION_RERANK_FUSION=fusion)
+    assert Settings(**required, RECOGNITION_TWO_STAGE_ENABLED=True, RECOGNITION_RERANK_FUSION="weighted")
+    assert Settings(**required).RECOGNITION_RERANK_FUSION is None
+
+
+@pytest.mark.asyncio
+async def test_rerank_many_fetches_faces_once_and_reorders_by_fused_distance():
+    near_face_id = uuid4()
+    far_face_id = uuid4()
+    first = build_template([1.0, 0.0], primary_face_id=far_face_id)
+    second = build_template([0.0, 1.0], support_face_ids=[near_face_id])
+    face_repo = AsyncMock()
+    face_repo.get_embeddings_by_ids.return_value = [
+        (near_face_id, second.criminal_id, [0.6, 0.8]),
+        (far_face_id, first.criminal_id, [-1.0, 0.0]),
+    ]
+    retriever = TwoStageRetriever(face_repo, fusion="support_min")
+    candidates = [
+        {"criminal_id": str(first.criminal_id), "template": first, "distance": 0.4},
+        {"criminal_id": str(second.criminal_id), "template": second, "distance": 0.6},
+    ]
+
+    [reranked] = await retriever.rerank_many([[0.6, 0.8]], [candidates])
+
+    face_repo.get_embeddings_by_ids.assert_awaited_once_with([far_face_id, near_face_id])
+    assert [candidate["criminal_id"] for candidate in reranked] == [str(second.criminal_id), str(first.criminal_id)]
+    assert reranked[0]["distance"] == pytest.approx(0.0)
+    assert reranked[0]["template_distance"] == pytest.approx(0.6)
+    assert reranked[1]["support_distance"] == pytest.approx(np.linalg.norm([1.6, 0.8]))
+
+
+@pytest.mark.asyncio
+async def test_rank_criminal_candidates_two_stage_uses_coarse_gallery_and_truncates():
+    rng = np.random.default_rng(5)
+    templates = [build_template(row) for row in rng.normal(size=(20, 8)).astype(np.float32)]
+    gallery = TemplateGallery()
+    gallery.load_templates(templates)
+    template_repo = AsyncMock()
+    face_repo = AsyncMock()
+    face_repo.get_embeddings_by_ids.return_value = []
+
+    service = RecognitionService(
+        MagicMock(),
+        template_repo,
+        face_repo,
+        AsyncMock(),
+        AsyncMock(),
+        template_gallery=gallery,
+        two_stage_retriever=TwoStageRetriever(face_repo, coarse_candidates=10, fusion="weighted"),
+    )
+    candidates = await service._rank_criminal_candidates(templates[3].template_embedding, limit=3)
+
+    template_repo.find_nearest_candidates.assert_not_awaited()
+    face_repo.get_embeddings_by_ids.assert_awaited_once()
+    assert len(candidates) == 3
+    assert candidates[0]["criminal_id"] == str(templates[3].criminal_id)
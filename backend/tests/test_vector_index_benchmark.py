@@ -0,0 +1,55 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from scripts.benchmark_vector_index import compute_recall_at_k, summarize_latencies, summarize_setting
+from src.infrastructure.repositories.identity_template import IdentityTemplateRepository
+
+
+def test_compute_recall_at_k_counts_overlap_with_exact_top_k():
+    assert compute_recall_at_k([1, 2, 3, 4], [4, 2, 9, 8], k=4) == 0.5
+    assert compute_recall_at_k([1, 2, 3], [3, 2, 1], k=2) == 0.5
+    assert compute_recall_at_k([], [1, 2], k=5) is None
+
+
+def test_summarize_setting_averages_recall_and_latency():
+    summary = summarize_setting(
+        parameter="hnsw.ef_search",
+        value=40,
+        exact_results=[[1, 2], [3, 4]],
+        approximate_results=[[1, 2], [3, 5]],
+        latencies_ms=[1.0, 3.0],
+        k=2,
+    )
+
+    assert summary["recall_at_k"] == 0.75
+    assert summary["min_recall_at_k"] == 0.5
+    assert summary["latency"]["p50_ms"] == 2.0
+    assert summarize_latencies([])["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_find_nearest_neighbors_sets_transaction_local_ef_search():
+    session = MagicMock()
+    result = MagicMock()
+    result.all.return_value = []
+    session.execute = AsyncMock(return_value=result)
+    repository = IdentityTemplateRepository(session, ef_search=5)
+
+    await repository.find_nearest_neighbors([0.1] * 512, limit=10)
+
+    assert session.execute.await_count == 2
+    tuning_sql = str(session.execute.await_args_list[0].args[0].compile(compile_kwargs={"literal_binds": True}))
+    assert "set_config('hnsw.ef_search', '10', true)" in tuning_sql
+
+
+@pytest.mark.asyncio
+async def test_find_nearest_neighbors_skips_tuning_when_unconfigured():
+    session = MagicMock()
+    result = MagicMock()
+    result.all.return_value = []
+    session.execute = AsyncMock(return_value=result)
+
+    await IdentityTemplateRepository(session).find_nearest_neighbors([0.1] * 512, limit=3)
+
+    assert session.execute.await_count == 1
@@ -0,0 +1,96 @@
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.infrastructure.vector_indexes import (
+    VectorIndexMismatchError,
+    ann_index_names,
+    ann_index_statements,
+    find_missing_ann_indexes,
+    verify_halfvec_indexes,
+)
+
+
+def index_session(index_names):
+    result = MagicMock()
+    result.all.return_value = [(name,) for name in index_names]
+    session = AsyncMock()
+    session.execute.return_value = result
+    return session
+
+
+def test_ann_index_names_match_the_migrations():
+    assert ann_index_names("tracenet_v1", halfvec=False) == [
+        "ix_identity_templates_ann_tracenet_v1",
+        "ix_face_embeddings_ann_tracenet_v1",
+    ]
+    assert ann_index_names("facenet.v2", halfvec=True) == [
+        "ix_identity_templates_ann_half_facenet_v2",
+        "ix_face_embeddings_ann_half_facenet_v2",
+    ]
+
+
+@pytest.mark.asyncio
+async def test_verify_halfvec_indexes_accepts_a_migrated_database():
+    session = index_session([*ann_index_names("tracenet_v1", halfvec=True), "ix_face_embeddings_ann_facenet_vggface2"])
+
+    await verify_halfvec_indexes(session, "tracenet_v1")
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "index_names",
+    [
+        # Migration 8d3f6a1c2e47 never ran with VECTOR_INDEX_HALFVEC=true.
+        ann_index_names("tracenet_v1", halfvec=False),
+        # A float32 index left next to the halfvec ones could serve the re-score's ORDER BY.
+        [*ann_index_names("tracenet_v1", halfvec=True), "ix_face_embeddings_ann_tracenet_v1"],
+        # Built for another embedding version only.
+        ann_index_names("facenet_vggface2", halfvec=True),
+    ],
+)
+async def test_verify_halfvec_indexes_refuses_mismatched_indexes(index_names):
+    with pytest.raises(VectorIndexMismatchError):
+        await verify_halfvec_indexes(index_session(index_names), "tracenet_v1")
+
+
+def test_ann_index_statements_build_the_partial_indexes_of_a_new_version():
+    statements = ann_index_statements("arcface_v2")
+
+    assert statements == [
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_identity_templates_ann_arcface_v2 ON identity_templates "
+        "USING hnsw (template_embedding vector_l2_ops) WITH (m = 16, ef_construction = 64) "
+        "WHERE embedding_version = 'arcface_v2'",
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_face_embeddings_ann_arcface_v2 ON face_embeddings "
+        "USING hnsw (embedding vector_l2_ops) WITH (m = 16, ef_construction = 64) "
+        "WHERE embedding_version = 'arcface_v2'",
+    ]
+
+
+def test_ann_index_statements_support_ivfflat_and_halfvec():
+    statements = ann_index_statements(
+        "arcface_v2",
+        method="ivfflat",
+        halfvec=True,
+        ivfflat_lists={"identity_templates": 40},
+    )
+
+    assert statements[0].startswith(
+        "CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_identity_templates_ann_half_arcface_v2 ON identity_templates "
+        "USING ivfflat ((template_embedding::halfvec(512)) halfvec_l2_ops) WITH (lists = 40)"
+    )
+    assert "WITH (lists = 10)" in statements[1]
+
+
+@pytest.mark.parametrize("embedding_version", ["arcface'; DROP TABLE face_embeddings; --", "Arcface"])
+def test_ann_index_statements_reject_unsafe_versions(embedding_version):
+    with pytest.raises(ValueError):
+        ann_index_statements(embedding_version)
+
+
+@pytest.mark.asyncio
+async def test_find_missing_ann_indexes_reports_versions_without_indexes():
+    session = index_session(ann_index_names("tracenet_v1", halfvec=False))
+
+    assert await find_missing_ann_indexes(session, "tracenet_v1") == []
+    assert await find_missing_ann_indexes(session, "arcface_v2") == ann_index_names("arcface_v2", halfvec=False)